@@ -0,0 +1,114 @@
+"""
+Benchmark: incident burst with and without admission control
+
+Sends a burst of unique incidents (a quarter from SREs on auth incidents,
+the rest low priority) at once through the service. The mock model
+saturates like a rate-limited backend: above --capacity concurrent calls,
+every call slows down in proportion. Each caller waits --deadline-ms.
+
+Without admission control every incident starts a model call, all of them
+slow down together and most miss the deadline. With it, MODEL_CONCURRENCY
+calls run at full speed, high-priority incidents are served first, and
+what cannot drain within the deadline (--queue, about capacity x deadline /
+latency) is shed immediately with the escalate_to_human fallback.
+
+Usage:
+    python scripts/bench_admission.py [--incidents 400] [--capacity 8] [--latency 0.2] [--deadline-ms 5000] [--queue 160]
+"""
+
+import argparse
+import asyncio
+import logging
+import sys
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.aegis_service import main
+from src.aegis_service.admission import AdmissionController
+from src.aegis_service.deadline import Deadline
+from src.aegis_service.models import IncidentRequest
+from src.aegis_service.watsonx_client import WatsonxClient
+
+
+def saturating_client(capacity: int, latency: float) -> WatsonxClient:
+    client = WatsonxClient()
+    client.mock_mode = True
+    client.async_transport = None
+    # Admission wraps generation only, so the slowdown goes there
+    real_generate = client._agenerate_tiered
+    in_flight = 0
+
+    async def generate(**kwargs):
+        nonlocal in_flight
+        in_flight += 1
+        try:
+            await asyncio.sleep(latency * max(1.0, in_flight / capacity))
+            return await real_generate(**kwargs)
+        finally:
+            in_flight -= 1
+
+    client._agenerate_tiered = generate
+    return client
+
+
+async def burst(controller: AdmissionController, total: int, capacity: int, latency: float, deadline_ms: float):
+    results = {"high": [], "low": []}
+
+    async def one(i: int):
+        high = i % 4 == 0
+        request = IncidentRequest(
+            incident_text=f"Login failures spiking on auth-gw-{i}" if high else f"Disk space at 99% on db-{i}",
+            category="auth" if high else "storage",
+            reporter_role="SRE" if high else "Other"
+        )
+        start = time.perf_counter()
+        response = await main._evaluate(request, f"bench-{i}", Deadline(deadline_ms))
+        results["high" if high else "low"].append(
+            ((time.perf_counter() - start) * 1000, response.decision_path == "model")
+        )
+
+    with patch.object(main, "watsonx_client", saturating_client(capacity, latency)), \
+            patch.object(main, "admission", controller):
+        await asyncio.gather(*(one(i) for i in range(total)))
+    return results
+
+
+def summarize(samples):
+    timings = sorted(ms for ms, _ in samples)
+    answered = sum(ok for _, ok in samples)
+    p95 = timings[min(len(timings) - 1, int(0.95 * (len(timings) - 1)))]
+    return f"{answered:>4}/{len(samples):<4} answered, p95 {p95:>6.0f}ms"
+
+
+def bench(total: int, capacity: int, latency: float, deadline_ms: float, queue: int):
+    print(
+        f"{total} incidents at once, model capacity {capacity} x {latency * 1000:.0f}ms, "
+        f"caller deadline {deadline_ms:.0f}ms, admission queue {queue}\n"
+    )
+    configs = [
+        ("no admission", AdmissionController(max_concurrency=10 ** 9, max_queue=10 ** 9)),
+        ("admission", AdmissionController(max_concurrency=capacity, max_queue=queue))
+    ]
+    for name, controller in configs:
+        results = asyncio.run(burst(controller, total, capacity, latency, deadline_ms))
+        stats = controller.stats()
+        print(f"{name:<14}high priority: {summarize(results['high'])}   low priority: {summarize(results['low'])}"
+              f"   shed {stats['shed']}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--incidents", type=int, default=400, help="Incidents in the burst")
+    parser.add_argument("--capacity", type=int, default=8, help="Concurrent model calls before slowdown")
+    parser.add_argument("--latency", type=float, default=0.2, help="Model latency at or below capacity (seconds)")
+    parser.add_argument("--deadline-ms", type=float, default=5000, help="Caller deadline")
+    parser.add_argument("--queue", type=int, default=160, help="Admission queue size")
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+
+    bench(args.incidents, args.capacity, args.latency, args.deadline_ms, args.queue)
@@ -0,0 +1,130 @@
+"""
+Benchmark: /evaluate-incident throughput vs. concurrency on a single worker
+
+Drives the FastAPI app in-process against a fake watsonx.ai that answers
+every generation after a fixed delay. Compares the async REST path with the
+old behaviour of calling the blocking client directly on the event loop.
+With the async path, throughput should grow roughly linearly with
+concurrency; with the blocking path it stays flat at 1/latency.
+
+Usage:
+    python scripts/bench_async_inference.py [--latency 0.2] [--requests 64]
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import sys
+import time
+from pathlib import Path
+
+import httpx
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.aegis_service import main
+from src.aegis_service.decision_cache import DecisionCache
+from src.aegis_service.model_pool import IAMTokenManager
+from src.aegis_service.watsonx_client import WatsonxClient
+from src.aegis_service.watsonx_http import AsyncWatsonxTransport
+
+GENERATED = json.dumps({
+    "analysis": "Disk space critically low",
+    "recommended_action": "clear_logs",
+    "confidence_score": 95,
+    "explanation": "Log rotation failed; standard cleanup applies."
+})
+
+PAYLOAD = {
+    "incident_text": "Disk space at 99% on Server-DB-01. /var/log is 95GB. Log rotation failed.",
+    "category": "storage",
+    "reporter_role": "SRE"
+}
+
+
+def build_async_client(latency: float) -> WatsonxClient:
+    """WatsonxClient using the pooled async transport against a fake watsonx.ai"""
+    async def handler(request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(latency)
+        if request.url.path.endswith("/generation_stream"):
+            event = json.dumps({"results": [{"generated_text": GENERATED}]})
+            return httpx.Response(200, text=f"data: {event}\n\n")
+        return httpx.Response(200, json={"results": [{"generated_text": GENERATED}]})
+
+    client = WatsonxClient()
+    client.mock_mode = False
+    # Every request in this benchmark is identical; measure inference, not the cache
+    client.decision_cache = DecisionCache(max_size=0)
+    client.async_transport = AsyncWatsonxTransport(
+        url="https://watsonx.bench",
+        project_id="bench",
+        token_manager=IAMTokenManager(
+            "bench",
+            fetch=lambda: {"access_token": "bench", "expires_in": 3600},
+            background_refresh=False
+        ),
+        transport=httpx.MockTransport(handler)
+    )
+    return client
+
+
+class BlockingClient(WatsonxClient):
+    """Reproduces the old behaviour: a blocking generation on the event loop"""
+
+    def __init__(self, latency: float):
+        super().__init__()
+        self.latency = latency
+
+    async def aget_decision(self, incident_text, category, reporter_role, runbook_context, model_slot=None):
+        time.sleep(self.latency)
+        return self._finalize_decision(GENERATED, incident_text)
+
+
+async def run_level(concurrency: int, total: int) -> float:
+    """Send `total` requests with `concurrency` in flight; return requests/sec"""
+    transport = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as http:
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def one():
+            async with semaphore:
+                response = await http.post("/evaluate-incident", json=PAYLOAD)
+                response.raise_for_status()
+
+        start = time.perf_counter()
+        await asyncio.gather(*[one() for _ in range(total)])
+        return total / (time.perf_counter() - start)
+
+
+async def bench(latency: float, total: int):
+    levels = [1, 4, 16, 64]
+    modes = {
+        "blocking": BlockingClient(latency),
+        "async": build_async_client(latency),
+    }
+
+    print(f"Model latency: {latency * 1000:.0f}ms, {total} requests per level\n")
+    print(f"{'mode':<10}" + "".join(f"{'c=' + str(c):>12}" for c in levels))
+
+    for name, client in modes.items():
+        main.watsonx_client = client
+        row = []
+        for concurrency in levels:
+            # Blocking mode is serial regardless; keep its run short
+            n = min(total, 8) if name == "blocking" else total
+            row.append(await run_level(concurrency, n))
+        print(f"{name:<10}" + "".join(f"{rps:>9.1f}r/s" for rps in row))
+        await client.aclose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--latency", type=float, default=0.2, help="Fake model latency (seconds)")
+    parser.add_argument("--requests", type=int, default=64, help="Requests per concurrency level")
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+
+    asyncio.run(bench(args.latency, args.requests))
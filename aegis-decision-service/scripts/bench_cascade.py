@@ -0,0 +1,199 @@
+"""
+Benchmark: offline replay of the small -> large model cascade
+
+Replays a trace of incidents that were each decided by both the small
+model (WATSONX_SMALL_MODEL_ID) and the large model (WATSONX_MODEL_ID), one
+JSON object per line:
+
+    {"incident_text": "...", "category": "storage",
+     "small": {"action": "clear_logs", "confidence": 94, "latency_ms": 610, "tokens": 820, "fallback": false},
+     "large": {"action": "clear_logs", "confidence": 91, "latency_ms": 1980, "tokens": 820, "fallback": false}}
+
+For each uncertainty band it reports what the cascade would have cost:
+mean/p95 latency, relative token cost, how often the large model was
+consulted, and how often the cascade's action agrees with the large model's.
+
+A trace is recorded against real watsonx.ai with --record (needs
+WATSONX_API_KEY and WATSONX_PROJECT_ID). --synthetic generates a seeded
+stand-in trace so the replay can run anywhere; its numbers only show the
+mechanics, not Granite's real behaviour.
+
+Usage:
+    python scripts/bench_cascade.py --trace cascade_trace.jsonl [--bands 60-90,50-95]
+    python scripts/bench_cascade.py --record cascade_trace.jsonl [--incidents 100]
+    python scripts/bench_cascade.py --synthetic 1000
+"""
+
+import argparse
+import json
+import logging
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.aegis_service.prompt_assembler import estimate_tokens
+from src.aegis_service.watsonx_client import WatsonxClient, parse_cascade_band
+
+ACTIONS = ["clear_logs", "restart_service", "scale_up", "rollback_deploy", "escalate_to_human"]
+INCIDENTS = [
+    ("Disk space at 99% on Server-DB-0{i}. Log rotation failed.", "storage"),
+    ("Database latency high on replica-{i} but CPU and memory metrics are normal", "latency"),
+    ("Login failures for all users on sso-{i} after certificate renewal", "auth"),
+    ("Service payments-{i} returning 502 errors after config change", "unknown"),
+    ("Intermittent timeouts on api-{i}, could be network, might be the cache", "latency"),
+]
+
+
+def record(path: Path, incidents: int):
+    """Decide each incident with both models against watsonx.ai and write the trace"""
+    client = WatsonxClient()
+    if client.mock_mode:
+        sys.exit("--record needs watsonx.ai credentials (WATSONX_API_KEY, WATSONX_PROJECT_ID)")
+
+    with path.open("w") as out:
+        for n in range(incidents):
+            template, category = INCIDENTS[n % len(INCIDENTS)]
+            incident = {
+                "incident_text": template.format(i=n),
+                "category": category,
+                "reporter_role": "SRE",
+                "runbook_context": ""
+            }
+            entry = {"incident_text": incident["incident_text"], "category": category}
+            for tier, model_id in (("small", client.small_model_id), ("large", client.model_id)):
+                start = time.perf_counter()
+                decision = client._generate_decision(**incident, model_id=model_id)
+                entry[tier] = {
+                    "action": decision.recommended_action,
+                    "confidence": decision.confidence_score,
+                    "latency_ms": round((time.perf_counter() - start) * 1000, 1),
+                    "tokens": (decision.prompt_tokens or 0) + estimate_tokens(decision.analysis + decision.explanation),
+                    "fallback": decision.is_fallback
+                }
+            out.write(json.dumps(entry) + "\n")
+    print(f"Recorded {incidents} incidents to {path}")
+
+
+def synthetic(count: int, seed: int = 0) -> List[Dict[str, Any]]:
+    """Seeded stand-in trace: the small model is faster and agrees less when unsure"""
+    rng = random.Random(seed)
+    trace = []
+    for _ in range(count):
+        large_action = rng.choice(ACTIONS)
+        large_latency = rng.lognormvariate(7.5, 0.35)  # ~1.8s median
+        # Most incidents are clear-cut one way or the other; a minority are borderline
+        mode = rng.random()
+        centre = 94 if mode < 0.5 else 40 if mode < 0.8 else 75
+        confidence = min(99, max(10, int(rng.gauss(centre, 6))))
+        # Disagreement is likelier the less confident the small model is
+        agrees = rng.random() < 0.55 + 0.45 * (confidence / 100) ** 2
+        tokens = rng.randint(600, 1200)
+        trace.append({
+            "small": {
+                "action": large_action if agrees else rng.choice(ACTIONS),
+                "confidence": confidence,
+                "latency_ms": large_latency * rng.uniform(0.25, 0.45),
+                "tokens": tokens,
+                "fallback": rng.random() < 0.01
+            },
+            "large": {
+                "action": large_action,
+                "confidence": min(99, confidence + rng.randint(-5, 10)),
+                "latency_ms": large_latency,
+                "tokens": tokens,
+                "fallback": False
+            }
+        })
+    return trace
+
+
+def replay(
+    trace: List[Dict[str, Any]],
+    band: Optional[Tuple[int, int]],
+    small_price: float,
+    large_price: float
+) -> Dict[str, float]:
+    """
+    Cost of deciding every incident in the trace with one cascade setting.
+
+    Args:
+        trace: Recorded small/large decisions
+        band: Uncertainty band (None = large model only)
+        small_price: Relative cost per 1k tokens on the small model
+        large_price: Relative cost per 1k tokens on the large model
+
+    Returns:
+        Latency, cost, escalation and agreement figures
+    """
+    latencies, cost, escalated, agreed = [], 0.0, 0, 0
+    for entry in trace:
+        small, large = entry["small"], entry["large"]
+        if band is None:
+            latency, spent, action = large["latency_ms"], large["tokens"] * large_price, large["action"]
+        else:
+            latency, spent, action = small["latency_ms"], small["tokens"] * small_price, small["action"]
+            low, high = band
+            if small["fallback"] or low <= small["confidence"] < high:
+                escalated += 1
+                latency += large["latency_ms"]
+                spent += large["tokens"] * large_price
+                action = large["action"]
+        latencies.append(latency)
+        cost += spent / 1000
+        agreed += action == large["action"]
+
+    latencies.sort()
+    return {
+        "mean_ms": statistics.mean(latencies),
+        "p95_ms": latencies[int(len(latencies) * 0.95) - 1],
+        "cost": cost,
+        "escalated": escalated / len(trace),
+        "agreement": agreed / len(trace)
+    }
+
+
+def report(trace: List[Dict[str, Any]], bands: List[str], small_price: float, large_price: float):
+    baseline = replay(trace, None, small_price, large_price)
+    print(f"{len(trace)} incidents, cost in units of {large_price:g}/1k tokens (large) vs {small_price:g}/1k (small)")
+    print(f"{'setting':<14} {'mean ms':>9} {'p95 ms':>9} {'cost':>9} {'saved':>7} {'to large':>9} {'agree':>7}")
+    rows = [("large only", baseline)] + [
+        (f"band {spec}", replay(trace, parse_cascade_band(spec), small_price, large_price)) for spec in bands
+    ]
+    for name, r in rows:
+        saved = 1 - r["cost"] / baseline["cost"]
+        print(
+            f"{name:<14} {r['mean_ms']:>9.0f} {r['p95_ms']:>9.0f} {r['cost']:>9.1f} {saved:>6.0%} "
+            f"{r['escalated']:>8.0%} {r['agreement']:>6.1%}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--trace", type=Path, help="Recorded trace to replay (JSONL)")
+    source.add_argument("--record", type=Path, help="Record a trace against watsonx.ai to this path")
+    source.add_argument("--synthetic", type=int, metavar="N", help="Replay a seeded synthetic trace of N incidents")
+    parser.add_argument("--incidents", type=int, default=100, help="Incidents to record (with --record)")
+    parser.add_argument("--bands", default="60-90,50-95,70-90,0-0", help="Comma-separated bands to compare (0-0 = small only)")
+    # Relative prices; the default 1:4 follows the 2B vs 8B parameter counts
+    parser.add_argument("--small-price", type=float, default=1.0, help="Relative cost per 1k tokens, small model")
+    parser.add_argument("--large-price", type=float, default=4.0, help="Relative cost per 1k tokens, large model")
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+
+    if args.record:
+        record(args.record, args.incidents)
+    else:
+        if args.synthetic:
+            print("SYNTHETIC trace - shows the replay mechanics only, not real model behaviour")
+            trace = synthetic(args.synthetic)
+        else:
+            trace = [json.loads(line) for line in args.trace.read_text().splitlines() if line.strip()]
+        report(trace, args.bands.split(","), args.small_price, args.large_price)
@@ -0,0 +1,77 @@
+"""
+Benchmark: response time with and without a request deadline
+
+Evaluates incidents through the service against a mock model whose latency
+is swept from well under to well over the caller's deadline. Without a
+deadline (the original behaviour) the caller waits for the model however
+long it takes; with one, the model call is cancelled at the deadline and
+the safe escalate_to_human fallback is returned in time.
+
+Usage:
+    python scripts/bench_deadline.py [--incidents 5] [--deadline-ms 1000]
+"""
+
+import argparse
+import asyncio
+import logging
+import sys
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.aegis_service import main
+from src.aegis_service.deadline import Deadline
+from src.aegis_service.models import IncidentRequest
+from src.aegis_service.watsonx_client import WatsonxClient
+
+
+def slow_client(latency: float) -> WatsonxClient:
+    client = WatsonxClient()
+    client.mock_mode = True
+    client.async_transport = None
+    real_decision = client.aget_decision
+
+    async def slow_decision(**kwargs):
+        await asyncio.sleep(latency)
+        return await real_decision(**kwargs)
+
+    client.aget_decision = slow_decision
+    return client
+
+
+async def run(latency: float, budget_ms: float, total: int):
+    timings, fallbacks = [], 0
+    with patch.object(main, "watsonx_client", slow_client(latency)):
+        for i in range(total):
+            request = IncidentRequest(incident_text=f"Disk space at 99% on db-{i}", category="storage")
+            start = time.perf_counter()
+            response = await main._evaluate(request, f"bench-{i}", Deadline(budget_ms))
+            timings.append((time.perf_counter() - start) * 1000)
+            fallbacks += response.decision_path == "fallback"
+    return sum(timings) / total, max(timings), fallbacks
+
+
+def bench(total: int, deadline_ms: float):
+    print(f"{total} incidents per run, caller deadline {deadline_ms:.0f}ms\n")
+    print(f"{'model latency':<15}{'no deadline (mean/max)':>24}{'deadline (mean/max)':>22}{'fallbacks':>11}")
+    for latency in (0.1, 0.5, 0.9, 1.5, 3.0):
+        unbounded_mean, unbounded_max, _ = asyncio.run(run(latency, 10 ** 9, total))
+        mean, worst, fallbacks = asyncio.run(run(latency, deadline_ms, total))
+        print(
+            f"{latency * 1000:>11.0f}ms{unbounded_mean:>14.0f}/{unbounded_max:.0f}ms"
+            f"{mean:>14.0f}/{worst:.0f}ms{f'{fallbacks}/{total}':>11}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--incidents", type=int, default=5, help="Incidents per run")
+    parser.add_argument("--deadline-ms", type=float, default=1000, help="Caller deadline")
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+
+    bench(args.incidents, args.deadline_ms)
@@ -0,0 +1,126 @@
+"""
+Benchmark: rule-based fast path vs. always calling the model
+
+Replays a traffic mix of textbook storage incidents, ambiguous incidents and
+everything else through WatsonxClient in mock mode, with a fixed simulated
+model latency. Reports model-call volume, latency and how often the
+fast-path decision agrees with the (mock) model's decision.
+
+Usage:
+    python scripts/bench_fast_path.py [--latency 0.2] [--requests 200]
+"""
+
+import argparse
+import asyncio
+import logging
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.aegis_service.decision_cache import DecisionCache
+from src.aegis_service.fast_path import FAST_PATH_RULES, RuleEngine
+from src.aegis_service.watsonx_client import WatsonxClient
+
+TEXTBOOK = [
+    "Disk space at 99% on Server-DB-0{i}. /var/log is 95GB. Log rotation failed.",
+    "Disk usage at 95% on app-node-{i}; log rotation stopped after the last deploy",
+]
+AMBIGUOUS = [
+    "Database latency high on replica-{i} but CPU and memory metrics are normal",
+    "Intermittent timeouts on api-{i}, could be network, might be the cache",
+]
+OTHER = [
+    "Login failures for all users on sso-{i} after certificate renewal",
+    "Service payments-{i} returning 502 errors after config change",
+    "Disk space at 85% on Server-DB-0{i}, growth trend unclear",
+]
+
+
+def build_workload(total: int, seed: int = 7):
+    """Roughly 40% textbook, 20% ambiguous, 40% other; unique texts defeat the cache"""
+    rng = random.Random(seed)
+    workload = []
+    for i in range(total):
+        roll = rng.random()
+        pool = TEXTBOOK if roll < 0.4 else AMBIGUOUS if roll < 0.6 else OTHER
+        category = "storage" if pool is TEXTBOOK else rng.choice(["latency", "auth", "unknown"])
+        workload.append((rng.choice(pool).format(i=i), category))
+    return workload
+
+
+class SlowMockClient(WatsonxClient):
+    """Mock-mode client that pays a fixed latency per model call"""
+
+    def __init__(self, latency: float, rules: bool):
+        super().__init__()
+        self.mock_mode = True
+        self.async_transport = None
+        self.decision_cache = DecisionCache(max_size=0)
+        self.rule_engine = RuleEngine.from_file(FAST_PATH_RULES) if rules else None
+        self.latency = latency
+        self.model_calls = 0
+
+    def _generate_decision(self, **kwargs):
+        self.model_calls += 1
+        time.sleep(self.latency)
+        return super()._generate_decision(**kwargs)
+
+
+def routes_to_automation(decision) -> bool:
+    return decision.confidence_score >= 80 and decision.recommended_action != "escalate_to_human"
+
+
+async def run(client: WatsonxClient, workload):
+    latencies, decisions = [], []
+    for incident_text, category in workload:
+        start = time.perf_counter()
+        decisions.append(await client.aget_decision(incident_text, category, "SRE", ""))
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies, decisions
+
+
+async def bench(latency: float, total: int):
+    workload = build_workload(total)
+    print(f"Model latency: {latency * 1000:.0f}ms, {total} incidents\n")
+    print(f"{'mode':<12}{'model calls':>12}{'mean':>10}{'p50':>10}{'total':>10}")
+
+    results = {}
+    for name, rules in [("model-only", False), ("fast-path", True)]:
+        client = SlowMockClient(latency, rules)
+        start = time.perf_counter()
+        latencies, decisions = await run(client, workload)
+        elapsed = time.perf_counter() - start
+        results[name] = decisions
+        print(f"{name:<12}{client.model_calls:>12}{statistics.mean(latencies):>8.1f}ms"
+              f"{statistics.median(latencies):>8.1f}ms{elapsed:>9.1f}s")
+        await client.aclose()
+
+    settled = [i for i, d in enumerate(results["fast-path"]) if d.decision_path == "rules"]
+    if settled:
+        same_action = sum(
+            results["fast-path"][i].recommended_action == results["model-only"][i].recommended_action
+            for i in settled
+        )
+        same_route = sum(
+            routes_to_automation(results["fast-path"][i]) == routes_to_automation(results["model-only"][i])
+            for i in settled
+        )
+        print(f"\nSettled by rules: {len(settled)}/{total}")
+        print(f"Agreement with model: action {same_action / len(settled):.0%}, "
+              f"automate-vs-human routing {same_route / len(settled):.0%}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--latency", type=float, default=0.2, help="Simulated model latency (seconds)")
+    parser.add_argument("--requests", type=int, default=200, help="Incidents to replay")
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+
+    asyncio.run(bench(args.latency, args.requests))
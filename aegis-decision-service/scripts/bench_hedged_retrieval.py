@@ -0,0 +1,75 @@
+"""
+Benchmark: sequential vs. hedged runbook retrieval
+
+Retrieves runbook context for unique incidents (Langflow cache disabled)
+against scripts/langflow_stub.py at several Langflow latencies, once the
+original way (wait for Langflow, then fall back to local) and once hedged
+(local immediately, Langflow only within the soft deadline). Reports the
+mean retrieval time and how often Langflow's context was used.
+
+Usage:
+    python scripts/bench_hedged_retrieval.py [--incidents 10] [--deadline-ms 300] [--timeout 1.0]
+"""
+
+import argparse
+import logging
+import sys
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from scripts.langflow_stub import LangflowStub
+from src.aegis_service import runbook_context
+from src.aegis_service.decision_cache import DecisionCache
+from src.aegis_service.langflow_client import LangflowClient
+
+
+def run(stub: LangflowStub, timeout: float, hedge: bool, deadline_ms: float, total: int):
+    client = LangflowClient(url=stub.url, timeout=timeout, cache=DecisionCache(max_size=0))
+    # Breaker disabled so every incident pays what the configuration costs
+    client.breaker.failure_threshold = 10 ** 9
+    with patch.object(runbook_context, "langflow_client", client), \
+            patch.object(runbook_context, "RUNBOOK_HEDGE", hedge), \
+            patch.object(runbook_context, "LANGFLOW_SOFT_DEADLINE_MS", deadline_ms):
+        wins = 0
+        start = time.perf_counter()
+        for i in range(total):
+            retrieval = runbook_context.retrieve_runbook_context("storage", f"Disk space at 99% on db-{i}")
+            wins += retrieval.source == "langflow"
+        elapsed = time.perf_counter() - start
+    client.close()
+    return elapsed / total * 1000, wins
+
+
+def bench(total: int, deadline_ms: float, timeout: float):
+    scenarios = [("50ms", 0.05, False), ("250ms", 0.25, False), ("800ms", 0.8, False),
+                 ("hung", timeout * 2, False), ("HTTP 500", 0.0, True)]
+
+    print(f"{total} incidents per run, soft deadline {deadline_ms:.0f}ms, Langflow timeout {timeout:.1f}s\n")
+    print(f"{'langflow':<10}{'sequential':>12}{'hedged':>10}{'langflow used (seq/hedged)':>30}")
+    for name, latency, failing in scenarios:
+        results = []
+        for hedge in (False, True):
+            stub = LangflowStub(latency=latency).start()
+            stub.failing = failing
+            try:
+                results.append(run(stub, timeout, hedge, deadline_ms, total))
+            finally:
+                stub.stop()
+        (seq_ms, seq_wins), (hedged_ms, hedged_wins) = results
+        print(f"{name:<10}{seq_ms:>10.0f}ms{hedged_ms:>8.0f}ms{f'{seq_wins}/{total} / {hedged_wins}/{total}':>30}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--incidents", type=int, default=10, help="Incidents per run")
+    parser.add_argument("--deadline-ms", type=float, default=300, help="Langflow soft deadline")
+    parser.add_argument("--timeout", type=float, default=1.0, help="Langflow request timeout (seconds)")
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+
+    bench(args.incidents, args.deadline_ms, args.timeout)
@@ -0,0 +1,115 @@
+"""
+Benchmark: generation tail latency with and without hedging
+
+Runs incidents through the async REST path against an in-process fake
+watsonx.ai whose latency has a long tail (by default 20ms typical, 10x
+slower for 5% of requests - the 2s / 10s+ pattern seen from Granite, scaled
+down 100x). Compares hedging off with hedging at the p95 latency capped at
+--max-rate hedges per generation. Reports p50/p95/p99 generation time and
+the extra requests sent.
+
+Usage:
+    python scripts/bench_hedging.py [--incidents 400] [--concurrency 8] [--slow-rate 0.05] [--max-rate 0.1]
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import random
+import sys
+import time
+from pathlib import Path
+
+import httpx
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.aegis_service.hedging import Hedger
+from src.aegis_service.model_pool import IAMTokenManager
+from src.aegis_service.watsonx_client import WatsonxClient
+from src.aegis_service.watsonx_http import AsyncWatsonxTransport
+
+GENERATED = json.dumps({
+    "recommended_action": "clear_logs",
+    "confidence_score": 95,
+    "analysis": "Disk space critically low",
+    "explanation": "Log rotation failed; standard cleanup applies."
+})
+
+
+def make_client(slow_rate: float, hedger: Hedger, sent: dict) -> WatsonxClient:
+    rng = random.Random(0)
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        sent["n"] += 1
+        latency = rng.uniform(0.015, 0.025)
+        if rng.random() < slow_rate:
+            latency *= 10
+        await asyncio.sleep(latency)
+        return httpx.Response(200, text=f'data: {json.dumps({"results": [{"generated_text": GENERATED}]})}\n\n')
+
+    client = WatsonxClient()
+    client.mock_mode = False
+    client.async_transport = AsyncWatsonxTransport(
+        url="https://watsonx.bench",
+        project_id="bench",
+        token_manager=IAMTokenManager(
+            "bench-key", fetch=lambda: {"access_token": "t", "expires_in": 3600}, background_refresh=False
+        ),
+        transport=httpx.MockTransport(handler)
+    )
+    client.hedger = hedger
+    return client
+
+
+async def run(client: WatsonxClient, total: int, concurrency: int):
+    semaphore = asyncio.Semaphore(concurrency)
+    timings = []
+
+    async def one(i: int):
+        async with semaphore:
+            start = time.perf_counter()
+            await client.aget_decision(
+                incident_text=f"Disk at 99% on Server-DB-{i}, log rotation failed",
+                category="storage",
+                reporter_role="SRE",
+                runbook_context=""
+            )
+            timings.append((time.perf_counter() - start) * 1000)
+
+    await asyncio.gather(*(one(i) for i in range(total)))
+    await client.aclose()
+    return sorted(timings)
+
+
+def pct(ordered, p):
+    return ordered[min(len(ordered) - 1, int(round(p / 100 * (len(ordered) - 1))))]
+
+
+def bench(total: int, concurrency: int, slow_rate: float, max_rate: float):
+    print(f"{total} incidents, {concurrency} concurrent, {slow_rate:.0%} of generations 10x slower\n")
+    print(f"{'mode':<10}{'p50':>8}{'p95':>8}{'p99':>8}{'extra requests':>16}")
+    for name, enabled in (("off", False), ("hedged", True)):
+        sent = {"n": 0}
+        hedger = Hedger(enabled=enabled, percentile=95, max_rate=max_rate, min_samples=20)
+        timings = asyncio.run(run(make_client(slow_rate, hedger, sent), total, concurrency))
+        extra = sent["n"] - total
+        print(
+            f"{name:<10}{pct(timings, 50):>6.0f}ms{pct(timings, 95):>6.0f}ms{pct(timings, 99):>6.0f}ms"
+            f"{f'{extra} ({extra / total:.1%})':>16}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--incidents", type=int, default=400, help="Incidents per run")
+    parser.add_argument("--concurrency", type=int, default=8, help="Incidents in flight")
+    parser.add_argument("--slow-rate", type=float, default=0.05, help="Fraction of 10x slower generations")
+    parser.add_argument("--max-rate", type=float, default=0.1, help="Hedges allowed per generation")
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+
+    bench(args.incidents, args.concurrency, args.slow_rate, args.max_rate)
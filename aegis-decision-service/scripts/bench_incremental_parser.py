@@ -0,0 +1,166 @@
+"""
+Benchmark: early generation stop and single-pass parsing
+
+Part 1 drives WatsonxClient against a fake watsonx.ai that decodes tokens at
+a fixed rate and, like Granite often does, keeps talking after the JSON
+object closes. Compares waiting for the full generation with streaming and
+cancelling as soon as the incremental parser sees the closing brace.
+
+Part 2 compares the old multi-strategy parser (direct parse, markdown fence
+regex, brace slicing) with parse_decision_fields and with feeding the whole
+response through the incremental parser (the per-response cost the
+streaming paths pay, spread across tokens).
+
+Usage:
+    python scripts/bench_incremental_parser.py [--token-ms 20] [--trailing-tokens 60]
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import re
+import sys
+import time
+from pathlib import Path
+
+import httpx
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.aegis_service import watsonx_client as watsonx_module
+from src.aegis_service.decision_cache import DecisionCache
+from src.aegis_service.incremental_parser import IncrementalDecisionParser, parse_decision_fields
+from src.aegis_service.model_pool import IAMTokenManager
+from src.aegis_service.watsonx_client import WatsonxClient
+from src.aegis_service.watsonx_http import AsyncWatsonxTransport
+
+DECISION = json.dumps({
+    "recommended_action": "clear_logs",
+    "confidence_score": 95,
+    "analysis": "Disk space critically low on Server-DB-01",
+    "explanation": "Log rotation failed; standard cleanup applies with low risk."
+}, indent=2)
+
+TRAILING = " I hope this analysis helps. Let me know if you need more details on the remediation."
+
+CHARS_PER_TOKEN = 4
+
+
+def tokenize(text: str):
+    return [text[i:i + CHARS_PER_TOKEN] for i in range(0, len(text), CHARS_PER_TOKEN)]
+
+
+def build_client(token_ms: float, trailing_tokens: int, counter: dict) -> WatsonxClient:
+    """WatsonxClient against a fake watsonx.ai decoding one token every token_ms"""
+    trailing = (TRAILING * (trailing_tokens // len(tokenize(TRAILING)) + 1))
+    tokens = tokenize(DECISION) + tokenize(trailing)[:trailing_tokens]
+    delay = token_ms / 1000
+
+    async def events():
+        for token in tokens:
+            await asyncio.sleep(delay)
+            counter["generated"] += 1
+            yield f'data: {json.dumps({"results": [{"generated_text": token}]})}\n\n'.encode()
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path.endswith("/generation_stream"):
+            return httpx.Response(200, content=events())
+        await asyncio.sleep(delay * len(tokens))
+        counter["generated"] += len(tokens)
+        return httpx.Response(200, json={"results": [{"generated_text": "".join(tokens)}]})
+
+    client = WatsonxClient()
+    client.mock_mode = False
+    client.decision_cache = DecisionCache(max_size=0)
+    client.async_transport = AsyncWatsonxTransport(
+        url="https://watsonx.bench",
+        project_id="bench",
+        token_manager=IAMTokenManager(
+            "bench",
+            fetch=lambda: {"access_token": "bench", "expires_in": 3600},
+            background_refresh=False
+        ),
+        transport=httpx.MockTransport(handler)
+    )
+    return client
+
+
+async def bench_early_stop(token_ms: float, trailing_tokens: int, runs: int):
+    print(f"Decode rate: {token_ms:.0f}ms/token, {len(tokenize(DECISION))} JSON tokens "
+          f"+ {trailing_tokens} trailing tokens, {runs} runs\n")
+    print(f"{'mode':<12}{'tokens':>10}{'latency':>12}{'action':>14}")
+
+    for name, early_stop in [("full", False), ("early-stop", True)]:
+        watsonx_module.WATSONX_EARLY_STOP = early_stop
+        counter = {"generated": 0}
+        client = build_client(token_ms, trailing_tokens, counter)
+
+        start = time.perf_counter()
+        for i in range(runs):
+            decision = await client.aget_decision(f"Disk at 99% on host-{i}", "storage", "SRE", "")
+        elapsed_ms = (time.perf_counter() - start) * 1000 / runs
+        await client.aclose()
+
+        print(f"{name:<12}{counter['generated'] / runs:>10.0f}{elapsed_ms:>10.0f}ms"
+              f"{decision.recommended_action:>14}")
+
+
+def legacy_parse(raw_response: str) -> dict:
+    """The old strategy chain, minus the regex last resort"""
+    try:
+        return json.loads(raw_response.strip())
+    except json.JSONDecodeError:
+        pass
+
+    match = re.search(r"```(?:json)?\s*(\{.*?\})\s*```", raw_response, re.DOTALL)
+    if match:
+        try:
+            return json.loads(match.group(1))
+        except json.JSONDecodeError:
+            pass
+
+    start_idx = raw_response.find("{")
+    end_idx = raw_response.rfind("}")
+    return json.loads(raw_response[start_idx:end_idx + 1])
+
+
+def incremental_parse(raw_response: str) -> dict:
+    parser = IncrementalDecisionParser()
+    parser.feed(raw_response)
+    return parser.fields
+
+
+def bench_parse(iterations: int):
+    samples = {
+        "bare": DECISION,
+        "fenced": f"```json\n{DECISION}\n```",
+        "wrapped": f"Here's the analysis:\n{DECISION}\n{TRAILING}",
+    }
+
+    print(f"\nParse cost per response ({iterations} iterations)\n")
+    print(f"{'format':<10}{'legacy':>12}{'single-pass':>14}{'incremental':>14}")
+    for name, text in samples.items():
+        assert legacy_parse(text) == parse_decision_fields(text) == incremental_parse(text)
+        row = []
+        for fn in (legacy_parse, parse_decision_fields, incremental_parse):
+            start = time.perf_counter()
+            for _ in range(iterations):
+                fn(text)
+            row.append((time.perf_counter() - start) * 1e6 / iterations)
+        print(f"{name:<10}{row[0]:>10.1f}us{row[1]:>12.1f}us{row[2]:>12.1f}us")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--token-ms", type=float, default=20, help="Fake decode time per token (ms)")
+    parser.add_argument("--trailing-tokens", type=int, default=60, help="Tokens generated after the JSON")
+    parser.add_argument("--runs", type=int, default=5, help="Evaluations per mode")
+    parser.add_argument("--iterations", type=int, default=20000, help="Parse iterations per format")
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+
+    asyncio.run(bench_early_stop(args.token_ms, args.trailing_tokens, args.runs))
+    bench_parse(args.iterations)
@@ -0,0 +1,89 @@
+"""
+Benchmark: bare requests.post vs. the pooled, cached, circuit-broken Langflow client
+
+Runs a stream of incidents (with repeats, as monitoring tools re-send the
+same alert) through the original per-call requests.post lookup and through
+LangflowClient, against scripts/langflow_stub.py in two modes:
+- healthy: the stub answers after --latency seconds
+- unhealthy: the stub hangs past the client timeout on every call
+
+Reports total and mean retrieval time per incident and how many calls
+reached Langflow. The stub speaks plain HTTP on localhost, so the TLS
+handshakes that connection pooling saves against a real endpoint are not
+part of these numbers.
+
+Usage:
+    python scripts/bench_langflow_client.py [--incidents 60] [--latency 0.02] [--timeout 0.3]
+"""
+
+import argparse
+import logging
+import sys
+import time
+from pathlib import Path
+
+import requests
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from scripts.langflow_stub import LangflowStub
+from src.aegis_service.langflow_client import LangflowClient
+
+
+def legacy_fetch(url: str, timeout: float, category: str, incident_text: str):
+    """The original get_langflow_runbook: a fresh requests.post per incident"""
+    try:
+        response = requests.post(
+            url,
+            json={"category": category, "incident_text": incident_text},
+            timeout=timeout,
+            headers={"Content-Type": "application/json"}
+        )
+        response.raise_for_status()
+        return response.json().get("context") or None
+    except Exception:
+        return None
+
+
+def run(fetch, incidents):
+    start = time.perf_counter()
+    for category, incident_text in incidents:
+        fetch(category, incident_text)
+    return time.perf_counter() - start
+
+
+def bench(total: int, latency: float, timeout: float):
+    # One in three incidents is a re-send of an earlier alert
+    incidents = [("storage", f"Disk space at 99% on Server-DB-{i * 2 // 3}") for i in range(total)]
+
+    print(f"{total} incidents, stub latency {latency * 1000:.0f}ms, client timeout {timeout * 1000:.0f}ms\n")
+    print(f"{'mode':<11}{'client':<10}{'total':>9}{'per incident':>15}{'langflow calls':>16}")
+    for mode in ("healthy", "unhealthy"):
+        for name in ("legacy", "pooled"):
+            stub = LangflowStub(latency=latency if mode == "healthy" else timeout * 2).start()
+            client = LangflowClient(url=stub.url, timeout=timeout)
+            fetch = client.fetch if name == "pooled" else (
+                lambda category, text: legacy_fetch(stub.url, timeout, category, text)
+            )
+            try:
+                elapsed = run(fetch, incidents)
+            finally:
+                client.close()
+                stub.stop()
+            print(
+                f"{mode:<11}{name:<10}{elapsed:>8.2f}s{elapsed / total * 1000:>13.1f}ms"
+                f"{stub.requests:>16}"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--incidents", type=int, default=60, help="Incidents per run")
+    parser.add_argument("--latency", type=float, default=0.02, help="Healthy stub latency (seconds)")
+    parser.add_argument("--timeout", type=float, default=0.3, help="Client timeout (seconds)")
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+
+    bench(args.incidents, args.latency, args.timeout)
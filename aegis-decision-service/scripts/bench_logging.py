@@ -0,0 +1,109 @@
+"""
+Benchmark: per-evaluation logging cost on the request path
+
+Emits the log records of one /evaluate-incident call (five INFO records
+with `extra` fields and one policy WARNING) many times and reports the
+time the calling thread spends in logging (wall clock, and its own CPU
+time, which excludes waiting for the GIL), for:
+
+- sync text: logging.basicConfig's StreamHandler (the previous setup)
+- sync json: JSON records, still written on the calling thread
+- async json: JSON records formatted and written by the queue listener
+- async json, sampled: as above with INFO sampled per trace (--sample)
+
+Output goes to a real file (not /dev/null) so write costs are included.
+Between evaluations the caller sleeps --gap-ms, standing in for the
+Langflow and watsonx.ai waits during which the listener catches up; only
+the time inside the logging calls is counted. With --gap-ms 0 (a burst)
+the listener competes with the caller for the GIL, so the async setups
+save CPU time on the caller but less wall time. "Drain" is how long the listener needs for what is still
+queued after the last evaluation.
+
+Usage:
+    python scripts/bench_logging.py [--evaluations 5000] [--gap-ms 1] [--sample 0.1]
+"""
+
+import argparse
+import logging
+import os
+import sys
+import tempfile
+import time
+import uuid
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.aegis_service.log_pipeline import LogPipeline
+
+logger = logging.getLogger("aegis_service.bench")
+
+
+def one_evaluation(trace_id: str):
+    """The records one evaluation logs (see main._run_evaluation and _evaluate)"""
+    logger.info("Evaluating incident", extra={
+        "trace_id": trace_id, "category": "storage", "reporter_role": "SRE",
+        "incident_length": 64, "deadline_ms": 25000
+    })
+    logger.info("Retrieved runbook context", extra={
+        "trace_id": trace_id, "runbook_length": 1800, "runbook_source": "local", "langflow_outcome": "disabled"
+    })
+    logger.info("Prompt assembled (%d estimated tokens)", 820)
+    logger.warning("Ambiguous incident but confidence was %s, capping at 60", 95)
+    logger.info("Received model decision", extra={
+        "trace_id": trace_id, "recommended_action": "escalate_to_human", "confidence_score": 60
+    })
+    logger.info("Incident evaluation complete", extra={
+        "trace_id": trace_id, "final_action": "escalate_to_human", "final_confidence": 60, "decision_path": "model"
+    })
+
+
+def run(name: str, evaluations: int, gap_s: float, path: str, **install):
+    # Generated up front: uuid4 reads os.urandom, which would dominate the timings
+    trace_ids = [str(uuid.uuid4()) for _ in range(evaluations)]
+    pipeline = LogPipeline()
+    with open(path, "w") as out:
+        pipeline.install(stream=out, **install)
+        try:
+            caller_s = cpu_s = 0.0
+            for trace_id in trace_ids:
+                start, cpu_start = time.perf_counter(), time.thread_time()
+                one_evaluation(trace_id)
+                caller_s += time.perf_counter() - start
+                cpu_s += time.thread_time() - cpu_start
+                if gap_s:
+                    time.sleep(gap_s)
+            drain_start = time.perf_counter()
+            pipeline.stop()
+            drain_s = time.perf_counter() - drain_start
+            dropped = pipeline.handler.dropped if hasattr(pipeline.handler, "dropped") else 0
+        finally:
+            pipeline.stop()
+    lines = sum(1 for _ in open(path))
+    print(
+        f"{name:<22} {caller_s / evaluations * 1e6:>10.1f} {cpu_s / evaluations * 1e6:>10.1f} "
+        f"{drain_s * 1000:>9.0f} {lines:>9} {dropped:>8}"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--evaluations", type=int, default=5000, help="Evaluations to log per setup")
+    parser.add_argument("--gap-ms", type=float, default=1.0, help="Idle time between evaluations (0 = burst)")
+    parser.add_argument("--sample", type=float, default=0.1, help="INFO sample rate for the sampled run")
+    args = parser.parse_args()
+
+    # Every record of every setup fits in the queue, so nothing is dropped
+    queue_size = args.evaluations * 6 + 1
+    path = os.path.join(tempfile.mkdtemp(), "bench.log")
+    gap_s = args.gap_ms / 1000
+    print(f"{args.evaluations} evaluations, 6 records each, {args.gap_ms:g}ms apart, written to {path}")
+    print(f"{'setup':<22} {'wall us':>10} {'cpu us':>10} {'drain ms':>9} {'lines':>9} {'dropped':>8}")
+    run("sync text", args.evaluations, gap_s, path, fmt="text", async_writes=False)
+    run("sync json", args.evaluations, gap_s, path, fmt="json", async_writes=False)
+    run("async json", args.evaluations, gap_s, path, fmt="json", async_writes=True, queue_size=queue_size)
+    run(
+        f"async json, INFO={args.sample:g}", args.evaluations, gap_s, path,
+        fmt="json", async_writes=True, queue_size=queue_size, sample_rates=f"INFO={args.sample}"
+    )
@@ -0,0 +1,72 @@
+"""
+Benchmark: cost of recording metrics on the hot path
+
+Times counter increments, histogram observations and a stage timer (the
+operations an evaluation performs about a dozen times), single-threaded
+and from several threads at once, plus rendering /metrics.
+
+Usage:
+    python scripts/bench_metrics.py [--ops 200000] [--threads 8]
+"""
+
+import argparse
+import sys
+import threading
+import time
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.aegis_service.metrics import Counter, Histogram, Registry
+
+STAGES = ("queue", "runbook", "prompt", "generation", "parse", "validate")
+
+
+def per_op_ns(fn, ops: int, threads: int = 1) -> float:
+    """Wall-clock nanoseconds per operation with `threads` threads sharing ops"""
+    per_thread = ops // threads
+
+    def work():
+        for i in range(per_thread):
+            fn(i)
+
+    workers = [threading.Thread(target=work) for _ in range(threads)]
+    start = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    return (time.perf_counter() - start) / (per_thread * threads) * 1e9
+
+
+def bench(ops: int, threads: int):
+    registry = Registry()
+    counter = registry.register(Counter("bench_total", "Bench counter", ["strategy"]))
+    histogram = registry.register(Histogram("bench_seconds", "Bench histogram", ["stage"]))
+
+    def timed(i):
+        with histogram.time(stage=STAGES[i % len(STAGES)]):
+            pass
+
+    cases = [
+        ("counter.inc", lambda i: counter.inc(strategy="json")),
+        ("histogram.observe", lambda i: histogram.observe(0.0123, stage=STAGES[i % len(STAGES)])),
+        ("histogram.time()", timed),
+    ]
+    print(f"{'operation':<20} {'1 thread':>12} {f'{threads} threads':>12}")
+    for name, fn in cases:
+        print(f"{name:<20} {per_op_ns(fn, ops):>9.0f} ns {per_op_ns(fn, ops, threads):>9.0f} ns")
+
+    start = time.perf_counter()
+    text = registry.render()
+    print(f"render: {(time.perf_counter() - start) * 1000:.2f} ms for {len(text.splitlines())} lines")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--ops", type=int, default=200000, help="Operations per case")
+    parser.add_argument("--threads", type=int, default=8, help="Threads for the contended run")
+    args = parser.parse_args()
+
+    bench(args.ops, args.threads)
@@ -0,0 +1,101 @@
+"""
+Benchmark: per-request model setup overhead, fresh vs. pooled
+
+Before pooling, every get_decision built a new model (IAM token exchange,
+APIClient construction, project lookup). This script measures the setup
+cost paid per incident in both modes.
+
+By default model construction is simulated with a fixed cost so the script
+runs anywhere. Pass --live with WATSONX_APIKEY and WATSONX_PROJECT_ID set
+to measure the real ibm_watsonx_ai initialization instead.
+
+Usage:
+    python scripts/bench_model_pool.py [--requests 20] [--init-cost 0.4] [--live]
+"""
+
+import argparse
+import logging
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.aegis_service.model_pool import IAMTokenManager, ModelPool
+
+PARAMS = {
+    "decoding_method": "greedy",
+    "max_new_tokens": 500,
+    "min_new_tokens": 50,
+    "temperature": 0.1,
+    "stop_sequences": ["<|endoftext|>", "<|user|>"]
+}
+MODEL_ID = os.environ.get("WATSONX_MODEL_ID", "ibm/granite-3-8b-instruct")
+URL = os.environ.get("WATSONX_URL", "https://us-south.ml.cloud.ibm.com")
+
+
+def fresh_live():
+    """The pre-pooling behaviour: a brand-new model per request"""
+    from ibm_watsonx_ai.foundation_models import Model
+    return Model(
+        model_id=MODEL_ID,
+        params=PARAMS,
+        credentials={"url": URL, "apikey": os.environ["WATSONX_APIKEY"]},
+        project_id=os.environ["WATSONX_PROJECT_ID"]
+    )
+
+
+def measure(acquire, requests: int):
+    timings = []
+    for _ in range(requests):
+        start = time.perf_counter()
+        acquire()
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def report(name: str, timings):
+    print(
+        f"{name:<8} first={timings[0]:9.2f}ms  "
+        f"median={statistics.median(timings):9.3f}ms  "
+        f"mean={statistics.mean(timings):9.3f}ms"
+    )
+
+
+def main(requests: int, init_cost: float, live: bool):
+    if live:
+        token_manager = IAMTokenManager(os.environ["WATSONX_APIKEY"])
+        pool = ModelPool(URL, os.environ["WATSONX_PROJECT_ID"], token_manager)
+        fresh = fresh_live
+    else:
+        def simulated_init(*_):
+            time.sleep(init_cost)
+            return object()
+
+        token_manager = IAMTokenManager(
+            "bench",
+            fetch=lambda: {"access_token": "bench", "expires_in": 3600},
+            background_refresh=False
+        )
+        pool = ModelPool(URL, "bench", token_manager, factory=simulated_init)
+        fresh = simulated_init
+
+    print(f"{'live' if live else 'simulated'} model setup, {requests} requests\n")
+    report("fresh", measure(fresh, requests))
+    report("pooled", measure(lambda: pool.get(MODEL_ID, PARAMS), requests))
+    print(f"\npool stats: {pool.stats()}")
+    token_manager.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=20, help="Acquisitions per mode")
+    parser.add_argument("--init-cost", type=float, default=0.4, help="Simulated setup cost (seconds)")
+    parser.add_argument("--live", action="store_true", help="Use real watsonx.ai credentials")
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+    main(args.requests, args.init_cost, args.live)
@@ -0,0 +1,83 @@
+"""
+Micro-benchmark: str.format on the full template vs. pre-rendered assembly
+
+Times building the prompt the original way (SYSTEM_PROMPT_TEMPLATE.format
+per request, no size limit) and with PromptAssembler (pre-rendered prefix,
+token estimate and budget enforcement) for incident texts of increasing
+size, and shows the prompt size each produces. The largest input simulates
+pasted application logs that would otherwise overflow the context window.
+
+Usage:
+    python scripts/bench_prompt_assembler.py [--iterations 200] [--budget 4096]
+"""
+
+import argparse
+import logging
+import random
+import sys
+import time
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.aegis_service.prompt_assembler import PromptAssembler, estimate_tokens
+from src.aegis_service.runbook_context import format_runbook_for_prompt, get_local_runbook
+from src.aegis_service.watsonx_client import PROMPT_CATEGORIES, WatsonxClient
+
+LOG_LINE = "2024-05-01T12:00:{s:02d}Z ERROR connection reset by peer pool_size={n}\n"
+
+
+def build_incident(size: int, rng: random.Random) -> str:
+    parts = ["Checkout API error rate spiking on prod-web-03 after 12:00 deploy. Logs:\n"]
+    total = len(parts[0])
+    while total < size:
+        line = LOG_LINE.format(s=rng.randrange(60), n=rng.randrange(10000))
+        parts.append(line)
+        total += len(line)
+    return "".join(parts)
+
+
+def timed(fn, iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - start) * 1e6 / iterations
+
+
+def bench(iterations: int, budget: int):
+    template = WatsonxClient.SYSTEM_PROMPT_TEMPLATE
+    assembler = PromptAssembler(template, PROMPT_CATEGORIES, budget=budget)
+    runbook = format_runbook_for_prompt(get_local_runbook("unknown"))
+
+    rng = random.Random(5)
+    inputs = {
+        "incident (100B)": "Database latency high but CPU and memory metrics look normal",
+        "paste (10KB)": build_incident(10_000, rng),
+        "paste (100KB)": build_incident(100_000, rng),
+    }
+
+    print(f"Prompt build per request ({iterations} iterations, budget {budget} tokens)\n")
+    print(f"{'input':<18}{'format':>10}{'assemble':>11}{'tokens (format)':>18}{'tokens (budget)':>18}")
+    for name, incident in inputs.items():
+        fields = dict(incident_text=incident, category="unknown", reporter_role="SRE", runbook_context=runbook)
+        formatted = template.format(**fields)
+        prompt = assembler.assemble(**fields)
+
+        format_us = timed(lambda: template.format(**fields), iterations)
+        assemble_us = timed(lambda: assembler.assemble(**fields), iterations)
+        print(
+            f"{name:<18}{format_us:>8.1f}us{assemble_us:>9.1f}us"
+            f"{estimate_tokens(formatted):>18}{prompt.tokens:>18}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--iterations", type=int, default=200, help="Iterations per input")
+    parser.add_argument("--budget", type=int, default=4096, help="Prompt token budget")
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+
+    bench(args.iterations, args.budget)
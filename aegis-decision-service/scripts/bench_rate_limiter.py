@@ -0,0 +1,95 @@
+"""
+Benchmark: watsonx.ai bursts with and without the client-side rate limiter
+
+Sends a burst of unique incidents at once through the async REST path to
+scripts/watsonx_stub.py, which answers HTTP 429 above a concurrency quota
+(like a watsonx.ai project limit). Compares:
+- unlimited: every call goes out immediately and a 429 is final (the
+  previous behaviour: a confidence-10 fallback decision)
+- limiter: AIMD concurrency + retries through the limiter
+
+Reports fallback decisions, 429s received, total time and the final
+concurrency limit.
+
+Usage:
+    python scripts/bench_rate_limiter.py [--incidents 60] [--quota 4] [--latency 0.1]
+"""
+
+import argparse
+import asyncio
+import logging
+import sys
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from scripts.watsonx_stub import WatsonxStub
+from src.aegis_service import rate_limiter, watsonx_http
+from src.aegis_service.model_pool import IAMTokenManager
+from src.aegis_service.rate_limiter import AIMDLimiter, WatsonxRateLimiter
+from src.aegis_service.watsonx_client import WatsonxClient
+from src.aegis_service.watsonx_http import AsyncWatsonxTransport
+
+
+async def burst(url: str, limiter: WatsonxRateLimiter, total: int):
+    client = WatsonxClient()
+    client.mock_mode = False
+    client.async_transport = AsyncWatsonxTransport(
+        url=url,
+        project_id="bench",
+        token_manager=IAMTokenManager(
+            "bench-key", fetch=lambda: {"access_token": "t", "expires_in": 3600}, background_refresh=False
+        ),
+        limiter=limiter
+    )
+    try:
+        return await asyncio.gather(*(
+            client.aget_decision(
+                incident_text=f"Disk at 99% on Server-DB-{i}, log rotation failed",
+                category="storage",
+                reporter_role="SRE",
+                runbook_context=""
+            )
+            for i in range(total)
+        ))
+    finally:
+        await client.aclose()
+
+
+def bench(total: int, quota: int, latency: float):
+    print(f"{total} incidents at once, stub quota {quota} concurrent generations x {latency * 1000:.0f}ms\n")
+    print(f"{'mode':<11}{'fallbacks':>11}{'429s':>7}{'total':>9}{'final limit':>13}")
+    configs = [
+        ("unlimited", AIMDLimiter(initial=10 ** 6, maximum=10 ** 6), 0),
+        ("limiter", AIMDLimiter(), rate_limiter.WATSONX_RATE_LIMIT_RETRIES)
+    ]
+    for name, concurrency, retries in configs:
+        stub = WatsonxStub(latency=latency, max_concurrency=quota).start()
+        limiter = WatsonxRateLimiter(concurrency=concurrency)
+        try:
+            with patch.object(watsonx_http, "WATSONX_RATE_LIMIT_RETRIES", retries), \
+                    patch.object(rate_limiter, "WATSONX_RATE_LIMIT_BACKOFF", latency):
+                start = time.perf_counter()
+                decisions = asyncio.run(burst(stub.url, limiter, total))
+                elapsed = time.perf_counter() - start
+        finally:
+            stub.stop()
+        fallbacks = sum(d.confidence_score == 10 for d in decisions)
+        limit = "-" if name == "unlimited" else f"{limiter.concurrency.limit:.1f}"
+        print(f"{name:<11}{fallbacks:>7}/{total:<3}{stub.rate_limited:>7}{elapsed:>8.2f}s{limit:>13}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--incidents", type=int, default=60, help="Incidents in the burst")
+    parser.add_argument("--quota", type=int, default=4, help="Concurrent generations the stub accepts")
+    parser.add_argument("--latency", type=float, default=0.1, help="Seconds per generation")
+    args = parser.parse_args()
+
+    # Unlimited-mode 429s are logged as errors; keep the table readable
+    logging.disable(logging.ERROR)
+
+    bench(args.incidents, args.quota, args.latency)
@@ -0,0 +1,125 @@
+"""
+Benchmark: full-runbook prompts vs. BM25 section retrieval
+
+Builds the model prompt for a set of labelled incidents twice, once with the
+whole category runbook and once with the top-k retrieved sections, and
+reports estimated prompt tokens (prompt_assembler.estimate_tokens), whether the
+hand-labelled relevant section was retrieved (recall@k), and decision
+agreement between the two contexts.
+
+Decision agreement needs the real model (--live, uses WATSONX_* credentials);
+mock mode ignores the runbook, so without --live agreement is trivially 100%
+and only the size and recall numbers are meaningful.
+
+Usage:
+    python scripts/bench_runbook_retrieval.py [--top-k 3] [--live]
+"""
+
+import argparse
+import logging
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.aegis_service.decision_cache import DecisionCache
+from src.aegis_service.prompt_assembler import estimate_tokens
+from src.aegis_service.runbook_context import (
+    format_runbook_for_prompt,
+    get_local_runbook,
+    get_relevant_runbook_sections,
+)
+from src.aegis_service.watsonx_client import WatsonxClient
+
+# (incident_text, category, title of the section a responder would need)
+LABELLED = [
+    ("Disk space at 99% on Server-DB-01. /var/log is 95GB. Log rotation failed.",
+     "storage", "Investigation Steps > Log File Review"),
+    ("/tmp on build-agent-4 full of orphaned temporary files older than 3 days",
+     "storage", "Investigation Steps > Temporary Files"),
+    ("Backup volume on db-02 out of space, nightly database backup job failed",
+     "storage", "Investigation Steps > Database and Backup Space"),
+    ("Checkout API latency up 4x; slow queries and lock waits on the orders table",
+     "latency", "Investigation Steps > Database Lock Analysis"),
+    ("Connection pool exhausted on payments-api, requests waiting for connections",
+     "latency", "Investigation Steps > Connection Pool Status"),
+    ("Packet loss and network latency between us-east and eu-west regions",
+     "latency", "Investigation Steps > Check Network Latency"),
+    ("SSO login failures for all users after the signing certificate expired",
+     "auth", "Investigation Steps > Credential Validity"),
+    ("Spike of failed login attempts from a single IP range against admin accounts",
+     "auth", "Investigation Steps > Login Attempt Analysis"),
+    ("LDAP integration with the identity provider returning timeouts",
+     "auth", "Investigation Steps > Integration Status"),
+    ("Service payments-7 returning 502 errors after a config change this morning",
+     "unknown", "Investigation Steps > Recent Changes"),
+    ("Third-party payment gateway dependency down, external API calls failing",
+     "unknown", "Investigation Steps > External Dependencies"),
+    ("Error rate rising on web tier; application logs show repeated stack traces",
+     "unknown", "Investigation Steps > Log Analysis"),
+]
+
+
+def bench(top_k: int, live: bool):
+    client = WatsonxClient()
+    client.decision_cache = DecisionCache(max_size=0)
+    if not live:
+        client.mock_mode = True
+        client.async_transport = None
+
+    full_tokens = section_tokens = full_context = section_context = hits = agree = 0
+    print(f"{'category':<10}{'full':>7}{'sections':>10}{'hit':>5}  decision (full / sections)")
+    for incident_text, category, relevant in LABELLED:
+        full = get_local_runbook(category)
+        sections = get_relevant_runbook_sections(category, incident_text, top_k)
+
+        prompts = [
+            client._build_prompt(incident_text, category, "SRE", format_runbook_for_prompt(context))
+            for context in (full, sections)
+        ]
+        tokens = [p.tokens for p in prompts]
+        full_tokens += tokens[0]
+        section_tokens += tokens[1]
+        full_context += estimate_tokens(full)
+        section_context += estimate_tokens(sections)
+
+        hit = f"] {relevant}\n" in sections
+        hits += hit
+
+        decisions = [
+            client.get_decision(incident_text, category, "SRE", format_runbook_for_prompt(context))
+            for context in (full, sections)
+        ]
+        same = all(
+            d.recommended_action == decisions[0].recommended_action
+            and (d.confidence_score >= 80) == (decisions[0].confidence_score >= 80)
+            for d in decisions
+        )
+        agree += same
+
+        print(
+            f"{category:<10}{tokens[0]:>7}{tokens[1]:>10}{'yes' if hit else 'no':>5}  "
+            f"{decisions[0].recommended_action} {decisions[0].confidence_score} / "
+            f"{decisions[1].recommended_action} {decisions[1].confidence_score}"
+        )
+
+    n = len(LABELLED)
+    print(f"\nPrompt tokens (est.): full {full_tokens / n:.0f} -> sections {section_tokens / n:.0f} "
+          f"per request ({1 - section_tokens / full_tokens:.0%} smaller)")
+    print(f"Runbook context alone: {full_context / n:.0f} -> {section_context / n:.0f} "
+          f"({1 - section_context / full_context:.0%} smaller)")
+    print(f"Recall@{top_k}: {hits}/{n}")
+    print(f"Decision agreement (action + routing): {agree}/{n}"
+          + ("" if live else " (mock mode ignores runbooks; use --live)"))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--top-k", type=int, default=3, help="Sections retrieved per incident")
+    parser.add_argument("--live", action="store_true", help="Call watsonx.ai for decision agreement")
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+
+    bench(args.top_k, args.live)
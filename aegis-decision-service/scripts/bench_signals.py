@@ -0,0 +1,118 @@
+"""
+Micro-benchmark: per-pattern regex scans vs. the single-pass signal matcher
+
+Runs the original _detect_ambiguity + auto-resolution checks (lowercase
+copy, one re.search/re.findall per pattern, each looked up in the re module
+cache on every call) and the SignalMatcher-based versions over incident
+texts of increasing size, the largest simulating pasted application logs.
+Also checks that both implementations agree on every input.
+
+Usage:
+    python scripts/bench_signals.py [--iterations 200]
+"""
+
+import argparse
+import logging
+import random
+import re
+import sys
+import time
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.aegis_service.watsonx_client import WatsonxClient
+
+LOG_LINES = [
+    "2024-05-01T12:00:{s:02d}Z INFO request completed status=200 duration_ms={n}",
+    "2024-05-01T12:00:{s:02d}Z WARN upstream slow, retrying attempt={n}",
+    "2024-05-01T12:00:{s:02d}Z ERROR connection reset by peer pool_size={n}",
+    "2024-05-01T12:00:{s:02d}Z DEBUG cache lookup key=session:{n} hit=false",
+]
+
+EXPLANATION = "Standard remediation applies; run diagnostics and have an SRE review before acting."
+
+
+def legacy_detect_ambiguity(incident_text: str) -> bool:
+    text_lower = incident_text.lower()
+    if re.search(r'\b(but|however|although)\b.*\bnormal\b', text_lower):
+        return True
+    high_symptom = re.search(r'\b(high|elevated|increased|spike)\b', text_lower)
+    normal_metric = re.search(r'\b(normal|low|stable|within range)\b', text_lower)
+    if high_symptom and normal_metric:
+        return True
+    uncertainty_count = len(re.findall(r'\b(may|might|could|possibly|unclear|unknown|intermittent)\b', text_lower))
+    if uncertainty_count >= 2:
+        return True
+    if re.search(r'\bno (clear|obvious|apparent) (pattern|cause|reason|indicator)', text_lower):
+        return True
+    return False
+
+
+def legacy_implies_auto_resolution(explanation: str) -> bool:
+    explanation_lower = explanation.lower()
+    for pattern in [
+        r'\bauto[\s-]?resolv',
+        r'\bresolved automatically\b',
+        r'\bcan be resolved\b.*\bautomatically\b',
+        r'\bwill be resolved\b'
+    ]:
+        if re.search(pattern, explanation_lower):
+            return True
+    return False
+
+
+def build_incident(size: int, rng: random.Random) -> str:
+    header = "Checkout API error rate spiking on prod-web-03 after 12:00 deploy. Logs:\n"
+    lines = [header]
+    total = len(header)
+    while total < size:
+        line = rng.choice(LOG_LINES).format(s=rng.randrange(60), n=rng.randrange(10000)) + "\n"
+        lines.append(line)
+        total += len(line)
+    return "".join(lines)
+
+
+def timed(fn, text: str, iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn(text)
+    return (time.perf_counter() - start) * 1e6 / iterations
+
+
+def bench(iterations: int):
+    client = WatsonxClient()
+
+    def matcher_checks(text: str):
+        client._detect_ambiguity(text)
+        client.explanation_signals.scan(EXPLANATION)
+
+    def legacy_checks(text: str):
+        legacy_detect_ambiguity(text)
+        legacy_implies_auto_resolution(EXPLANATION)
+
+    rng = random.Random(3)
+    inputs = {
+        "incident (100B)": "Database latency high but CPU and memory metrics look normal, cause unclear",
+        "paste (10KB)": build_incident(10_000, rng),
+        "paste (100KB)": build_incident(100_000, rng),
+    }
+
+    print(f"Ambiguity + auto-resolution checks per incident ({iterations} iterations)\n")
+    print(f"{'input':<18}{'legacy':>12}{'single-pass':>14}{'speedup':>10}")
+    for name, text in inputs.items():
+        assert legacy_detect_ambiguity(text) == client._detect_ambiguity(text)
+        legacy = timed(legacy_checks, text, iterations)
+        matcher = timed(matcher_checks, text, iterations)
+        print(f"{name:<18}{legacy:>10.1f}us{matcher:>12.1f}us{legacy / matcher:>9.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--iterations", type=int, default=200, help="Iterations per input")
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+
+    bench(args.iterations)
@@ -0,0 +1,109 @@
+"""
+Local Langflow stand-in for testing the runbook client
+
+Serves POST requests with {"context": "..."} built from the request's
+category, after an optional delay. Failures can be injected to exercise the
+client's circuit breaker: a fraction of requests can return HTTP 500, and
+the stub can be switched to fail (or recover) at runtime.
+
+Point the service at it with LANGFLOW_RUNBOOK_URL=http://127.0.0.1:7860/runbook
+
+Usage:
+    python scripts/langflow_stub.py [--port 7860] [--latency 0.05] [--fail-rate 0.0]
+"""
+
+import argparse
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class _QuietServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        # Clients that time out hang up before the answer; that's expected here
+        pass
+
+
+class LangflowStub:
+    """Threaded HTTP server imitating the Langflow runbook endpoint"""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, latency: float = 0.0, fail_rate: float = 0.0):
+        """
+        Args:
+            host: Interface to bind
+            port: Port to bind (0 picks a free port)
+            latency: Seconds to wait before answering
+            fail_rate: Fraction of requests answered with HTTP 500
+        """
+        self.latency = latency
+        self.fail_rate = fail_rate
+        self.failing = False  # answer every request with HTTP 500
+        self.requests = 0
+        self.traceparents = []  # traceparent header of each request (None if absent)
+        self._rng = random.Random(0)
+
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length", 0))
+                payload = json.loads(self.rfile.read(length) or b"{}")
+                stub.requests += 1
+                stub.traceparents.append(self.headers.get("traceparent"))
+                time.sleep(stub.latency)
+
+                if stub.failing or stub._rng.random() < stub.fail_rate:
+                    self.send_response(500)
+                    self.end_headers()
+                    return
+
+                body = json.dumps({
+                    "context": f"## Langflow {payload.get('category', 'unknown')} runbook\n"
+                               f"- Retrieved for: {payload.get('incident_text', '')[:80]}"
+                }).encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = _QuietServer((host, port), Handler)
+        self._thread: threading.Thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}/runbook"
+
+    def start(self) -> "LangflowStub":
+        """Serve in a background thread"""
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--host", default="127.0.0.1", help="Interface to bind")
+    parser.add_argument("--port", type=int, default=7860, help="Port to bind")
+    parser.add_argument("--latency", type=float, default=0.05, help="Seconds before each answer")
+    parser.add_argument("--fail-rate", type=float, default=0.0, help="Fraction of requests that return HTTP 500")
+    args = parser.parse_args()
+
+    stub = LangflowStub(args.host, args.port, args.latency, args.fail_rate)
+    print(f"Langflow stub listening on {stub.url}")
+    try:
+        stub.server.serve_forever()
+    except KeyboardInterrupt:
+        stub.server.server_close()
@@ -0,0 +1,336 @@
+"""
+Load test: synthetic incident storms against /evaluate-incident
+
+Sends incidents at a target rate (open loop: arrivals do not wait for
+earlier answers, as alerts don't) for a fixed duration and reports
+throughput, p50/p95/p99 latency, the fallback rate and the decision_path
+breakdown.
+
+Incidents are drawn from storage, latency, auth and unknown templates with
+random hosts and figures; --duplicate-rate re-sends an earlier incident,
+as a paging storm does, exercising the decision cache and coalescing.
+Arrivals are Poisson (bursty) or evenly spaced (--arrival constant).
+Requests that would exceed --max-in-flight are not sent and are reported
+as "skipped", so a stalled service shows up instead of slowing the load.
+
+With --local, the harness starts scripts/watsonx_stub.py in-process and
+the service (uvicorn) as a subprocess pointed at it, so the full REST
+inference path runs without watsonx.ai; the --stub-* options shape the
+stub (latency distribution, 429s, errors, responses file). Otherwise it
+targets --url, whatever backs it.
+
+Usage:
+    python scripts/load_test.py --local [--rps 20] [--duration 30] [--stub-latency lognormal:1.8,0.35]
+        [--stub-responses scripts/watsonx_stub_responses.json] [--stub-rate-limit-rate 0.02]
+    python scripts/load_test.py --url http://127.0.0.1:5000 [--rps 5] [--output summary.json]
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import subprocess
+import sys
+import time
+from collections import Counter
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import httpx
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from scripts.watsonx_stub import WatsonxStub, add_stub_arguments, stub_from_arguments
+
+SERVICE_DIR = Path(__file__).parent.parent
+
+TEMPLATES = {
+    "storage": [
+        "Disk usage on {host} reached {pct}% on /var/log after log rotation failed overnight.",
+        "Volume /data on {host} is {pct}% full; writes are starting to fail for the ingest job.",
+    ],
+    "latency": [
+        "p95 latency for checkout on {host} rose from 120ms to {ms}ms over the last 15 minutes.",
+        "Database query times on {host} increased from 50ms to {ms}ms; thread pool is saturated.",
+    ],
+    "auth": [
+        "{count} users report login failures via SSO; token validation errors on {host}.",
+        "Service account on {host} receives 401 responses after certificate rotation; {count} jobs failing.",
+    ],
+    "unknown": [
+        "Intermittent errors reported by {count} customers on {host}; no clear pattern yet.",
+        "Alert fired on {host} with no runbook match; on-call sees elevated error counts ({count}).",
+    ],
+}
+ROLES = ["SRE", "Developer", "Manager", "Other"]
+
+
+def incident_storm(rng: random.Random, duplicate_rate: float = 0.0) -> Iterator[Dict[str, Any]]:
+    """
+    Endless stream of /evaluate-incident request bodies.
+
+    Args:
+        rng: Random source (seed it for repeatable storms)
+        duplicate_rate: Fraction of incidents that repeat an earlier one verbatim
+
+    Yields:
+        IncidentRequest JSON bodies
+    """
+    sent: List[Dict[str, Any]] = []
+    while True:
+        if sent and rng.random() < duplicate_rate:
+            yield rng.choice(sent)
+            continue
+        category = rng.choice(list(TEMPLATES))
+        text = rng.choice(TEMPLATES[category]).format(
+            host=f"{rng.choice(['web', 'db', 'api', 'batch'])}-{rng.randint(1, 40):02d}",
+            pct=rng.randint(85, 99),
+            ms=rng.randrange(800, 5000, 50),
+            count=rng.randint(3, 500)
+        )
+        body = {"incident_text": text, "category": category, "reporter_role": rng.choice(ROLES)}
+        # Keep the duplicate pool bounded and recent, like a storm of repeating alerts
+        sent = (sent + [body])[-50:]
+        yield body
+
+
+def percentile(values: List[float], q: float) -> Optional[float]:
+    """Nearest-rank percentile (q in 0-100) of values, None when empty"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(1, math.ceil(q / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+# (HTTP status or exception name, seconds, decision_path or None)
+Result = Tuple[Any, float, Optional[str]]
+
+
+def summarize(results: List[Result], elapsed_s: float, skipped: int = 0) -> Dict[str, Any]:
+    """
+    Aggregate per-request results.
+
+    Args:
+        results: One (status, latency seconds, decision_path) per request sent
+        elapsed_s: Wall time from the first send to the last answer
+        skipped: Arrivals not sent because --max-in-flight was reached
+
+    Returns:
+        Summary dict: counts, throughput, latency percentiles (ms), fallback
+        rate (fallback decisions and failed requests over requests sent) and
+        breakdowns by decision_path and status
+    """
+    latencies = [seconds * 1000 for status, seconds, _ in results if status == 200]
+    paths = Counter(path for status, _, path in results if status == 200)
+    statuses = Counter(str(status) for status, _, _ in results)
+    failed = len(results) - len(latencies)
+    sent = len(results)
+    return {
+        "sent": sent,
+        "skipped": skipped,
+        "completed": len(latencies),
+        "failed": failed,
+        "elapsed_s": round(elapsed_s, 3),
+        "throughput_rps": round(len(latencies) / elapsed_s, 2) if elapsed_s else 0.0,
+        "latency_ms": {
+            name: round(value, 1) if value is not None else None
+            for name, value in (
+                ("p50", percentile(latencies, 50)),
+                ("p95", percentile(latencies, 95)),
+                ("p99", percentile(latencies, 99)),
+                ("max", max(latencies) if latencies else None),
+            )
+        },
+        "fallback_rate": round((paths["fallback"] + failed) / sent, 4) if sent else 0.0,
+        "decision_paths": dict(paths),
+        "statuses": dict(statuses)
+    }
+
+
+async def run_load(
+    url: str,
+    rps: float,
+    duration_s: float,
+    arrival: str = "poisson",
+    duplicate_rate: float = 0.0,
+    max_in_flight: int = 256,
+    timeout_s: float = 60.0,
+    deadline_ms: Optional[int] = None,
+    seed: Optional[int] = None
+) -> Dict[str, Any]:
+    """
+    Drive /evaluate-incident at a target rate and summarize the results.
+
+    Args:
+        url: Service base URL
+        rps: Target arrivals per second
+        duration_s: Seconds to keep sending
+        arrival: "poisson" (exponential gaps) or "constant"
+        duplicate_rate: Fraction of incidents repeated verbatim
+        max_in_flight: Outstanding requests beyond which arrivals are skipped
+        timeout_s: Client timeout per request
+        deadline_ms: X-Request-Deadline-Ms sent with each request (None = service default)
+        seed: Seed for arrivals and incidents
+
+    Returns:
+        summarize() output, plus the achieved send rate
+    """
+    rng = random.Random(seed)
+    storm = incident_storm(rng, duplicate_rate)
+    headers = {"X-Request-Deadline-Ms": str(deadline_ms)} if deadline_ms else {}
+    results: List[Result] = []
+    tasks = set()
+    skipped = 0
+    limits = httpx.Limits(max_connections=max_in_flight, max_keepalive_connections=max_in_flight)
+
+    async with httpx.AsyncClient(base_url=url, timeout=timeout_s, limits=limits) as client:
+        async def send(body: Dict[str, Any]):
+            start = time.perf_counter()
+            try:
+                response = await client.post("/evaluate-incident", json=body, headers=headers)
+                path = response.json().get("decision_path") if response.status_code == 200 else None
+                results.append((response.status_code, time.perf_counter() - start, path))
+            except httpx.HTTPError as e:
+                results.append((type(e).__name__, time.perf_counter() - start, None))
+
+        start = time.perf_counter()
+        next_at = 0.0
+        sent = 0
+        while next_at < duration_s:
+            delay = start + next_at - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            if len(tasks) >= max_in_flight:
+                skipped += 1
+            else:
+                task = asyncio.create_task(send(next(storm)))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+                sent += 1
+            next_at += rng.expovariate(rps) if arrival == "poisson" else 1.0 / rps
+        send_window_s = time.perf_counter() - start
+        if tasks:
+            await asyncio.gather(*tasks)
+        elapsed_s = time.perf_counter() - start
+
+    summary = summarize(results, elapsed_s, skipped)
+    summary["target_rps"] = rps
+    summary["send_rps"] = round(sent / send_window_s, 2) if send_window_s else 0.0
+    return summary
+
+
+def _wait_healthy(url: str, process: subprocess.Popen, timeout_s: float = 30.0):
+    deadline = time.monotonic() + timeout_s
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"Service exited during startup (code {process.returncode})")
+        try:
+            if httpx.get(f"{url}/health", timeout=1.0).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"Service did not become healthy within {timeout_s:g}s")
+
+
+@contextmanager
+def local_service(stub: WatsonxStub, port: int, env: Optional[Dict[str, str]] = None):
+    """
+    Run the service as a uvicorn subprocess against a started stub.
+
+    Args:
+        stub: Running watsonx.ai stand-in
+        port: Port for the service
+        env: Extra environment for the service (e.g. feature flags under test)
+
+    Yields:
+        The service base URL
+    """
+    url = f"http://127.0.0.1:{port}"
+    service_env = {
+        **os.environ,
+        "WATSONX_URL": stub.url,
+        "IBM_IAM_URL": f"{stub.url}/identity/token",
+        "WATSONX_APIKEY": "load-test",
+        "WATSONX_PROJECT_ID": "load-test",
+        "MOCK_WATSONX": "0",
+        "LOG_LEVEL": "WARNING",
+        **(env or {})
+    }
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "src.aegis_service.main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=SERVICE_DIR,
+        env=service_env
+    )
+    try:
+        _wait_healthy(url, process)
+        yield url
+    finally:
+        process.terminate()
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+
+
+def print_summary(summary: Dict[str, Any]):
+    latency = summary["latency_ms"]
+    fmt = lambda value: f"{value:.0f}" if value is not None else "-"
+    print(
+        f"sent {summary['sent']} ({summary['send_rps']}/s of {summary['target_rps']:g}/s target), "
+        f"skipped {summary['skipped']}, completed {summary['completed']}, failed {summary['failed']}"
+    )
+    print(f"throughput        {summary['throughput_rps']}/s over {summary['elapsed_s']}s")
+    print(
+        f"latency ms        p50 {fmt(latency['p50'])}  p95 {fmt(latency['p95'])}  "
+        f"p99 {fmt(latency['p99'])}  max {fmt(latency['max'])}"
+    )
+    print(f"fallback rate     {summary['fallback_rate']:.2%}")
+    print(f"decision paths    {summary['decision_paths']}")
+    print(f"HTTP statuses     {summary['statuses']}")
+    if "stub" in summary:
+        print(f"watsonx stub      {summary['stub']}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--url", default="http://127.0.0.1:5000", help="Service base URL (ignored with --local)")
+    parser.add_argument("--rps", type=float, default=10.0, help="Target incidents per second")
+    parser.add_argument("--duration", type=float, default=30.0, help="Seconds to keep sending")
+    parser.add_argument("--arrival", choices=["poisson", "constant"], default="poisson", help="Arrival process")
+    parser.add_argument("--duplicate-rate", type=float, default=0.1, help="Fraction of repeated incidents")
+    parser.add_argument("--max-in-flight", type=int, default=256, help="Outstanding requests before arrivals are skipped")
+    parser.add_argument("--timeout", type=float, default=60.0, help="Client timeout per request (seconds)")
+    parser.add_argument("--deadline-ms", type=int, default=None, help="X-Request-Deadline-Ms sent with each request")
+    parser.add_argument("--seed", type=int, default=None, help="Seed for arrivals and incidents")
+    parser.add_argument("--output", default=None, help="Also write the summary as JSON to this file")
+    parser.add_argument("--local", action="store_true", help="Start the watsonx stub and the service locally")
+    parser.add_argument("--service-port", type=int, default=5055, help="Service port with --local")
+    add_stub_arguments(parser, prefix="stub-")
+    args = parser.parse_args()
+
+    load = dict(
+        rps=args.rps, duration_s=args.duration, arrival=args.arrival, duplicate_rate=args.duplicate_rate,
+        max_in_flight=args.max_in_flight, timeout_s=args.timeout, deadline_ms=args.deadline_ms, seed=args.seed
+    )
+    if args.local:
+        stub = stub_from_arguments(args, "127.0.0.1", 0, prefix="stub-").start()
+        try:
+            with local_service(stub, args.service_port) as url:
+                print(f"service {url} -> watsonx stub {stub.url} (latency {args.stub_latency})")
+                summary = asyncio.run(run_load(url, **load))
+                summary["stub"] = stub.stats()
+        finally:
+            stub.stop()
+    else:
+        summary = asyncio.run(run_load(args.url, **load))
+
+    print_summary(summary)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(summary, f, indent=2)
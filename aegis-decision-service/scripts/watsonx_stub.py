@@ -0,0 +1,402 @@
+"""
+Local watsonx.ai stand-in for testing and load-testing the REST inference path
+
+Serves the text generation endpoints (/ml/v1/text/generation and
+/ml/v1/text/generation_stream) and a fake IAM token exchange
+(/identity/token), so the service can run against it as a separate process
+without spending watsonx.ai quota.
+
+Latency is a fixed number of seconds or a distribution spec:
+- "0.2" or "fixed:0.2"
+- "uniform:0.1,0.5" (low, high)
+- "normal:1.5,0.3" (mean, standard deviation; clamped at 0)
+- "lognormal:1.8,0.35" (median, sigma) - Granite-like long tail
+- "exp:0.5" (mean)
+- a weighted mixture of the above: "lognormal:1.8,0.35@97|fixed:12@3"
+Streams wait the sampled latency before the first chunk and chunk_delay
+between chunks.
+
+Failures can be injected:
+- max_concurrency: generations above this many in flight get HTTP 429
+- rps: requests above this many per second get HTTP 429
+- rate_limit_rate: fraction of requests answered with HTTP 429 at random
+- retry_after: value of the Retry-After header sent with each 429
+- error_rate: fraction of requests answered with error_status (e.g. 500, 503)
+- malformed_rate: fraction of generations that return text with no decision
+
+Outputs are a canned Granite-style decision unless a responses file is
+given (see watsonx_stub_responses.json): a JSON list of
+{"match": regex, "output": text or object, "weight": n}. One of the entries
+whose "match" is found in the prompt is picked by weight; entries without
+a "match" are the default when none is found. "${confidence}" (a random score in the entry's
+"confidence" range, default [60, 99]), "${model_id}" and "${request_id}" in
+text outputs are substituted.
+
+Point the service at it with:
+    WATSONX_URL=http://127.0.0.1:8090 IBM_IAM_URL=http://127.0.0.1:8090/identity/token
+    WATSONX_APIKEY=stub WATSONX_PROJECT_ID=stub
+GET /stats returns the stub's counters. scripts/load_test.py starts the
+stub and the service together.
+
+Usage:
+    python scripts/watsonx_stub.py [--port 8090] [--latency lognormal:1.8,0.35] [--max-concurrency 4]
+        [--rps 0] [--rate-limit-rate 0.02] [--error-rate 0.01] [--responses scripts/watsonx_stub_responses.json]
+"""
+
+import argparse
+import json
+import math
+import random
+import re
+import string
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional, Union
+
+DECISION = json.dumps({
+    "recommended_action": "clear_logs",
+    "confidence_score": 92,
+    "analysis": "Disk space critically low after log rotation failure",
+    "explanation": "Log rotation failed; standard cleanup per the storage runbook."
+})
+
+MALFORMED = "I'm not able to determine a recommended action for this incident."
+
+Sampler = Callable[[random.Random], float]
+
+
+def parse_latency(spec: Union[float, str]) -> Sampler:
+    """
+    Parse a latency spec into a sampler of seconds.
+
+    Args:
+        spec: Seconds, or a distribution spec (see the module docstring)
+
+    Returns:
+        Function drawing one latency from a random source
+
+    Raises:
+        ValueError: If the spec is not understood
+    """
+    if isinstance(spec, (int, float)):
+        return lambda rng: float(spec)
+
+    components = []
+    for part in str(spec).split("|"):
+        part, _, weight = part.partition("@")
+        kind, _, args = part.strip().partition(":")
+        try:
+            if not args:
+                value = float(kind)
+                components.append((lambda rng, v=value: v, float(weight or 1)))
+                continue
+            params = [float(x) for x in args.split(",")]
+        except ValueError:
+            raise ValueError(f"Invalid latency spec: {spec!r}") from None
+
+        if kind == "fixed" and len(params) == 1:
+            sampler = lambda rng, v=params[0]: v
+        elif kind == "uniform" and len(params) == 2:
+            sampler = lambda rng, lo=params[0], hi=params[1]: rng.uniform(lo, hi)
+        elif kind == "normal" and len(params) == 2:
+            sampler = lambda rng, mu=params[0], sd=params[1]: max(0.0, rng.gauss(mu, sd))
+        elif kind == "lognormal" and len(params) == 2:
+            sampler = lambda rng, mu=math.log(params[0]), sigma=params[1]: rng.lognormvariate(mu, sigma)
+        elif kind == "exp" and len(params) == 1:
+            sampler = lambda rng, mean=params[0]: rng.expovariate(1 / mean)
+        else:
+            raise ValueError(f"Invalid latency spec: {spec!r}")
+        components.append((sampler, float(weight or 1)))
+
+    if len(components) == 1:
+        return components[0][0]
+    samplers = [c[0] for c in components]
+    weights = [c[1] for c in components]
+    return lambda rng: rng.choices(samplers, weights)[0](rng)
+
+
+def load_responses(path: str) -> List[Dict[str, Any]]:
+    """Load a responses file, compiling each entry's match pattern"""
+    with open(path) as f:
+        entries = json.load(f)
+    for entry in entries:
+        entry["_pattern"] = re.compile(entry["match"], re.IGNORECASE) if entry.get("match") else None
+        output = entry["output"]
+        entry["_template"] = string.Template(output if isinstance(output, str) else json.dumps(output))
+    return entries
+
+
+class _QuietServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        # Clients that give up hang up before the answer; that's expected here
+        pass
+
+
+class WatsonxStub:
+    """Threaded HTTP server imitating the watsonx.ai text generation API"""
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency: Union[float, str] = 0.0,
+        max_concurrency: int = 0,
+        rps: float = 0.0,
+        retry_after: Optional[float] = None,
+        rate_limit_rate: float = 0.0,
+        error_rate: float = 0.0,
+        error_status: int = 500,
+        malformed_rate: float = 0.0,
+        responses: Optional[List[Dict[str, Any]]] = None,
+        chunk_delay: float = 0.0,
+        seed: Optional[int] = 0
+    ):
+        """
+        Args:
+            host: Interface to bind
+            port: Port to bind (0 picks a free port)
+            latency: Seconds each generation takes, or a distribution spec
+            max_concurrency: Generations allowed in flight before 429s (0 = unlimited)
+            rps: Requests accepted per second before 429s (0 = unlimited)
+            retry_after: Retry-After seconds sent with 429s (None = no header)
+            rate_limit_rate: Fraction of requests answered with 429 at random
+            error_rate: Fraction of requests answered with error_status
+            error_status: HTTP status of injected errors
+            malformed_rate: Fraction of generations returning text with no decision
+            responses: Entries from load_responses() (None = the canned decision)
+            chunk_delay: Seconds between streamed chunks
+            seed: Seed for latency and injection draws (None = unseeded)
+        """
+        self.latency = parse_latency(latency)
+        self.max_concurrency = max_concurrency
+        self.rps = rps
+        self.retry_after = retry_after
+        self.rate_limit_rate = rate_limit_rate
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.malformed_rate = malformed_rate
+        self.responses = responses
+        self.chunk_delay = chunk_delay
+        self.requests = 0
+        self.rate_limited = 0
+        self.errors = 0
+        self.malformed = 0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self._lock = threading.Lock()
+        self._rng = random.Random(seed)
+        self._recent = []  # acceptance times within the last second
+
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                if self.path.split("?")[0] == "/stats":
+                    self._json(200, stub.stats())
+                else:
+                    self._json(404, {"errors": [{"code": "not_found"}]})
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length", 0))
+                raw = self.rfile.read(length)
+                path = self.path.split("?")[0]
+
+                if path.endswith("/identity/token"):
+                    self._json(200, {
+                        "access_token": "stub-token",
+                        "expires_in": 3600,
+                        "expiration": int(time.time()) + 3600
+                    })
+                    return
+
+                verdict, latency = stub._admit()
+                if verdict == "rate_limited":
+                    headers = {"Retry-After": str(stub.retry_after)} if stub.retry_after is not None else {}
+                    self._json(429, {"errors": [{"code": "rate_limit_exceeded"}]}, headers)
+                    return
+                try:
+                    time.sleep(latency)
+                    if verdict == "error":
+                        self._json(stub.error_status, {"errors": [{"code": "injected_error"}]})
+                        return
+                    try:
+                        payload = json.loads(raw or b"{}")
+                    except ValueError:
+                        payload = {}
+                    text = stub._output(payload.get("input", ""), payload.get("model_id", ""))
+                    if path.endswith("/generation_stream"):
+                        self._stream(text)
+                    else:
+                        self._json(200, {"results": [{
+                            "generated_text": text,
+                            "generated_token_count": max(1, len(text) // 4),
+                            "input_token_count": max(1, len(payload.get("input", "")) // 4),
+                            "stop_reason": "eos_token"
+                        }]})
+                finally:
+                    with stub._lock:
+                        stub.in_flight -= 1
+
+            def _json(self, status: int, data: Dict[str, Any], headers: Optional[Dict[str, str]] = None):
+                body = json.dumps(data).encode("utf-8")
+                self.send_response(status)
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _stream(self, text: str):
+                chunks = [
+                    f'data: {json.dumps({"results": [{"generated_text": text[i:i + 16]}]})}\n\n'.encode("utf-8")
+                    for i in range(0, len(text), 16)
+                ]
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                if stub.chunk_delay:
+                    self.send_header("Transfer-Encoding", "chunked")
+                    self.end_headers()
+                    for chunk in chunks:
+                        self.wfile.write(f"{len(chunk):x}\r\n".encode() + chunk + b"\r\n")
+                        self.wfile.flush()
+                        time.sleep(stub.chunk_delay)
+                    self.wfile.write(b"0\r\n\r\n")
+                else:
+                    events = b"".join(chunks)
+                    self.send_header("Content-Length", str(len(events)))
+                    self.end_headers()
+                    self.wfile.write(events)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = _QuietServer((host, port), Handler)
+        self._thread: threading.Thread = None
+
+    def _admit(self):
+        """
+        Count the request and decide its fate.
+
+        Returns:
+            Tuple of ("ok" | "error" | "rate_limited", latency seconds);
+            anything but "rate_limited" holds an in-flight slot
+        """
+        now = time.monotonic()
+        with self._lock:
+            self.requests += 1
+            self._recent = [t for t in self._recent if now - t < 1.0]
+            if (self.max_concurrency and self.in_flight >= self.max_concurrency) or \
+                    (self.rps and len(self._recent) >= self.rps) or \
+                    (self.rate_limit_rate and self._rng.random() < self.rate_limit_rate):
+                self.rate_limited += 1
+                return "rate_limited", 0.0
+            self._recent.append(now)
+            self.in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+            latency = self.latency(self._rng)
+            if self.error_rate and self._rng.random() < self.error_rate:
+                self.errors += 1
+                return "error", latency
+            return "ok", latency
+
+    def _output(self, prompt: str, model_id: str) -> str:
+        """Generated text for a prompt: malformed, canned or from the responses file"""
+        with self._lock:
+            if self.malformed_rate and self._rng.random() < self.malformed_rate:
+                self.malformed += 1
+                return MALFORMED
+            if not self.responses:
+                return DECISION
+            candidates = [e for e in self.responses if e["_pattern"] is not None and e["_pattern"].search(prompt)] \
+                or [e for e in self.responses if e["_pattern"] is None]
+            if not candidates:
+                return DECISION
+            entry = self._rng.choices(candidates, [e.get("weight", 1) for e in candidates])[0]
+            low, high = entry.get("confidence", (60, 99))
+            confidence = self._rng.randint(low, high)
+            request_id = self.requests
+        return entry["_template"].safe_substitute(
+            confidence=confidence, model_id=model_id, request_id=request_id
+        )
+
+    def stats(self) -> Dict[str, int]:
+        """Counters since the stub started"""
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "rate_limited": self.rate_limited,
+                "errors": self.errors,
+                "malformed": self.malformed,
+                "in_flight": self.in_flight,
+                "peak_in_flight": self.peak_in_flight
+            }
+
+    @property
+    def url(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "WatsonxStub":
+        """Serve in a background thread"""
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def add_stub_arguments(parser: argparse.ArgumentParser, prefix: str = ""):
+    """Stub options, shared with scripts/load_test.py (which prefixes them with "stub-")"""
+    parser.add_argument(f"--{prefix}latency", default="0.2", help="Seconds per generation or a distribution spec")
+    parser.add_argument(f"--{prefix}max-concurrency", type=int, default=4, help="Generations in flight before 429s (0 = unlimited)")
+    parser.add_argument(f"--{prefix}rps", type=float, default=0, help="Requests per second before 429s (0 = unlimited)")
+    parser.add_argument(f"--{prefix}retry-after", type=float, default=None, help="Retry-After seconds sent with 429s")
+    parser.add_argument(f"--{prefix}rate-limit-rate", type=float, default=0.0, help="Fraction of requests answered with 429")
+    parser.add_argument(f"--{prefix}error-rate", type=float, default=0.0, help="Fraction of requests answered with an error")
+    parser.add_argument(f"--{prefix}error-status", type=int, default=500, help="HTTP status of injected errors")
+    parser.add_argument(f"--{prefix}malformed-rate", type=float, default=0.0, help="Fraction of generations without a decision")
+    parser.add_argument(f"--{prefix}responses", default=None, help="Responses file (JSON list of match/output entries)")
+    parser.add_argument(f"--{prefix}chunk-delay", type=float, default=0.0, help="Seconds between streamed chunks")
+
+
+def stub_from_arguments(args: argparse.Namespace, host: str, port: int, prefix: str = "") -> WatsonxStub:
+    """Build a stub from the options added by add_stub_arguments"""
+    option = lambda name: getattr(args, prefix.replace("-", "_") + name)
+    return WatsonxStub(
+        host=host,
+        port=port,
+        latency=option("latency"),
+        max_concurrency=option("max_concurrency"),
+        rps=option("rps"),
+        retry_after=option("retry_after"),
+        rate_limit_rate=option("rate_limit_rate"),
+        error_rate=option("error_rate"),
+        error_status=option("error_status"),
+        malformed_rate=option("malformed_rate"),
+        responses=load_responses(option("responses")) if option("responses") else None,
+        chunk_delay=option("chunk_delay"),
+        seed=None
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--host", default="127.0.0.1", help="Interface to bind")
+    parser.add_argument("--port", type=int, default=8090, help="Port to bind")
+    add_stub_arguments(parser)
+    args = parser.parse_args()
+
+    stub = stub_from_arguments(args, args.host, args.port)
+    print(f"watsonx.ai stub listening on {stub.url}")
+    try:
+        stub.server.serve_forever()
+    except KeyboardInterrupt:
+        stub.server.server_close()
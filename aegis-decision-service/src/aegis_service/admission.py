@@ -0,0 +1,209 @@
+"""
+Priority-aware admission control for A.E.G.I.S.
+
+An outage produces thousands of incidents at once. Without admission
+control every one of them starts a model call immediately, watsonx.ai
+slows down for all of them, and callers time out before any answer comes
+back. The admission controller sits in front of each model call; decision
+cache hits and fast-path rule decisions never wait for it:
+
+- at most MODEL_CONCURRENCY model calls per worker process run at a time
+- the rest wait in a bounded queue (ADMISSION_QUEUE_SIZE) ordered by
+  priority, then by deadline, then by arrival
+- when the queue is full, the lowest-priority request is shed - either the
+  newcomer or a lower-priority waiter it displaces - and answered right
+  away with the safe escalate_to_human fallback instead of timing out
+
+Priority is the sum of weights for the reporter role, the incident
+category and the caller (X-Caller-Id header), configured as
+"name=weight" lists.
+"""
+
+import os
+import heapq
+import asyncio
+import logging
+import itertools
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from .latency import LatencyWindow
+
+logger = logging.getLogger(__name__)
+
+# Configuration from environment
+MODEL_CONCURRENCY = int(os.environ.get("MODEL_CONCURRENCY", "16"))  # model calls in flight per worker
+ADMISSION_QUEUE_SIZE = int(os.environ.get("ADMISSION_QUEUE_SIZE", "128"))  # waiting model calls per worker
+ADMISSION_ROLE_PRIORITY = os.environ.get("ADMISSION_ROLE_PRIORITY", "SRE=2,Developer=1,Manager=1,Other=0")
+ADMISSION_CATEGORY_PRIORITY = os.environ.get("ADMISSION_CATEGORY_PRIORITY", "auth=2,latency=1,storage=1,unknown=0")
+ADMISSION_CALLER_PRIORITY = os.environ.get("ADMISSION_CALLER_PRIORITY", "")  # e.g. "servicenow=2,orchestrate=1"
+
+CALLER_HEADER = "X-Caller-Id"
+
+
+def parse_weights(spec: str) -> Dict[str, int]:
+    """Parse "name=weight,name=weight" into a dict, skipping malformed entries"""
+    weights = {}
+    for item in spec.split(","):
+        name, sep, value = item.partition("=")
+        if not sep or not name.strip():
+            continue
+        try:
+            weights[name.strip().lower()] = int(value)
+        except ValueError:
+            logger.warning(f"Ignoring invalid priority weight: {item!r}")
+    return weights
+
+
+ROLE_WEIGHTS = parse_weights(ADMISSION_ROLE_PRIORITY)
+CATEGORY_WEIGHTS = parse_weights(ADMISSION_CATEGORY_PRIORITY)
+CALLER_WEIGHTS = parse_weights(ADMISSION_CALLER_PRIORITY)
+
+
+def request_priority(
+    reporter_role: Optional[str],
+    category: Optional[str],
+    caller: Optional[str] = None
+) -> int:
+    """
+    Priority of an evaluation (higher is served first).
+
+    Args:
+        reporter_role: Reporter role from the request
+        category: Incident category from the request
+        caller: Caller identity (X-Caller-Id header), if any
+
+    Returns:
+        Sum of the role, category and caller weights (unknown names weigh 0)
+    """
+    return (
+        ROLE_WEIGHTS.get((reporter_role or "").lower(), 0)
+        + CATEGORY_WEIGHTS.get((category or "").lower(), 0)
+        + CALLER_WEIGHTS.get((caller or "").lower(), 0)
+    )
+
+
+class AdmissionRejected(Exception):
+    """Raised when an evaluation is shed because the admission queue is full"""
+
+    def __init__(self, priority: int, reason: str):
+        super().__init__(f"Load shed at priority {priority}: {reason}")
+        self.priority = priority
+        self.reason = reason
+
+
+class AdmissionController:
+    """Concurrency cap with a bounded, priority-ordered wait queue"""
+
+    def __init__(self, max_concurrency: int = MODEL_CONCURRENCY, max_queue: int = ADMISSION_QUEUE_SIZE):
+        """
+        Args:
+            max_concurrency: Evaluations allowed to run at once
+            max_queue: Evaluations allowed to wait for a slot
+        """
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.in_flight = 0
+        # Heap of [-priority, deadline_at, seq, future]; served from the top
+        self._waiters: List[list] = []
+        self._seq = itertools.count()
+        self.queue_wait = LatencyWindow()
+        self.admitted = 0
+        self.shed = 0
+        self.evicted = 0
+
+    @asynccontextmanager
+    async def slot(self, priority: int = 0, deadline_at: float = float("inf")) -> AsyncIterator[None]:
+        """
+        Hold an evaluation slot for the duration of the block.
+
+        Args:
+            priority: Request priority (see request_priority)
+            deadline_at: Monotonic time the caller gives up; earlier deadlines
+                are served first among equal priorities
+
+        Raises:
+            AdmissionRejected: If the request was shed (queue full, or
+                displaced by a higher-priority request while waiting)
+        """
+        await self.acquire(priority, deadline_at)
+        try:
+            yield
+        finally:
+            self.release()
+
+    async def acquire(self, priority: int = 0, deadline_at: float = float("inf")):
+        """Take a slot, waiting in the priority queue if all slots are busy"""
+        loop = asyncio.get_running_loop()
+        if self.in_flight < self.max_concurrency and not self._waiters:
+            self.in_flight += 1
+            self.admitted += 1
+            self.queue_wait.observe(0.0)
+            return
+
+        if len(self._waiters) >= self.max_queue:
+            self._make_room(priority)
+
+        future = loop.create_future()
+        entry = [-priority, deadline_at, next(self._seq), future]
+        heapq.heappush(self._waiters, entry)
+        start = loop.time()
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled() and future.exception() is None:
+                # Slot was handed over just as the caller went away: pass it on
+                self.release()
+            else:
+                self._remove(entry)
+            raise
+        self.admitted += 1
+        self.queue_wait.observe((loop.time() - start) * 1000)
+
+    def _make_room(self, priority: int):
+        """Shed the newcomer, or the lowest-priority waiter if the newcomer outranks it"""
+        if not self._waiters:
+            self.shed += 1
+            raise AdmissionRejected(priority, "no queue capacity")
+
+        # Lowest priority, latest deadline, newest arrival
+        lowest = max(self._waiters, key=lambda entry: (entry[0], entry[1], entry[2]))
+        if -lowest[0] >= priority:
+            self.shed += 1
+            logger.warning(f"Admission queue full ({len(self._waiters)}), shedding priority {priority} request")
+            raise AdmissionRejected(priority, "admission queue full")
+
+        self._remove(lowest)
+        self.shed += 1
+        self.evicted += 1
+        logger.warning(f"Admission queue full, evicting priority {-lowest[0]} request for priority {priority}")
+        lowest[3].set_exception(AdmissionRejected(-lowest[0], "displaced by higher-priority request"))
+
+    def _remove(self, entry: list):
+        try:
+            self._waiters.remove(entry)
+        except ValueError:
+            return
+        heapq.heapify(self._waiters)
+
+    def release(self):
+        """Free a slot, handing it straight to the highest-priority waiter"""
+        while self._waiters:
+            future = heapq.heappop(self._waiters)[3]
+            if not future.done():
+                future.set_result(None)  # slot transfers, in_flight unchanged
+                return
+        self.in_flight -= 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Slot usage and shedding counters for health reporting"""
+        return {
+            "max_concurrency": self.max_concurrency,
+            "max_queue": self.max_queue,
+            "in_flight": self.in_flight,
+            "queued": len(self._waiters),
+            "admitted": self.admitted,
+            "shed": self.shed,
+            "evicted": self.evicted,
+            "queue_wait": self.queue_wait.stats()
+        }
@@ -0,0 +1,150 @@
+"""
+NDJSON streaming bulk evaluation for A.E.G.I.S.
+
+Used by POST /evaluate-incidents/stream to push tens of thousands of
+historical incidents through the pipeline without buffering them:
+
+1. The request body is read incrementally and split into lines
+2. Lines feed a bounded queue consumed by a fixed pool of workers
+3. Results are written back as NDJSON as soon as each one finishes
+
+Every queue is bounded, so memory stays constant regardless of input size;
+a slow client applies back-pressure all the way to the body reader.
+"""
+
+import os
+import json
+import asyncio
+import logging
+from typing import AsyncIterator, Awaitable, Callable, Dict, Any, Optional, Tuple
+
+from starlette.responses import StreamingResponse
+from starlette.types import Receive, Scope, Send
+
+logger = logging.getLogger(__name__)
+
+# Configuration from environment
+NDJSON_WORKERS = int(os.environ.get("NDJSON_WORKERS", "8"))
+NDJSON_MAX_LINE_BYTES = int(os.environ.get("NDJSON_MAX_LINE_BYTES", str(1024 * 1024)))
+
+
+class DuplexStreamingResponse(StreamingResponse):
+    """
+    StreamingResponse that streams while the request body is still being read.
+
+    The stock StreamingResponse listens for client disconnects by calling
+    receive() concurrently, which would swallow request body chunks that the
+    content iterator is still consuming. Here only the body reader calls
+    receive(); a disconnect surfaces there as ClientDisconnect.
+    """
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        await self.stream_response(send)
+        if self.background is not None:
+            await self.background()
+
+
+async def iter_ndjson_lines(
+    chunks: AsyncIterator[bytes],
+    max_line_bytes: int = NDJSON_MAX_LINE_BYTES
+) -> AsyncIterator[Tuple[int, Optional[bytes]]]:
+    """
+    Split a byte stream into (line_number, line) pairs.
+
+    Blank lines are skipped but still counted. A line longer than
+    max_line_bytes is discarded and yielded as (line_number, None) so the
+    caller can report it without holding it in memory.
+    """
+    buffer = b""
+    line_number = 0
+    oversized = False
+
+    async for chunk in chunks:
+        buffer += chunk
+        while True:
+            newline = buffer.find(b"\n")
+            if newline == -1:
+                if len(buffer) > max_line_bytes:
+                    oversized = True
+                    buffer = b""
+                break
+
+            line, buffer = buffer[:newline], buffer[newline + 1:]
+            line_number += 1
+            if oversized:
+                oversized = False
+                yield line_number, None
+            elif line.strip():
+                yield line_number, line
+
+    if oversized:
+        yield line_number + 1, None
+    elif buffer.strip():
+        yield line_number + 1, buffer
+
+
+async def evaluate_ndjson_stream(
+    lines: AsyncIterator[Tuple[int, Optional[bytes]]],
+    evaluate_line: Callable[[int, Optional[bytes]], Awaitable[Dict[str, Any]]],
+    workers: int = NDJSON_WORKERS
+) -> AsyncIterator[str]:
+    """
+    Evaluate lines with a bounded worker pool and yield NDJSON results.
+
+    Results are yielded in completion order; each carries its input line
+    number so callers can correlate them.
+
+    Args:
+        lines: Output of iter_ndjson_lines
+        evaluate_line: Coroutine turning (line_number, line) into a result dict
+        workers: Number of concurrent evaluations
+
+    Yields:
+        One JSON document per line, newline-terminated
+    """
+    inputs: asyncio.Queue = asyncio.Queue(maxsize=workers * 2)
+    outputs: asyncio.Queue = asyncio.Queue(maxsize=workers * 2)
+    done = object()
+
+    async def read():
+        last_line = 0
+        try:
+            async for item in lines:
+                last_line = item[0]
+                await inputs.put(item)
+        except Exception as e:
+            logger.error(f"Error reading NDJSON body: {e}")
+            await outputs.put({"line": last_line + 1, "error": f"Failed to read request body: {str(e)[:100]}"})
+        for _ in range(workers):
+            await inputs.put(done)
+
+    async def work():
+        while True:
+            item = await inputs.get()
+            if item is done:
+                break
+            try:
+                result = await evaluate_line(*item)
+            except Exception as e:
+                # One bad incident must not end the stream for the rest
+                logger.error(f"Error evaluating NDJSON line {item[0]}: {e}", exc_info=True)
+                result = {"line": item[0], "error": f"Evaluation failed: {str(e)[:100]}"}
+            await outputs.put(result)
+
+    async def run():
+        await asyncio.gather(read(), *[work() for _ in range(workers)])
+        await outputs.put(done)
+
+    runner = asyncio.ensure_future(run())
+    try:
+        while True:
+            result = await outputs.get()
+            if result is done:
+                break
+            yield json.dumps(result) + "\n"
+        await runner
+    finally:
+        # Client went away - stop reading and evaluating, and wait for the
+        # workers to unwind so no evaluation outlives the response
+        runner.cancel()
+        await asyncio.gather(runner, return_exceptions=True)
@@ -0,0 +1,123 @@
+"""
+Circuit breaker for A.E.G.I.S. downstream dependencies
+
+Stops calling a dependency that keeps failing so each incident doesn't pay
+its full timeout. After failure_threshold consecutive failures the breaker
+opens and calls are rejected immediately for cooldown seconds; then a
+single probe call is let through (half-open). The probe's outcome closes
+the breaker again or re-opens it for another cool-down.
+"""
+
+import time
+import logging
+import threading
+from typing import Any, Callable, Dict
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """Thread-safe consecutive-failure circuit breaker"""
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = 3,
+        cooldown: float = 30.0,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        Args:
+            name: Dependency name (for logs)
+            failure_threshold: Consecutive failures that open the breaker
+            cooldown: Seconds to reject calls before probing again
+            clock: Monotonic time source (injectable for tests)
+        """
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self._clock = clock
+        self._lock = threading.Lock()
+
+        self._state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+
+        self.opens = 0
+        self.rejected = 0
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._current_state()
+
+    def _current_state(self) -> str:
+        if self._state == OPEN and self._clock() - self._opened_at >= self.cooldown:
+            self._state = HALF_OPEN
+            self._probe_in_flight = False
+        return self._state
+
+    def allow(self) -> bool:
+        """
+        Ask to make a call.
+
+        Returns:
+            True if the call may proceed (the caller must then report its
+            outcome), False if the dependency should be skipped
+        """
+        with self._lock:
+            state = self._current_state()
+            if state == CLOSED:
+                return True
+            if state == HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return True
+            self.rejected += 1
+            return False
+
+    def record_success(self):
+        """Report a successful call"""
+        with self._lock:
+            if self._state != CLOSED:
+                logger.info(f"Circuit '{self.name}' closed")
+            self._state = CLOSED
+            self._failures = 0
+            self._probe_in_flight = False
+
+    def record_failure(self):
+        """Report a failed call"""
+        with self._lock:
+            self._failures += 1
+            if self._state == HALF_OPEN or self._failures >= self.failure_threshold:
+                if self._state != OPEN:
+                    self.opens += 1
+                    logger.warning(
+                        f"Circuit '{self.name}' opened after {self._failures} consecutive failures; "
+                        f"skipping calls for {self.cooldown:.0f}s"
+                    )
+                self._state = OPEN
+                self._opened_at = self._clock()
+                self._probe_in_flight = False
+
+    def record_cancelled(self):
+        """Report a call abandoned without an outcome (frees a half-open probe)"""
+        with self._lock:
+            self._probe_in_flight = False
+
+    def stats(self) -> Dict[str, Any]:
+        """Breaker state for health reporting"""
+        with self._lock:
+            state = self._current_state()
+            remaining = self.cooldown - (self._clock() - self._opened_at) if state == OPEN else 0.0
+            return {
+                "state": state,
+                "consecutive_failures": self._failures,
+                "opens": self.opens,
+                "rejected": self.rejected,
+                "cooldown_remaining_s": round(max(0.0, remaining), 1)
+            }
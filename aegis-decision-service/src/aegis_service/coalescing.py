@@ -0,0 +1,97 @@
+"""
+Single-flight request coalescing for A.E.G.I.S.
+
+When an alert fires on many hosts, ServiceNow and Orchestrate send identical
+/evaluate-incident payloads within milliseconds. Instead of launching one
+model call per request, concurrent callers with the same key attach to the
+model call already in flight and share its result. Everything around the
+call (runbook retrieval, deadline, admission priority, trace) stays with
+each caller.
+
+The shared call runs as its own task, so a caller that disconnects does not
+cancel the work for everyone else attached to it.
+"""
+
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, Tuple, Type
+
+logger = logging.getLogger(__name__)
+
+
+class SingleFlight:
+    """
+    Deduplicates concurrent async calls by key.
+
+    Only calls that overlap in time are merged; once an evaluation finishes
+    its key is released and the next caller starts a fresh one (the decision
+    cache handles repeats that arrive later).
+    """
+
+    def __init__(self):
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self.hits = 0  # callers that attached to an in-flight evaluation
+        self.misses = 0  # callers that started a new evaluation
+        self.reruns = 0  # attached callers that ran again after the leader's own failure
+
+    async def do(
+        self,
+        key: str,
+        fn: Callable[[], Awaitable[Any]],
+        rerun_on: Tuple[Type[BaseException], ...] = ()
+    ) -> Tuple[Any, bool]:
+        """
+        Run fn() once per key among concurrent callers.
+
+        Args:
+            key: Fingerprint identifying identical work
+            fn: Coroutine factory performing the evaluation
+            rerun_on: Failures that belong to the caller that started the
+                evaluation (shed, out of time) rather than to the work; an
+                attached caller that sees one runs its own fn() instead
+
+        Returns:
+            Tuple of (result, coalesced) where coalesced is True if this caller
+            attached to an evaluation started by another request
+
+        Raises:
+            Whatever fn() raised - every attached caller sees the same exception,
+            except for rerun_on failures
+        """
+        task = self._inflight.get(key)
+        if task is not None and not task.done():
+            self.hits += 1
+            logger.info("Attaching to in-flight evaluation")
+            try:
+                return await asyncio.shield(task), True
+            except rerun_on as e:
+                # The key was released when the task finished, so this starts
+                # (or joins) a fresh evaluation under this caller's own fn()
+                self.reruns += 1
+                logger.info(f"In-flight evaluation failed for its caller ({e}), running again")
+                return await self.do(key, fn, rerun_on)
+
+        self.misses += 1
+        task = asyncio.ensure_future(fn())
+        self._inflight[key] = task
+        task.add_done_callback(lambda _: self._release(key, task))
+        return await asyncio.shield(task), False
+
+    def _release(self, key: str, task: asyncio.Task):
+        """Forget a finished evaluation so later callers start fresh"""
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        # Mark the exception retrieved even if every caller went away
+        if not task.cancelled():
+            task.exception()
+
+    def stats(self) -> Dict[str, Any]:
+        """Coalescing counters for monitoring"""
+        total = self.hits + self.misses
+        return {
+            "in_flight": len(self._inflight),
+            "hits": self.hits,
+            "misses": self.misses,
+            "reruns": self.reruns,
+            "hit_ratio": round(self.hits / total, 4) if total else 0.0
+        }
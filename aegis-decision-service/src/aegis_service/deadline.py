@@ -0,0 +1,157 @@
+"""
+Per-request deadlines for A.E.G.I.S.
+
+Callers give up after a fixed time (the ServiceNow business rule waits 30s),
+so work that finishes later is wasted and the caller retries. Every
+evaluation gets a deadline - REQUEST_DEADLINE_MS by default, or the
+caller's own budget from the X-Request-Deadline-Ms header - that is split
+across stages:
+
+- runbook: at most DEADLINE_RUNBOOK_SHARE of the budget; caps the Langflow
+  soft deadline / timeout
+- inference: whatever is left, minus DEADLINE_RESERVE_MS kept back to build
+  the response (parsing and policy checks run inside this stage)
+
+A stage that runs out of budget is cancelled and the service answers with
+the safe escalate_to_human fallback while the caller is still waiting.
+Per-stage budget and usage are returned with each response.
+"""
+
+import os
+import time
+import asyncio
+import logging
+import threading
+from contextvars import ContextVar
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Configuration from environment
+REQUEST_DEADLINE_MS = float(os.environ.get("REQUEST_DEADLINE_MS", "25000"))  # below the 30s caller timeout
+REQUEST_DEADLINE_MAX_MS = float(os.environ.get("REQUEST_DEADLINE_MAX_MS", "60000"))  # cap for header values
+DEADLINE_RUNBOOK_SHARE = float(os.environ.get("DEADLINE_RUNBOOK_SHARE", "0.2"))
+DEADLINE_RESERVE_MS = float(os.environ.get("DEADLINE_RESERVE_MS", "250"))
+
+DEADLINE_HEADER = "X-Request-Deadline-Ms"
+
+# stage -> number of evaluations that ran out of budget in it
+_exceeded: Dict[str, int] = {}
+_exceeded_lock = threading.Lock()
+
+
+class DeadlineExceeded(Exception):
+    """Raised when a stage runs out of its share of the request deadline"""
+
+    def __init__(self, stage: str, budget_ms: float):
+        super().__init__(f"Deadline exceeded in stage '{stage}' (budget {budget_ms:.0f}ms)")
+        self.stage = stage
+        self.budget_ms = budget_ms
+
+
+class Deadline:
+    """A request's time budget and the per-stage usage recorded against it"""
+
+    def __init__(self, budget_ms: float = REQUEST_DEADLINE_MS, clock: Callable[[], float] = time.monotonic):
+        """
+        Args:
+            budget_ms: Total time the caller is willing to wait
+            clock: Monotonic time source (injectable for tests)
+        """
+        self.budget_ms = budget_ms
+        self._clock = clock
+        self._start = clock()
+        self.stages: Dict[str, Dict[str, float]] = {}
+        self.exceeded_stage: Optional[str] = None
+
+    @classmethod
+    def from_header(cls, value: Optional[str]) -> "Deadline":
+        """
+        Build a deadline from the X-Request-Deadline-Ms header.
+
+        Missing or invalid values use REQUEST_DEADLINE_MS; values are capped
+        at REQUEST_DEADLINE_MAX_MS.
+        """
+        budget_ms = REQUEST_DEADLINE_MS
+        if value:
+            try:
+                requested = float(value)
+                if requested > 0:
+                    budget_ms = min(requested, REQUEST_DEADLINE_MAX_MS)
+            except ValueError:
+                logger.warning(f"Ignoring invalid {DEADLINE_HEADER} header: {value!r}")
+        return cls(budget_ms)
+
+    def elapsed_ms(self) -> float:
+        return (self._clock() - self._start) * 1000
+
+    def remaining_ms(self) -> float:
+        return max(0.0, self.budget_ms - self.elapsed_ms())
+
+    def expires_at(self) -> float:
+        """Clock time at which the budget runs out"""
+        return self._start + self.budget_ms / 1000
+
+    def runbook_budget_ms(self) -> float:
+        """Budget for runbook retrieval"""
+        return max(0.0, min(self.budget_ms * DEADLINE_RUNBOOK_SHARE, self.remaining_ms() - DEADLINE_RESERVE_MS))
+
+    def inference_budget_ms(self) -> float:
+        """Budget for model inference, parsing and policy"""
+        return max(0.0, self.remaining_ms() - DEADLINE_RESERVE_MS)
+
+    def record(self, stage: str, budget_ms: float, used_ms: float):
+        """Record a stage's budget and the time it actually took"""
+        self.stages[stage] = {"budget_ms": round(budget_ms, 1), "used_ms": round(used_ms, 1)}
+
+    async def run(self, stage: str, awaitable: Awaitable[Any], budget_ms: Optional[float] = None) -> Any:
+        """
+        Await a stage, cancelling it when its budget runs out.
+
+        Args:
+            stage: Stage name for reporting
+            awaitable: The stage's work
+            budget_ms: Stage budget (default: everything that is left)
+
+        Returns:
+            The stage's result
+
+        Raises:
+            DeadlineExceeded: If the stage did not finish within its budget
+        """
+        if budget_ms is None:
+            budget_ms = self.remaining_ms()
+        start = self._clock()
+        try:
+            return await asyncio.wait_for(awaitable, timeout=budget_ms / 1000)
+        except asyncio.TimeoutError:
+            self.exceeded_stage = stage
+            with _exceeded_lock:
+                _exceeded[stage] = _exceeded.get(stage, 0) + 1
+            logger.warning(f"Stage '{stage}' exceeded its {budget_ms:.0f}ms budget, cancelled")
+            raise DeadlineExceeded(stage, budget_ms) from None
+        finally:
+            self.record(stage, budget_ms, (self._clock() - start) * 1000)
+
+    def report(self) -> Dict[str, Any]:
+        """Budget usage for the response"""
+        return {
+            "budget_ms": round(self.budget_ms, 1),
+            "elapsed_ms": round(self.elapsed_ms(), 1),
+            "exceeded_stage": self.exceeded_stage,
+            "stages": dict(self.stages)
+        }
+
+
+# Deadline of the request being served; set by the endpoint, read by retry logic
+current_deadline: ContextVar[Optional[Deadline]] = ContextVar("current_deadline", default=None)
+
+
+def deadline_stats() -> Dict[str, Any]:
+    """Default budget and per-stage exceeded counts for health reporting"""
+    with _exceeded_lock:
+        exceeded = dict(_exceeded)
+    return {
+        "default_budget_ms": REQUEST_DEADLINE_MS,
+        "exceeded": exceeded
+    }
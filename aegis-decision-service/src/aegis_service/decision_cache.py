@@ -0,0 +1,226 @@
+"""
+Decision cache for A.E.G.I.S.
+
+Monitoring tools re-send the same incident text over and over. This module
+keeps recently validated decisions in a bounded LRU cache with a TTL so
+repeats skip the Granite call entirely.
+
+Cache keys are a hash of:
+- normalized incident_text (case and whitespace folded)
+- category and reporter_role
+- model_id
+- prompt template version (changing the prompt invalidates old entries)
+- the runbook context sent with the prompt (editing a runbook invalidates
+  decisions made with the old text, even ones still in flight)
+
+The cache can optionally be snapshotted to disk (DECISION_CACHE_SNAPSHOT)
+on shutdown and reloaded on startup, so it survives Code Engine
+scale-to-zero restarts.
+"""
+
+import os
+import re
+import json
+import time
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional, Dict, Any, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Configuration from environment
+DECISION_CACHE_SIZE = int(os.environ.get("DECISION_CACHE_SIZE", "1024"))
+DECISION_CACHE_TTL = float(os.environ.get("DECISION_CACHE_TTL", "300"))  # seconds
+DECISION_CACHE_SNAPSHOT = os.environ.get("DECISION_CACHE_SNAPSHOT")
+
+SNAPSHOT_FORMAT_VERSION = 1
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_incident_text(incident_text: str) -> str:
+    """Fold case and whitespace so trivially different re-sends share a key"""
+    return _WHITESPACE.sub(" ", incident_text.strip().lower())
+
+
+def make_cache_key(
+    incident_text: str,
+    category: str,
+    reporter_role: str,
+    model_id: str,
+    prompt_version: str,
+    runbook_context: str = ""
+) -> str:
+    """
+    Build the cache key for an incident.
+
+    Args:
+        incident_text: Raw incident description
+        category: Incident category
+        reporter_role: Reporter's role
+        model_id: watsonx.ai model ID
+        prompt_version: Hash of the prompt template and generation params
+        runbook_context: Runbook context included in the prompt
+
+    Returns:
+        Hex digest identifying the incident fingerprint
+    """
+    fingerprint = "\x1f".join([
+        normalize_incident_text(incident_text),
+        category or "",
+        reporter_role or "",
+        model_id,
+        prompt_version,
+        runbook_context
+    ])
+    return hashlib.sha256(fingerprint.encode("utf-8")).hexdigest()
+
+
+class DecisionCache:
+    """
+    Thread-safe LRU cache of validated decisions with per-entry TTL.
+
+    Values are stored as plain dicts (ModelDecision.model_dump()) so callers
+    always get an independent copy and entries serialize cleanly to disk.
+    """
+
+    def __init__(
+        self,
+        max_size: int = DECISION_CACHE_SIZE,
+        ttl: float = DECISION_CACHE_TTL,
+        snapshot_path: Optional[str] = DECISION_CACHE_SNAPSHOT
+    ):
+        """
+        Args:
+            max_size: Maximum number of entries (0 disables the cache)
+            ttl: Seconds an entry stays valid
+            snapshot_path: Optional file used to persist entries across restarts
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        self.snapshot_path = Path(snapshot_path) if snapshot_path else None
+
+        # key -> (expires_at wall-clock, decision dict)
+        self._entries: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_size > 0
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return a copy of the cached decision, or None on miss/expiry"""
+        if not self.enabled:
+            return None
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            expires_at, value = entry
+            if expires_at <= time.time():
+                del self._entries[key]
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return dict(value)
+
+    def put(self, key: str, value: Dict[str, Any]):
+        """Store a decision, evicting the least recently used entry if full"""
+        if not self.enabled:
+            return
+
+        with self._lock:
+            self._entries[key] = (time.time() + self.ttl, dict(value))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """Drop all entries"""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Cache statistics for monitoring"""
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0
+        }
+
+    def load_snapshot(self) -> int:
+        """
+        Load unexpired entries from the snapshot file.
+
+        Returns:
+            Number of entries restored
+        """
+        if not self.enabled or not self.snapshot_path or not self.snapshot_path.exists():
+            return 0
+
+        try:
+            data = json.loads(self.snapshot_path.read_text(encoding="utf-8"))
+            if data.get("version") != SNAPSHOT_FORMAT_VERSION:
+                logger.warning("Ignoring decision cache snapshot with unknown format version")
+                return 0
+
+            now = time.time()
+            with self._lock:
+                for key, expires_at, value in data.get("entries", []):
+                    if expires_at > now:
+                        self._entries[key] = (expires_at, value)
+                while len(self._entries) > self.max_size:
+                    self._entries.popitem(last=False)
+                restored = len(self._entries)
+
+            logger.info(f"Restored {restored} decision cache entries from {self.snapshot_path}")
+            return restored
+        except Exception as e:
+            logger.error(f"Failed to load decision cache snapshot: {e}")
+            return 0
+
+    def save_snapshot(self) -> int:
+        """
+        Write unexpired entries to the snapshot file atomically.
+
+        Returns:
+            Number of entries written
+        """
+        if not self.enabled or not self.snapshot_path:
+            return 0
+
+        now = time.time()
+        with self._lock:
+            entries = [
+                [key, expires_at, value]
+                for key, (expires_at, value) in self._entries.items()
+                if expires_at > now
+            ]
+
+        try:
+            self.snapshot_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.snapshot_path.with_suffix(self.snapshot_path.suffix + ".tmp")
+            tmp_path.write_text(
+                json.dumps({"version": SNAPSHOT_FORMAT_VERSION, "entries": entries}),
+                encoding="utf-8"
+            )
+            os.replace(tmp_path, self.snapshot_path)
+            logger.info(f"Saved {len(entries)} decision cache entries to {self.snapshot_path}")
+            return len(entries)
+        except Exception as e:
+            logger.error(f"Failed to save decision cache snapshot: {e}")
+            return 0
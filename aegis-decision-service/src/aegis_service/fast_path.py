@@ -0,0 +1,178 @@
+"""
+Rule-based fast path for A.E.G.I.S.
+
+Textbook incidents ("disk at 99%, log rotation failed") always get the same
+answer from Granite, and incidents flagged by the ambiguity detector are
+forced to escalate by policy anyway. The rule engine settles both cases
+before the model is called:
+
+1. Ambiguous incidents -> the configured escalation decision
+2. Otherwise the first rule whose patterns match -> that rule's decision
+3. No match -> None (the model decides)
+
+Rules live in a JSON file derived from the runbooks
+(runbooks/fast_path_rules.json by default, FAST_PATH_RULES to override).
+Rule decisions still go through the normal policy validation.
+"""
+
+import os
+import re
+import json
+import logging
+import threading
+from pathlib import Path
+from typing import Optional, Dict, Any, List, Tuple
+
+from .models import ModelDecision
+
+logger = logging.getLogger(__name__)
+
+# Configuration from environment
+FAST_PATH_ENABLED = os.environ.get("FAST_PATH_ENABLED", "0") == "1"
+FAST_PATH_RULES = os.environ.get(
+    "FAST_PATH_RULES",
+    str(Path(__file__).parent.parent.parent / "runbooks" / "fast_path_rules.json")
+)
+
+AMBIGUITY_RULE = "ambiguity"
+
+
+class Rule:
+    """A compiled fast-path rule"""
+
+    def __init__(self, spec: Dict[str, Any]):
+        self.name: str = spec["name"]
+        self.categories: Optional[List[str]] = spec.get("categories")
+        self.all_of = [re.compile(p) for p in spec.get("all_of", [])]
+        self.none_of = [re.compile(p) for p in spec.get("none_of", [])]
+        # Validate the decision once at load time
+        self.decision: Dict[str, Any] = ModelDecision(**spec["decision"]).model_dump(
+            include={"analysis", "recommended_action", "confidence_score", "explanation"}
+        )
+
+        if not self.all_of:
+            raise ValueError(f"Rule '{self.name}' has no all_of patterns")
+
+    def matches(self, text_lower: str, category: Optional[str]) -> bool:
+        if self.categories is not None and category not in self.categories:
+            return False
+        return all(p.search(text_lower) for p in self.all_of) and \
+            not any(p.search(text_lower) for p in self.none_of)
+
+
+class RuleEngine:
+    """
+    Pre-model decision rules.
+
+    Thread-safe for concurrent evaluate() calls; only the hit counters are
+    shared state.
+    """
+
+    def __init__(self, rules: List[Rule], ambiguity_decision: Optional[Dict[str, Any]] = None):
+        """
+        Args:
+            rules: Compiled rules, evaluated in order
+            ambiguity_decision: Decision for ambiguous incidents (None = let the model decide)
+        """
+        self.rules = rules
+        self.ambiguity_decision = ambiguity_decision
+
+        self._lock = threading.Lock()
+        self.hits: Dict[str, int] = {}
+        self.misses = 0
+
+    @classmethod
+    def from_file(cls, path: str = FAST_PATH_RULES) -> "RuleEngine":
+        """
+        Load and compile rules from a JSON file.
+
+        Raises:
+            ValueError: If a rule pattern or decision is invalid
+        """
+        data = json.loads(Path(path).read_text(encoding="utf-8"))
+        return cls.from_dict(data)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "RuleEngine":
+        """Compile rules from an already-parsed rules document"""
+        rules = [Rule(spec) for spec in data.get("rules", [])]
+
+        ambiguity = data.get("ambiguity") or {}
+        ambiguity_decision = None
+        if ambiguity.get("enabled"):
+            ambiguity_decision = ModelDecision(**ambiguity["decision"]).model_dump(
+                include={"analysis", "recommended_action", "confidence_score", "explanation"}
+            )
+
+        return cls(rules, ambiguity_decision)
+
+    def evaluate(
+        self,
+        incident_text: str,
+        category: Optional[str],
+        ambiguous: bool
+    ) -> Optional[Tuple[str, Dict[str, Any]]]:
+        """
+        Try to settle an incident without the model.
+
+        Args:
+            incident_text: The incident description
+            category: Incident category
+            ambiguous: Result of the ambiguity detector for this incident
+
+        Returns:
+            Tuple of (rule name, decision fields), or None if no rule applies
+        """
+        match = None
+        if ambiguous:
+            if self.ambiguity_decision is not None:
+                match = (AMBIGUITY_RULE, self.ambiguity_decision)
+        else:
+            text_lower = incident_text.lower()
+            for rule in self.rules:
+                if rule.matches(text_lower, category):
+                    match = (rule.name, rule.decision)
+                    break
+
+        with self._lock:
+            if match is None:
+                self.misses += 1
+            else:
+                self.hits[match[0]] = self.hits.get(match[0], 0) + 1
+
+        if match is None:
+            return None
+        return match[0], dict(match[1])
+
+    def stats(self) -> Dict[str, Any]:
+        """Fast-path counters for monitoring"""
+        with self._lock:
+            hits = dict(self.hits)
+            misses = self.misses
+        total = sum(hits.values()) + misses
+        return {
+            "rules": len(self.rules),
+            "hits": hits,
+            "misses": misses,
+            "hit_ratio": round(sum(hits.values()) / total, 4) if total else 0.0
+        }
+
+
+def load_rule_engine() -> Optional[RuleEngine]:
+    """
+    Load the configured rule engine.
+
+    Returns:
+        RuleEngine, or None if the fast path is disabled or the rules file
+        cannot be loaded (every incident then goes to the model)
+    """
+    if not FAST_PATH_ENABLED:
+        return None
+
+    try:
+        engine = RuleEngine.from_file(FAST_PATH_RULES)
+        logger.info(f"Loaded {len(engine.rules)} fast-path rules from {FAST_PATH_RULES}")
+        return engine
+    except Exception as e:
+        logger.error(f"Failed to load fast-path rules, fast path disabled: {e}")
+        return None
@@ -0,0 +1,136 @@
+"""
+Hedged watsonx.ai generations for A.E.G.I.S.
+
+Granite latency has a long tail: most generations finish in about 2s, a few
+take 10s or more. With hedging on (WATSONX_HEDGE=1), a generation still
+running after the WATSONX_HEDGE_PERCENTILE of recent latencies gets an
+identical second request. The first successful result wins and the other
+request is cancelled, which closes its HTTP stream so watsonx.ai stops
+generating.
+
+Hedges are capped at WATSONX_HEDGE_MAX_RATE of generations so quota use
+stays predictable, and none are sent until WATSONX_HEDGE_MIN_SAMPLES
+latencies have been observed. Latencies are tracked in-process either way
+and reported by /health.
+"""
+
+import os
+import time
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from .latency import LatencyWindow
+
+logger = logging.getLogger(__name__)
+
+# Configuration from environment
+WATSONX_HEDGE = os.environ.get("WATSONX_HEDGE", "0") == "1"
+WATSONX_HEDGE_PERCENTILE = float(os.environ.get("WATSONX_HEDGE_PERCENTILE", "95"))
+WATSONX_HEDGE_MAX_RATE = float(os.environ.get("WATSONX_HEDGE_MAX_RATE", "0.05"))  # hedges per generation
+WATSONX_HEDGE_MIN_SAMPLES = int(os.environ.get("WATSONX_HEDGE_MIN_SAMPLES", "20"))
+
+
+class Hedger:
+    """Runs a generation, duplicating it once if it outlasts the latency percentile"""
+
+    def __init__(
+        self,
+        enabled: bool = WATSONX_HEDGE,
+        percentile: float = WATSONX_HEDGE_PERCENTILE,
+        max_rate: float = WATSONX_HEDGE_MAX_RATE,
+        min_samples: int = WATSONX_HEDGE_MIN_SAMPLES,
+        latency: Optional[LatencyWindow] = None
+    ):
+        """
+        Args:
+            enabled: Send hedges (latency is tracked regardless)
+            percentile: Latency percentile after which a hedge is sent
+            max_rate: Maximum hedges per generation
+            min_samples: Observed latencies needed before hedging
+            latency: Window of recent generation latencies
+        """
+        self.enabled = enabled
+        self.percentile = percentile
+        self.max_rate = max_rate
+        self.min_samples = min_samples
+        self.latency = latency if latency is not None else LatencyWindow()
+        self.calls = 0
+        self.hedged = 0
+        self.hedge_wins = 0
+
+    def hedge_delay(self) -> Optional[float]:
+        """Seconds to wait before hedging, or None if this call may not hedge"""
+        if not self.enabled or self.latency.count < self.min_samples:
+            return None
+        # Cap: hedges so far plus this one must stay within max_rate of calls
+        if self.hedged + 1 > self.max_rate * self.calls:
+            return None
+        delay_ms = self.latency.percentile(self.percentile)
+        return delay_ms / 1000 if delay_ms is not None else None
+
+    async def _timed(self, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """Run one attempt, recording its latency if it completes"""
+        start = time.perf_counter()
+        result = await fn()
+        self.latency.observe((time.perf_counter() - start) * 1000)
+        return result
+
+    async def run(self, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Await fn(), hedging with a second fn() call if it is slow.
+
+        Args:
+            fn: Factory for the generation coroutine (called once per attempt)
+
+        Returns:
+            The first successful result
+
+        Raises:
+            The primary's exception if every attempt failed
+        """
+        self.calls += 1
+        delay = self.hedge_delay()
+        if delay is None:
+            return await self._timed(fn)
+
+        primary = asyncio.ensure_future(self._timed(fn))
+        try:
+            done, _ = await asyncio.wait({primary}, timeout=delay)
+            if done:
+                return primary.result()
+
+            # Re-check the cap: concurrent slow calls may have used it up meanwhile
+            if self.hedged + 1 > self.max_rate * self.calls:
+                return await primary
+
+            self.hedged += 1
+            logger.info(f"Generation slower than p{self.percentile:.0f} ({delay * 1000:.0f}ms), sending hedge")
+            hedge = asyncio.ensure_future(self._timed(fn))
+            pending = {primary, hedge}
+            try:
+                while pending:
+                    done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                    for task in done:
+                        if task.exception() is None:
+                            self.hedge_wins += task is hedge
+                            return task.result()
+                # Both failed: report the primary's error
+                return primary.result()
+            finally:
+                hedge.cancel()
+        finally:
+            primary.cancel()
+
+    def stats(self) -> Dict[str, Any]:
+        """Hedging counters and generation latency for health reporting"""
+        return {
+            "enabled": self.enabled,
+            "calls": self.calls,
+            "hedged": self.hedged,
+            "hedge_rate": round(self.hedged / self.calls, 4) if self.calls else 0.0,
+            "hedge_wins": self.hedge_wins,
+            "hedge_after_ms": round(self.latency.percentile(self.percentile), 1)
+            if self.latency.count else None,
+            "latency": self.latency.stats()
+        }
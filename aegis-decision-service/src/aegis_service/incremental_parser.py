@@ -0,0 +1,282 @@
+"""
+Incremental decision parser for A.E.G.I.S.
+
+Consumes model output chunk by chunk in a single pass and recognizes the
+moment the four-field decision object has closed, so callers can stop the
+generation instead of paying for chatty trailing text ("Hope this helps!").
+
+Handles the same inputs the old multi-strategy parser did:
+- bare JSON
+- JSON wrapped in markdown fences or surrounded by prose (text before the
+  first '{' is skipped)
+- objects that fail midway (parsing restarts at the next '{')
+
+Top-level fields are decoded as soon as their values close, which is what
+the streaming endpoint uses for its early routing signal.
+"""
+
+import json
+import re
+from typing import Any, Dict
+
+REQUIRED_FIELDS = ("analysis", "recommended_action", "confidence_score", "explanation")
+
+# States
+_SCAN = 0          # looking for the opening '{'
+_KEY_OR_END = 1    # inside object, expecting a key, ',' or '}'
+_KEY = 2           # inside a key string
+_COLON = 3         # expecting ':'
+_VALUE = 4         # expecting the start of a value
+_STRING = 5        # inside a string value
+_SCALAR = 6        # inside a number / true / false / null
+_NESTED = 7        # inside a nested object or array value
+_AFTER_VALUE = 8   # expecting ',' or '}'
+
+_STRING_SPECIAL = re.compile(r'["\\]')
+_NESTED_SPECIAL = re.compile(r'["\\{}\[\]]')
+_SCALAR_END = re.compile(r'[\s,}]')
+_NON_WHITESPACE = re.compile(r'\S')
+
+_DECODER = json.JSONDecoder()
+
+
+class IncrementalDecisionParser:
+    """
+    Single-pass, chunk-at-a-time parser for the decision JSON object.
+
+    Usage:
+        parser = IncrementalDecisionParser()
+        for chunk in stream:
+            parser.feed(chunk)
+            if parser.complete:
+                break  # cancel the rest of the generation
+        decision_fields = parser.fields
+    """
+
+    def __init__(self):
+        self.fields: Dict[str, Any] = {}
+        self.complete = False
+        self.chars_consumed = 0  # characters read up to and including the closing '}'
+
+        self._state = _SCAN
+        self._token: list = []
+        self._key = ""
+        self._escape = False
+        self._has_escape = False
+        self._depth = 0
+        self._nested_in_string = False
+
+    def feed(self, chunk: str) -> bool:
+        """
+        Consume the next chunk of model output.
+
+        Returns:
+            True once a complete object with all required fields has been seen
+        """
+        if self.complete:
+            return True
+
+        i = 0
+        n = len(chunk)
+        while i < n:
+            state = self._state
+
+            if state == _SCAN:
+                start = chunk.find("{", i)
+                if start == -1:
+                    i = n
+                    break
+                self._start_object()
+                i = start + 1
+
+            elif state in (_KEY, _STRING):
+                i = self._consume_string(chunk, i)
+
+            elif state == _NESTED:
+                i = self._consume_nested(chunk, i)
+
+            elif state == _SCALAR:
+                match = _SCALAR_END.search(chunk, i)
+                end = match.start() if match else n
+                self._token.append(chunk[i:end])
+                i = end
+                if match:
+                    self._store(self._decode_scalar("".join(self._token)))
+                    self._state = _AFTER_VALUE
+
+            else:
+                match = _NON_WHITESPACE.search(chunk, i)
+                if match is None:
+                    i = n
+                    break
+                i = match.end()
+                char = match.group()
+
+                if state == _KEY_OR_END:
+                    if char == '"':
+                        self._state = _KEY
+                        self._token = ['"']
+                        self._has_escape = False
+                    elif char == "}":
+                        i = self._end_object(i)
+                    elif char != ",":
+                        self._restart(char)
+                elif state == _COLON:
+                    if char == ":":
+                        self._state = _VALUE
+                    else:
+                        self._restart(char)
+                elif state == _VALUE:
+                    if char == '"':
+                        self._state = _STRING
+                        self._token = ['"']
+                        self._has_escape = False
+                    elif char in "{[":
+                        self._state = _NESTED
+                        self._token = [char]
+                        self._depth = 1
+                        self._nested_in_string = False
+                    else:
+                        self._state = _SCALAR
+                        self._token = [char]
+                elif state == _AFTER_VALUE:
+                    if char == ",":
+                        self._state = _KEY_OR_END
+                    elif char == "}":
+                        i = self._end_object(i)
+                    else:
+                        self._restart(char)
+
+            if self.complete:
+                self.chars_consumed += i
+                return True
+
+        self.chars_consumed += n
+        return False
+
+    def _start_object(self):
+        self.fields = {}
+        self._state = _KEY_OR_END
+
+    def _restart(self, char: str):
+        """Current object is malformed - look for the next one"""
+        self._state = _SCAN
+        if char == "{":
+            self._start_object()
+
+    def _end_object(self, i: int) -> int:
+        if all(field in self.fields for field in REQUIRED_FIELDS):
+            self.complete = True
+        else:
+            self._state = _SCAN
+        return i
+
+    def _consume_string(self, chunk: str, i: int) -> int:
+        """Advance through a key or string value; returns the next index"""
+        n = len(chunk)
+        while i < n:
+            if self._escape:
+                self._token.append(chunk[i])
+                self._escape = False
+                i += 1
+                continue
+
+            match = _STRING_SPECIAL.search(chunk, i)
+            if match is None:
+                self._token.append(chunk[i:])
+                return n
+
+            end = match.start()
+            self._token.append(chunk[i:end + 1])
+            i = end + 1
+            if match.group() == "\\":
+                self._escape = self._has_escape = True
+                continue
+
+            # Closing quote - only strings with escapes need a real decode
+            raw = "".join(self._token)
+            text = self._decode_string(raw) if self._has_escape else raw[1:-1]
+            if self._state == _KEY:
+                self._key = text
+                self._state = _COLON
+            else:
+                self._store(text)
+                self._state = _AFTER_VALUE
+            return i
+        return i
+
+    def _consume_nested(self, chunk: str, i: int) -> int:
+        """Advance through a nested object/array value; returns the next index"""
+        n = len(chunk)
+        while i < n:
+            if self._escape:
+                self._token.append(chunk[i])
+                self._escape = False
+                i += 1
+                continue
+
+            match = _NESTED_SPECIAL.search(chunk, i)
+            if match is None:
+                self._token.append(chunk[i:])
+                return n
+
+            end = match.start()
+            char = match.group()
+            self._token.append(chunk[i:end + 1])
+            i = end + 1
+
+            if char == "\\":
+                self._escape = self._nested_in_string
+            elif char == '"':
+                self._nested_in_string = not self._nested_in_string
+            elif not self._nested_in_string:
+                self._depth += 1 if char in "{[" else -1
+                if self._depth == 0:
+                    self._store(self._decode_scalar("".join(self._token)))
+                    self._state = _AFTER_VALUE
+                    return i
+        return i
+
+    def _store(self, value: Any):
+        self.fields[self._key] = value
+        self._token = []
+
+    @staticmethod
+    def _decode_string(raw: str) -> str:
+        try:
+            return json.loads(raw)
+        except json.JSONDecodeError:
+            return raw[1:-1]
+
+    @staticmethod
+    def _decode_scalar(raw: str) -> Any:
+        try:
+            return json.loads(raw)
+        except json.JSONDecodeError:
+            return raw
+
+
+def parse_decision_fields(text: str) -> Dict[str, Any]:
+    """
+    Parse a complete model response.
+
+    The common case - one well-formed object, possibly fenced or followed by
+    prose - is decoded by the C JSON scanner starting at the first '{'.
+    Anything else goes through the incremental parser.
+
+    Returns:
+        Top-level fields of the first object containing all required fields,
+        or whatever fields were decoded if no such object was found
+    """
+    start = text.find("{")
+    if start != -1:
+        try:
+            data, _ = _DECODER.raw_decode(text, start)
+            if isinstance(data, dict) and all(field in data for field in REQUIRED_FIELDS):
+                return data
+        except json.JSONDecodeError:
+            pass
+
+    parser = IncrementalDecisionParser()
+    parser.feed(text)
+    return parser.fields
@@ -0,0 +1,183 @@
+"""
+Langflow runbook client for A.E.G.I.S.
+
+Fetches runbook context from an optional Langflow flow. Compared with a
+bare requests.post per incident, this client:
+- reuses TLS connections through one pooled requests.Session
+- caches contexts for LANGFLOW_CACHE_TTL seconds, keyed on the category and
+  the normalized incident text
+- opens a circuit breaker after repeated failures, so while Langflow is
+  unhealthy incidents fall back to local runbooks immediately instead of
+  each waiting LANGFLOW_TIMEOUT
+
+scripts/langflow_stub.py serves a local stand-in for testing.
+"""
+
+import os
+import time
+import hashlib
+import logging
+import threading
+from typing import Any, Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from .circuit_breaker import CircuitBreaker
+from .decision_cache import DecisionCache, normalize_incident_text
+from .tracing import KIND_CLIENT, inject, span
+
+logger = logging.getLogger(__name__)
+
+# Configuration from environment
+LANGFLOW_URL = os.environ.get("LANGFLOW_RUNBOOK_URL")
+LANGFLOW_TIMEOUT = float(os.environ.get("LANGFLOW_TIMEOUT", "3"))  # seconds
+LANGFLOW_POOL_SIZE = int(os.environ.get("LANGFLOW_POOL_SIZE", "10"))
+LANGFLOW_CACHE_SIZE = int(os.environ.get("LANGFLOW_CACHE_SIZE", "256"))  # 0 disables
+LANGFLOW_CACHE_TTL = float(os.environ.get("LANGFLOW_CACHE_TTL", "300"))  # seconds
+LANGFLOW_BREAKER_FAILURES = int(os.environ.get("LANGFLOW_BREAKER_FAILURES", "3"))
+LANGFLOW_BREAKER_COOLDOWN = float(os.environ.get("LANGFLOW_BREAKER_COOLDOWN", "30"))  # seconds
+
+
+def langflow_cache_key(category: str, incident_text: str) -> str:
+    """Cache key for a Langflow context: category plus incident fingerprint"""
+    fingerprint = f"{category or ''}\x1f{normalize_incident_text(incident_text)}"
+    return hashlib.sha256(fingerprint.encode("utf-8")).hexdigest()
+
+
+class LangflowClient:
+    """Pooled, cached and circuit-broken client for the Langflow runbook endpoint"""
+
+    def __init__(
+        self,
+        url: Optional[str] = LANGFLOW_URL,
+        timeout: float = LANGFLOW_TIMEOUT,
+        pool_size: int = LANGFLOW_POOL_SIZE,
+        cache: Optional[DecisionCache] = None,
+        breaker: Optional[CircuitBreaker] = None
+    ):
+        """
+        Args:
+            url: Langflow endpoint (None disables the client)
+            timeout: Per-request timeout in seconds
+            pool_size: Pooled connections kept to the Langflow host
+            cache: TTL cache of contexts (default: LANGFLOW_CACHE_SIZE/TTL)
+            breaker: Circuit breaker (default: LANGFLOW_BREAKER_FAILURES/COOLDOWN)
+        """
+        self.url = url
+        self.timeout = timeout
+        self.cache = cache if cache is not None else DecisionCache(
+            max_size=LANGFLOW_CACHE_SIZE, ttl=LANGFLOW_CACHE_TTL, snapshot_path=None
+        )
+        self.breaker = breaker if breaker is not None else CircuitBreaker(
+            "langflow",
+            failure_threshold=LANGFLOW_BREAKER_FAILURES,
+            cooldown=LANGFLOW_BREAKER_COOLDOWN
+        )
+
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
+
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.failures = 0
+        self.last_latency_ms: Optional[float] = None
+
+    @property
+    def configured(self) -> bool:
+        return bool(self.url)
+
+    def fetch(self, category: str, incident_text: str, timeout: Optional[float] = None) -> Optional[str]:
+        """
+        Get runbook context from Langflow.
+
+        Args:
+            category: Incident category
+            incident_text: Full incident description
+            timeout: Seconds to wait (default and upper bound: the client timeout)
+
+        Returns:
+            Context string, or None if Langflow is not configured, the
+            breaker is open, the call failed or returned an empty context
+        """
+        if not self.url:
+            return None
+
+        key = langflow_cache_key(category, incident_text)
+        cached = self.cache.get(key)
+        if cached is not None:
+            logger.info("Using cached Langflow runbook context")
+            return cached["context"]
+
+        if not self.breaker.allow():
+            logger.info("Langflow circuit open, skipping remote runbook fetch")
+            return None
+
+        with self._lock:
+            self.requests += 1
+
+        timeout = self.timeout if timeout is None else min(timeout, self.timeout)
+        start = time.perf_counter()
+        try:
+            logger.info(f"Fetching runbook from Langflow: {self.url}")
+            with span("langflow.fetch", kind=KIND_CLIENT, category=category) as langflow_span:
+                response = self._session.post(
+                    self.url,
+                    json={
+                        "category": category,
+                        "incident_text": incident_text
+                    },
+                    timeout=timeout,
+                    headers=inject({"Content-Type": "application/json"})
+                )
+                langflow_span.set_attribute("http.response.status_code", response.status_code)
+                response.raise_for_status()
+                data = response.json()
+        except requests.exceptions.Timeout:
+            logger.warning(f"Langflow request timed out after {timeout}s")
+            self._record_failure()
+            return None
+        except (requests.exceptions.RequestException, ValueError) as e:
+            logger.warning(f"Langflow request failed: {e}")
+            self._record_failure()
+            return None
+        finally:
+            self.last_latency_ms = round((time.perf_counter() - start) * 1000, 1)
+
+        self.breaker.record_success()
+
+        # Langflow should return {"context": "..."}
+        context = data.get("context", "") if isinstance(data, dict) else ""
+        if not context:
+            logger.warning("Langflow returned empty context")
+            return None
+
+        logger.info("Successfully retrieved runbook from Langflow")
+        self.cache.put(key, {"context": context})
+        return context
+
+    def _record_failure(self):
+        with self._lock:
+            self.failures += 1
+        self.breaker.record_failure()
+
+    def stats(self) -> Dict[str, Any]:
+        """Client, cache and breaker state for health reporting"""
+        return {
+            "configured": self.configured,
+            "requests": self.requests,
+            "failures": self.failures,
+            "last_latency_ms": self.last_latency_ms,
+            "cache": self.cache.stats(),
+            "breaker": self.breaker.stats()
+        }
+
+    def close(self):
+        """Close pooled connections"""
+        self._session.close()
+
+
+# Shared client used by get_langflow_runbook
+langflow_client = LangflowClient()
@@ -0,0 +1,44 @@
+"""
+In-process latency tracking for A.E.G.I.S.
+
+A small sliding window of recent observations with percentile lookups,
+cheap enough to update on every request.
+"""
+
+import threading
+from collections import deque
+from typing import Dict, Any, Optional
+
+
+class LatencyWindow:
+    """Keeps the most recent latency samples (milliseconds) for percentiles"""
+
+    def __init__(self, size: int = 1024):
+        self._samples = deque(maxlen=size)
+        self._lock = threading.Lock()
+        self.count = 0
+
+    def observe(self, value_ms: float):
+        """Record one latency sample"""
+        with self._lock:
+            self._samples.append(value_ms)
+            self.count += 1
+
+    def percentile(self, pct: float) -> Optional[float]:
+        """Return the pct-th percentile (0-100) of the window, or None if empty"""
+        with self._lock:
+            if not self._samples:
+                return None
+            ordered = sorted(self._samples)
+        index = min(len(ordered) - 1, max(0, int(round(pct / 100 * (len(ordered) - 1)))))
+        return ordered[index]
+
+    def stats(self) -> Dict[str, Any]:
+        """Summary for monitoring"""
+        p50 = self.percentile(50)
+        p95 = self.percentile(95)
+        return {
+            "count": self.count,
+            "p50_ms": round(p50, 1) if p50 is not None else None,
+            "p95_ms": round(p95, 1) if p95 is not None else None
+        }
@@ -0,0 +1,246 @@
+"""
+Asynchronous structured logging for A.E.G.I.S.
+
+Replaces logging.basicConfig's synchronous StreamHandler, which formats and
+writes every record on the event loop. Here the calling thread only
+filters the record and puts it on a bounded queue; a QueueListener thread
+formats it and writes it out. Under a burst the queue absorbs the writes;
+if it fills up, records are dropped and counted rather than blocking the
+request.
+
+Records are emitted as one JSON object per line (LOG_FORMAT=json), with the
+`extra` fields passed to the logger as top-level keys, and the active
+trace's trace_id and span_id when the record does not set its own.
+LOG_FORMAT=text keeps the previous human-readable format.
+
+High-volume levels can be sampled (LOG_SAMPLE_RATES, e.g. "INFO=0.1"):
+records carrying a trace_id are kept or dropped per trace, so a sampled
+evaluation keeps all of its log lines. WARNING and above are never
+sampled unless listed.
+"""
+
+import os
+import sys
+import json
+import queue
+import atexit
+import random
+import logging
+import logging.handlers
+import threading
+import zlib
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional, TextIO
+
+from .tracing import current_span, current_trace_id
+
+# Configuration from environment
+LOG_LEVEL = os.environ.get("LOG_LEVEL", "INFO").upper()
+LOG_FORMAT = os.environ.get("LOG_FORMAT", "json")  # json or text
+LOG_ASYNC = os.environ.get("LOG_ASYNC", "1") == "1"
+LOG_QUEUE_SIZE = int(os.environ.get("LOG_QUEUE_SIZE", "10000"))  # records waiting to be written
+LOG_SAMPLE_RATES = os.environ.get("LOG_SAMPLE_RATES", "")  # e.g. "DEBUG=0.01,INFO=0.25"
+
+TEXT_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+
+# Attributes every LogRecord has; anything else on a record came from `extra`
+_RECORD_ATTRIBUTES = frozenset(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime"}
+
+
+def parse_sample_rates(spec: str) -> Dict[int, float]:
+    """
+    Parse LOG_SAMPLE_RATES.
+
+    Args:
+        spec: Comma-separated LEVEL=rate pairs, e.g. "DEBUG=0.01,INFO=0.25"
+
+    Returns:
+        Map of logging level number to the fraction of records kept
+
+    Raises:
+        ValueError: If a level is unknown or a rate is outside 0-1
+    """
+    rates: Dict[int, float] = {}
+    for item in filter(None, (part.strip() for part in spec.split(","))):
+        name, _, rate = item.partition("=")
+        level = logging.getLevelName(name.strip().upper())
+        if not isinstance(level, int):
+            raise ValueError(f"Unknown log level in LOG_SAMPLE_RATES: {name!r}")
+        value = float(rate)
+        if not 0.0 <= value <= 1.0:
+            raise ValueError(f"LOG_SAMPLE_RATES rate must be between 0 and 1, got {rate!r}")
+        rates[level] = value
+    return rates
+
+
+class JSONFormatter(logging.Formatter):
+    """Formats a record as one JSON object, `extra` fields included"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry: Dict[str, Any] = {
+            "timestamp": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage()
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRIBUTES and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry["exception"] = record.exc_text
+        if record.stack_info:
+            entry["stack"] = record.stack_info
+        return json.dumps(entry, default=str)
+
+
+class SamplingFilter(logging.Filter):
+    """Keeps a fraction of records per level, consistently per trace_id"""
+
+    def __init__(self, rates: Dict[int, float], rng: Optional[random.Random] = None):
+        """
+        Args:
+            rates: Fraction of records kept per level (unlisted levels are kept)
+            rng: Random source for records without a trace_id
+        """
+        super().__init__()
+        self.rates = rates
+        self._rng = rng or random.Random()
+        self.sampled_out = 0
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        rate = self.rates.get(record.levelno)
+        if rate is None or rate >= 1.0:
+            return True
+        trace_id = getattr(record, "trace_id", None) or current_trace_id()
+        if trace_id is not None:
+            # Same decision for every record of a trace
+            keep = zlib.crc32(str(trace_id).encode()) / 0xFFFFFFFF < rate
+        else:
+            keep = self._rng.random() < rate
+        if not keep:
+            self.sampled_out += 1
+        return keep
+
+
+class AsyncQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler that does as little as possible on the calling thread.
+
+    The record is queued as-is instead of being pre-formatted: the message,
+    `extra` fields and exception are formatted on the listener thread. Only
+    the trace context, which lives in a context variable, is captured here.
+    """
+
+    def __init__(self, log_queue: "queue.SimpleQueue[logging.LogRecord]", max_size: int = LOG_QUEUE_SIZE):
+        super().__init__(log_queue)
+        self.max_size = max_size
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        if "trace_id" not in record.__dict__:
+            trace_id = current_trace_id()
+            if trace_id is not None:
+                record.trace_id = trace_id
+                record.span_id = current_span().span_id
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        # SimpleQueue (C, no Condition) with an approximate bound: cheaper than queue.Queue
+        if self.queue.qsize() >= self.max_size:
+            self.dropped += 1
+            return
+        self.queue.put_nowait(record)
+
+
+class LogPipeline:
+    """Root logger setup: formatter, sampling and the background writer"""
+
+    def __init__(self):
+        self.handler: Optional[logging.Handler] = None
+        self.listener: Optional[logging.handlers.QueueListener] = None
+        self.sampler: Optional[SamplingFilter] = None
+        self.format = LOG_FORMAT
+        self._lock = threading.Lock()
+
+    def install(
+        self,
+        level: str = LOG_LEVEL,
+        fmt: str = LOG_FORMAT,
+        async_writes: bool = LOG_ASYNC,
+        sample_rates: str = LOG_SAMPLE_RATES,
+        queue_size: int = LOG_QUEUE_SIZE,
+        stream: Optional[TextIO] = None
+    ):
+        """
+        Route root logger output through the pipeline (replacing an earlier install).
+
+        Args:
+            level: Root log level
+            fmt: "json" or "text"
+            async_writes: Format and write on a background thread
+            sample_rates: LOG_SAMPLE_RATES spec
+            queue_size: Records buffered before new ones are dropped
+            stream: Output stream (default: stderr, as basicConfig)
+        """
+        with self._lock:
+            self._uninstall()
+            writer = logging.StreamHandler(stream if stream is not None else sys.stderr)
+            writer.setFormatter(JSONFormatter() if fmt == "json" else logging.Formatter(TEXT_FORMAT))
+
+            if async_writes:
+                self.listener = logging.handlers.QueueListener(
+                    queue.SimpleQueue(), writer, respect_handler_level=True
+                )
+                self.handler = AsyncQueueHandler(self.listener.queue, queue_size)
+                self.listener.start()
+            else:
+                self.handler = writer
+
+            rates = parse_sample_rates(sample_rates)
+            self.sampler = SamplingFilter(rates) if rates else None
+            if self.sampler is not None:
+                # Filter before queueing, so sampled-out records cost no more work
+                self.handler.addFilter(self.sampler)
+
+            root = logging.getLogger()
+            root.setLevel(level)
+            root.addHandler(self.handler)
+            self.format = fmt
+
+    def _uninstall(self):
+        if self.handler is not None:
+            logging.getLogger().removeHandler(self.handler)
+            self.handler = None
+        if self.listener is not None:
+            self.listener.stop()
+            self.listener = None
+
+    def stop(self):
+        """Write out queued records and detach from the root logger"""
+        with self._lock:
+            self._uninstall()
+
+    def flush(self):
+        """Block until every queued record has been written"""
+        listener = self.listener
+        if listener is not None:
+            # QueueListener has no join: stopping drains the queue, then restart
+            with self._lock:
+                listener.stop()
+                listener.start()
+
+    def stats(self) -> Dict[str, Any]:
+        """Pipeline counters for health reporting"""
+        return {
+            "format": self.format,
+            "async": self.listener is not None,
+            "queued": self.listener.queue.qsize() if self.listener is not None else 0,
+            "dropped": getattr(self.handler, "dropped", 0),
+            "sampled_out": self.sampler.sampled_out if self.sampler is not None else 0
+        }
+
+
+log_pipeline = LogPipeline()
+atexit.register(log_pipeline.stop)
@@ -8,34 +8,121 @@ with confidence-based routing for watsonx Orchestrate.
 """
 
 import os
+import json
+import time
+import asyncio
 import logging
+from typing import Any, Dict, List, Optional, Tuple
 from uuid import uuid4
 from contextlib import asynccontextmanager
 
-from fastapi import FastAPI, HTTPException, Request
+from fastapi import FastAPI, Header, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from pydantic import ValidationError
 
 from .models import (
     IncidentRequest,
     IncidentResponse,
+    BatchIncidentRequest,
+    BatchIncidentResponse,
+    ModelDecision,
     DecisionPolicy,
     HealthResponse,
-    VersionResponse
+    VersionResponse,
+    RunbookRetrievalInfo,
+    DeadlineInfo
 )
-from .watsonx_client import WatsonxClient, WATSONX_MODEL_ID, WATSONX_URL
-from .runbook_context import get_runbook_context, format_runbook_for_prompt
-
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+from .watsonx_client import WatsonxClient, WATSONX_MODEL_ID, WATSONX_URL, BATCH_CONCURRENCY
+from .runbook_context import (
+    RunbookRetrieval,
+    get_runbook_context,
+    retrieve_runbook_context,
+    retrieval_stats,
+    runbook_context_key,
+    format_runbook_for_prompt,
+    runbook_store
+)
+from .langflow_client import langflow_client
+from .deadline import DEADLINE_HEADER, Deadline, DeadlineExceeded, current_deadline, deadline_stats
+from .admission import CALLER_HEADER, AdmissionController, AdmissionRejected, request_priority
+from .decision_cache import make_cache_key
+from .coalescing import SingleFlight
+from .latency import LatencyWindow
+from .metrics import (
+    CONTENT_TYPE as METRICS_CONTENT_TYPE,
+    DECISIONS,
+    HTTP_REQUEST_SECONDS,
+    METRICS_ENABLED,
+    REGISTRY,
+    STAGE_SECONDS,
+    Counter,
+    Gauge,
+    HTTPMetricsMiddleware
 )
+from .tracing import TracingMiddleware, current_trace_id, exporter as span_exporter, record_span, span
+from .bulk_stream import DuplexStreamingResponse, iter_ndjson_lines, evaluate_ndjson_stream
+from .log_pipeline import log_pipeline
+
+# Configure logging: JSON records written by a background thread (LOG_FORMAT, LOG_ASYNC, LOG_SAMPLE_RATES)
+log_pipeline.install()
 logger = logging.getLogger(__name__)
 
+# Merge concurrent identical model calls (default: on)
+SINGLE_FLIGHT_ENABLED = os.environ.get("SINGLE_FLIGHT_ENABLED", "1") == "1"
+
 # Global client instance
 watsonx_client: WatsonxClient = None
 
+# In-flight evaluations shared by identical concurrent requests
+single_flight = SingleFlight()
+
+# Per-worker cap on concurrent model calls, with a priority queue in front
+admission = AdmissionController()
+
+# Streaming endpoint timings: time to first routing signal and to final decision
+stream_routing_latency = LatencyWindow()
+stream_total_latency = LatencyWindow()
+
+
+def _cache_stats() -> Dict[str, Dict[str, Any]]:
+    """Hit/miss stats of each cache, read at scrape time"""
+    caches = {"langflow": langflow_client.cache.stats()}
+    if watsonx_client is not None:
+        caches["decision"] = watsonx_client.decision_cache.stats()
+    return caches
+
+
+def _in_flight() -> Dict[Tuple[str, ...], float]:
+    """Work in progress per component, read at scrape time"""
+    admission_stats = admission.stats()
+    values = {
+        ("evaluations",): admission_stats["in_flight"],
+        ("admission_queue",): admission_stats["queued"],
+        ("coalesced",): single_flight.stats()["in_flight"]
+    }
+    if watsonx_client is not None and watsonx_client.async_transport is not None:
+        values[("watsonx_generations",)] = watsonx_client.async_transport.limiter.concurrency.in_flight
+    return values
+
+
+REGISTRY.register(Counter(
+    "aegis_cache_hits_total", "Cache lookups answered from the cache", ["cache"],
+    callback=lambda: {(name,): stats["hits"] for name, stats in _cache_stats().items()}
+))
+REGISTRY.register(Counter(
+    "aegis_cache_misses_total", "Cache lookups that missed", ["cache"],
+    callback=lambda: {(name,): stats["misses"] for name, stats in _cache_stats().items()}
+))
+REGISTRY.register(Gauge(
+    "aegis_cache_hit_ratio", "Cache hits per lookup since startup", ["cache"],
+    callback=lambda: {(name,): stats["hit_ratio"] for name, stats in _cache_stats().items()}
+))
+REGISTRY.register(Gauge(
+    "aegis_in_flight", "Evaluations, queued requests and generations in progress", ["component"],
+    callback=_in_flight
+))
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -44,10 +131,29 @@ async def lifespan(app: FastAPI):
     global watsonx_client
     logger.info("Initializing A.E.G.I.S. Decision Service")
     watsonx_client = WatsonxClient()
+
+    # Preload runbooks and hot-reload them on change
+    runbook_store.reload()
+    runbook_store.add_listener(_on_runbooks_changed)
+    runbook_store.start_watching()
+
     logger.info("Service initialized successfully")
     yield
     # Shutdown
     logger.info("Shutting down A.E.G.I.S. Decision Service")
+    runbook_store.stop()
+    langflow_client.close()
+    await watsonx_client.aclose()
+    span_exporter.shutdown()
+
+
+def _on_runbooks_changed(categories):
+    """Drop cached decisions that were made with the previous runbook text"""
+    if not categories:
+        return
+    logger.info(f"Runbooks changed ({sorted(categories)}), clearing decision cache")
+    if watsonx_client is not None:
+        watsonx_client.decision_cache.clear()
 
 
 # Initialize FastAPI app
@@ -82,6 +188,12 @@ app = FastAPI(
     lifespan=lifespan
 )
 
+# Time every request by route (pure ASGI, so streaming responses are unaffected)
+app.add_middleware(HTTPMetricsMiddleware, histogram=HTTP_REQUEST_SECONDS)
+
+# Server span per request from the caller's traceparent; adds traceparent and Server-Timing headers
+app.add_middleware(TracingMiddleware)
+
 # Add CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -106,7 +218,7 @@ async def global_exception_handler(request: Request, exc: Exception):
             "confidence_score": 10,
             "explanation": "An unexpected error occurred. Human review required for safety.",
             "runbook_context": "",
-            "trace_id": str(uuid4()),
+            "trace_id": current_trace_id() or str(uuid4()),
             "model_id": WATSONX_MODEL_ID,
             "policy": {
                 "auto_execute_threshold": 80,
@@ -131,7 +243,11 @@ async def root():
         "endpoints": {
             "health": "/health",
             "version": "/version",
+            "metrics": "/metrics",
             "evaluate": "POST /evaluate-incident",
+            "evaluate_stream": "POST /evaluate-incident/stream",
+            "evaluate_batch": "POST /evaluate-incidents",
+            "evaluate_batch_stream": "POST /evaluate-incidents/stream",
             "docs": "/docs",
             "openapi": "/openapi.json"
         }
@@ -154,7 +270,45 @@ async def health_check():
                 message="WatsonX client not initialized"
             )
 
-        return HealthResponse(status="ok")
+        # Fail-fast mode: the breaker is open, incidents are escalated without a model call
+        degraded = watsonx_client.resilience.degraded
+
+        return HealthResponse(
+            status="degraded" if degraded else "ok",
+            message="watsonx.ai circuit breaker open; incidents escalate to humans" if degraded else None,
+            details={
+                "watsonx": watsonx_client.resilience.stats(),
+                "hedging": watsonx_client.hedger.stats(),
+                "cascade": {
+                    "enabled": watsonx_client.cascade,
+                    "small_model_id": watsonx_client.small_model_id if watsonx_client.cascade else None,
+                    "band": list(watsonx_client.cascade_band) if watsonx_client.cascade else None,
+                    "decided_by_tier": dict(watsonx_client.tier_counts)
+                },
+                "coalescing": single_flight.stats(),
+                "streaming": {
+                    "time_to_routing": stream_routing_latency.stats(),
+                    "time_to_decision": stream_total_latency.stats()
+                },
+                "decision_cache": watsonx_client.decision_cache.stats(),
+                "runbooks": {
+                    "version": runbook_store.version,
+                    "categories": sorted(runbook_store.snapshot()),
+                    "langflow_outcomes": retrieval_stats()
+                },
+                "langflow": langflow_client.stats(),
+                "tracing": span_exporter.stats(),
+                "logging": log_pipeline.stats(),
+                "deadlines": deadline_stats(),
+                "admission": admission.stats(),
+                "rate_limiter": (
+                    watsonx_client.async_transport.limiter.stats()
+                    if watsonx_client.async_transport is not None else None
+                ),
+                "fast_path": watsonx_client.rule_engine.stats() if watsonx_client.rule_engine else None,
+                "prompt": watsonx_client.prompt_assembler.stats()
+            }
+        )
     except Exception as e:
         logger.error(f"Health check failed: {e}")
         return HealthResponse(
@@ -163,6 +317,21 @@ async def health_check():
         )
 
 
+@app.get(
+    "/metrics",
+    response_class=Response,
+    summary="Prometheus metrics",
+    description="Stage latency histograms, model-call, token, parse and policy counters, "
+                "cache hit ratios and in-flight gauges in the Prometheus text format",
+    responses={200: {"content": {"text/plain": {}}}}
+)
+async def metrics():
+    """Prometheus scrape endpoint"""
+    if not METRICS_ENABLED:
+        raise HTTPException(status_code=404, detail="Metrics are disabled (METRICS_ENABLED=0)")
+    return Response(content=REGISTRY.render(), media_type=METRICS_CONTENT_TYPE)
+
+
 @app.get(
     "/version",
     response_model=VersionResponse,
@@ -177,6 +346,155 @@ async def version():
     )
 
 
+@asynccontextmanager
+async def _model_slot(request: IncidentRequest, deadline: Deadline, caller: Optional[str]):
+    """
+    Hold an admission slot around a model call.
+
+    Waits for a slot (highest priority first, earliest deadline next) and
+    records the wait as the "queue" stage.
+
+    Args:
+        request: Incident being evaluated (role and category set its priority)
+        deadline: Request deadline; the request is shed once it passes
+        caller: Caller identity, used for admission priority
+
+    Raises:
+        AdmissionRejected: If the model call was shed under load
+    """
+    priority = request_priority(request.reporter_role, request.category, caller)
+    async with _admission_slot(priority, deadline):
+        yield
+
+
+@asynccontextmanager
+async def _admission_slot(priority: int, deadline: Optional[Deadline] = None):
+    """
+    Hold an admission slot at a given priority.
+
+    Args:
+        priority: Admission priority (see request_priority)
+        deadline: Request deadline, if any; calls without one (batch, SSE)
+            queue behind equal-priority calls that have one
+
+    Raises:
+        AdmissionRejected: If the model call was shed under load
+    """
+    deadline_at = deadline.expires_at() if deadline is not None else float("inf")
+    queue_budget_ms = deadline.remaining_ms() if deadline is not None else None
+    queue_start = time.perf_counter()
+    async with admission.slot(priority, deadline_at):
+        queue_s = time.perf_counter() - queue_start
+        if deadline is not None:
+            deadline.record("queue", queue_budget_ms, queue_s * 1000)
+        STAGE_SECONDS.observe(queue_s, stage="queue")
+        record_span("admission.queue", queue_s, priority=priority)
+        yield
+
+
+def _batch_slot(incidents: List[Dict[str, str]], caller: Optional[str]):
+    """Admission slot for a batch generation, at the priority of its most urgent incident"""
+    return _admission_slot(max(
+        request_priority(incident["reporter_role"], incident["category"], caller) for incident in incidents
+    ))
+
+
+async def _run_evaluation(
+    request: IncidentRequest,
+    trace_id: str,
+    deadline: Deadline,
+    caller: Optional[str] = None
+) -> Tuple[RunbookRetrieval, ModelDecision, bool]:
+    """
+    Retrieve runbook context and get the validated model decision.
+
+    Args:
+        request: Incident to evaluate
+        trace_id: Trace ID for this caller
+        deadline: Request deadline; each stage gets its share
+        caller: Caller identity, used for admission priority
+
+    Returns:
+        Tuple of (runbook retrieval, validated ModelDecision, coalesced) where
+        coalesced is True if the model call was shared with an identical request
+
+    Raises:
+        AdmissionRejected: If the model call was shed under load
+        DeadlineExceeded: If inference did not finish within its budget
+    """
+    # Step 1: Get runbook context (off the event loop - may call Langflow,
+    # whose wait is capped by the stage budget)
+    runbook_budget_ms = deadline.runbook_budget_ms()
+    stage_start = time.perf_counter()
+    with span("runbook.retrieve", category=request.category) as runbook_span:
+        retrieval = await asyncio.to_thread(
+            retrieve_runbook_context,
+            category=request.category,
+            incident_text=request.incident_text,
+            budget_ms=runbook_budget_ms
+        )
+        runbook_span.set_attribute("runbook.source", retrieval.source)
+        runbook_span.set_attribute("langflow.outcome", retrieval.langflow_outcome)
+    runbook_s = time.perf_counter() - stage_start
+    deadline.record("runbook", runbook_budget_ms, runbook_s * 1000)
+    STAGE_SECONDS.observe(runbook_s, stage="runbook")
+    runbook_context_formatted = format_runbook_for_prompt(retrieval.context)
+
+    logger.info(
+        "Retrieved runbook context",
+        extra={
+            "trace_id": trace_id,
+            "runbook_length": len(retrieval.context),
+            "runbook_source": retrieval.source,
+            "langflow_outcome": retrieval.langflow_outcome
+        }
+    )
+
+    # Step 2: Get AI decision (non-blocking), cancelled if it outlives the deadline. Only a
+    # model call waits for an admission slot; fast-path and cached decisions answer at once
+    def model_call():
+        return watsonx_client.aget_decision(
+            incident_text=request.incident_text,
+            category=request.category,
+            reporter_role=request.reporter_role,
+            runbook_context=runbook_context_formatted,
+            model_slot=lambda: _model_slot(request, deadline, caller)
+        )
+
+    if SINGLE_FLIGHT_ENABLED:
+        # Identical requests in flight share one model call. A caller attached to someone
+        # else's call still stops waiting at its own deadline, and runs the call itself if
+        # the caller that started it was shed or ran out of time
+        fingerprint = make_cache_key(
+            incident_text=request.incident_text,
+            category=request.category,
+            reporter_role=request.reporter_role,
+            model_id=WATSONX_MODEL_ID,
+            prompt_version="",
+            runbook_context=runbook_context_formatted
+        )
+        model_decision, coalesced = await deadline.run(
+            "inference",
+            single_flight.do(fingerprint, model_call, rerun_on=(AdmissionRejected, DeadlineExceeded)),
+            deadline.inference_budget_ms()
+        )
+    else:
+        model_decision = await deadline.run("inference", model_call(), deadline.inference_budget_ms())
+        coalesced = False
+
+    logger.info(
+        "Received model decision",
+        extra={
+            "trace_id": trace_id,
+            "coalesced": coalesced,
+            "recommended_action": model_decision.recommended_action,
+            "confidence_score": model_decision.confidence_score
+        }
+    )
+
+    return retrieval, model_decision, coalesced
+
+
 @app.post(
     "/evaluate-incident",
     response_model=IncidentResponse,
@@ -243,7 +561,19 @@ async def version():
         500: {"description": "Server error - returns safe escalation response"}
     }
 )
-async def evaluate_incident(request: IncidentRequest):
+async def evaluate_incident(
+    request: IncidentRequest,
+    x_request_deadline_ms: Optional[str] = Header(
+        default=None,
+        alias=DEADLINE_HEADER,
+        description="Milliseconds the caller will wait (default REQUEST_DEADLINE_MS)"
+    ),
+    x_caller_id: Optional[str] = Header(
+        default=None,
+        alias=CALLER_HEADER,
+        description="Caller identity, weighted by ADMISSION_CALLER_PRIORITY"
+    )
+):
     """
     Main endpoint for incident evaluation.
 
@@ -252,8 +582,14 @@ async def evaluate_incident(request: IncidentRequest):
     2. AI decision via watsonx.ai Granite
     3. Policy enforcement (confidence threshold)
     4. Response construction with trace ID
+
+    All of it runs within the caller's deadline; if the budget runs out, or
+    the request is shed under load, the safe escalation fallback is returned
+    instead.
     """
-    trace_id = str(uuid4())
+    # The W3C trace ID of this request, so the trace_id finds the request's spans
+    trace_id = current_trace_id() or str(uuid4())
+    deadline = Deadline.from_header(x_request_deadline_ms)
 
     # Structured logging
     logger.info(
@@ -262,59 +598,56 @@ async def evaluate_incident(request: IncidentRequest):
             "trace_id": trace_id,
             "category": request.category,
             "reporter_role": request.reporter_role,
-            "incident_length": len(request.incident_text)
+            "incident_length": len(request.incident_text),
+            "deadline_ms": deadline.budget_ms
         }
     )
 
-    try:
-        # Step 1: Get runbook context
-        runbook_context_raw = get_runbook_context(
-            category=request.category,
-            incident_text=request.incident_text
-        )
-        runbook_context_formatted = format_runbook_for_prompt(runbook_context_raw)
+    return await _evaluate(request, trace_id, deadline, caller=x_caller_id)
 
-        logger.info(
-            "Retrieved runbook context",
-            extra={
-                "trace_id": trace_id,
-                "runbook_length": len(runbook_context_raw)
-            }
-        )
 
-        # Step 2: Get AI decision
-        model_decision = watsonx_client.get_decision(
-            incident_text=request.incident_text,
-            category=request.category,
-            reporter_role=request.reporter_role,
-            runbook_context=runbook_context_formatted
-        )
+async def _evaluate(
+    request: IncidentRequest,
+    trace_id: str,
+    deadline: Optional[Deadline] = None,
+    caller: Optional[str] = None
+) -> IncidentResponse:
+    """
+    Evaluate one incident end to end, never raising.
 
-        logger.info(
-            "Received model decision",
-            extra={
-                "trace_id": trace_id,
-                "recommended_action": model_decision.recommended_action,
-                "confidence_score": model_decision.confidence_score
-            }
+    Args:
+        request: Incident to evaluate
+        trace_id: Trace ID for this caller
+        deadline: Request deadline (default: REQUEST_DEADLINE_MS from now)
+        caller: Caller identity, used for admission priority
+
+    Returns:
+        IncidentResponse (safe escalation fallback on any error, when the
+        deadline runs out or when the request is shed)
+    """
+    if deadline is None:
+        deadline = Deadline()
+    current_deadline.set(deadline)
+
+    try:
+        # Steps 1-2
+        retrieval, model_decision, coalesced = await deadline.run(
+            "evaluation", _run_evaluation(request, trace_id, deadline, caller)
         )
 
         # Step 3: Build response with policy
-        response = IncidentResponse(
-            analysis=model_decision.analysis,
-            recommended_action=model_decision.recommended_action,
-            confidence_score=model_decision.confidence_score,
-            explanation=model_decision.explanation,
-            runbook_context=runbook_context_raw[:500],  # Truncate for response size
-            trace_id=trace_id,
-            model_id=WATSONX_MODEL_ID,
-            policy=DecisionPolicy()
+        response = _build_response(
+            model_decision, retrieval.context, trace_id,
+            coalesced=coalesced, retrieval=retrieval, deadline=deadline
         )
 
         logger.info(
             "Incident evaluation complete",
             extra={
                 "trace_id": trace_id,
+                "coalesced": coalesced,
+                "decision_path": response.decision_path,
+                "prompt_tokens": response.prompt_tokens,
                 "final_action": response.recommended_action,
                 "final_confidence": response.confidence_score
             }
@@ -322,6 +655,20 @@ async def evaluate_incident(request: IncidentRequest):
 
         return response
 
+    except DeadlineExceeded as e:
+        logger.warning(
+            f"Evaluation abandoned: {e}",
+            extra={"trace_id": trace_id, "deadline_ms": deadline.budget_ms}
+        )
+        return _fallback_response(trace_id, e, deadline)
+
+    except AdmissionRejected as e:
+        logger.warning(
+            f"Evaluation shed: {e}",
+            extra={"trace_id": trace_id, "priority": e.priority}
+        )
+        return _fallback_response(trace_id, e, deadline)
+
     except Exception as e:
         logger.error(
             f"Error evaluating incident: {e}",
@@ -330,17 +677,335 @@ async def evaluate_incident(request: IncidentRequest):
         )
 
         # Return safe fallback
-        return IncidentResponse(
-            analysis="System error during analysis",
-            recommended_action="escalate_to_human",
-            confidence_score=10,
-            explanation=f"An error occurred during analysis. Human review required. Error: {str(e)[:100]}",
-            runbook_context="",
-            trace_id=trace_id,
-            model_id=WATSONX_MODEL_ID,
-            policy=DecisionPolicy()
+        return _fallback_response(trace_id, e, deadline)
+
+
+@app.post(
+    "/evaluate-incident/stream",
+    summary="Evaluate Incident (SSE Stream)",
+    description="""
+    Streaming variant of /evaluate-incident using watsonx.ai streaming generation.
+
+    Returns a text/event-stream with these events, in order:
+    - `routing`: recommended_action and confidence_score as soon as the model
+      has decoded them, already adjusted by the confidence/ambiguity policy.
+      This is an early signal (`provisional: true`).
+    - `analysis` and `explanation` as each field completes
+    - `decision`: the full IncidentResponse after parsing and policy
+      validation, plus `timing` (time_to_routing_ms, total_ms).
+      **This event is authoritative** - act on it, not on `routing`.
+    """,
+    response_class=StreamingResponse,
+    responses={
+        200: {
+            "description": "Server-sent events stream",
+            "content": {"text/event-stream": {}}
+        }
+    }
+)
+async def evaluate_incident_stream(
+    request: IncidentRequest,
+    x_caller_id: Optional[str] = Header(
+        default=None,
+        alias=CALLER_HEADER,
+        description="Caller identity, weighted by ADMISSION_CALLER_PRIORITY"
+    )
+):
+    """SSE streaming endpoint for incident evaluation"""
+    trace_id = current_trace_id() or str(uuid4())
+
+    logger.info(
+        "Evaluating incident (streaming)",
+        extra={
+            "trace_id": trace_id,
+            "category": request.category,
+            "reporter_role": request.reporter_role,
+            "incident_length": len(request.incident_text)
+        }
+    )
+
+    async def event_generator():
+        start = time.perf_counter()
+        time_to_routing_ms = None
+        yield _sse("trace", {"trace_id": trace_id})
+
+        try:
+            # Step 1: Get runbook context
+            with STAGE_SECONDS.time(stage="runbook"), span("runbook.retrieve", category=request.category):
+                retrieval = await asyncio.to_thread(
+                    retrieve_runbook_context,
+                    category=request.category,
+                    incident_text=request.incident_text
+                )
+
+            # Step 2: Stream the AI decision, holding an admission slot while the model streams
+            async for event, payload in watsonx_client.astream_decision(
+                incident_text=request.incident_text,
+                category=request.category,
+                reporter_role=request.reporter_role,
+                runbook_context=format_runbook_for_prompt(retrieval.context),
+                model_slot=lambda: _admission_slot(
+                    request_priority(request.reporter_role, request.category, x_caller_id)
+                )
+            ):
+                if event == "decision":
+                    response = _build_response(payload, retrieval.context, trace_id, retrieval=retrieval)
+                    break
+                if event == "routing" and time_to_routing_ms is None:
+                    time_to_routing_ms = (time.perf_counter() - start) * 1000
+                    stream_routing_latency.observe(time_to_routing_ms)
+                yield _sse(event, payload)
+            else:
+                raise RuntimeError("Decision stream ended without a decision")
+
+        except Exception as e:
+            logger.error(
+                f"Error evaluating incident (streaming): {e}",
+                extra={"trace_id": trace_id},
+                exc_info=True
+            )
+            response = _fallback_response(trace_id, e)
+
+        total_ms = (time.perf_counter() - start) * 1000
+        stream_total_latency.observe(total_ms)
+
+        logger.info(
+            "Incident evaluation complete (streaming)",
+            extra={
+                "trace_id": trace_id,
+                "final_action": response.recommended_action,
+                "final_confidence": response.confidence_score,
+                "time_to_routing_ms": time_to_routing_ms,
+                "total_ms": total_ms
+            }
         )
 
+        yield _sse("decision", {
+            **response.model_dump(),
+            "timing": {
+                "time_to_routing_ms": round(time_to_routing_ms, 1) if time_to_routing_ms is not None else None,
+                "total_ms": round(total_ms, 1)
+            }
+        })
+
+    return StreamingResponse(
+        event_generator(),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no",
+            "X-Trace-Id": trace_id
+        }
+    )
+
+
+def _sse(event: str, data: Dict[str, Any]) -> str:
+    """Format one server-sent event"""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+@app.post(
+    "/evaluate-incidents",
+    response_model=BatchIncidentResponse,
+    summary="Evaluate Incidents (Batch)",
+    description="""
+    Evaluates a list of incidents in one call, e.g. for backfills.
+
+    Runbook context is retrieved once per distinct incident, and lookups and
+    prompts to watsonx.ai run concurrently (each bounded by BATCH_CONCURRENCY).
+    Every item goes through the same parsing and confidence policy as
+    /evaluate-incident and gets its own trace_id; a failing item falls back to escalate_to_human
+    without affecting the rest of the batch.
+    """,
+    responses={
+        400: {"description": "Bad request - invalid input"},
+        500: {"description": "Server error - returns safe escalation response"}
+    }
+)
+async def evaluate_incidents(
+    request: BatchIncidentRequest,
+    x_caller_id: Optional[str] = Header(
+        default=None,
+        alias=CALLER_HEADER,
+        description="Caller identity, weighted by ADMISSION_CALLER_PRIORITY"
+    )
+):
+    """
+    Batch endpoint for incident evaluation.
+
+    This endpoint coordinates:
+    1. Runbook context retrieval, once per distinct incident
+    2. Concurrent AI decisions via watsonx.ai Granite
+    3. Per-item policy enforcement and response construction
+    """
+    batch_id = str(uuid4())
+    trace_ids = [str(uuid4()) for _ in request.incidents]
+
+    logger.info(
+        "Evaluating incident batch",
+        extra={
+            "batch_id": batch_id,
+            "batch_size": len(request.incidents)
+        }
+    )
+
+    try:
+        # Step 1: Get runbook context once per distinct incident (once per category
+        # when every incident of a category gets the same full runbook), with at most
+        # BATCH_CONCURRENCY lookups in flight
+        keys = [runbook_context_key(incident.category, incident.incident_text) for incident in request.incidents]
+        distinct: Dict[Tuple[str, ...], IncidentRequest] = {}
+        for key, incident in zip(keys, request.incidents):
+            distinct.setdefault(key, incident)
+        retrieval_slots = asyncio.Semaphore(BATCH_CONCURRENCY)
+
+        async def lookup(incident: IncidentRequest) -> str:
+            async with retrieval_slots:
+                return await asyncio.to_thread(
+                    get_runbook_context, category=incident.category, incident_text=incident.incident_text
+                )
+
+        contexts = await asyncio.gather(*[lookup(incident) for incident in distinct.values()])
+        by_incident = dict(zip(distinct, contexts))
+        runbook_contexts = [by_incident[key] for key in keys]
+
+        # Step 2: Get AI decisions; generations wait for admission slots like single requests
+        model_decisions = await watsonx_client.aget_decisions(
+            [
+                {
+                    "incident_text": incident.incident_text,
+                    "category": incident.category,
+                    "reporter_role": incident.reporter_role,
+                    "runbook_context": format_runbook_for_prompt(runbook_context)
+                }
+                for incident, runbook_context in zip(request.incidents, runbook_contexts)
+            ],
+            concurrency_limit=BATCH_CONCURRENCY,
+            model_slot=lambda incidents: _batch_slot(incidents, x_caller_id)
+        )
+
+        # Step 3: Build per-item responses with policy
+        results = [
+            _build_response(decision, runbook_context, trace_id)
+            for runbook_context, decision, trace_id in zip(runbook_contexts, model_decisions, trace_ids)
+        ]
+
+    except Exception as e:
+        logger.error(
+            f"Error evaluating incident batch: {e}",
+            extra={"batch_id": batch_id},
+            exc_info=True
+        )
+        results = [_fallback_response(trace_id, e) for trace_id in trace_ids]
+
+    logger.info(
+        "Incident batch evaluation complete",
+        extra={
+            "batch_id": batch_id,
+            "escalations": sum(r.recommended_action == "escalate_to_human" for r in results)
+        }
+    )
+
+    return BatchIncidentResponse(batch_id=batch_id, count=len(results), results=results)
+
+
+@app.post(
+    "/evaluate-incidents/stream",
+    summary="Evaluate Incidents (NDJSON Stream)",
+    description="""
+    Streaming bulk evaluation for very large backlogs and migrations.
+
+    The request body is newline-delimited JSON: one IncidentRequest object
+    per line (Content-Type: application/x-ndjson). Incidents are evaluated by
+    a bounded worker pool (NDJSON_WORKERS) and results stream back as NDJSON
+    as each one finishes - not in input order. Every result line carries the
+    1-based input `line` number plus either the usual /evaluate-incident
+    fields or an `error` for lines that failed validation or evaluation.
+
+    Memory use is constant regardless of input size.
+    """,
+    response_class=StreamingResponse,
+    responses={
+        200: {
+            "description": "NDJSON stream of per-incident results",
+            "content": {"application/x-ndjson": {}}
+        }
+    }
+)
+async def evaluate_incidents_stream(request: Request):
+    """NDJSON streaming endpoint for bulk incident evaluation"""
+    stream_id = str(uuid4())
+    logger.info("Starting NDJSON bulk evaluation", extra={"stream_id": stream_id})
+
+    async def evaluate_line(line_number: int, line: Optional[bytes]) -> Dict[str, Any]:
+        if line is None:
+            return {"line": line_number, "error": "Line exceeds NDJSON_MAX_LINE_BYTES"}
+        try:
+            incident = IncidentRequest.model_validate_json(line)
+        except ValidationError as e:
+            return {"line": line_number, "error": f"Invalid incident: {str(e)[:200]}"}
+
+        response = await _evaluate(incident, str(uuid4()))
+        return {"line": line_number, **response.model_dump()}
+
+    return DuplexStreamingResponse(
+        evaluate_ndjson_stream(iter_ndjson_lines(request.stream()), evaluate_line),
+        media_type="application/x-ndjson",
+        headers={"X-Stream-Id": stream_id}
+    )
+
+
+def _build_response(
+    model_decision: ModelDecision,
+    runbook_context_raw: str,
+    trace_id: str,
+    coalesced: bool = False,
+    retrieval: Optional[RunbookRetrieval] = None,
+    deadline: Optional[Deadline] = None
+) -> IncidentResponse:
+    """Build the API response for a validated model decision"""
+    DECISIONS.inc(decision_path=model_decision.decision_path, action=model_decision.recommended_action)
+    return IncidentResponse(
+        analysis=model_decision.analysis,
+        recommended_action=model_decision.recommended_action,
+        confidence_score=model_decision.confidence_score,
+        explanation=model_decision.explanation,
+        runbook_context=runbook_context_raw[:500],  # Truncate for response size
+        trace_id=trace_id,
+        model_id=model_decision.model_id or WATSONX_MODEL_ID,
+        policy=DecisionPolicy(),
+        cache_hit=model_decision.cache_hit,
+        coalesced=coalesced,
+        decision_path=model_decision.decision_path,
+        rule=model_decision.rule,
+        prompt_tokens=model_decision.prompt_tokens,
+        model_tier=model_decision.model_tier,
+        runbook_retrieval=RunbookRetrievalInfo(
+            source=retrieval.source,
+            langflow_outcome=retrieval.langflow_outcome,
+            local_ms=retrieval.local_ms,
+            langflow_ms=retrieval.langflow_ms
+        ) if retrieval is not None else None,
+        deadline=DeadlineInfo(**deadline.report()) if deadline is not None else None
+    )
+
+
+def _fallback_response(trace_id: str, error: Exception, deadline: Optional[Deadline] = None) -> IncidentResponse:
+    """Safe escalation response used when evaluation fails"""
+    DECISIONS.inc(decision_path="fallback", action="escalate_to_human")
+    return IncidentResponse(
+        analysis="System error during analysis",
+        recommended_action="escalate_to_human",
+        confidence_score=10,
+        explanation=f"An error occurred during analysis. Human review required. Error: {str(error)[:100]}",
+        runbook_context="",
+        trace_id=trace_id,
+        model_id=WATSONX_MODEL_ID,
+        policy=DecisionPolicy(),
+        decision_path="fallback",
+        deadline=DeadlineInfo(**deadline.report()) if deadline is not None else None
+    )
+
 
 # For local development
 if __name__ == "__main__":
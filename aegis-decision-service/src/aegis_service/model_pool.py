@@ -0,0 +1,250 @@
+"""
+Long-lived watsonx.ai model handles and IAM token caching for A.E.G.I.S.
+
+Creating an ibm_watsonx_ai model performs an IAM token exchange, builds an
+APIClient and looks up the project - hundreds of milliseconds that used to
+be paid on every incident. This module keeps that work off the request path:
+
+1. IAMTokenManager exchanges the API key once and refreshes the token in a
+   background thread before it expires
+2. ModelPool keeps one initialized ModelInference per (model_id, params),
+   all sharing a single APIClient that receives refreshed tokens
+"""
+
+import os
+import json
+import time
+import logging
+import threading
+from typing import Optional, Dict, Any, Callable, List, Tuple
+
+import requests
+
+logger = logging.getLogger(__name__)
+
+# Configuration from environment
+IBM_IAM_URL = os.environ.get("IBM_IAM_URL", "https://iam.cloud.ibm.com/identity/token")
+IAM_REFRESH_MARGIN = int(os.environ.get("IAM_REFRESH_MARGIN", "300"))  # seconds before expiry
+IAM_TIMEOUT = 10  # seconds
+TOKEN_EXPIRY_MARGIN = 60  # treat tokens as expired this many seconds early
+IAM_RETRY_DELAY = 30  # seconds between failed background refreshes
+
+
+class IAMTokenManager:
+    """
+    Caches an IBM Cloud IAM bearer token and refreshes it in the background.
+
+    get_token() is safe to call from any thread; cached_token() never blocks
+    and is what the event loop should try first.
+    """
+
+    def __init__(
+        self,
+        apikey: Optional[str],
+        fetch: Optional[Callable[[], Dict[str, Any]]] = None,
+        background_refresh: bool = True
+    ):
+        """
+        Args:
+            apikey: IBM Cloud API key
+            fetch: Optional replacement for the IAM HTTP exchange (tests/benchmarks).
+                Must return a dict with access_token and expiration or expires_in.
+            background_refresh: Start a refresher thread after the first exchange
+        """
+        self.apikey = apikey
+        self._fetch = fetch or self._fetch_from_iam
+        self._background_refresh = background_refresh
+
+        self._token: Optional[str] = None
+        self._expiry = 0.0
+        self._lock = threading.Lock()
+        self._listeners: List[Callable[[str], None]] = []
+        self._refresher: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+        self.refresh_count = 0
+
+    def cached_token(self) -> Optional[str]:
+        """Return the cached token if it is still comfortably valid, else None"""
+        if self._token and time.time() < self._expiry - TOKEN_EXPIRY_MARGIN:
+            return self._token
+        return None
+
+    def get_token(self) -> str:
+        """Return a valid token, exchanging the API key if needed"""
+        token = self.cached_token()
+        if token:
+            return token
+
+        with self._lock:
+            token = self.cached_token()
+            if token:
+                return token
+            self._refresh()
+
+        self._ensure_refresher()
+        return self._token
+
+    def add_listener(self, callback: Callable[[str], None]):
+        """Register a callback invoked with every newly refreshed token"""
+        self._listeners.append(callback)
+
+    def stop(self):
+        """Stop the background refresher"""
+        self._stop.set()
+
+    def _refresh(self):
+        """Exchange the API key for a fresh token (caller holds the lock)"""
+        if not self.apikey:
+            raise RuntimeError("WATSONX_APIKEY not set - cannot obtain IAM token")
+
+        start = time.perf_counter()
+        data = self._fetch()
+        self._token = data["access_token"]
+        self._expiry = float(data.get("expiration", time.time() + data.get("expires_in", 3600)))
+        self.refresh_count += 1
+
+        logger.info(f"Refreshed IAM token in {(time.perf_counter() - start) * 1000:.0f}ms")
+
+        for callback in self._listeners:
+            try:
+                callback(self._token)
+            except Exception as e:
+                logger.error(f"IAM token listener failed: {e}")
+
+    def _fetch_from_iam(self) -> Dict[str, Any]:
+        """Perform the API key -> bearer token exchange"""
+        response = requests.post(
+            IBM_IAM_URL,
+            data={
+                "grant_type": "urn:ibm:params:oauth:grant-type:apikey",
+                "apikey": self.apikey
+            },
+            headers={"Accept": "application/json"},
+            timeout=IAM_TIMEOUT
+        )
+        response.raise_for_status()
+        return response.json()
+
+    def _ensure_refresher(self):
+        """Start the background refresher thread once"""
+        if not self._background_refresh or self._refresher is not None:
+            return
+        with self._lock:
+            if self._refresher is None:
+                self._refresher = threading.Thread(
+                    target=self._refresh_loop,
+                    name="iam-token-refresher",
+                    daemon=True
+                )
+                self._refresher.start()
+
+    def _refresh_loop(self):
+        """Refresh the token IAM_REFRESH_MARGIN seconds before it expires"""
+        while not self._stop.is_set():
+            wait = max(self._expiry - IAM_REFRESH_MARGIN - time.time(), 0)
+            if self._stop.wait(wait):
+                return
+            try:
+                with self._lock:
+                    self._refresh()
+            except Exception as e:
+                logger.warning(f"Background IAM token refresh failed: {e}")
+                if self._stop.wait(IAM_RETRY_DELAY):
+                    return
+
+
+class ModelPool:
+    """
+    Pool of initialized watsonx.ai model handles keyed by model_id and params.
+
+    Handles are created on first use and then reused for the lifetime of the
+    worker. Acquisition timings are recorded so per-request overhead can be
+    compared against fresh initialization.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        project_id: Optional[str],
+        token_manager: IAMTokenManager,
+        factory: Optional[Callable[[str, Dict[str, Any]], Any]] = None
+    ):
+        """
+        Args:
+            url: watsonx.ai regional endpoint
+            project_id: watsonx.ai project ID
+            token_manager: Shared IAM token cache
+            factory: Optional replacement for handle construction (tests/benchmarks)
+        """
+        self.url = url
+        self.project_id = project_id
+        self.token_manager = token_manager
+        self._factory = factory or self._create_model
+
+        self._handles: Dict[Tuple[str, str], Any] = {}
+        self._api_client = None
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.total_acquire_seconds = 0.0
+
+    def get(self, model_id: str, params: Dict[str, Any]):
+        """
+        Return an initialized model handle, creating it on first use.
+
+        Args:
+            model_id: watsonx.ai model ID
+            params: Generation parameters the handle is configured with
+
+        Returns:
+            ModelInference (or factory result)
+        """
+        start = time.perf_counter()
+        key = (model_id, json.dumps(params, sort_keys=True, default=str))
+
+        handle = self._handles.get(key)
+        if handle is not None:
+            self.hits += 1
+        else:
+            with self._lock:
+                handle = self._handles.get(key)
+                if handle is None:
+                    logger.info(f"Initializing pooled model handle for {model_id}")
+                    handle = self._factory(model_id, params)
+                    self._handles[key] = handle
+                    self.misses += 1
+                else:
+                    self.hits += 1
+
+        self.total_acquire_seconds += time.perf_counter() - start
+        return handle
+
+    def stats(self) -> Dict[str, Any]:
+        """Pool and token statistics for monitoring"""
+        acquisitions = self.hits + self.misses
+        return {
+            "handles": len(self._handles),
+            "hits": self.hits,
+            "misses": self.misses,
+            "avg_acquire_ms": (
+                round(self.total_acquire_seconds / acquisitions * 1000, 3) if acquisitions else 0.0
+            ),
+            "token_refreshes": self.token_manager.refresh_count
+        }
+
+    def _create_model(self, model_id: str, params: Dict[str, Any]):
+        """Build a ModelInference on the shared, token-authenticated APIClient"""
+        from ibm_watsonx_ai import APIClient, Credentials
+        from ibm_watsonx_ai.foundation_models import ModelInference
+
+        if self._api_client is None:
+            self._api_client = APIClient(
+                credentials=Credentials(url=self.url, token=self.token_manager.get_token()),
+                project_id=self.project_id
+            )
+            # Push background-refreshed tokens into the shared client
+            self.token_manager.add_listener(self._api_client.set_token)
+
+        return ModelInference(model_id=model_id, params=params, api_client=self._api_client)
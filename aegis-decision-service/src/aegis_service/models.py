@@ -5,9 +5,13 @@ These models define the strict JSON contract between watsonx Orchestrate
 and the Decision Service.
 """
 
-from typing import Optional, Dict, Any, Literal
+import os
+from typing import Optional, Dict, Any, List, Literal
 from pydantic import BaseModel, Field, field_validator
 
+# Maximum incidents accepted by POST /evaluate-incidents
+BATCH_MAX_SIZE = int(os.environ.get("BATCH_MAX_SIZE", "500"))
+
 
 class IncidentRequest(BaseModel):
     """Request model for incident evaluation"""
@@ -57,6 +61,54 @@ class DecisionPolicy(BaseModel):
     )
 
 
+class RunbookRetrievalInfo(BaseModel):
+    """Where the runbook context came from and how long each source took"""
+
+    source: Literal["local", "langflow"] = Field(
+        ...,
+        description="Source of the runbook context used for the decision"
+    )
+
+    langflow_outcome: Literal["disabled", "won", "late", "failed"] = Field(
+        ...,
+        description="Langflow result: not configured, used, missed the soft deadline, or failed/skipped"
+    )
+
+    local_ms: Optional[float] = Field(
+        default=None,
+        description="Local retrieval time in milliseconds"
+    )
+
+    langflow_ms: Optional[float] = Field(
+        default=None,
+        description="Langflow retrieval time in milliseconds (null if not called or late)"
+    )
+
+
+class DeadlineInfo(BaseModel):
+    """Request deadline and how much of it each stage used"""
+
+    budget_ms: float = Field(
+        ...,
+        description="Total time budget for this request"
+    )
+
+    elapsed_ms: float = Field(
+        ...,
+        description="Time spent when the response was built"
+    )
+
+    exceeded_stage: Optional[str] = Field(
+        default=None,
+        description="Stage that ran out of budget (the response is then the safe fallback)"
+    )
+
+    stages: Dict[str, Dict[str, float]] = Field(
+        default_factory=dict,
+        description="Per-stage budget_ms and used_ms (runbook, inference, evaluation)"
+    )
+
+
 class IncidentResponse(BaseModel):
     """Response model for incident evaluation
 
@@ -113,6 +165,47 @@ class IncidentResponse(BaseModel):
         description="Decision policy thresholds"
     )
 
+    cache_hit: bool = Field(
+        default=False,
+        description="True if the decision was served from the decision cache without a model call"
+    )
+
+    coalesced: bool = Field(
+        default=False,
+        description="True if this request shared an identical in-flight model call"
+    )
+
+    decision_path: Literal["model", "rules", "fallback"] = Field(
+        default="model",
+        description="What produced the decision: the model, a fast-path rule, or the safe fallback"
+    )
+
+    rule: Optional[str] = Field(
+        default=None,
+        description="Name of the fast-path rule that settled the incident (decision_path=rules)"
+    )
+
+    prompt_tokens: Optional[int] = Field(
+        default=None,
+        description="Estimated prompt tokens sent to the model (None when no prompt was sent)"
+    )
+
+    model_tier: Optional[Literal["small", "large"]] = Field(
+        default=None,
+        description="Cascade tier that decided: small (WATSONX_SMALL_MODEL_ID) or large (WATSONX_MODEL_ID); "
+                    "None for rules and fallbacks"
+    )
+
+    runbook_retrieval: Optional[RunbookRetrievalInfo] = Field(
+        default=None,
+        description="Runbook context source and timings"
+    )
+
+    deadline: Optional[DeadlineInfo] = Field(
+        default=None,
+        description="Request deadline and per-stage budget usage"
+    )
+
     @field_validator("confidence_score")
     @classmethod
     def validate_confidence_and_action(cls, v: int) -> int:
@@ -122,6 +215,40 @@ class IncidentResponse(BaseModel):
         return v
 
 
+class BatchIncidentRequest(BaseModel):
+    """Request model for batch incident evaluation"""
+
+    incidents: List[IncidentRequest] = Field(
+        ...,
+        min_length=1,
+        max_length=BATCH_MAX_SIZE,
+        description="Incidents to evaluate"
+    )
+
+
+class BatchIncidentResponse(BaseModel):
+    """Response model for batch incident evaluation
+
+    results[i] is the decision for incidents[i] and follows the same
+    contract as a single /evaluate-incident response.
+    """
+
+    batch_id: str = Field(
+        ...,
+        description="Unique ID for this batch"
+    )
+
+    count: int = Field(
+        ...,
+        description="Number of results"
+    )
+
+    results: List[IncidentResponse] = Field(
+        ...,
+        description="Per-incident decisions, in request order"
+    )
+
+
 class ModelDecision(BaseModel):
     """Internal model for AI-generated decision (before policy enforcement)"""
 
@@ -135,12 +262,25 @@ class ModelDecision(BaseModel):
     confidence_score: int = Field(ge=0, le=100)
     explanation: str
 
+    # Provenance metadata (not produced by the model)
+    cache_hit: bool = False
+    is_fallback: bool = False
+    decision_path: Literal["model", "rules", "fallback"] = "model"
+    rule: Optional[str] = None
+    prompt_tokens: Optional[int] = None
+    model_id: Optional[str] = None
+    model_tier: Optional[Literal["small", "large"]] = None
+
 
 class HealthResponse(BaseModel):
     """Health check response"""
 
     status: Literal["ok", "degraded", "error"] = "ok"
     message: Optional[str] = None
+    details: Optional[Dict[str, Any]] = Field(
+        default=None,
+        description="Component statistics (coalescing, caches) for monitoring"
+    )
 
 
 class VersionResponse(BaseModel):
@@ -0,0 +1,236 @@
+"""
+Token-budgeted prompt assembly for A.E.G.I.S.
+
+The system prompt is long and identical for every request of a category, so
+it is split into its literal pieces and rendered once per category at
+startup; assembling a prompt is then a join of the pre-rendered pieces with
+the per-request fields (runbook context, incident text, reporter role).
+
+Prompt size is estimated locally (no tokenizer download or API call) and
+held under a token budget. When a prompt would exceed it, the runbook
+context is trimmed first (whole blocks from the end), and only if the
+incident text alone still does not fit is the incident text shortened,
+keeping its beginning and end.
+"""
+
+import os
+import re
+import logging
+import threading
+from functools import lru_cache
+from string import Formatter
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Configuration from environment
+# Prompt tokens allowed per request; the model's context must also fit MAX_NEW_TOKENS
+PROMPT_TOKEN_BUDGET = int(os.environ.get("PROMPT_TOKEN_BUDGET", "4096"))
+
+# Approximates a BPE tokenizer: letters split roughly every 4 characters,
+# numbers every 3 digits, each punctuation mark is a token, a single space
+# merges into the next word and other whitespace runs cost one token.
+# Every match is one token, so counting stays inside the regex engine.
+_TOKEN_PIECE = re.compile(r"[A-Za-z]{1,4}|[0-9]{1,3}|[^A-Za-z0-9\s]|\s{2,}|[^\S ]")
+
+RUNBOOK_TRIMMED_MARKER = "\n[runbook context truncated to fit the prompt budget]\n"
+INCIDENT_TRIMMED_MARKER = "\n[... {omitted} characters of incident text omitted ...]\n"
+
+# Template fields filled per request; everything else is static per category
+DYNAMIC_FIELDS = ("runbook_context", "incident_text", "reporter_role")
+
+
+def estimate_tokens(text: str) -> int:
+    """Approximate token count of text (typically within ~15% of BPE tokenizers)"""
+    return len(_TOKEN_PIECE.findall(text))
+
+
+# Runbook contexts repeat across requests (one per category or section set)
+_estimate_runbook_tokens = lru_cache(maxsize=256)(estimate_tokens)
+
+
+class AssembledPrompt(NamedTuple):
+    """A rendered prompt and how it was fitted to the budget"""
+    text: str
+    tokens: int             # estimated prompt tokens
+    runbook_trimmed: bool
+    incident_trimmed: bool
+
+
+class PromptAssembler:
+    """Pre-rendered prompt template with a token budget"""
+
+    def __init__(self, template: str, categories: Iterable[str], budget: int = PROMPT_TOKEN_BUDGET):
+        """
+        Args:
+            template: str.format template using category plus DYNAMIC_FIELDS
+            categories: Categories to pre-render at startup (others render on first use)
+            budget: Maximum estimated prompt tokens
+        """
+        self.budget = budget
+        self._segments = self._parse(template)
+        self._field_order = [field for _, field in self._segments if field in DYNAMIC_FIELDS]
+        self._rendered: Dict[str, Tuple[List[str], int]] = {}
+        self._lock = threading.Lock()
+
+        self._assembled = 0
+        self._runbook_trimmed = 0
+        self._incident_trimmed = 0
+        self._max_tokens = 0
+
+        for category in categories:
+            self._prerender(category)
+
+    @staticmethod
+    def _parse(template: str) -> List[Tuple[str, Optional[str]]]:
+        """Split the template into (literal, field) pairs; field is None after the last literal"""
+        segments = []
+        for literal, field, format_spec, conversion in Formatter().parse(template):
+            if field is not None and (field not in DYNAMIC_FIELDS + ("category",) or format_spec or conversion):
+                raise ValueError(f"Unsupported prompt template field: {{{field}}}")
+            segments.append((literal, field))
+        return segments
+
+    def _prerender(self, category: str) -> Tuple[List[str], int]:
+        """
+        Render everything except the dynamic fields for one category.
+
+        Returns:
+            (pieces, static_tokens): literal pieces interleaved with the
+            dynamic fields in DYNAMIC_FIELDS template order, and their token
+            estimate
+        """
+        rendered = self._rendered.get(category)
+        if rendered is not None:
+            return rendered
+
+        pieces = [""]
+        for literal, field in self._segments:
+            pieces[-1] += literal
+            if field == "category":
+                pieces[-1] += category
+            elif field is not None:
+                pieces.append("")
+
+        rendered = (pieces, sum(estimate_tokens(piece) for piece in pieces))
+        with self._lock:
+            self._rendered[category] = rendered
+        return rendered
+
+    def assemble(
+        self,
+        incident_text: str,
+        category: str,
+        reporter_role: str,
+        runbook_context: str
+    ) -> AssembledPrompt:
+        """
+        Render a prompt that fits the token budget.
+
+        Args:
+            incident_text: The incident description
+            category: Incident category
+            reporter_role: Reporter's role
+            runbook_context: Formatted runbook context
+
+        Returns:
+            AssembledPrompt with the final text and its estimated token count
+        """
+        pieces, static_tokens = self._prerender(category)
+        available = self.budget - static_tokens - estimate_tokens(reporter_role)
+
+        incident_tokens = estimate_tokens(incident_text)
+        runbook_tokens = _estimate_runbook_tokens(runbook_context)
+        runbook_trimmed = incident_trimmed = False
+
+        if incident_tokens + runbook_tokens > available:
+            if runbook_context:
+                runbook_context = _trim_blocks(runbook_context, max(0, available - incident_tokens))
+                runbook_tokens = estimate_tokens(runbook_context)
+                runbook_trimmed = True
+
+            if incident_tokens > available:
+                incident_text = _trim_middle(incident_text, incident_tokens, max(0, available))
+                incident_tokens = estimate_tokens(incident_text)
+                incident_trimmed = True
+
+        values = {
+            "runbook_context": runbook_context,
+            "incident_text": incident_text,
+            "reporter_role": reporter_role
+        }
+        parts = [pieces[0]]
+        for field, piece in zip(self._field_order, pieces[1:]):
+            parts.append(values[field])
+            parts.append(piece)
+
+        tokens = static_tokens + estimate_tokens(reporter_role) + incident_tokens + runbook_tokens
+        if runbook_trimmed or incident_trimmed:
+            logger.warning(
+                f"Prompt trimmed to fit {self.budget} token budget "
+                f"(runbook_trimmed={runbook_trimmed}, incident_trimmed={incident_trimmed})"
+            )
+
+        with self._lock:
+            self._assembled += 1
+            self._runbook_trimmed += runbook_trimmed
+            self._incident_trimmed += incident_trimmed
+            self._max_tokens = max(self._max_tokens, tokens)
+
+        return AssembledPrompt("".join(parts), tokens, runbook_trimmed, incident_trimmed)
+
+    def stats(self) -> Dict[str, int]:
+        """Budget and trimming counters for health reporting"""
+        with self._lock:
+            return {
+                "budget": self.budget,
+                "assembled": self._assembled,
+                "runbook_trimmed": self._runbook_trimmed,
+                "incident_trimmed": self._incident_trimmed,
+                "max_tokens": self._max_tokens
+            }
+
+
+def _trim_blocks(text: str, max_tokens: int) -> str:
+    """Keep whole blank-line separated blocks from the start while they fit"""
+    if max_tokens <= estimate_tokens(RUNBOOK_TRIMMED_MARKER):
+        return ""
+
+    limit = max_tokens - estimate_tokens(RUNBOOK_TRIMMED_MARKER)
+    kept, used = [], 0
+    for block in text.split("\n\n"):
+        cost = estimate_tokens(block) + 1
+        if used + cost > limit:
+            if not kept:
+                kept.append(_cut_to_tokens(block, limit))
+            break
+        kept.append(block)
+        used += cost
+    return "\n\n".join(kept) + RUNBOOK_TRIMMED_MARKER
+
+
+def _trim_middle(text: str, text_tokens: int, max_tokens: int) -> str:
+    """Shorten text of text_tokens to max_tokens, keeping the first two thirds and the last third"""
+    marker_tokens = estimate_tokens(INCIDENT_TRIMMED_MARKER.format(omitted=len(text)))
+    if max_tokens <= marker_tokens:
+        return _cut_to_tokens(text, max_tokens)
+
+    keep = len(text) * (max_tokens - marker_tokens) // max(1, text_tokens)
+    while True:
+        head, tail = keep * 2 // 3, keep - keep * 2 // 3
+        trimmed = (
+            text[:head]
+            + INCIDENT_TRIMMED_MARKER.format(omitted=len(text) - keep)
+            + (text[-tail:] if tail else "")
+        )
+        if estimate_tokens(trimmed) <= max_tokens or keep == 0:
+            return trimmed
+        keep = keep * 9 // 10
+
+
+def _cut_to_tokens(text: str, max_tokens: int) -> str:
+    """Longest prefix of text estimated at no more than max_tokens"""
+    keep = len(text) * max_tokens // max(1, estimate_tokens(text))
+    while keep > 0 and estimate_tokens(text[:keep]) > max_tokens:
+        keep = keep * 9 // 10
+    return text[:keep]
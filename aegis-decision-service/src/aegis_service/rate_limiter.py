@@ -0,0 +1,284 @@
+"""
+Client-side rate limiting for watsonx.ai calls
+
+watsonx.ai enforces per-project rate limits. A burst of concurrent
+generations used to trigger HTTP 429s that surfaced as confidence-10
+fallback decisions. WatsonxRateLimiter sits on the REST call path and
+makes requests wait for capacity instead:
+
+- token buckets cap requests per second (WATSONX_RPS) and tokens per
+  second (WATSONX_TPS, prompt estimate + max_new_tokens); 0 disables each
+- an AIMD concurrency limit adapts to what the service accepts: it grows
+  by one per window of successful calls, halves on a 429 and shrinks
+  gently when latency exceeds WATSONX_LATENCY_TARGET_MS. Only responses to
+  calls sent after the last decrease can shrink it again, so one burst of
+  429s counts as one congestion signal
+- a Retry-After header pauses all new calls for that long
+
+A rate-limited call is retried through the limiter (up to
+WATSONX_RATE_LIMIT_RETRIES times) rather than failing.
+"""
+
+import os
+import time
+import asyncio
+import logging
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Callable, Deque, Dict, Optional
+
+from .latency import LatencyWindow
+
+logger = logging.getLogger(__name__)
+
+# Configuration from environment
+WATSONX_RPS = float(os.environ.get("WATSONX_RPS", "0"))  # requests per second; 0 = unlimited
+WATSONX_TPS = float(os.environ.get("WATSONX_TPS", "0"))  # tokens per second; 0 = unlimited
+WATSONX_CONCURRENCY_INITIAL = int(os.environ.get("WATSONX_CONCURRENCY_INITIAL", "8"))
+WATSONX_CONCURRENCY_MIN = int(os.environ.get("WATSONX_CONCURRENCY_MIN", "1"))
+WATSONX_CONCURRENCY_MAX = int(os.environ.get("WATSONX_CONCURRENCY_MAX", "20"))
+WATSONX_LATENCY_TARGET_MS = float(os.environ.get("WATSONX_LATENCY_TARGET_MS", "10000"))
+WATSONX_RATE_LIMIT_RETRIES = int(os.environ.get("WATSONX_RATE_LIMIT_RETRIES", "3"))
+WATSONX_RATE_LIMIT_BACKOFF = float(os.environ.get("WATSONX_RATE_LIMIT_BACKOFF", "1.0"))  # seconds without Retry-After
+
+RATE_LIMIT_DECREASE = 0.5  # on 429
+LATENCY_DECREASE = 0.9  # on a response slower than the latency target
+
+
+class TokenBucket:
+    """
+    Token bucket that makes callers wait instead of rejecting them.
+
+    Callers reserve tokens up front, so the balance can go negative; each
+    caller then sleeps until its reservation is covered. Waiters are served
+    in arrival order and the long-run rate never exceeds `rate`.
+    """
+
+    def __init__(self, rate: float, burst: Optional[float] = None, clock: Callable[[], float] = time.monotonic):
+        """
+        Args:
+            rate: Tokens added per second (0 = unlimited)
+            burst: Bucket capacity (default: one second's worth)
+            clock: Monotonic time source
+        """
+        self.rate = rate
+        self.burst = burst if burst is not None else max(rate, 1.0)
+        self._clock = clock
+        self._tokens = self.burst
+        self._updated = clock()
+
+    def reserve(self, amount: float) -> float:
+        """Take `amount` tokens and return the seconds to wait before using them"""
+        if self.rate <= 0:
+            return 0.0
+        self._refill()
+        self._tokens -= amount
+        return max(0.0, -self._tokens / self.rate)
+
+    def refund(self, amount: float):
+        """Give back a reservation that was never used (capped at burst)"""
+        if self.rate <= 0:
+            return
+        self._refill()
+        self._tokens = min(self.burst, self._tokens + amount)
+
+    def _refill(self):
+        now = self._clock()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self, amount: float = 1.0):
+        """Wait until `amount` tokens are available"""
+        delay = self.reserve(amount)
+        if delay > 0:
+            try:
+                await asyncio.sleep(delay)
+            except asyncio.CancelledError:
+                # The call was never sent: later callers get the tokens instead
+                self.refund(amount)
+                raise
+
+
+class AIMDLimiter:
+    """Concurrency limit with additive increase and multiplicative decrease"""
+
+    def __init__(
+        self,
+        initial: int = WATSONX_CONCURRENCY_INITIAL,
+        minimum: int = WATSONX_CONCURRENCY_MIN,
+        maximum: int = WATSONX_CONCURRENCY_MAX,
+        latency_target_ms: float = WATSONX_LATENCY_TARGET_MS,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        Args:
+            initial: Starting concurrency limit
+            minimum: Floor for the limit
+            maximum: Ceiling for the limit (at most the HTTP connection pool)
+            latency_target_ms: Responses slower than this shrink the limit
+            clock: Monotonic time source
+        """
+        self.minimum = minimum
+        self.maximum = maximum
+        self.limit = float(max(minimum, min(initial, maximum)))
+        self.latency_target_ms = latency_target_ms
+        self._clock = clock
+        self.in_flight = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+        self._last_decrease = float("-inf")
+        self.decreases = 0
+
+    async def acquire(self):
+        """Wait for a slot under the current limit (first come, first served)"""
+        if self.in_flight < int(self.limit) and not self._waiters:
+            self.in_flight += 1
+            return
+        future = asyncio.get_running_loop().create_future()
+        self._waiters.append(future)
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                self.release()  # slot was granted as the caller went away
+            elif future in self._waiters:
+                self._waiters.remove(future)
+            raise
+
+    def release(self):
+        """Free a slot and admit waiters while under the limit"""
+        self.in_flight -= 1
+        self._wake()
+
+    def _wake(self):
+        while self._waiters and self.in_flight < int(self.limit):
+            future = self._waiters.popleft()
+            if not future.done():
+                self.in_flight += 1
+                future.set_result(None)
+
+    def on_success(self, started_at: float, latency_ms: float):
+        """Grow the limit by one per window of successes, or shrink it if too slow"""
+        if latency_ms > self.latency_target_ms:
+            self._decrease(started_at, LATENCY_DECREASE, f"latency {latency_ms:.0f}ms")
+            return
+        self.limit = min(self.maximum, self.limit + 1 / self.limit)
+        self._wake()
+
+    def on_rate_limited(self, started_at: float):
+        """Halve the limit after a 429"""
+        self._decrease(started_at, RATE_LIMIT_DECREASE, "HTTP 429")
+
+    def _decrease(self, started_at: float, factor: float, reason: str):
+        # Calls sent before the last decrease reflect the old limit
+        if started_at < self._last_decrease:
+            return
+        self.limit = max(self.minimum, self.limit * factor)
+        self._last_decrease = self._clock()
+        self.decreases += 1
+        logger.warning(f"watsonx.ai concurrency limit lowered to {self.limit:.1f} ({reason})")
+
+
+class Permit:
+    """One admitted watsonx.ai call"""
+
+    def __init__(self, started_at: float):
+        self.started_at = started_at
+
+
+class WatsonxRateLimiter:
+    """Token buckets plus AIMD concurrency for the watsonx.ai REST path"""
+
+    def __init__(
+        self,
+        rps: float = WATSONX_RPS,
+        tps: float = WATSONX_TPS,
+        concurrency: Optional[AIMDLimiter] = None,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        Args:
+            rps: Requests per second (0 = unlimited)
+            tps: Tokens per second (0 = unlimited)
+            concurrency: Adaptive concurrency limit (default from WATSONX_CONCURRENCY_*)
+            clock: Monotonic time source
+        """
+        self._clock = clock
+        self.request_bucket = TokenBucket(rps, clock=clock)
+        self.token_bucket = TokenBucket(tps, clock=clock)
+        self.concurrency = concurrency if concurrency is not None else AIMDLimiter(clock=clock)
+        self._paused_until = 0.0
+        self.wait = LatencyWindow()
+        self.requests = 0
+        self.rate_limited = 0
+
+    @asynccontextmanager
+    async def slot(self, tokens: float = 0.0) -> AsyncIterator[Permit]:
+        """
+        Wait for capacity and hold a concurrency slot for one call.
+
+        Args:
+            tokens: Estimated tokens the call consumes (prompt + max output)
+
+        Yields:
+            Permit to pass to record_success / record_rate_limited
+        """
+        start = self._clock()
+        await self.concurrency.acquire()
+        try:
+            pause = self._paused_until - self._clock()
+            if pause > 0:
+                await asyncio.sleep(pause)
+            await self.request_bucket.acquire(1)
+            try:
+                await self.token_bucket.acquire(tokens)
+            except asyncio.CancelledError:
+                self.request_bucket.refund(1)
+                raise
+
+            permit = Permit(self._clock())
+            self.requests += 1
+            self.wait.observe((permit.started_at - start) * 1000)
+            yield permit
+        finally:
+            self.concurrency.release()
+
+    def record_success(self, permit: Permit):
+        """Report a successful call (latency to first response)"""
+        self.concurrency.on_success(permit.started_at, (self._clock() - permit.started_at) * 1000)
+
+    def record_rate_limited(self, permit: Permit, retry_after: Optional[float] = None):
+        """
+        Report a 429 and pause new calls.
+
+        Args:
+            permit: The rejected call
+            retry_after: Seconds from the Retry-After header (default WATSONX_RATE_LIMIT_BACKOFF)
+        """
+        self.rate_limited += 1
+        self.concurrency.on_rate_limited(permit.started_at)
+        delay = WATSONX_RATE_LIMIT_BACKOFF if retry_after is None else retry_after
+        self._paused_until = max(self._paused_until, self._clock() + delay)
+
+    def stats(self) -> Dict[str, Any]:
+        """Limiter state for health reporting"""
+        return {
+            "concurrency_limit": round(self.concurrency.limit, 2),
+            "in_flight": self.concurrency.in_flight,
+            "queued": len(self.concurrency._waiters),
+            "requests": self.requests,
+            "rate_limited": self.rate_limited,
+            "limit_decreases": self.concurrency.decreases,
+            "rps": self.request_bucket.rate or None,
+            "tps": self.token_bucket.rate or None,
+            "wait": self.wait.stats()
+        }
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Seconds from a Retry-After header (delta-seconds form only)"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        return None
@@ -0,0 +1,277 @@
+"""
+Retries and circuit breaking around watsonx.ai generation
+
+A connection reset or a 503 used to turn straight into a fallback
+escalation, while during a full outage every request still waited for its
+own timeout. ResilientCaller wraps each generation:
+
+- transient failures (connection errors, timeouts, HTTP 408/5xx) are
+  retried with full-jitter exponential backoff, up to
+  WATSONX_RETRY_MAX_ATTEMPTS attempts
+- retries draw on a shared RetryBudget: at most WATSONX_RETRY_BUDGET_RATIO
+  of recent calls (plus a small floor) may be retries, so an outage cannot
+  multiply the load on watsonx.ai
+- a retry is only started if its backoff ends before the request deadline
+- every failed attempt counts toward a CircuitBreaker; once it opens,
+  generations fail fast (the caller gets the safe fallback immediately)
+  until a probe succeeds after WATSONX_BREAKER_COOLDOWN seconds
+
+HTTP 429s are not retried here; the rate limiter has already waited and
+retried them.
+"""
+
+import os
+import time
+import random
+import asyncio
+import logging
+import threading
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional
+
+import requests
+
+from .circuit_breaker import CircuitBreaker
+from .deadline import current_deadline
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover - httpx ships with requirements.txt
+    httpx = None
+
+logger = logging.getLogger(__name__)
+
+# Configuration from environment
+WATSONX_RETRY_MAX_ATTEMPTS = int(os.environ.get("WATSONX_RETRY_MAX_ATTEMPTS", "3"))
+WATSONX_RETRY_BASE_DELAY = float(os.environ.get("WATSONX_RETRY_BASE_DELAY", "0.2"))  # seconds
+WATSONX_RETRY_MAX_DELAY = float(os.environ.get("WATSONX_RETRY_MAX_DELAY", "2.0"))  # seconds
+WATSONX_RETRY_BUDGET_RATIO = float(os.environ.get("WATSONX_RETRY_BUDGET_RATIO", "0.2"))
+WATSONX_RETRY_BUDGET_MIN = int(os.environ.get("WATSONX_RETRY_BUDGET_MIN", "3"))  # retries always allowed per window
+WATSONX_BREAKER_FAILURES = int(os.environ.get("WATSONX_BREAKER_FAILURES", "5"))
+WATSONX_BREAKER_COOLDOWN = float(os.environ.get("WATSONX_BREAKER_COOLDOWN", "30"))  # seconds
+
+RETRY_BUDGET_WINDOW = 10.0  # seconds
+RETRYABLE_STATUS = {408, 500, 502, 503, 504}
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling watsonx.ai while its circuit breaker is open"""
+
+
+def error_status(error: Exception) -> Optional[int]:
+    """HTTP status watsonx.ai answered with, or None if it never answered"""
+    status = getattr(error, "status_code", None)
+    if status is None:
+        # ibm_watsonx_ai's ApiRequestFailure carries the HTTP response
+        status = getattr(getattr(error, "response", None), "status_code", None)
+    return status
+
+
+def is_retryable(error: Exception) -> bool:
+    """True for failures worth retrying: connection problems, timeouts, 408 and 5xx"""
+    status = error_status(error)
+    if status is not None:
+        return status in RETRYABLE_STATUS
+    if httpx is not None and isinstance(error, httpx.TransportError):
+        return True
+    return isinstance(error, (
+        ConnectionError,
+        TimeoutError,
+        requests.exceptions.ConnectionError,
+        requests.exceptions.Timeout
+    ))
+
+
+def backoff_delay(attempt: int, base: float, cap: float, rng: random.Random = random) -> float:
+    """Full-jitter exponential backoff: uniform in [0, min(cap, base * 2^attempt)]"""
+    return rng.uniform(0, min(cap, base * (2 ** attempt)))
+
+
+class RetryBudget:
+    """
+    Limits retries to a share of recent calls.
+
+    Over a sliding RETRY_BUDGET_WINDOW, retries may make up at most `ratio`
+    of first attempts, plus `minimum` retries that are always allowed so a
+    quiet service can still retry.
+    """
+
+    def __init__(
+        self,
+        ratio: float = WATSONX_RETRY_BUDGET_RATIO,
+        minimum: int = WATSONX_RETRY_BUDGET_MIN,
+        window: float = RETRY_BUDGET_WINDOW,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.ratio = ratio
+        self.minimum = minimum
+        self.window = window
+        self._clock = clock
+        self._calls: Deque[float] = deque()
+        self._retries: Deque[float] = deque()
+        self._lock = threading.Lock()
+        self.exhausted = 0
+
+    def _trim(self, now: float):
+        for events in (self._calls, self._retries):
+            while events and now - events[0] > self.window:
+                events.popleft()
+
+    def record_call(self):
+        """Count a first attempt"""
+        with self._lock:
+            now = self._clock()
+            self._trim(now)
+            self._calls.append(now)
+
+    def try_withdraw(self) -> bool:
+        """Spend one retry if the budget allows it"""
+        with self._lock:
+            now = self._clock()
+            self._trim(now)
+            if len(self._retries) >= self.minimum + self.ratio * len(self._calls):
+                self.exhausted += 1
+                return False
+            self._retries.append(now)
+            return True
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            self._trim(self._clock())
+            return {
+                "calls": len(self._calls),
+                "retries": len(self._retries),
+                "exhausted": self.exhausted
+            }
+
+
+class ResilientCaller:
+    """Retry budget, jittered backoff and circuit breaker around one dependency"""
+
+    def __init__(
+        self,
+        breaker: Optional[CircuitBreaker] = None,
+        budget: Optional[RetryBudget] = None,
+        max_attempts: int = WATSONX_RETRY_MAX_ATTEMPTS,
+        base_delay: float = WATSONX_RETRY_BASE_DELAY,
+        max_delay: float = WATSONX_RETRY_MAX_DELAY,
+        rng: Optional[random.Random] = None
+    ):
+        """
+        Args:
+            breaker: Circuit breaker (default: WATSONX_BREAKER_FAILURES/COOLDOWN)
+            budget: Shared retry budget (default: WATSONX_RETRY_BUDGET_*)
+            max_attempts: Attempts per call, including the first
+            base_delay: Backoff before the first retry (seconds, before jitter)
+            max_delay: Backoff cap (seconds)
+            rng: Random source for jitter
+        """
+        self.breaker = breaker if breaker is not None else CircuitBreaker(
+            "watsonx",
+            failure_threshold=WATSONX_BREAKER_FAILURES,
+            cooldown=WATSONX_BREAKER_COOLDOWN
+        )
+        self.budget = budget if budget is not None else RetryBudget()
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._rng = rng or random.Random()
+        self.retries = 0
+
+    def _admit(self):
+        if not self.breaker.allow():
+            raise CircuitOpenError("watsonx.ai circuit breaker is open; failing fast")
+        self.budget.record_call()
+
+    def _retry_delay(self, attempt: int, error: Exception) -> Optional[float]:
+        """
+        Record a failed attempt and decide whether to retry it.
+
+        Returns:
+            Seconds to wait before the retry, or None to give up
+        """
+        if not is_retryable(error):
+            if error_status(error) is not None:
+                # watsonx.ai answered, so it is up; the request itself was refused
+                self.breaker.record_success()
+            else:
+                self.breaker.record_cancelled()
+            return None
+
+        self.breaker.record_failure()
+        if attempt + 1 >= self.max_attempts:
+            return None
+
+        delay = backoff_delay(attempt, self.base_delay, self.max_delay, self._rng)
+        deadline = current_deadline.get()
+        if deadline is not None and delay * 1000 >= deadline.remaining_ms():
+            logger.info("Not retrying watsonx.ai call: backoff would outlast the request deadline")
+            return None
+        if not self.budget.try_withdraw():
+            logger.warning("watsonx.ai retry budget exhausted, not retrying")
+            return None
+        if not self.breaker.allow():
+            return None
+
+        self.retries += 1
+        logger.warning(f"watsonx.ai call failed ({error}), retry {attempt + 1} in {delay * 1000:.0f}ms")
+        return delay
+
+    async def acall(self, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Await fn() with retries.
+
+        Args:
+            fn: Factory for the generation coroutine (called once per attempt)
+
+        Raises:
+            CircuitOpenError: If the breaker is open
+            The last attempt's exception if it was not retried
+        """
+        self._admit()
+        attempt = 0
+        while True:
+            try:
+                result = await fn()
+            except asyncio.CancelledError:
+                self.breaker.record_cancelled()
+                raise
+            except Exception as e:
+                delay = self._retry_delay(attempt, e)
+                if delay is None:
+                    raise
+                await asyncio.sleep(delay)
+                attempt += 1
+                continue
+            self.breaker.record_success()
+            return result
+
+    def call(self, fn: Callable[[], Any]) -> Any:
+        """Blocking variant of acall for the SDK path (runs in a worker thread)"""
+        self._admit()
+        attempt = 0
+        while True:
+            try:
+                result = fn()
+            except Exception as e:
+                delay = self._retry_delay(attempt, e)
+                if delay is None:
+                    raise
+                time.sleep(delay)
+                attempt += 1
+                continue
+            self.breaker.record_success()
+            return result
+
+    @property
+    def degraded(self) -> bool:
+        """True while the breaker is not closed"""
+        return self.breaker.state != "closed"
+
+    def stats(self) -> Dict[str, Any]:
+        """Breaker and retry state for health reporting"""
+        return {
+            "breaker": self.breaker.stats(),
+            "retries": self.retries,
+            "retry_budget": self.budget.stats()
+        }
@@ -5,28 +5,213 @@ Supports both local markdown runbooks and optional remote Langflow integration.
 
 Architecture:
 1. Try local runbook files first (runbooks/{category}.md)
-2. If LANGFLOW_RUNBOOK_URL is set, attempt remote fetch
+2. If LANGFLOW_RUNBOOK_URL is set, race a remote fetch (pooled, cached and
+   circuit-broken, see langflow_client.py) against local retrieval
 3. Fallback to generic runbook if specific category not found
 4. Always return valid context string (never None)
+
+By default only the runbook sections most relevant to the incident are
+returned (BM25 over sections of all runbooks, see runbook_index.py) rather
+than the whole category runbook.
+
+Local runbooks are served from an in-memory RunbookStore loaded once at
+startup. A background thread polls the directory's file mtimes and swaps in
+a new immutable snapshot when anything changes, notifying listeners so
+dependent caches can be invalidated.
 """
 
 import os
+import time
 import logging
+import threading
+import contextvars
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
 from pathlib import Path
-from typing import Optional
-import requests
+from types import MappingProxyType
+from typing import Callable, Dict, List, Mapping, NamedTuple, Optional, Set, Tuple
+
+from .langflow_client import LANGFLOW_POOL_SIZE, langflow_client
+from .runbook_index import BM25Index
 
 logger = logging.getLogger(__name__)
 
 # Configuration
 RUNBOOK_DIR = Path(__file__).parent.parent.parent / "runbooks"
-LANGFLOW_URL = os.environ.get("LANGFLOW_RUNBOOK_URL")
-LANGFLOW_TIMEOUT = 3  # seconds
+# Race Langflow against local runbooks instead of waiting for Langflow first
+RUNBOOK_HEDGE = os.environ.get("RUNBOOK_HEDGE", "1") == "1"
+LANGFLOW_SOFT_DEADLINE_MS = float(os.environ.get("LANGFLOW_SOFT_DEADLINE_MS", "300"))
+RUNBOOK_RELOAD_INTERVAL = float(os.environ.get("RUNBOOK_RELOAD_INTERVAL", "5"))  # seconds; 0 disables
+RUNBOOK_RETRIEVAL = os.environ.get("RUNBOOK_RETRIEVAL", "sections")  # sections | full
+RUNBOOK_TOP_K = int(os.environ.get("RUNBOOK_TOP_K", "3"))
+RUNBOOK_CATEGORY_BOOST = float(os.environ.get("RUNBOOK_CATEGORY_BOOST", "1.5"))
+# Sections of the incident's category that are always included (title prefixes)
+RUNBOOK_PINNED_SECTIONS = [
+    s.strip() for s in os.environ.get("RUNBOOK_PINNED_SECTIONS", "Red Flags").split(",") if s.strip()
+]
+
+
+class RunbookStore:
+    """
+    Immutable in-memory snapshot of the runbook directory with hot reload.
+
+    Readers grab the current snapshot (a read-only mapping) without locking;
+    reloads build a complete new snapshot and replace it in one assignment,
+    so a reader never sees a half-updated set of runbooks.
+    """
+
+    def __init__(self, directory: Path = RUNBOOK_DIR):
+        """
+        Args:
+            directory: Directory containing {category}.md runbooks
+        """
+        self.directory = Path(directory)
+        self.version = 0
+
+        self._runbooks: Mapping[str, str] = MappingProxyType({})
+        self._signatures: Dict[str, Tuple[int, int]] = {}  # category -> (mtime_ns, size)
+        self._failed: Dict[str, Tuple[int, int]] = {}  # category -> signature that could not be read
+        self._loaded = False
+        self._reload_lock = threading.Lock()
+        self._listeners: List[Callable[[Set[str]], None]] = []
+        self._stop = threading.Event()
+        self._watcher: Optional[threading.Thread] = None
+
+    def snapshot(self) -> Mapping[str, str]:
+        """Current category -> runbook mapping (loads on first use)"""
+        if not self._loaded:
+            self.reload()
+        return self._runbooks
+
+    def get(self, category: str) -> Optional[str]:
+        """Runbook content for a category, or None if there is no such file"""
+        return self.snapshot().get(category)
+
+    def add_listener(self, callback: Callable[[Set[str]], None]):
+        """Register a callback invoked with the changed categories after each reload"""
+        self._listeners.append(callback)
+
+    def reload(self) -> Set[str]:
+        """
+        Re-read changed runbooks and swap in a new snapshot.
+
+        Returns:
+            Categories that were added, modified or removed (empty if nothing changed)
+        """
+        with self._reload_lock:
+            signatures = self._scan()
+            changed = {
+                category for category in set(signatures) | set(self._signatures)
+                if signatures.get(category) != self._signatures.get(category)
+            }
+            if self._loaded and not changed:
+                return set()
+
+            runbooks = dict(self._runbooks)
+            failed = set()
+            for category in changed:
+                if category not in signatures:
+                    runbooks.pop(category, None)
+                    self._failed.pop(category, None)
+                    continue
+                try:
+                    path = self.directory / f"{category}.md"
+                    runbooks[category] = path.read_text(encoding="utf-8").strip()
+                    self._failed.pop(category, None)
+                except OSError as e:
+                    # Keep serving the previous version; retry on the next poll,
+                    # but only log again once the file changes
+                    if self._failed.get(category) != signatures[category]:
+                        logger.error(f"Error reading runbook {category}: {e}")
+                        self._failed[category] = signatures[category]
+                    failed.add(category)
+                    signatures.pop(category, None)
+                    if category in self._signatures:
+                        signatures[category] = self._signatures[category]
+            changed -= failed
+            if self._loaded and not changed:
+                return set()
+
+            self._runbooks = MappingProxyType(runbooks)
+            self._signatures = signatures
+            self._loaded = True
+            self.version += 1
+
+        logger.info(f"Loaded runbooks {sorted(changed)} (store version {self.version})")
+        for callback in self._listeners:
+            try:
+                callback(changed)
+            except Exception as e:
+                logger.error(f"Runbook reload listener failed: {e}")
+        return changed
+
+    def _scan(self) -> Dict[str, Tuple[int, int]]:
+        """Cheap stat-only scan of the runbook directory"""
+        signatures = {}
+        try:
+            for path in self.directory.glob("*.md"):
+                stat = path.stat()
+                signatures[path.stem] = (stat.st_mtime_ns, stat.st_size)
+        except OSError as e:
+            logger.error(f"Error scanning runbook directory {self.directory}: {e}")
+            return dict(self._signatures)
+        return signatures
+
+    def start_watching(self, interval: float = RUNBOOK_RELOAD_INTERVAL):
+        """Poll the directory for changes every `interval` seconds (0 disables)"""
+        if interval <= 0 or self._watcher is not None:
+            return
+
+        def watch():
+            while not self._stop.wait(interval):
+                self.reload()
+
+        self._stop.clear()
+        self._watcher = threading.Thread(target=watch, name="runbook-watcher", daemon=True)
+        self._watcher.start()
+
+    def stop(self):
+        """Stop the background watcher"""
+        self._stop.set()
+        if self._watcher is not None:
+            self._watcher.join(timeout=1)
+            self._watcher = None
+
+
+# Shared store used by get_local_runbook
+runbook_store = RunbookStore()
+
+# Background Langflow requests for hedged retrieval; they may outlive the request
+_langflow_executor = ThreadPoolExecutor(max_workers=LANGFLOW_POOL_SIZE, thread_name_prefix="langflow")
+
+# Langflow outcome -> count
+_retrieval_outcomes: Dict[str, int] = {}
+_retrieval_lock = threading.Lock()
+
+# Section index over the current store snapshot: (snapshot, index)
+_section_index: Tuple[Optional[Mapping[str, str]], Optional[BM25Index]] = (None, None)
+_section_index_lock = threading.Lock()
+
+
+def get_section_index() -> BM25Index:
+    """BM25 index for the current runbook snapshot, rebuilt after each reload"""
+    global _section_index
+    snapshot = runbook_store.snapshot()
+    indexed, index = _section_index
+    if indexed is snapshot:
+        return index
+
+    with _section_index_lock:
+        indexed, index = _section_index
+        if indexed is not snapshot:
+            index = BM25Index.from_runbooks(snapshot)
+            _section_index = (snapshot, index)
+            logger.info(f"Indexed {len(index.sections)} runbook sections")
+        return index
 
 
 def get_local_runbook(category: str) -> str:
     """
-    Load runbook from local markdown file.
+    Load runbook from the in-memory store of local markdown files.
 
     Args:
         category: Incident category (latency, storage, auth, unknown)
@@ -34,19 +219,18 @@ def get_local_runbook(category: str) -> str:
     Returns:
         Runbook content as string
     """
-    runbook_file = RUNBOOK_DIR / f"{category}.md"
-
     try:
-        if runbook_file.exists():
-            content = runbook_file.read_text(encoding="utf-8")
+        runbooks = runbook_store.snapshot()
+        content = runbooks.get(category)
+        if content is not None:
             logger.info(f"Loaded local runbook for category: {category}")
-            return content.strip()
+            return content
         else:
-            logger.warning(f"Runbook file not found: {runbook_file}, using fallback")
+            logger.warning(f"Runbook not found for category: {category}, using fallback")
             # Fallback to unknown.md
-            fallback_file = RUNBOOK_DIR / "unknown.md"
-            if fallback_file.exists():
-                return fallback_file.read_text(encoding="utf-8").strip()
+            fallback = runbooks.get("unknown")
+            if fallback is not None:
+                return fallback
             else:
                 return _get_hardcoded_fallback(category)
     except Exception as e:
@@ -54,88 +238,219 @@ def get_local_runbook(category: str) -> str:
         return _get_hardcoded_fallback(category)
 
 
-def get_langflow_runbook(category: str, incident_text: str) -> Optional[str]:
+def get_relevant_runbook_sections(
+    category: str,
+    incident_text: str,
+    top_k: int = RUNBOOK_TOP_K
+) -> str:
     """
-    Fetch runbook context from remote Langflow endpoint.
+    Retrieve the runbook sections most relevant to an incident.
+
+    Sections from every runbook are ranked with BM25 against the incident
+    text (sections of the incident's own category are boosted), and the
+    category's pinned sections (red flags by default) are always included.
 
     Args:
         category: Incident category
         incident_text: Full incident description
+        top_k: Number of ranked sections to include
 
     Returns:
-        Runbook context string or None if fetch fails
+        Selected sections as markdown, or the full category runbook if no
+        section matches the incident text
     """
-    if not LANGFLOW_URL:
-        return None
-
     try:
-        logger.info(f"Fetching runbook from Langflow: {LANGFLOW_URL}")
-
-        response = requests.post(
-            LANGFLOW_URL,
-            json={
-                "category": category,
-                "incident_text": incident_text
-            },
-            timeout=LANGFLOW_TIMEOUT,
-            headers={"Content-Type": "application/json"}
+        index = get_section_index()
+        pinned_category = category if category in runbook_store.snapshot() else "unknown"
+        pinned = index.sections_for(pinned_category, RUNBOOK_PINNED_SECTIONS)
+
+        # Pinned sections are included anyway, so they don't take ranked slots
+        ranked = [section for _, section in index.search(
+            incident_text, top_k + len(pinned),
+            boost_category=category,
+            category_boost=RUNBOOK_CATEGORY_BOOST
+        ) if section not in pinned][:top_k]
+        if not ranked:
+            logger.info(f"No runbook section matched, using full runbook for category: {category}")
+            return get_local_runbook(category)
+
+        selected = ranked + pinned
+        logger.info(f"Selected {len(selected)} runbook sections for category: {category}")
+        return "\n\n".join(
+            f"### [{section.category}] {section.title}\n{section.text.split(chr(10), 1)[-1].strip()}"
+            for section in selected
         )
+    except Exception as e:
+        logger.error(f"Error retrieving runbook sections: {e}")
+        return get_local_runbook(category)
 
-        response.raise_for_status()
-        data = response.json()
 
-        # Langflow should return {"context": "..."}
-        context = data.get("context", "")
+def get_langflow_runbook(category: str, incident_text: str, timeout: Optional[float] = None) -> Optional[str]:
+    """
+    Fetch runbook context from remote Langflow endpoint.
 
-        if context:
-            logger.info("Successfully retrieved runbook from Langflow")
-            return context
-        else:
-            logger.warning("Langflow returned empty context")
-            return None
-
-    except requests.exceptions.Timeout:
-        logger.warning(f"Langflow request timed out after {LANGFLOW_TIMEOUT}s")
-        return None
-    except requests.exceptions.RequestException as e:
-        logger.warning(f"Langflow request failed: {e}")
-        return None
-    except Exception as e:
-        logger.error(f"Unexpected error fetching from Langflow: {e}")
-        return None
+    Args:
+        category: Incident category
+        incident_text: Full incident description
+        timeout: Seconds to wait (capped at LANGFLOW_TIMEOUT)
 
+    Returns:
+        Runbook context string or None if fetch fails or the Langflow
+        circuit breaker is open
+    """
+    return langflow_client.fetch(category, incident_text, timeout)
 
-def get_runbook_context(category: str, incident_text: str) -> str:
+
+class RunbookRetrieval(NamedTuple):
+    """Runbook context for an incident and how it was obtained"""
+    context: str
+    source: str                     # "langflow" or "local"
+    langflow_outcome: str           # disabled | won | late | failed
+    local_ms: Optional[float]       # None if local retrieval was not needed
+    langflow_ms: Optional[float]    # None if not called or still running at the deadline
+
+
+def retrieve_runbook_context(
+    category: str,
+    incident_text: str,
+    budget_ms: Optional[float] = None
+) -> RunbookRetrieval:
     """
-    Get runbook context for an incident.
+    Get runbook context for an incident, recording where it came from.
 
     Strategy:
-    1. Try Langflow if configured
-    2. Fall back to local runbooks
-    3. Always return valid string (never None)
+    1. Without Langflow, use local runbooks (relevant sections, or the full
+       runbook with RUNBOOK_RETRIEVAL=full)
+    2. Hedged (default): start the Langflow request in the background,
+       retrieve local context meanwhile, and use Langflow's context only if
+       it arrives within LANGFLOW_SOFT_DEADLINE_MS. A late answer still
+       lands in the Langflow cache for the next identical incident.
+    3. RUNBOOK_HEDGE=0: wait for Langflow (up to LANGFLOW_TIMEOUT), then
+       fall back to local runbooks
+    4. Always return valid context (never None)
 
     Args:
         category: Incident category
         incident_text: Full incident description
+        budget_ms: Time left for this stage of the request deadline; caps the
+            Langflow soft deadline (hedged) or timeout (sequential)
 
     Returns:
-        Runbook context string
+        RunbookRetrieval with the context, winning source and timings
     """
-    # Try Langflow first if configured
-    if LANGFLOW_URL:
-        langflow_context = get_langflow_runbook(category, incident_text)
+    start = time.perf_counter()
+    soft_deadline_ms = LANGFLOW_SOFT_DEADLINE_MS if budget_ms is None else min(LANGFLOW_SOFT_DEADLINE_MS, budget_ms)
+
+    if not langflow_client.configured:
+        context = _get_local_context(category, incident_text)
+        return _record_retrieval(RunbookRetrieval(context, "local", "disabled", _ms_since(start), None))
+
+    if not RUNBOOK_HEDGE:
+        langflow_context = get_langflow_runbook(
+            category, incident_text, None if budget_ms is None else budget_ms / 1000
+        )
+        langflow_ms = _ms_since(start)
         if langflow_context:
             logger.info("Using Langflow runbook context")
-            return langflow_context
-        else:
-            logger.info("Langflow unavailable, falling back to local runbooks")
+            return _record_retrieval(RunbookRetrieval(langflow_context, "langflow", "won", None, langflow_ms))
+
+        logger.info("Langflow unavailable, falling back to local runbooks")
+        local_start = time.perf_counter()
+        context = _get_local_context(category, incident_text)
+        return _record_retrieval(
+            RunbookRetrieval(context, "local", "failed", _ms_since(local_start), langflow_ms)
+        )
+
+    # Run in a copy of this context so the Langflow span joins the request's trace
+    langflow_future = _langflow_executor.submit(
+        contextvars.copy_context().run, _timed_langflow_runbook, category, incident_text
+    )
+    context = _get_local_context(category, incident_text)
+    local_ms = _ms_since(start)
+
+    remaining = soft_deadline_ms / 1000 - (time.perf_counter() - start)
+    try:
+        langflow_context, langflow_ms = langflow_future.result(timeout=max(0.0, remaining))
+    except FutureTimeoutError:
+        # Still queued behind other Langflow calls: don't send it at all
+        langflow_future.cancel()
+        logger.info(f"Langflow missed the {soft_deadline_ms:.0f}ms soft deadline, using local runbooks")
+        return _record_retrieval(RunbookRetrieval(context, "local", "late", local_ms, None))
 
-    # Fall back to local runbooks
-    local_context = get_local_runbook(category)
+    if langflow_context:
+        logger.info("Using Langflow runbook context")
+        return _record_retrieval(RunbookRetrieval(langflow_context, "langflow", "won", local_ms, langflow_ms))
+
+    logger.info("Langflow unavailable, using local runbooks")
+    return _record_retrieval(RunbookRetrieval(context, "local", "failed", local_ms, langflow_ms))
+
+
+def get_runbook_context(category: str, incident_text: str) -> str:
+    """
+    Get runbook context for an incident (see retrieve_runbook_context).
+
+    Args:
+        category: Incident category
+        incident_text: Full incident description
+
+    Returns:
+        Runbook context string
+    """
+    return retrieve_runbook_context(category, incident_text).context
+
+
+def runbook_context_key(category: str, incident_text: str) -> Tuple[str, ...]:
+    """
+    Key under which incidents get the same runbook context.
+
+    Local sections are ranked against the incident text and Langflow is
+    queried with it, so only the full-runbook mode without Langflow depends
+    on the category alone.
+
+    Args:
+        category: Incident category
+        incident_text: Full incident description
+
+    Returns:
+        Tuple usable as a dict key
+    """
+    if RUNBOOK_RETRIEVAL == "full" and not langflow_client.configured:
+        return (category,)
+    return (category, incident_text)
+
+
+def retrieval_stats() -> Dict[str, int]:
+    """Counts of Langflow outcomes (disabled/won/late/failed) for health reporting"""
+    with _retrieval_lock:
+        return dict(_retrieval_outcomes)
+
+
+def _get_local_context(category: str, incident_text: str) -> str:
+    """Local runbook context: relevant sections or the full category runbook"""
+    if RUNBOOK_RETRIEVAL == "sections":
+        local_context = get_relevant_runbook_sections(category, incident_text)
+    else:
+        local_context = get_local_runbook(category)
     logger.info("Using local runbook context")
     return local_context
 
 
+def _timed_langflow_runbook(category: str, incident_text: str) -> Tuple[Optional[str], float]:
+    start = time.perf_counter()
+    context = get_langflow_runbook(category, incident_text)
+    return context, _ms_since(start)
+
+
+def _ms_since(start: float) -> float:
+    return round((time.perf_counter() - start) * 1000, 1)
+
+
+def _record_retrieval(retrieval: RunbookRetrieval) -> RunbookRetrieval:
+    with _retrieval_lock:
+        _retrieval_outcomes[retrieval.langflow_outcome] = _retrieval_outcomes.get(retrieval.langflow_outcome, 0) + 1
+    return retrieval
+
+
 def _get_hardcoded_fallback(category: str) -> str:
     """
     Hardcoded fallback runbooks if files are missing.
@@ -0,0 +1,171 @@
+"""
+Section-level runbook retrieval for A.E.G.I.S.
+
+Injecting a whole category runbook into every prompt wastes tokens on
+sections that have nothing to do with the incident. This module splits
+runbooks into sections and ranks them against the incident text with
+BM25, so only the most relevant sections (from any category) go into the
+prompt.
+
+Sections are:
+- each "## " heading, or
+- each numbered step ("1. **Log File Review**") or bold label line
+  ("**High Confidence (Auto-Execute):**") inside a heading that has them
+"""
+
+import re
+import math
+from collections import Counter
+from typing import Dict, Iterable, List, Mapping, NamedTuple, Optional, Tuple
+
+_HEADING = re.compile(r"^##\s+(.+?)\s*$")
+_SUBSECTION = re.compile(r"^(?:\d+\.\s+\*\*(.+?)\*\*|\*\*([^*]+?):?\*\*:?)\s*$")
+_TOKEN = re.compile(r"[a-z0-9]+")
+
+_STOPWORDS = frozenset(
+    "a an and are as at be by for from has have if in is it its of on or that the "
+    "this to was were will with not no all any can".split()
+)
+
+
+class Section(NamedTuple):
+    """A retrievable runbook section"""
+    category: str
+    title: str      # e.g. "Investigation Steps > Log File Review"
+    text: str       # section body including its own heading line
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word tokens with stopwords removed and a light suffix strip"""
+    tokens = []
+    for token in _TOKEN.findall(text.lower()):
+        if token in _STOPWORDS:
+            continue
+        for suffix in ("ing", "ed", "s"):
+            if len(token) > len(suffix) + 3 and token.endswith(suffix) and not token.endswith("ss"):
+                token = token[:-len(suffix)]
+                break
+        tokens.append(token)
+    return tokens
+
+
+def split_sections(category: str, runbook: str) -> List[Section]:
+    """
+    Split a markdown runbook into sections.
+
+    Text before the first "## " heading (title and banner) is dropped.
+    """
+    sections: List[Section] = []
+    heading: Optional[str] = None
+    block: List[str] = []
+
+    def flush():
+        if heading is not None:
+            sections.extend(_split_heading_block(category, heading, block))
+
+    for line in runbook.splitlines():
+        match = _HEADING.match(line)
+        if match:
+            flush()
+            heading, block = match.group(1), []
+        elif heading is not None:
+            block.append(line)
+    flush()
+    return sections
+
+
+def _split_heading_block(category: str, heading: str, lines: List[str]) -> List[Section]:
+    """Split one heading's body on numbered steps / bold labels, if it has any"""
+    parts: List[Tuple[Optional[str], List[str]]] = [(None, [])]
+    for line in lines:
+        match = _SUBSECTION.match(line.strip())
+        if match and not line.startswith(" "):
+            parts.append((match.group(1) or match.group(2), [line]))
+        else:
+            parts[-1][1].append(line)
+
+    intro = "\n".join(parts[0][1]).strip()
+    if len(parts) == 1:
+        return [Section(category, heading, f"## {heading}\n{intro}".strip())] if intro else []
+
+    sections = [Section(category, heading, f"## {heading}\n{intro}")] if intro else []
+    for label, body in parts[1:]:
+        text = "\n".join(body).strip()
+        sections.append(Section(category, f"{heading} > {label}", f"## {heading}\n{text}"))
+    return sections
+
+
+class BM25Index:
+    """Okapi BM25 over runbook sections"""
+
+    def __init__(self, sections: List[Section], k1: float = 1.5, b: float = 0.75):
+        self.sections = sections
+        self.k1 = k1
+        self.b = b
+
+        # Title words count toward the section's terms
+        self._term_freqs = [Counter(tokenize(f"{s.title} {s.text}")) for s in sections]
+        self._lengths = [sum(tf.values()) for tf in self._term_freqs]
+        self._avg_length = (sum(self._lengths) / len(sections)) if sections else 0.0
+
+        postings: Dict[str, List[int]] = {}
+        for doc_id, tf in enumerate(self._term_freqs):
+            for term in tf:
+                postings.setdefault(term, []).append(doc_id)
+        n = len(sections)
+        self._postings = postings
+        self._idf = {
+            term: math.log(1 + (n - len(docs) + 0.5) / (len(docs) + 0.5))
+            for term, docs in postings.items()
+        }
+
+    @classmethod
+    def from_runbooks(cls, runbooks: Mapping[str, str]) -> "BM25Index":
+        """Build an index over every section of every runbook"""
+        sections = []
+        for category in sorted(runbooks):
+            sections.extend(split_sections(category, runbooks[category]))
+        return cls(sections)
+
+    def search(
+        self,
+        query: str,
+        top_k: int,
+        boost_category: Optional[str] = None,
+        category_boost: float = 1.0
+    ) -> List[Tuple[float, Section]]:
+        """
+        Rank sections against a query.
+
+        Args:
+            query: Incident text
+            top_k: Maximum sections to return
+            boost_category: Category whose sections get their score multiplied
+            category_boost: Multiplier for boost_category sections
+
+        Returns:
+            (score, section) pairs with a positive score, best first
+        """
+        scores: Dict[int, float] = {}
+        for term in set(tokenize(query)):
+            docs = self._postings.get(term)
+            if not docs:
+                continue
+            idf = self._idf[term]
+            for doc_id in docs:
+                tf = self._term_freqs[doc_id][term]
+                norm = self.k1 * (1 - self.b + self.b * self._lengths[doc_id] / self._avg_length)
+                scores[doc_id] = scores.get(doc_id, 0.0) + idf * tf * (self.k1 + 1) / (tf + norm)
+
+        if boost_category is not None:
+            for doc_id in scores:
+                if self.sections[doc_id].category == boost_category:
+                    scores[doc_id] *= category_boost
+
+        ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)[:top_k]
+        return [(score, self.sections[doc_id]) for doc_id, score in ranked]
+
+    def sections_for(self, category: str, title_prefixes: Iterable[str]) -> List[Section]:
+        """Sections of a category whose title starts with any of the given prefixes"""
+        prefixes = tuple(title_prefixes)
+        return [s for s in self.sections if s.category == category and s.title.startswith(prefixes)]
@@ -0,0 +1,88 @@
+"""
+Single-pass text signal matcher for A.E.G.I.S.
+
+Ambiguity detection, the auto-resolution language check and the mock
+responses all look for a handful of keywords. Instead of running a separate
+regex per keyword, each signal set in signals.json is compiled once into a
+single alternation and scanned in one pass that reports every signal
+found, with positions.
+
+The compiled pattern starts with a lookahead on the set of possible first
+characters, which lets the regex engine skip ahead with its fast charset
+scan instead of trying every alternative at every word boundary. For that
+reason patterns are written in lowercase, start with a literal character
+and are matched against a lowercased copy of the text.
+
+Consumers combine the signals into their own rules, e.g. "a contrast word
+followed later by 'normal'".
+"""
+
+import os
+import re
+import json
+import logging
+from pathlib import Path
+from typing import Dict, List
+
+logger = logging.getLogger(__name__)
+
+# Configuration from environment
+SIGNALS_FILE = os.environ.get("SIGNALS_FILE", str(Path(__file__).parent / "signals.json"))
+
+
+class SignalMatcher:
+    """One precompiled multi-pattern scanner for a set of named signals"""
+
+    def __init__(self, signals: Dict[str, List[str]]):
+        """
+        Args:
+            signals: Signal name -> list of regex alternatives (matched as whole words)
+        """
+        if not signals:
+            raise ValueError("Signal set is empty")
+
+        first_chars = set()
+        for name, alternatives in signals.items():
+            for alternative in alternatives:
+                if not alternative[:1].isalnum() or alternative != alternative.lower():
+                    raise ValueError(
+                        f"Signal '{name}' pattern '{alternative}' must be lowercase "
+                        f"and start with a letter or digit"
+                    )
+                first_chars.add(alternative[0])
+
+        groups = "|".join(
+            f"(?P<{name}>{'|'.join(alternatives)})"
+            for name, alternatives in signals.items()
+        )
+        self.names = list(signals)
+        self._pattern = re.compile(
+            rf"(?=[{re.escape(''.join(sorted(first_chars)))}])\b(?:{groups})\b"
+        )
+
+    def scan(self, text: str) -> Dict[str, List[int]]:
+        """
+        Find every signal in one pass.
+
+        Returns:
+            Signal name -> start offsets of its matches, in text order
+            (signals that did not match are absent)
+        """
+        found: Dict[str, List[int]] = {}
+        for match in self._pattern.finditer(text.lower()):
+            found.setdefault(match.lastgroup, []).append(match.start())
+        return found
+
+
+def load_signal_matchers(path: str = SIGNALS_FILE) -> Dict[str, SignalMatcher]:
+    """
+    Compile every signal set in a signals file.
+
+    Raises:
+        ValueError: If the file is malformed or a pattern does not compile
+    """
+    data = json.loads(Path(path).read_text(encoding="utf-8"))
+    try:
+        return {name: SignalMatcher(signals) for name, signals in data["sets"].items()}
+    except (KeyError, re.error) as e:
+        raise ValueError(f"Invalid signals file {path}: {e}") from e
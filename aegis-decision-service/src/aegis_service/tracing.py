@@ -0,0 +1,494 @@
+"""
+Distributed tracing for A.E.G.I.S.
+
+Spans for each stage of an evaluation (admission queue, runbook retrieval,
+the Langflow call, prompt assembly, watsonx.ai generation, parsing and the
+decision policy), tied together by W3C Trace Context:
+
+- An incoming `traceparent` header continues the caller's trace; without
+  one a new trace is started. The response carries the server span's
+  `traceparent` and a `Server-Timing` header with the time spent in each
+  stage, so slow incidents can be read straight off the response.
+- The trace ID is also the incident's trace_id (as a UUID), so a trace_id
+  from a response or a log line finds the trace, and vice versa.
+- Outgoing Langflow and watsonx.ai requests carry `traceparent`.
+
+Finished spans are exported off the request path in OTLP/JSON: appended to
+TRACE_FILE (one ExportTraceServiceRequest per line, the format of the
+OpenTelemetry Collector file exporter) or POSTed to an OTLP/HTTP endpoint
+(TRACE_OTLP_ENDPOINT, e.g. http://collector:4318/v1/traces). Spans of
+traces the caller marked as not sampled still feed Server-Timing but are
+not exported.
+"""
+
+import os
+import json
+import time
+import uuid
+import queue
+import random
+import logging
+import threading
+import urllib.request
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Configuration from environment
+TRACING_ENABLED = os.environ.get("TRACING_ENABLED", "1") == "1"
+TRACE_EXPORT = os.environ.get("TRACE_EXPORT", "none")  # none, file or otlp
+TRACE_FILE = os.environ.get("TRACE_FILE", "traces.jsonl")
+TRACE_OTLP_ENDPOINT = os.environ.get("TRACE_OTLP_ENDPOINT", "http://localhost:4318/v1/traces")
+TRACE_SERVICE_NAME = os.environ.get("TRACE_SERVICE_NAME", "aegis-decision-service")
+TRACE_QUEUE_SIZE = int(os.environ.get("TRACE_QUEUE_SIZE", "4096"))  # spans waiting for export
+
+TRACEPARENT_HEADER = "traceparent"
+
+# OTLP span kinds and status codes
+KIND_INTERNAL, KIND_SERVER, KIND_CLIENT = 1, 2, 3
+STATUS_UNSET, STATUS_OK, STATUS_ERROR = 0, 1, 2
+
+_EXPORT_BATCH = 256
+
+
+def parse_traceparent(header: Optional[str]) -> Optional[Tuple[str, str, bool]]:
+    """
+    Parse a W3C traceparent header.
+
+    Args:
+        header: Header value, e.g. "00-4bf92f3577b34da6a3ce929d0e0e4736-00f067aa0ba902b7-01"
+
+    Returns:
+        Tuple of (trace ID, parent span ID, sampled), or None if the header
+        is missing or malformed (the trace then starts here)
+    """
+    if not header:
+        return None
+    parts = header.strip().lower().split("-")
+    if len(parts) < 4 or len(parts[0]) != 2 or parts[0] == "ff":
+        return None
+    version, trace_id, span_id, flags = parts[:4]
+    # Version 00 has exactly four fields; later versions may append more
+    if version == "00" and len(parts) != 4:
+        return None
+    try:
+        if len(trace_id) != 32 or len(span_id) != 16 or len(flags) != 2:
+            return None
+        if int(trace_id, 16) == 0 or int(span_id, 16) == 0:
+            return None
+        sampled = bool(int(flags, 16) & 0x01)
+    except ValueError:
+        return None
+    return trace_id, span_id, sampled
+
+
+def format_traceparent(trace_id: str, span_id: str, sampled: bool = True) -> str:
+    return f"00-{trace_id}-{span_id}-{'01' if sampled else '00'}"
+
+
+def _new_id(bits: int) -> str:
+    value = 0
+    while not value:
+        value = random.getrandbits(bits)
+    return f"{value:0{bits // 4}x}"
+
+
+class Span:
+    """One timed operation within a trace"""
+
+    __slots__ = (
+        "name", "trace_id", "span_id", "parent_id", "kind", "sampled", "start_ns", "end_ns",
+        "attributes", "events", "status", "status_message", "root", "_finished"
+    )
+
+    def __init__(
+        self,
+        name: str,
+        parent: Optional["Span"] = None,
+        remote: Optional[Tuple[str, str, bool]] = None,
+        kind: int = KIND_INTERNAL,
+        attributes: Optional[Dict[str, Any]] = None
+    ):
+        """
+        Args:
+            name: Operation name
+            parent: Local parent span (None for a root span)
+            remote: (trace ID, span ID, sampled) of a remote parent from traceparent
+            kind: OTLP span kind
+            attributes: Initial span attributes
+        """
+        self.name = name
+        self.kind = kind
+        self.span_id = _new_id(64)
+        if parent is not None:
+            self.trace_id, self.parent_id, self.sampled = parent.trace_id, parent.span_id, parent.sampled
+            self.root = parent.root
+        else:
+            self.trace_id, self.parent_id, self.sampled = remote if remote else (_new_id(128), None, True)
+            self.root = self
+        self.attributes: Dict[str, Any] = dict(attributes) if attributes else {}
+        self.events: List[Tuple[int, str, Dict[str, Any]]] = []
+        self.status = STATUS_UNSET
+        self.status_message = ""
+        self.start_ns = time.time_ns()
+        self.end_ns: Optional[int] = None
+        # Root spans collect their finished descendants for Server-Timing
+        self._finished: List["Span"] = []
+
+    @property
+    def traceparent(self) -> str:
+        return format_traceparent(self.trace_id, self.span_id, self.sampled)
+
+    @property
+    def duration_ms(self) -> float:
+        end_ns = self.end_ns if self.end_ns is not None else time.time_ns()
+        return (end_ns - self.start_ns) / 1e6
+
+    def set_attribute(self, key: str, value: Any):
+        self.attributes[key] = value
+
+    def add_event(self, name: str, **attributes: Any):
+        self.events.append((time.time_ns(), name, attributes))
+
+    def record_error(self, error: BaseException):
+        self.status = STATUS_ERROR
+        self.status_message = f"{type(error).__name__}: {error}"[:200]
+
+    def end(self, end_ns: Optional[int] = None):
+        """Finish the span and hand it to the exporter (idempotent)"""
+        if self.end_ns is not None:
+            return
+        self.end_ns = end_ns if end_ns is not None else time.time_ns()
+        if self.root is not self:
+            self.root._finished.append(self)
+        if self.sampled:
+            exporter.export(self)
+
+    def server_timing(self) -> str:
+        """
+        Server-Timing header value: time per stage for the spans finished so far.
+
+        Repeated stages (e.g. both tiers of a cascade) are summed; "total"
+        is the time since this span started.
+        """
+        durations: Dict[str, float] = {}
+        for child in list(self._finished):
+            durations[child.name] = durations.get(child.name, 0.0) + child.duration_ms
+        metrics = [f"{name};dur={ms:.1f}" for name, ms in durations.items()]
+        metrics.append(f"total;dur={self.duration_ms:.1f}")
+        return ", ".join(metrics)
+
+    def to_otlp(self) -> Dict[str, Any]:
+        """The span in OTLP/JSON encoding"""
+        data = {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": self.kind,
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.end_ns),
+            "attributes": _otlp_attributes(self.attributes),
+            "status": {"code": self.status}
+        }
+        if self.parent_id:
+            data["parentSpanId"] = self.parent_id
+        if self.events:
+            data["events"] = [
+                {"timeUnixNano": str(ts), "name": name, "attributes": _otlp_attributes(attrs)}
+                for ts, name, attrs in self.events
+            ]
+        if self.status_message:
+            data["status"]["message"] = self.status_message
+        return data
+
+
+class _NoopSpan(Span):
+    """Stand-in yielded while tracing is disabled: records nothing"""
+
+    def __init__(self):
+        self.name = ""
+        self.trace_id, self.span_id, self.parent_id, self.sampled = "0" * 32, "0" * 16, None, False
+        self.kind, self.root = KIND_INTERNAL, self
+        self.attributes, self.events, self._finished = {}, [], []
+        self.status, self.status_message = STATUS_UNSET, ""
+        self.start_ns, self.end_ns = 0, 0
+
+    def set_attribute(self, key: str, value: Any):
+        pass
+
+    def add_event(self, name: str, **attributes: Any):
+        pass
+
+    def record_error(self, error: BaseException):
+        pass
+
+    def end(self, end_ns: Optional[int] = None):
+        pass
+
+
+NOOP_SPAN = _NoopSpan()
+
+_current_span: ContextVar[Optional[Span]] = ContextVar("aegis_current_span", default=None)
+
+
+def current_span() -> Span:
+    """The active span, or a no-op span outside any trace"""
+    span = _current_span.get()
+    return span if span is not None else NOOP_SPAN
+
+
+def current_trace_id() -> Optional[str]:
+    """The active trace ID formatted as a UUID (the incident trace_id), if any"""
+    span = _current_span.get()
+    return str(uuid.UUID(hex=span.trace_id)) if span is not None else None
+
+
+def inject(headers: Dict[str, str]) -> Dict[str, str]:
+    """Add the active span's traceparent to outgoing request headers"""
+    span = _current_span.get()
+    if span is not None:
+        headers[TRACEPARENT_HEADER] = span.traceparent
+    return headers
+
+
+@contextmanager
+def span(name: str, kind: int = KIND_INTERNAL, **attributes: Any) -> Iterator[Span]:
+    """
+    Run a block as a child span of the active span.
+
+    Outside a trace (no active span) a root span is started. The span is
+    marked as failed if the block raises.
+
+    Args:
+        name: Operation name (also the Server-Timing metric name)
+        kind: OTLP span kind
+        **attributes: Span attributes
+
+    Yields:
+        The span, for adding attributes and events
+    """
+    if not TRACING_ENABLED:
+        yield NOOP_SPAN
+        return
+
+    active = Span(name, parent=_current_span.get(), kind=kind, attributes=attributes)
+    token = _current_span.set(active)
+    try:
+        yield active
+    except BaseException as e:
+        active.record_error(e)
+        raise
+    finally:
+        try:
+            _current_span.reset(token)
+        except ValueError:
+            # Closed from another context (an abandoned async generator finalized
+            # by the event loop), which never had this span active
+            pass
+        active.end()
+
+
+def record_span(name: str, duration_s: float, **attributes: Any):
+    """Record a child span for an operation that just ended (e.g. a queue wait)"""
+    parent = _current_span.get()
+    if not TRACING_ENABLED or parent is None:
+        return
+    end_ns = time.time_ns()
+    finished = Span(name, parent=parent, attributes=attributes)
+    finished.start_ns = end_ns - int(duration_s * 1e9)
+    finished.end(end_ns)
+
+
+def _otlp_value(value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def _otlp_attributes(attributes: Dict[str, Any]) -> List[Dict[str, Any]]:
+    return [{"key": key, "value": _otlp_value(value)} for key, value in attributes.items() if value is not None]
+
+
+class SpanExporter:
+    """Exports finished spans in OTLP/JSON batches from a background thread"""
+
+    def __init__(
+        self,
+        mode: str = TRACE_EXPORT,
+        path: str = TRACE_FILE,
+        endpoint: str = TRACE_OTLP_ENDPOINT,
+        service_name: str = TRACE_SERVICE_NAME,
+        max_queue: int = TRACE_QUEUE_SIZE
+    ):
+        """
+        Args:
+            mode: "none", "file" (append to path) or "otlp" (POST to endpoint)
+            path: File receiving one OTLP/JSON export request per line
+            endpoint: OTLP/HTTP traces endpoint
+            service_name: service.name resource attribute
+            max_queue: Spans buffered before new ones are dropped
+        """
+        self.mode = mode
+        self.path = path
+        self.endpoint = endpoint
+        self.service_name = service_name
+        self._queue: "queue.Queue[Optional[Span]]" = queue.Queue(maxsize=max_queue)
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+        self.exported = 0
+        self.dropped = 0
+        self.failures = 0
+
+    def export(self, span: Span):
+        """Queue a finished span (never blocks the request path)"""
+        if self.mode not in ("file", "otlp"):
+            return
+        if self._thread is None:
+            self._start()
+        try:
+            self._queue.put_nowait(span)
+        except queue.Full:
+            self.dropped += 1
+
+    def _start(self):
+        with self._start_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="aegis-span-exporter", daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            span = self._queue.get()
+            batch = [span]
+            while len(batch) < _EXPORT_BATCH:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            spans = [s for s in batch if s is not None]
+            if spans:
+                self._write(spans)
+            for _ in batch:
+                self._queue.task_done()
+            if None in batch:
+                return
+
+    def _write(self, spans: List[Span]):
+        payload = json.dumps(self.encode(spans))
+        try:
+            if self.mode == "file":
+                with open(self.path, "a") as f:
+                    f.write(payload + "\n")
+            else:
+                request = urllib.request.Request(
+                    self.endpoint,
+                    data=payload.encode(),
+                    headers={"Content-Type": "application/json"},
+                    method="POST"
+                )
+                with urllib.request.urlopen(request, timeout=5):
+                    pass
+            self.exported += len(spans)
+        except Exception as e:
+            self.failures += 1
+            logger.warning(f"Span export failed ({len(spans)} spans): {e}")
+
+    def encode(self, spans: List[Span]) -> Dict[str, Any]:
+        """An OTLP ExportTraceServiceRequest in JSON encoding"""
+        return {
+            "resourceSpans": [{
+                "resource": {"attributes": _otlp_attributes({"service.name": self.service_name})},
+                "scopeSpans": [{
+                    "scope": {"name": "aegis_service.tracing"},
+                    "spans": [s.to_otlp() for s in spans]
+                }]
+            }]
+        }
+
+    def flush(self):
+        """Wait until every queued span has been exported"""
+        if self._thread is not None:
+            self._queue.join()
+
+    def shutdown(self):
+        """Export what is queued and stop the background thread"""
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def stats(self) -> Dict[str, Any]:
+        """Export counters for health reporting"""
+        return {
+            "export": self.mode,
+            "exported": self.exported,
+            "dropped": self.dropped,
+            "failures": self.failures
+        }
+
+
+exporter = SpanExporter()
+
+
+class TracingMiddleware:
+    """
+    ASGI middleware running each HTTP request in a server span.
+
+    Continues the caller's trace from `traceparent` and adds `traceparent`
+    and `Server-Timing` to the response. Headers are sent before a
+    streaming body, so a streamed response's Server-Timing only covers the
+    stages that finished before its first byte.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not TRACING_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        remote = None
+        for name, value in scope.get("headers", ()):
+            if name == b"traceparent":
+                remote = parse_traceparent(value.decode("latin-1"))
+                break
+
+        server = Span(
+            f"{scope['method']} {scope['path']}",
+            remote=remote,
+            kind=KIND_SERVER,
+            attributes={"http.request.method": scope["method"], "url.path": scope["path"]}
+        )
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                server.set_attribute("http.response.status_code", message["status"])
+                if message["status"] >= 500:
+                    server.status = STATUS_ERROR
+                headers = list(message.get("headers", []))
+                headers.append((b"traceparent", server.traceparent.encode()))
+                headers.append((b"server-timing", server.server_timing().encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        token = _current_span.set(server)
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except BaseException as e:
+            server.record_error(e)
+            raise
+        finally:
+            _current_span.reset(token)
+            # Name by route template once the router has matched one
+            route = getattr(scope.get("route"), "path", None)
+            if route:
+                server.name = f"{scope['method']} {route}"
+                server.set_attribute("http.route", route)
+            server.end()
@@ -7,13 +7,30 @@ Provides robust JSON parsing with fallback mechanisms.
 
 import os
 import json
+import asyncio
+import hashlib
 import logging
 import re
-from typing import Optional
-from ibm_watsonx_ai.foundation_models import Model
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import aclosing, contextmanager, nullcontext
+from typing import Optional, Dict, Any, Iterator, List, AsyncIterator, AsyncContextManager, Callable, Tuple
+from ibm_watsonx_ai.foundation_models import ModelInference
 from ibm_watsonx_ai.metanames import GenTextParamsMetaNames as GenParams
 
 from .models import ModelDecision
+from .decision_cache import DecisionCache, make_cache_key
+from .fast_path import RuleEngine, load_rule_engine
+from .signals import load_signal_matchers
+from .incremental_parser import IncrementalDecisionParser, parse_decision_fields
+from .prompt_assembler import AssembledPrompt, PromptAssembler, estimate_tokens
+from .model_pool import IAMTokenManager, ModelPool
+from .watsonx_http import AsyncWatsonxTransport, HTTPX_AVAILABLE, WATSONX_ASYNC_HTTP
+from .resilience import ResilientCaller
+from .hedging import Hedger
+from .metrics import MODEL_CALLS, MODEL_TOKENS, PARSE_STRATEGY, POLICY_OVERRIDES, STAGE_SECONDS
+from .tracing import KIND_CLIENT, current_span, span
 
 logger = logging.getLogger(__name__)
 
@@ -23,6 +40,26 @@ WATSONX_URL = os.environ.get("WATSONX_URL", "https://us-south.ml.cloud.ibm.com")
 WATSONX_PROJECT_ID = os.environ.get("WATSONX_PROJECT_ID")
 WATSONX_MODEL_ID = os.environ.get("WATSONX_MODEL_ID", "ibm/granite-3-8b-instruct")
 MOCK_WATSONX = os.environ.get("MOCK_WATSONX", "0") == "1"
+BATCH_CONCURRENCY = int(os.environ.get("BATCH_CONCURRENCY", "8"))
+# Stream generations and cancel them as soon as the decision object closes
+WATSONX_EARLY_STOP = os.environ.get("WATSONX_EARLY_STOP", "1") == "1"
+# Threads pumping blocking SDK streams when the async REST transport is off
+WATSONX_STREAM_THREADS = int(os.environ.get("WATSONX_STREAM_THREADS", "8"))
+# Cascade: a smaller model decides first; confidences inside the band go to WATSONX_MODEL_ID
+WATSONX_CASCADE = os.environ.get("WATSONX_CASCADE", "0") == "1"
+WATSONX_SMALL_MODEL_ID = os.environ.get("WATSONX_SMALL_MODEL_ID", "ibm/granite-3-2b-instruct")
+WATSONX_CASCADE_BAND = os.environ.get("WATSONX_CASCADE_BAND", "60-90")  # low (inclusive) - high (exclusive)
+# Categories whose static prompt prefix is rendered at startup
+PROMPT_CATEGORIES = ("latency", "storage", "auth", "unknown")
+
+# Each SDK stream holds its thread until the next chunk arrives, even after the reader left
+_stream_executor = ThreadPoolExecutor(max_workers=WATSONX_STREAM_THREADS, thread_name_prefix="watsonx-stream")
+
+
+def parse_cascade_band(spec: str) -> Tuple[int, int]:
+    """Parse "low-high" into the confidence band the small model may not settle"""
+    low, _, high = spec.partition("-")
+    return int(low), int(high)
 
 
 class WatsonxClient:
@@ -40,7 +77,7 @@ Your job is to analyze incident reports and provide structured decision recommen
 
 CRITICAL RULES:
 1. Respond ONLY with valid JSON - absolutely no additional text, explanation, markdown fences, or commentary
-2. The JSON must contain exactly these 4 fields: analysis, recommended_action, confidence_score, explanation
+2. The JSON must contain exactly these 4 fields, in this order: recommended_action, confidence_score, analysis, explanation
 3. Valid recommended_action values are ONLY: clear_logs, restart_service, run_diagnostics, escalate_to_human
 4. Always prefer safety over automation
 
@@ -67,9 +104,9 @@ POLICY ENFORCEMENT:
 
 Response Format (STRICT JSON - NO OTHER TEXT OR MARKDOWN):
 {{
-  "analysis": "one sentence summary of the incident",
   "recommended_action": "clear_logs|restart_service|run_diagnostics|escalate_to_human",
   "confidence_score": 0-100,
+  "analysis": "one sentence summary of the incident",
   "explanation": "short explanation for human reviewer"
 }}
 
@@ -91,8 +128,58 @@ Category: {category}
         }
         self.project_id = WATSONX_PROJECT_ID
         self.model_id = WATSONX_MODEL_ID
+        self.cascade = WATSONX_CASCADE
+        self.small_model_id = WATSONX_SMALL_MODEL_ID
+        self.cascade_band = parse_cascade_band(WATSONX_CASCADE_BAND)
+        self.tier_counts = {"small": 0, "large": 0}
         self.mock_mode = MOCK_WATSONX
 
+        # Shared IAM token cache and long-lived model handles
+        self.token_manager = IAMTokenManager(WATSONX_APIKEY)
+        self.model_pool = ModelPool(
+            url=WATSONX_URL,
+            project_id=WATSONX_PROJECT_ID,
+            token_manager=self.token_manager
+        )
+
+        # Pooled async transport for non-blocking inference (None = SDK in a thread)
+        self.async_transport: Optional[AsyncWatsonxTransport] = None
+        if not self.mock_mode and WATSONX_ASYNC_HTTP and HTTPX_AVAILABLE:
+            self.async_transport = AsyncWatsonxTransport(
+                url=WATSONX_URL,
+                project_id=WATSONX_PROJECT_ID,
+                token_manager=self.token_manager
+            )
+
+        # Retries with a shared budget, and a breaker that fails fast during outages
+        self.resilience = ResilientCaller()
+
+        # Generation latency tracking, and optional hedging of slow REST generations
+        self.hedger = Hedger()
+
+        # Pre-rendered prompt prefixes with a token budget
+        self.prompt_assembler = PromptAssembler(self.SYSTEM_PROMPT_TEMPLATE, PROMPT_CATEGORIES)
+
+        # Cache of validated decisions; the prompt version keys out stale entries
+        self.prompt_version = hashlib.sha256(
+            (
+                self.SYSTEM_PROMPT_TEMPLATE
+                + json.dumps(self._generation_params(), sort_keys=True)
+                + str(self.prompt_assembler.budget)
+                + (f"cascade:{self.small_model_id}:{self.cascade_band}" if self.cascade else "")
+            ).encode("utf-8")
+        ).hexdigest()[:12]
+        self.decision_cache = DecisionCache()
+        self.decision_cache.load_snapshot()
+
+        # Precompiled keyword scanners for ambiguity and auto-resolution checks
+        signal_matchers = load_signal_matchers()
+        self.incident_signals = signal_matchers["incident"]
+        self.explanation_signals = signal_matchers["explanation"]
+
+        # Deterministic pre-model rules (None = every incident goes to the model)
+        self.rule_engine: Optional[RuleEngine] = load_rule_engine()
+
         # Validate configuration
         if not MOCK_WATSONX:
             if not WATSONX_APIKEY:
@@ -127,6 +214,42 @@ Category: {category}
         Raises:
             Exception: Only if credentials are missing or model initialization fails
         """
+        rule_decision = self._fast_path_decision(incident_text, category)
+        if rule_decision is not None:
+            return rule_decision
+
+        cache_key = self._cache_key(incident_text, category, reporter_role, runbook_context)
+        cached = self._get_cached_decision(cache_key)
+        if cached is not None:
+            return cached
+
+        decision = self._generate_tiered(
+            incident_text=incident_text,
+            category=category,
+            reporter_role=reporter_role,
+            runbook_context=runbook_context
+        )
+        self._store_decision(cache_key, decision)
+        return decision
+
+    def _generate_tiered(self, **incident) -> ModelDecision:
+        """Blocking generation through the cascade (or the configured model alone)"""
+        if self.cascade:
+            small = self._tag_tier(self._generate_decision(**incident, model_id=self.small_model_id), "small")
+            if self._settled_by_small(small):
+                return small
+        return self._tag_tier(self._generate_decision(**incident), "large")
+
+    def _generate_decision(
+        self,
+        incident_text: str,
+        category: str,
+        reporter_role: str,
+        runbook_context: str,
+        model_id: Optional[str] = None
+    ) -> ModelDecision:
+        """Blocking generation + parsing + policy (SDK or mock), bypassing the cache"""
+        model_id = model_id or self.model_id
         try:
             # Build prompt
             prompt = self._build_prompt(
@@ -137,42 +260,592 @@ Category: {category}
             )
 
             # Get response (mocked or real)
-            if self.mock_mode:
-                logger.info("Using MOCK response")
-                raw_response = self._get_mock_response(incident_text)
-            else:
-                # Initialize model
-                model = self._initialize_model()
+            parser = None
+            with self._model_call(model_id, prompt.tokens):
+                if self.mock_mode:
+                    logger.info("Using MOCK response")
+                    raw_response = self._get_mock_response(incident_text)
+                else:
+                    # Reuse a pooled, already-authenticated model handle
+                    model = self._initialize_model(model_id)
+
+                    # Generate response
+                    logger.info("Sending request to %s", model_id)
+                    if WATSONX_EARLY_STOP:
+                        raw_response, parser = self.resilience.call(
+                            lambda: self._collect_decision_text(model.generate_text_stream(prompt=prompt.text))
+                        )
+                    else:
+                        raw_response = self.resilience.call(lambda: model.generate_text(prompt=prompt.text))
+                    logger.info("Received response from model (length: %d)", len(raw_response))
+
+            return self._finalize_decision(raw_response, incident_text, parser, prompt, model_id)
 
-                # Generate response
-                logger.info(f"Sending request to {self.model_id}")
-                raw_response = model.generate_text(prompt=prompt)
-                logger.info(f"Received response from model (length: {len(raw_response)})")
+        except Exception as e:
+            logger.error(f"Error in get_decision: {e}", exc_info=True)
+            # Return safe fallback
+            return self._get_fallback_decision(str(e))
+
+    async def aget_decision(
+        self,
+        incident_text: str,
+        category: str,
+        reporter_role: str,
+        runbook_context: str,
+        model_slot: Optional[Callable[[], AsyncContextManager[Any]]] = None
+    ) -> ModelDecision:
+        """
+        Non-blocking variant of get_decision for use on the event loop.
 
-            # Parse response with fallback
-            decision = self._parse_response(raw_response)
+        Uses the pooled async REST transport when available; otherwise the
+        blocking SDK path runs in a worker thread so other requests on the
+        same worker keep flowing.
 
-            # Validate decision with ambiguity detection
-            decision = self._validate_decision(decision, incident_text)
+        Args:
+            incident_text: The incident description
+            category: Incident category
+            reporter_role: Reporter's role
+            runbook_context: Formatted runbook context
+            model_slot: Context manager factory held around model generation
+                only (e.g. an admission slot); fast-path and cached decisions
+                never enter it
 
-            return decision
+        Returns:
+            ModelDecision object (safe fallback on any error)
+        """
+        rule_decision = self._fast_path_decision(incident_text, category)
+        if rule_decision is not None:
+            return rule_decision
+
+        cache_key = self._cache_key(incident_text, category, reporter_role, runbook_context)
+        cached = self._get_cached_decision(cache_key)
+        if cached is not None:
+            return cached
+
+        async with (model_slot() if model_slot is not None else nullcontext()):
+            decision = await self._agenerate_tiered(
+                incident_text=incident_text,
+                category=category,
+                reporter_role=reporter_role,
+                runbook_context=runbook_context
+            )
+
+        self._store_decision(cache_key, decision)
+        return decision
+
+    async def _agenerate_tiered(self, **incident) -> ModelDecision:
+        """Non-blocking generation through the cascade (or the configured model alone)"""
+        if self.cascade:
+            small = self._tag_tier(await self._agenerate_any(**incident, model_id=self.small_model_id), "small")
+            if self._settled_by_small(small):
+                return small
+        return self._tag_tier(await self._agenerate_any(**incident), "large")
+
+    async def _agenerate_any(self, model_id: Optional[str] = None, **incident) -> ModelDecision:
+        """Generate via the async REST transport, or the blocking path in a worker thread"""
+        if self.mock_mode or self.async_transport is None:
+            return await asyncio.to_thread(self._generate_decision, **incident, model_id=model_id)
+        return await self._agenerate_decision(**incident, model_id=model_id)
+
+    def _settled_by_small(self, decision: ModelDecision) -> bool:
+        """True if the small model's validated confidence is outside the uncertainty band"""
+        low, high = self.cascade_band
+        return not decision.is_fallback and not (low <= decision.confidence_score < high)
+
+    def _tag_tier(self, decision: ModelDecision, tier: str) -> ModelDecision:
+        """Record which model tier produced a model decision"""
+        if decision.decision_path == "model":
+            decision.model_tier = tier
+            decision.model_id = self.small_model_id if tier == "small" else self.model_id
+            self.tier_counts[tier] += 1
+        return decision
+
+    async def _agenerate_decision(
+        self,
+        incident_text: str,
+        category: str,
+        reporter_role: str,
+        runbook_context: str,
+        model_id: Optional[str] = None
+    ) -> ModelDecision:
+        """Async REST generation + parsing + policy, bypassing the cache"""
+        model_id = model_id or self.model_id
+        try:
+            prompt = self._build_prompt(
+                incident_text=incident_text,
+                category=category,
+                reporter_role=reporter_role,
+                runbook_context=runbook_context
+            )
+
+            logger.info("Sending async request to %s", model_id)
+            # A hedge is a second, independent (retried, rate-limited) generation
+            parser = None
+            with self._model_call(model_id, prompt.tokens):
+                if WATSONX_EARLY_STOP:
+                    raw_response, parser = await self.hedger.run(
+                        lambda: self.resilience.acall(
+                            lambda: self._acollect_decision_text(
+                                self.async_transport.generate_stream(prompt.text, model_id, self._generation_params())
+                            )
+                        )
+                    )
+                else:
+                    raw_response = await self.hedger.run(
+                        lambda: self.resilience.acall(
+                            lambda: self.async_transport.generate_text(prompt.text, model_id, self._generation_params())
+                        )
+                    )
+            logger.info("Received response from model (length: %d)", len(raw_response))
+
+            return self._finalize_decision(raw_response, incident_text, parser, prompt, model_id)
 
         except Exception as e:
-            logger.error(f"Error in get_decision: {e}", exc_info=True)
-            # Return safe fallback
+            logger.error(f"Error in aget_decision: {e}", exc_info=True)
             return self._get_fallback_decision(str(e))
 
+    async def aget_decisions(
+        self,
+        incidents: List[Dict[str, str]],
+        concurrency_limit: int = BATCH_CONCURRENCY,
+        model_slot: Optional[Callable[[List[Dict[str, str]]], AsyncContextManager[Any]]] = None
+    ) -> List[ModelDecision]:
+        """
+        Get decisions for many incidents at once.
+
+        Incidents settled by fast-path rules or the cache are answered
+        immediately and duplicates within the batch are generated once. The rest go through the async REST
+        transport (bounded by concurrency_limit) or, without it, through the
+        SDK's multi-prompt generate_text in a worker thread. Every item is
+        parsed and policy-validated individually and falls back on its own.
+
+        Args:
+            incidents: Dicts with incident_text, category, reporter_role, runbook_context
+            concurrency_limit: Maximum generations in flight
+            model_slot: Context manager factory held around each generation,
+                called with the incidents it covers (one per REST call, all
+                of them for the SDK multi-prompt call); if entering it fails
+                (e.g. shed under load) those incidents get the safe fallback
+
+        Returns:
+            One ModelDecision per incident, in input order
+        """
+        decisions: List[Optional[ModelDecision]] = [None] * len(incidents)
+        keys = [
+            self._cache_key(i["incident_text"], i["category"], i["reporter_role"], i["runbook_context"])
+            for i in incidents
+        ]
+
+        # key -> positions waiting on that generation
+        pending: Dict[str, List[int]] = {}
+        for idx, key in enumerate(keys):
+            incident = incidents[idx]
+            rule_decision = self._fast_path_decision(incident["incident_text"], incident["category"])
+            if rule_decision is not None:
+                decisions[idx] = rule_decision
+                continue
+            if key in pending:
+                pending[key].append(idx)
+                continue
+            cached = self._get_cached_decision(key)
+            if cached is not None:
+                decisions[idx] = cached
+            else:
+                pending[key] = [idx]
+
+        if pending:
+            to_generate = [incidents[positions[0]] for positions in pending.values()]
+            logger.info(f"Batch: {len(incidents)} incidents, {len(to_generate)} to generate")
+
+            if self.mock_mode or self.async_transport is None:
+                try:
+                    async with (model_slot(to_generate) if model_slot is not None else nullcontext()):
+                        generated = await asyncio.to_thread(
+                            self._generate_decisions, to_generate, concurrency_limit
+                        )
+                    # The SDK multi-prompt call serves a single model, so it skips the cascade
+                    generated = [self._tag_tier(decision, "large") for decision in generated]
+                except Exception as e:
+                    logger.warning(f"Batch generation not admitted: {e}")
+                    generated = [self._get_fallback_decision(str(e)) for _ in to_generate]
+            else:
+                semaphore = asyncio.Semaphore(concurrency_limit)
+
+                async def generate_one(incident: Dict[str, str]) -> ModelDecision:
+                    async with semaphore:
+                        try:
+                            async with (model_slot([incident]) if model_slot is not None else nullcontext()):
+                                return await self._agenerate_tiered(**incident)
+                        except Exception as e:
+                            # Only this item falls back; the rest of the batch goes on
+                            logger.warning(f"Batch generation not admitted: {e}")
+                            return self._get_fallback_decision(str(e))
+
+                generated = await asyncio.gather(*[generate_one(i) for i in to_generate])
+
+            for (key, positions), decision in zip(pending.items(), generated):
+                self._store_decision(key, decision)
+                for idx in positions:
+                    decisions[idx] = decision.model_copy()
+
+        return decisions
+
+    def _generate_decisions(
+        self,
+        incidents: List[Dict[str, str]],
+        concurrency_limit: int
+    ) -> List[ModelDecision]:
+        """Blocking batch generation via the SDK's multi-prompt generate_text"""
+        if self.mock_mode:
+            return [self._generate_decision(**incident) for incident in incidents]
+
+        try:
+            prompts = [self._build_prompt(**incident) for incident in incidents]
+            model = self._initialize_model()
+
+            logger.info(f"Sending {len(prompts)} prompts to {self.model_id}")
+            with self._model_call(self.model_id, sum(prompt.tokens for prompt in prompts), calls=len(prompts)):
+                raw_responses = self.resilience.call(
+                    lambda: model.generate_text(
+                        prompt=[prompt.text for prompt in prompts], concurrency_limit=concurrency_limit
+                    )
+                )
+        except Exception as e:
+            logger.error(f"Error in batch generation: {e}", exc_info=True)
+            return [self._get_fallback_decision(str(e)) for _ in incidents]
+
+        decisions = []
+        for incident, prompt, raw_response in zip(incidents, prompts, raw_responses):
+            try:
+                decisions.append(
+                    self._finalize_decision(raw_response, incident["incident_text"], prompt=prompt, model_id=self.model_id)
+                )
+            except Exception as e:
+                logger.error(f"Error finalizing batch item: {e}")
+                decisions.append(self._get_fallback_decision(str(e)))
+        return decisions
+
+    async def astream_decision(
+        self,
+        incident_text: str,
+        category: str,
+        reporter_role: str,
+        runbook_context: str,
+        model_slot: Optional[Callable[[], AsyncContextManager[Any]]] = None
+    ) -> AsyncIterator[Tuple[str, Any]]:
+        """
+        Stream a decision as the model decodes it.
+
+        Yields (event, payload) pairs:
+        - ("routing", {...}): recommended_action and confidence_score as soon
+          as both are decoded, already adjusted by the confidence/ambiguity
+          policy. Provisional - the final decision is authoritative.
+        - ("analysis", {...}) and ("explanation", {...}) as each completes
+        - ("decision", ModelDecision): the fully parsed and validated decision
+
+        Args:
+            incident_text: The incident description
+            category: Incident category
+            reporter_role: Reporter's role
+            runbook_context: Formatted runbook context
+            model_slot: Context manager factory held while the model streams
+                (e.g. an admission slot); fast-path and cached decisions never
+                enter it
+        """
+        settled = self._fast_path_decision(incident_text, category)
+        cache_key = self._cache_key(incident_text, category, reporter_role, runbook_context)
+        if settled is None:
+            settled = self._get_cached_decision(cache_key)
+        if settled is not None:
+            yield "routing", {
+                "recommended_action": settled.recommended_action,
+                "confidence_score": settled.confidence_score,
+                "provisional": False
+            }
+            yield "analysis", {"analysis": settled.analysis}
+            yield "explanation", {"explanation": settled.explanation}
+            yield "decision", settled
+            return
+
+        emitted = set()
+        parts = []
+        parser = IncrementalDecisionParser()
+        try:
+            prompt = self._build_prompt(
+                incident_text=incident_text,
+                category=category,
+                reporter_role=reporter_role,
+                runbook_context=runbook_context
+            )
+
+            async with (model_slot() if model_slot is not None else nullcontext()):
+                with self._model_call(self.model_id, prompt.tokens):
+                    async with aclosing(self._stream_text(prompt.text, incident_text)) as stream:
+                        async for chunk in stream:
+                            parts.append(chunk)
+                            parser.feed(chunk)
+                            fields = parser.fields
+
+                            if "routing" not in emitted and \
+                                    "recommended_action" in fields and "confidence_score" in fields:
+                                emitted.add("routing")
+                                routing = self._provisional_routing(fields, incident_text)
+                                if routing is not None:
+                                    yield "routing", routing
+
+                            for name in ("analysis", "explanation"):
+                                if name not in emitted and name in fields:
+                                    emitted.add(name)
+                                    yield name, {name: fields[name]}
+
+                            if parser.complete:
+                                # Leaving the block closes the stream and cancels the generation
+                                break
+
+            decision = self._finalize_decision("".join(parts), incident_text, parser, prompt, self.model_id)
+
+        except Exception as e:
+            logger.error(f"Error in astream_decision: {e}", exc_info=True)
+            decision = self._get_fallback_decision(str(e))
+
+        self._store_decision(cache_key, decision)
+        yield "decision", decision
+
+    async def _stream_text(self, prompt: str, incident_text: str) -> AsyncIterator[str]:
+        """Yield generated text chunks from the best available source"""
+        if self.mock_mode:
+            raw_response = self._get_mock_response(incident_text)
+            if isinstance(raw_response, dict):
+                raw_response = json.dumps(raw_response)
+            for i in range(0, len(raw_response), 8):
+                await asyncio.sleep(0)
+                yield raw_response[i:i + 8]
+            return
+
+        if self.async_transport is not None:
+            async with aclosing(self.async_transport.generate_stream(
+                prompt, self.model_id, self._generation_params()
+            )) as stream:
+                async for chunk in stream:
+                    yield chunk
+            return
+
+        # SDK fallback: pump the blocking stream from a worker thread
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue()
+        done = object()
+        stop = threading.Event()
+
+        def put(item):
+            # Nobody is reading once the consumer stopped or its loop is gone
+            if stop.is_set() or loop.is_closed():
+                return
+            try:
+                loop.call_soon_threadsafe(queue.put_nowait, item)
+            except RuntimeError:
+                pass  # loop closed since the check
+
+        def produce():
+            if stop.is_set():
+                return  # Consumer left while this was queued for a thread
+            chunks = None
+            try:
+                model = self._initialize_model()
+                chunks = model.generate_text_stream(prompt=prompt)
+                for chunk in chunks:
+                    if stop.is_set():
+                        break
+                    put(chunk)
+            except Exception as e:
+                put(e)
+            finally:
+                try:
+                    # Release the HTTP stream instead of leaving it open, as _collect_decision_text does
+                    close = getattr(chunks, "close", None)
+                    if close is not None:
+                        close()
+                finally:
+                    put(done)
+
+        producer = _stream_executor.submit(produce)
+        try:
+            while True:
+                item = await queue.get()
+                if item is done:
+                    break
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+        finally:
+            stop.set()
+            producer.cancel()
+
+    def _collect_decision_text(self, chunks) -> Tuple[str, IncrementalDecisionParser]:
+        """Consume a blocking stream until the decision object closes, then drop the rest"""
+        parser = IncrementalDecisionParser()
+        parts = []
+        try:
+            for chunk in chunks:
+                parts.append(chunk)
+                if parser.feed(chunk):
+                    break
+        finally:
+            close = getattr(chunks, "close", None)
+            if close is not None:
+                close()
+        return "".join(parts), parser
+
+    async def _acollect_decision_text(
+        self,
+        chunks: AsyncIterator[str]
+    ) -> Tuple[str, IncrementalDecisionParser]:
+        """Consume an async stream until the decision object closes, then cancel the rest"""
+        parser = IncrementalDecisionParser()
+        parts = []
+        async with aclosing(chunks) as stream:
+            async for chunk in stream:
+                parts.append(chunk)
+                if parser.feed(chunk):
+                    break
+        return "".join(parts), parser
+
+    def _provisional_routing(self, fields: Dict[str, Any], incident_text: str) -> Optional[Dict[str, Any]]:
+        """Apply the decision policy to the early action/confidence pair"""
+        try:
+            provisional = ModelDecision(
+                analysis="",
+                recommended_action=fields["recommended_action"],
+                confidence_score=fields["confidence_score"],
+                explanation=""
+            )
+        except Exception:
+            # Invalid action or out-of-range score; the final decision will escalate
+            return None
+
+        provisional = self._validate_decision(provisional, incident_text, record_overrides=False)
+        return {
+            "recommended_action": provisional.recommended_action,
+            "confidence_score": provisional.confidence_score,
+            "provisional": True
+        }
+
+    def _fast_path_decision(self, incident_text: str, category: str) -> Optional[ModelDecision]:
+        """Settle the incident with a deterministic rule, or return None for the model"""
+        if self.rule_engine is None:
+            return None
+
+        match = self.rule_engine.evaluate(
+            incident_text, category, ambiguous=self._detect_ambiguity(incident_text)
+        )
+        if match is None:
+            return None
+
+        rule, fields = match
+        logger.info(f"Decision settled by fast-path rule '{rule}'")
+        decision = ModelDecision(**fields, decision_path="rules", rule=rule)
+        return self._validate_decision(decision, incident_text)
+
+    def _cache_key(self, incident_text: str, category: str, reporter_role: str, runbook_context: str) -> str:
+        """Decision cache key for this incident under the current model, prompt and runbook"""
+        return make_cache_key(
+            incident_text=incident_text,
+            category=category,
+            reporter_role=reporter_role,
+            model_id=self.model_id,
+            prompt_version=self.prompt_version,
+            runbook_context=runbook_context
+        )
+
+    def _get_cached_decision(self, cache_key: str) -> Optional[ModelDecision]:
+        """Return a cached decision marked as a cache hit, or None"""
+        cached = self.decision_cache.get(cache_key)
+        if cached is None:
+            return None
+        logger.info("Serving decision from cache")
+        cached["cache_hit"] = True
+        return ModelDecision(**cached)
+
+    def _store_decision(self, cache_key: str, decision: ModelDecision):
+        """Cache a validated decision (safe fallbacks are never cached)"""
+        if not decision.is_fallback:
+            self.decision_cache.put(cache_key, decision.model_dump())
+
+    def _finalize_decision(
+        self,
+        raw_response,
+        incident_text: str,
+        parser: Optional[IncrementalDecisionParser] = None,
+        prompt: Optional[AssembledPrompt] = None,
+        model_id: Optional[str] = None
+    ) -> ModelDecision:
+        """
+        Parse a raw model response and apply the decision policy.
+
+        Args:
+            raw_response: Raw model output (or mock dict)
+            incident_text: The incident description
+            parser: Parser that already consumed raw_response while streaming
+            prompt: The prompt that produced raw_response (its token count is recorded)
+            model_id: Model that generated raw_response (its output tokens are counted)
+        """
+        if model_id is not None:
+            text = raw_response if isinstance(raw_response, str) else json.dumps(raw_response)
+            MODEL_TOKENS.inc(estimate_tokens(text), model=model_id, kind="completion")
+
+        # Parse response with fallback
+        with STAGE_SECONDS.time(stage="parse"), span("decision.parse"):
+            if parser is not None:
+                decision = self._decision_from_fields(parser.fields, raw_response)
+            else:
+                decision = self._parse_response(raw_response)
+
+        # Validate decision with ambiguity detection
+        with STAGE_SECONDS.time(stage="validate"), span("policy.validate") as policy_span:
+            decision = self._validate_decision(decision, incident_text)
+            policy_span.set_attribute("decision.action", decision.recommended_action)
+            policy_span.set_attribute("decision.confidence", decision.confidence_score)
+        if prompt is not None:
+            decision.prompt_tokens = prompt.tokens
+        return decision
+
+    @contextmanager
+    def _model_call(self, model_id: str, prompt_tokens: int, calls: int = 1) -> Iterator[None]:
+        """Time, trace and count a generation, with its prompt tokens, by outcome"""
+        MODEL_TOKENS.inc(prompt_tokens, model=model_id, kind="prompt")
+        outcome = "error"
+        start = time.perf_counter()
+        with span(
+            "watsonx.generate", kind=KIND_CLIENT, model=model_id, prompt_tokens=prompt_tokens, calls=calls
+        ) as generation_span:
+            try:
+                yield
+                outcome = "ok"
+            except (asyncio.CancelledError, GeneratorExit):
+                outcome = "cancelled"
+                raise
+            finally:
+                generation_span.set_attribute("outcome", outcome)
+                STAGE_SECONDS.observe(time.perf_counter() - start, stage="generation")
+                MODEL_CALLS.inc(calls, model=model_id, outcome=outcome)
+
+    async def aclose(self):
+        """Release pooled HTTP connections, stop token refresh and snapshot the cache"""
+        self.token_manager.stop()
+        self.decision_cache.save_snapshot()
+        if self.async_transport is not None:
+            await self.async_transport.aclose()
+
     def _get_mock_response(self, incident_text: str) -> str:
         """
         Return mock responses for testing.
 
         Simulates both clean JSON and JSON with extra text.
         """
-        incident_lower = incident_text.lower()
+        signals = self.incident_signals.scan(incident_text)
 
         # Ambiguous incident pattern
-        if ("but" in incident_lower and "normal" in incident_lower) or \
-           ("high" in incident_lower and "metrics" in incident_lower and "normal" in incident_lower):
+        if ("contrast" in signals and "normal" in signals) or \
+           ("high_symptom" in signals and "metrics" in signals and "normal" in signals):
             return '''
 Here's the analysis:
 {
@@ -185,7 +858,7 @@ Hope this helps!
 '''
 
         # Clear disk space issue
-        if "disk" in incident_lower and ("99" in incident_text or "95" in incident_text):
+        if "disk" in signals and "critical_usage" in signals:
             return '{"analysis": "Disk space critically low on server", "recommended_action": "clear_logs", "confidence_score": 95, "explanation": "Clear disk space issue with standard remediation available. Low risk for automated cleanup."}'
 
         # Default ambiguous case
@@ -202,40 +875,42 @@ Hope this helps!
         category: str,
         reporter_role: str,
         runbook_context: str
-    ) -> str:
-        """Build the complete prompt for the model"""
-        return self.SYSTEM_PROMPT_TEMPLATE.format(
-            incident_text=incident_text,
-            category=category,
-            reporter_role=reporter_role,
-            runbook_context=runbook_context
-        )
+    ) -> AssembledPrompt:
+        """Build the complete prompt for the model, fitted to the token budget"""
+        with STAGE_SECONDS.time(stage="prompt"), span("prompt.assemble"):
+            prompt = self.prompt_assembler.assemble(
+                incident_text=incident_text,
+                category=category,
+                reporter_role=reporter_role,
+                runbook_context=runbook_context
+            )
+        logger.info("Prompt assembled (%d estimated tokens)", prompt.tokens)
+        return prompt
 
-    def _initialize_model(self) -> Model:
-        """Initialize the watsonx.ai model"""
-        return Model(
-            model_id=self.model_id,
-            params={
-                GenParams.DECODING_METHOD: "greedy",
-                GenParams.MAX_NEW_TOKENS: 500,
-                GenParams.MIN_NEW_TOKENS: 50,
-                GenParams.TEMPERATURE: 0.1,  # Low temperature for consistent JSON
-                GenParams.STOP_SEQUENCES: ["<|endoftext|>", "<|user|>"]
-            },
-            credentials=self.credentials,
-            project_id=self.project_id
-        )
+    def _generation_params(self) -> Dict[str, Any]:
+        """Generation parameters shared by the SDK and REST paths"""
+        return {
+            GenParams.DECODING_METHOD: "greedy",
+            GenParams.MAX_NEW_TOKENS: 500,
+            GenParams.MIN_NEW_TOKENS: 50,
+            GenParams.TEMPERATURE: 0.1,  # Low temperature for consistent JSON
+            GenParams.STOP_SEQUENCES: ["<|endoftext|>", "<|user|>"]
+        }
+
+    def _initialize_model(self, model_id: Optional[str] = None) -> ModelInference:
+        """Get the initialized watsonx.ai model handle from the pool"""
+        return self.model_pool.get(model_id or self.model_id, self._generation_params())
 
     def _parse_response(self, raw_response: str) -> ModelDecision:
         """
         Parse model response with robust JSON extraction.
 
         Strategies:
-        1. Direct JSON parse
-        2. Extract JSON from markdown code blocks
-        3. Find JSON object boundaries and extract
-        4. Regex field extraction
-        5. Fallback to safe decision
+        1. Single-pass parse of the first complete decision object (handles
+           bare JSON, markdown fences and surrounding prose; skips malformed
+           objects)
+        2. Regex field extraction
+        3. Fallback to safe decision
 
         Args:
             raw_response: Raw model output
@@ -245,46 +920,32 @@ Hope this helps!
         """
         # Handle dict input from mock
         if isinstance(raw_response, dict):
+            PARSE_STRATEGY.inc(strategy="json")
             return self._create_model_decision(raw_response)
 
-        # Strategy 1: Direct parse
-        try:
-            data = json.loads(raw_response.strip())
-            return self._create_model_decision(data)
-        except (json.JSONDecodeError, TypeError):
-            pass
-
-        # Strategy 2: Extract from markdown code blocks
-        code_block_pattern = r"```(?:json)?\s*(\{.*?\})\s*```"
-        match = re.search(code_block_pattern, raw_response, re.DOTALL)
-        if match:
-            try:
-                data = json.loads(match.group(1))
-                return self._create_model_decision(data)
-            except json.JSONDecodeError:
-                pass
-
-        # Strategy 3: Find JSON object boundaries
-        start_idx = raw_response.find('{')
-        end_idx = raw_response.rfind('}')
+        return self._decision_from_fields(parse_decision_fields(raw_response), raw_response)
 
-        if start_idx != -1 and end_idx != -1 and end_idx > start_idx:
-            json_str = raw_response[start_idx:end_idx + 1]
-            try:
-                data = json.loads(json_str)
-                return self._create_model_decision(data)
-            except json.JSONDecodeError:
-                pass
+    def _decision_from_fields(self, fields: Dict[str, Any], raw_response: str) -> ModelDecision:
+        """Build a decision from parsed fields, falling back to regex extraction"""
+        try:
+            decision = self._create_model_decision(fields)
+            PARSE_STRATEGY.inc(strategy="json")
+            return decision
+        except (ValueError, TypeError) as e:
+            logger.warning(f"Parsed decision object was incomplete or invalid: {e}")
 
-        # Strategy 4: Try to find each field with regex
-        logger.warning("All JSON parsing strategies failed, attempting regex extraction")
+        # Strategy 2: Try to find each field with regex
+        logger.warning("JSON parsing failed, attempting regex extraction")
         try:
-            return self._extract_with_regex(raw_response)
+            decision = self._extract_with_regex(raw_response)
+            PARSE_STRATEGY.inc(strategy="regex")
+            return decision
         except Exception as e:
             logger.error(f"Regex extraction failed: {e}")
 
         # Final fallback
         logger.error(f"Could not parse response: {raw_response[:200]}")
+        PARSE_STRATEGY.inc(strategy="fallback")
         return self._get_fallback_decision("Unable to parse model response as JSON")
 
     def _extract_with_regex(self, text: str) -> ModelDecision:
@@ -330,30 +991,34 @@ Hope this helps!
 
         Returns True if incident appears ambiguous.
         """
-        text_lower = incident_text.lower()
+        # One pass over the text collects every signal used below
+        signals = self.incident_signals.scan(incident_text)
 
         # Pattern 1: "but normal" or similar contradictions
-        if re.search(r'\b(but|however|although)\b.*\bnormal\b', text_lower):
+        if "contrast" in signals and "normal" in signals and \
+                signals["contrast"][0] < signals["normal"][-1]:
             return True
 
         # Pattern 2: High symptom with low/normal metric
-        high_symptom = re.search(r'\b(high|elevated|increased|spike)\b', text_lower)
-        normal_metric = re.search(r'\b(normal|low|stable|within range)\b', text_lower)
-        if high_symptom and normal_metric:
+        if "high_symptom" in signals and ("normal" in signals or "steady_metric" in signals):
             return True
 
         # Pattern 3: Multiple "may be" / "could be" / "possibly"
-        uncertainty_count = len(re.findall(r'\b(may|might|could|possibly|unclear|unknown|intermittent)\b', text_lower))
-        if uncertainty_count >= 2:
+        if len(signals.get("uncertainty", [])) >= 2:
             return True
 
         # Pattern 4: "no clear pattern" or similar
-        if re.search(r'\bno (clear|obvious|apparent) (pattern|cause|reason|indicator)', text_lower):
+        if "no_clear_cause" in signals:
             return True
 
         return False
 
-    def _validate_decision(self, decision: ModelDecision, incident_text: str) -> ModelDecision:
+    def _validate_decision(
+        self,
+        decision: ModelDecision,
+        incident_text: str,
+        record_overrides: bool = True
+    ) -> ModelDecision:
         """
         Validate and enforce decision policy with ambiguity detection.
 
@@ -363,12 +1028,23 @@ Hope this helps!
         - If ambiguity detected, cap confidence at 60
         - If confidence < 90, explanation must not imply auto-resolution
         - Confidence must be 0-100
+
+        Each rule that changes the decision is counted in
+        aegis_policy_overrides_total, and added to the active span as a
+        policy.override event, unless record_overrides is False (provisional
+        routing re-validates later).
         """
+        def override(rule: str):
+            if record_overrides:
+                POLICY_OVERRIDES.inc(rule=rule)
+                current_span().add_event("policy.override", rule=rule)
+
         valid_actions = ["clear_logs", "restart_service", "run_diagnostics", "escalate_to_human"]
 
         # Validate action
         if decision.recommended_action not in valid_actions:
-            logger.warning(f"Invalid action '{decision.recommended_action}', forcing escalation")
+            logger.warning("Invalid action '%s', forcing escalation", decision.recommended_action)
+            override("invalid_action")
             decision.recommended_action = "escalate_to_human"
             decision.confidence_score = min(decision.confidence_score, 10)
 
@@ -378,37 +1054,40 @@ Hope this helps!
             logger.info("Ambiguity detected in incident text")
             # Cap confidence at 60 for ambiguous incidents
             if decision.confidence_score > 60:
-                logger.warning(f"Ambiguous incident but confidence was {decision.confidence_score}, capping at 60")
+                logger.warning("Ambiguous incident but confidence was %s, capping at 60", decision.confidence_score)
+                override("ambiguity_confidence_cap")
                 decision.confidence_score = 60
 
             # Force safe action
             if decision.recommended_action not in ["escalate_to_human", "run_diagnostics"]:
-                logger.warning(f"Ambiguous incident but action was '{decision.recommended_action}', forcing escalation")
+                logger.warning("Ambiguous incident but action was '%s', forcing escalation", decision.recommended_action)
+                override("ambiguity_escalation")
                 decision.recommended_action = "escalate_to_human"
 
         # Enforce confidence threshold policy
         if decision.confidence_score < 80:
             if decision.recommended_action not in ["escalate_to_human", "run_diagnostics"]:
                 logger.warning(
-                    f"Low confidence ({decision.confidence_score}) but action is "
-                    f"'{decision.recommended_action}'. Forcing escalation."
+                    "Low confidence (%s) but action is '%s'. Forcing escalation.",
+                    decision.confidence_score, decision.recommended_action
                 )
+                override("low_confidence_escalation")
                 decision.recommended_action = "escalate_to_human"
 
         # Check for auto-resolution language with confidence < 90
         if decision.confidence_score < 90:
-            auto_resolve_patterns = [
-                r'\bauto[\s-]?resolv',
-                r'\bresolved automatically\b',
-                r'\bcan be resolved\b.*\bautomatically\b',
-                r'\bwill be resolved\b'
-            ]
-            explanation_lower = decision.explanation.lower()
-            for pattern in auto_resolve_patterns:
-                if re.search(pattern, explanation_lower):
-                    logger.warning(f"Confidence < 90 but explanation implies auto-resolution. Updating explanation.")
-                    decision.explanation = decision.explanation + " Requires review before execution."
-                    break
+            signals = self.explanation_signals.scan(decision.explanation)
+            implies_auto_resolution = (
+                "auto_resolve" in signals or
+                "resolved_automatically" in signals or
+                "will_be_resolved" in signals or
+                ("can_be_resolved" in signals and "automatically" in signals and
+                 signals["can_be_resolved"][0] < signals["automatically"][-1])
+            )
+            if implies_auto_resolution:
+                logger.warning("Confidence < 90 but explanation implies auto-resolution. Updating explanation.")
+                override("auto_resolution_caveat")
+                decision.explanation = decision.explanation + " Requires review before execution."
 
         # Clamp confidence score
         decision.confidence_score = max(0, min(100, decision.confidence_score))
@@ -426,7 +1105,9 @@ Hope this helps!
             analysis="System error during AI analysis",
             recommended_action="escalate_to_human",
             confidence_score=10,
-            explanation=f"An error occurred during analysis. Human review required. Error: {error_message[:100]}"
+            explanation=f"An error occurred during analysis. Human review required. Error: {error_message[:100]}",
+            is_fallback=True,
+            decision_path="fallback"
         )
 
     def test_connection(self) -> bool:
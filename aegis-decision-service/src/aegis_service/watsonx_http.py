@@ -0,0 +1,228 @@
+"""
+Async HTTP transport for watsonx.ai text generation
+
+Talks to the watsonx.ai REST API over a pooled httpx.AsyncClient so that
+Granite calls never block the event loop. WatsonxClient uses this transport
+from aget_decision(); when httpx is not installed (or WATSONX_ASYNC_HTTP=0)
+the client falls back to running the blocking SDK call in a worker thread.
+"""
+
+import os
+import json
+import asyncio
+import logging
+from typing import Optional, Dict, Any, AsyncIterator
+
+from .model_pool import IAMTokenManager
+from .prompt_assembler import estimate_tokens
+from .rate_limiter import WATSONX_RATE_LIMIT_RETRIES, WatsonxRateLimiter, parse_retry_after
+from .tracing import inject
+
+try:
+    import httpx
+    HTTPX_AVAILABLE = True
+except ImportError:  # pragma: no cover - httpx ships with requirements.txt
+    httpx = None
+    HTTPX_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# Configuration from environment
+WATSONX_ASYNC_HTTP = os.environ.get("WATSONX_ASYNC_HTTP", "1") == "1"
+WATSONX_API_VERSION = os.environ.get("WATSONX_API_VERSION", "2023-05-29")
+WATSONX_HTTP_TIMEOUT = float(os.environ.get("WATSONX_HTTP_TIMEOUT", "30"))
+WATSONX_HTTP_MAX_CONNECTIONS = int(os.environ.get("WATSONX_HTTP_MAX_CONNECTIONS", "20"))
+
+
+class WatsonxHTTPError(Exception):
+    """Raised when watsonx.ai (or IAM) returns a non-success response"""
+
+    def __init__(self, status_code: int, message: str):
+        super().__init__(f"watsonx.ai returned HTTP {status_code}: {message}")
+        self.status_code = status_code
+
+
+class AsyncWatsonxTransport:
+    """
+    Pooled async client for the watsonx.ai text generation REST API.
+
+    One instance is shared by all requests on a worker, so TLS connections
+    and the IAM bearer token (via IAMTokenManager) are reused across incidents.
+    Every call passes through a WatsonxRateLimiter; HTTP 429s shrink its
+    concurrency limit and the call is retried once there is capacity.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        project_id: Optional[str],
+        token_manager: IAMTokenManager,
+        transport: Optional["httpx.AsyncBaseTransport"] = None,
+        limiter: Optional[WatsonxRateLimiter] = None
+    ):
+        """
+        Args:
+            url: watsonx.ai regional endpoint (e.g. https://us-south.ml.cloud.ibm.com)
+            project_id: watsonx.ai project ID
+            token_manager: Shared IAM token cache
+            transport: Optional httpx transport (used by tests and benchmarks)
+            limiter: Client-side rate limiter (default from WATSONX_RPS/TPS/CONCURRENCY_*)
+        """
+        if not HTTPX_AVAILABLE:
+            raise RuntimeError("httpx is required for the async watsonx transport")
+
+        self.url = url.rstrip("/")
+        self.project_id = project_id
+        self.token_manager = token_manager
+        self.limiter = limiter if limiter is not None else WatsonxRateLimiter()
+
+        self._client = httpx.AsyncClient(
+            timeout=WATSONX_HTTP_TIMEOUT,
+            limits=httpx.Limits(
+                max_connections=WATSONX_HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=WATSONX_HTTP_MAX_CONNECTIONS
+            ),
+            transport=transport
+        )
+
+    async def _get_token(self) -> str:
+        """Return the cached IAM token, exchanging the API key off the event loop if needed"""
+        token = self.token_manager.cached_token()
+        if token is None:
+            token = await asyncio.to_thread(self.token_manager.get_token)
+        return token
+
+    async def generate(self, prompt: str, model_id: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Run a single text generation.
+
+        Args:
+            prompt: Fully rendered prompt
+            model_id: watsonx.ai model ID
+            params: Generation parameters (GenTextParamsMetaNames keys)
+
+        Returns:
+            First entry of the API "results" list (generated_text, token counts, stop_reason)
+
+        Raises:
+            WatsonxHTTPError: On any non-success response (429 only once
+                WATSONX_RATE_LIMIT_RETRIES retries are used up)
+        """
+        cost = self._estimate_cost(prompt, params)
+        for attempt in range(WATSONX_RATE_LIMIT_RETRIES + 1):
+            async with self.limiter.slot(cost) as permit:
+                token = await self._get_token()
+
+                response = await self._client.post(
+                    f"{self.url}/ml/v1/text/generation",
+                    params={"version": WATSONX_API_VERSION},
+                    json={
+                        "model_id": model_id,
+                        "input": prompt,
+                        "parameters": params,
+                        "project_id": self.project_id
+                    },
+                    headers=inject({
+                        "Authorization": f"Bearer {token}",
+                        "Accept": "application/json"
+                    })
+                )
+                if response.status_code == 429:
+                    self.limiter.record_rate_limited(permit, parse_retry_after(response.headers.get("Retry-After")))
+                    if attempt < WATSONX_RATE_LIMIT_RETRIES:
+                        logger.info("watsonx.ai rate limited the request, retrying when there is capacity")
+                        continue
+                if response.status_code >= 400:
+                    raise WatsonxHTTPError(response.status_code, response.text[:200])
+                self.limiter.record_success(permit)
+                break
+
+        results = response.json().get("results") or []
+        if not results:
+            raise WatsonxHTTPError(response.status_code, "response contained no results")
+        return results[0]
+
+    async def generate_text(self, prompt: str, model_id: str, params: Dict[str, Any]) -> str:
+        """Run a single text generation and return only the generated text"""
+        result = await self.generate(prompt, model_id, params)
+        return result.get("generated_text", "")
+
+    async def generate_stream(
+        self,
+        prompt: str,
+        model_id: str,
+        params: Dict[str, Any]
+    ) -> AsyncIterator[str]:
+        """
+        Stream a text generation as it is decoded.
+
+        Closing the iterator early closes the HTTP response, which stops the
+        generation server-side.
+
+        Args:
+            prompt: Fully rendered prompt
+            model_id: watsonx.ai model ID
+            params: Generation parameters (GenTextParamsMetaNames keys)
+
+        Yields:
+            Generated text chunks
+
+        Raises:
+            WatsonxHTTPError: On any non-success response (429 only once
+                WATSONX_RATE_LIMIT_RETRIES retries are used up)
+        """
+        cost = self._estimate_cost(prompt, params)
+        for attempt in range(WATSONX_RATE_LIMIT_RETRIES + 1):
+            # The slot is held until the stream ends: concurrency counts generations in flight
+            async with self.limiter.slot(cost) as permit:
+                token = await self._get_token()
+
+                async with self._client.stream(
+                    "POST",
+                    f"{self.url}/ml/v1/text/generation_stream",
+                    params={"version": WATSONX_API_VERSION},
+                    json={
+                        "model_id": model_id,
+                        "input": prompt,
+                        "parameters": params,
+                        "project_id": self.project_id
+                    },
+                    headers=inject({
+                        "Authorization": f"Bearer {token}",
+                        "Accept": "text/event-stream"
+                    })
+                ) as response:
+                    if response.status_code == 429:
+                        self.limiter.record_rate_limited(
+                            permit, parse_retry_after(response.headers.get("Retry-After"))
+                        )
+                        if attempt < WATSONX_RATE_LIMIT_RETRIES:
+                            logger.info("watsonx.ai rate limited the stream, retrying when there is capacity")
+                            continue
+                    if response.status_code >= 400:
+                        body = await response.aread()
+                        raise WatsonxHTTPError(response.status_code, body.decode("utf-8", "replace")[:200])
+                    self.limiter.record_success(permit)
+
+                    # Server-sent events: "data: {"results": [{"generated_text": "..."}]}"
+                    async for line in response.aiter_lines():
+                        if not line.startswith("data:"):
+                            continue
+                        try:
+                            data = json.loads(line[5:].strip())
+                        except json.JSONDecodeError:
+                            continue
+                        for result in data.get("results") or []:
+                            text = result.get("generated_text")
+                            if text:
+                                yield text
+                    return
+
+    @staticmethod
+    def _estimate_cost(prompt: str, params: Dict[str, Any]) -> int:
+        """Tokens a generation can consume: the prompt plus the output allowance"""
+        return estimate_tokens(prompt) + int(params.get("max_new_tokens", 0))
+
+    async def aclose(self):
+        """Close pooled connections"""
+        await self._client.aclose()
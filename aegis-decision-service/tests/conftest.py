@@ -0,0 +1,16 @@
+"""
+Shared test fixtures
+"""
+
+import pytest
+
+from src.aegis_service.watsonx_client import WatsonxClient
+
+
+@pytest.fixture
+def mock_client() -> WatsonxClient:
+    """WatsonxClient answering from its mock responses, on the blocking path"""
+    client = WatsonxClient()
+    client.mock_mode = True
+    client.async_transport = None
+    return client
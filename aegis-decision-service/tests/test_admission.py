@@ -0,0 +1,169 @@
+"""
+Tests for priority-aware admission control
+
+These tests validate:
+1. Priority comes from reporter role, category and caller
+2. A freed slot goes to the highest-priority waiter, earliest deadline first
+3. A full queue sheds the lowest-priority request: a low-priority newcomer
+   is rejected, a high-priority newcomer displaces a lower waiter
+4. A shed model call gets the safe escalate_to_human response
+5. Only model calls take a slot: a cached decision is answered while every
+   slot is busy
+6. Batch and SSE model calls take slots too, and a shed batch item or
+   stream escalates on its own
+"""
+
+import asyncio
+import json
+from unittest.mock import patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.aegis_service import admission as admission_module
+from src.aegis_service import main
+from src.aegis_service.admission import AdmissionController, AdmissionRejected, request_priority
+from src.aegis_service.decision_cache import DecisionCache
+from src.aegis_service.models import IncidentRequest
+from src.aegis_service.watsonx_client import WatsonxClient
+
+
+@pytest.fixture
+def mock_client(mock_client: WatsonxClient) -> WatsonxClient:
+    """The shared mock client with a private, empty decision cache"""
+    mock_client.decision_cache = DecisionCache(max_size=16)
+    return mock_client
+
+
+def test_priority_from_role_category_and_caller():
+    """Weights add up across role, category and caller"""
+    with patch.object(admission_module, "CALLER_WEIGHTS", {"servicenow": 3}):
+        assert request_priority("SRE", "auth", "ServiceNow") == 2 + 2 + 3
+        assert request_priority("Other", "unknown") == 0
+        assert request_priority(None, None, "someone-else") == 0
+
+
+def test_freed_slot_goes_to_highest_priority_waiter():
+    """Waiters are served by priority, then deadline, not arrival order"""
+    async def scenario():
+        controller = AdmissionController(max_concurrency=1, max_queue=10)
+        order = []
+
+        async def evaluate(name, priority, deadline_at=float("inf")):
+            async with controller.slot(priority, deadline_at):
+                order.append(name)
+
+        await controller.acquire()
+        tasks = [
+            asyncio.create_task(evaluate("low", 0)),
+            asyncio.create_task(evaluate("high-late", 3, deadline_at=200.0)),
+            asyncio.create_task(evaluate("high-soon", 3, deadline_at=100.0)),
+            asyncio.create_task(evaluate("mid", 1))
+        ]
+        await asyncio.sleep(0)
+        assert controller.stats()["queued"] == 4
+        controller.release()
+        await asyncio.gather(*tasks)
+        return order, controller.stats()
+
+    order, stats = asyncio.run(scenario())
+    assert order == ["high-soon", "high-late", "mid", "low"]
+    assert stats["in_flight"] == 0 and stats["admitted"] == 5
+
+
+def test_full_queue_sheds_lowest_priority():
+    """Low-priority newcomers are shed; high-priority ones displace a waiter"""
+    async def scenario():
+        controller = AdmissionController(max_concurrency=1, max_queue=1)
+        await controller.acquire()
+        low_waiter = asyncio.create_task(controller.acquire(priority=1))
+        await asyncio.sleep(0)
+
+        with pytest.raises(AdmissionRejected):
+            await controller.acquire(priority=0)
+
+        high_waiter = asyncio.create_task(controller.acquire(priority=5))
+        await asyncio.sleep(0)
+        with pytest.raises(AdmissionRejected):
+            await low_waiter
+
+        controller.release()
+        await high_waiter
+        controller.release()
+        return controller.stats()
+
+    stats = asyncio.run(scenario())
+    assert stats["shed"] == 2 and stats["evicted"] == 1
+    assert stats["in_flight"] == 0 and stats["queued"] == 0
+
+
+def test_shed_request_gets_escalation_fallback(mock_client):
+    """A request that cannot be queued is answered at once with escalate_to_human"""
+    async def scenario():
+        controller = AdmissionController(max_concurrency=1, max_queue=0)
+        with patch.object(main, "admission", controller), patch.object(main, "watsonx_client", mock_client):
+            async with controller.slot():
+                request = IncidentRequest(incident_text="Disk space at 99% on Server-DB-01", category="storage")
+                return await main._evaluate(request, "trace-shed")
+
+    response = asyncio.run(scenario())
+    assert response.recommended_action == "escalate_to_human"
+    assert response.decision_path == "fallback"
+    assert "Load shed" in response.explanation
+
+
+def test_cached_decision_skips_admission(mock_client):
+    """With every slot taken, a repeat incident is served from the cache and a new one is shed"""
+    async def scenario():
+        controller = AdmissionController(max_concurrency=1, max_queue=0)
+        with patch.object(main, "admission", controller), patch.object(main, "watsonx_client", mock_client):
+            first = await main._evaluate(
+                IncidentRequest(incident_text="Disk space at 99% on Server-DB-01", category="storage"), "trace-first"
+            )
+            async with controller.slot():
+                repeat = await main._evaluate(
+                    IncidentRequest(incident_text="Disk space at 99% on Server-DB-01", category="storage"), "trace-repeat"
+                )
+                new = await main._evaluate(
+                    IncidentRequest(incident_text="Disk space at 97% on Server-DB-02", category="storage"), "trace-new"
+                )
+        return first, repeat, new, controller.stats()
+
+    first, repeat, new, stats = asyncio.run(scenario())
+    assert first.decision_path == "model" and not first.cache_hit
+    assert repeat.decision_path == "model" and repeat.cache_hit
+    assert repeat.recommended_action == first.recommended_action
+    assert new.decision_path == "fallback" and "Load shed" in new.explanation
+    assert stats["admitted"] == 2 and stats["shed"] == 1
+
+
+def test_batch_and_stream_take_admission_slots(mock_client):
+    """Batch and streaming generations are admitted like single requests and shed per response"""
+    controller = AdmissionController(max_concurrency=1, max_queue=0)
+    http = TestClient(main.app)
+    incidents = [
+        {"incident_text": "Disk space at 99% on Server-DB-01", "category": "storage"},
+        {"incident_text": "Login failures for 40 users after certificate rotation", "category": "auth"},
+    ]
+
+    with patch.object(main, "admission", controller), patch.object(main, "watsonx_client", mock_client):
+        admitted = http.post("/evaluate-incidents", json={"incidents": incidents}).json()
+        assert controller.stats()["admitted"] == 1  # one multi-prompt SDK call
+
+        asyncio.run(controller.acquire())  # every slot busy, no queue
+        shed = http.post("/evaluate-incidents", json={"incidents": [
+            {"incident_text": "Disk space at 97% on Server-DB-02", "category": "storage"},
+            {"incident_text": "Disk space at 99% on Server-DB-01", "category": "storage"},
+        ]}).json()
+        stream = http.post(
+            "/evaluate-incident/stream",
+            json={"incident_text": "API latency 900ms after deploy", "category": "latency"}
+        )
+
+    assert [r["decision_path"] for r in admitted["results"]] == ["model", "model"]
+    new, cached = shed["results"]
+    assert new["decision_path"] == "fallback" and "Load shed" in new["explanation"]
+    assert cached["decision_path"] == "model" and cached["cache_hit"]
+    decision = json.loads(stream.text.strip().split("\n\n")[-1].split("data: ", 1)[1])
+    assert decision["decision_path"] == "fallback" and "Load shed" in decision["explanation"]
+    assert controller.stats()["shed"] == 2
@@ -0,0 +1,133 @@
+"""
+Tests for the non-blocking watsonx.ai inference path
+
+These tests validate:
+1. REST responses are parsed and policy-validated like the SDK path
+2. The IAM token is exchanged once and reused
+3. Concurrent evaluations overlap instead of serializing
+"""
+
+import asyncio
+import json
+import time
+
+import httpx
+
+from src.aegis_service.model_pool import IAMTokenManager
+from src.aegis_service.watsonx_client import WatsonxClient
+from src.aegis_service.watsonx_http import AsyncWatsonxTransport
+
+
+GENERATED = json.dumps({
+    "analysis": "Disk space critically low",
+    "recommended_action": "clear_logs",
+    "confidence_score": 95,
+    "explanation": "Log rotation failed; standard cleanup applies."
+})
+
+
+def _token_manager(calls: dict) -> IAMTokenManager:
+    """Token manager with a counting fake IAM exchange"""
+    def fetch():
+        calls["iam"] = calls.get("iam", 0) + 1
+        return {"access_token": "t", "expires_in": 3600}
+
+    return IAMTokenManager("test-key", fetch=fetch, background_refresh=False)
+
+
+def _make_client(delay: float = 0.0, calls: dict = None, status_code: int = 200) -> WatsonxClient:
+    """WatsonxClient wired to an in-process fake watsonx.ai"""
+    calls = calls if calls is not None else {}
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        calls["generate"] = calls.get("generate", 0) + 1
+        await asyncio.sleep(delay)
+        if status_code != 200:
+            return httpx.Response(status_code, text="service unavailable")
+        if request.url.path.endswith("/generation_stream"):
+            events = "".join(
+                f'data: {json.dumps({"results": [{"generated_text": GENERATED[i:i + 16]}]})}\n\n'
+                for i in range(0, len(GENERATED), 16)
+            )
+            return httpx.Response(200, text=events, headers={"Content-Type": "text/event-stream"})
+        return httpx.Response(200, json={"results": [{"generated_text": GENERATED}]})
+
+    client = WatsonxClient()
+    client.mock_mode = False
+    client.async_transport = AsyncWatsonxTransport(
+        url="https://watsonx.test",
+        project_id="test-project",
+        token_manager=_token_manager(calls),
+        transport=httpx.MockTransport(handler)
+    )
+    return client
+
+
+def test_async_decision_parses_and_validates():
+    """REST output goes through _parse_response and _validate_decision"""
+    client = _make_client()
+
+    async def run():
+        try:
+            return await client.aget_decision(
+                incident_text="Disk at 99% on Server-DB-01, log rotation failed",
+                category="storage",
+                reporter_role="SRE",
+                runbook_context=""
+            )
+        finally:
+            await client.aclose()
+
+    decision = asyncio.run(run())
+    assert decision.recommended_action == "clear_logs"
+    assert decision.confidence_score == 95
+
+
+def test_iam_token_reused_across_requests():
+    """Token exchange happens once per transport, not once per incident"""
+    calls = {}
+    client = _make_client(calls=calls)
+
+    async def run():
+        try:
+            for i in range(3):
+                await client.aget_decision(f"Disk at 9{i}% on host-{i}", "storage", "SRE", "")
+        finally:
+            await client.aclose()
+
+    asyncio.run(run())
+    assert calls["iam"] == 1
+    assert calls["generate"] == 3
+
+
+def test_concurrent_decisions_overlap():
+    """Ten 100ms generations on one event loop finish in well under 1s"""
+    client = _make_client(delay=0.1)
+
+    async def run():
+        try:
+            await asyncio.gather(*[
+                client.aget_decision("Disk at 99% on host", "storage", "SRE", "")
+                for _ in range(10)
+            ])
+        finally:
+            await client.aclose()
+
+    start = time.perf_counter()
+    asyncio.run(run())
+    assert time.perf_counter() - start < 0.5
+
+
+def test_http_error_returns_fallback():
+    """Non-success responses become the safe escalation fallback"""
+    client = _make_client(status_code=503)
+
+    async def run():
+        try:
+            return await client.aget_decision("Disk at 99% on host", "storage", "SRE", "")
+        finally:
+            await client.aclose()
+
+    decision = asyncio.run(run())
+    assert decision.recommended_action == "escalate_to_human"
+    assert decision.confidence_score == 10
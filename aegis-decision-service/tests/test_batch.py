@@ -0,0 +1,178 @@
+"""
+Tests for the batch evaluation endpoint
+
+These tests validate:
+1. One IncidentResponse per input, in order, each with its own trace_id
+2. Runbook context is retrieved once per distinct incident (once per
+   category for full runbooks), at most BATCH_CONCURRENCY at a time, and
+   each prompt gets the runbook sections ranked for its own incident
+3. Every item goes through the confidence/ambiguity policy
+4. A bad item falls back on its own without failing the batch
+"""
+
+import threading
+import time
+
+from fastapi.testclient import TestClient
+from unittest.mock import patch
+
+from src.aegis_service import main
+from src.aegis_service import runbook_context as runbook_module
+from src.aegis_service.decision_cache import DecisionCache
+from src.aegis_service.runbook_context import get_runbook_context
+from src.aegis_service.watsonx_client import WatsonxClient
+
+GOOD = '{"analysis": "Disk full", "recommended_action": "clear_logs", "confidence_score": 95, "explanation": "Rotate logs."}'
+
+
+class FakeModel:
+    """Stands in for ModelInference.generate_text with a list of prompts"""
+
+    def __init__(self, outputs):
+        self.outputs = outputs
+        self.calls = []
+
+    def generate_text(self, prompt, concurrency_limit=8):
+        self.calls.append((prompt, concurrency_limit))
+        return self.outputs[:len(prompt)]
+
+
+def _sdk_client(model: FakeModel) -> WatsonxClient:
+    client = WatsonxClient()
+    client.mock_mode = False
+    client.async_transport = None
+    client.decision_cache = DecisionCache(max_size=0)
+    client._initialize_model = lambda: model
+    return client
+
+
+def test_batch_returns_one_result_per_incident():
+    """Results are in request order with unique trace_ids"""
+    model = FakeModel([GOOD, GOOD, GOOD])
+    incidents = [
+        {"incident_text": "Disk space at 99% on Server-DB-01", "category": "storage"},
+        {"incident_text": "Disk space at 97% on Server-DB-02", "category": "storage"},
+        {"incident_text": "Login failures for all users", "category": "auth"},
+    ]
+
+    with patch.object(main, "watsonx_client", _sdk_client(model)), \
+            patch.object(main, "get_runbook_context", return_value="runbook") as runbooks:
+        response = TestClient(main.app).post("/evaluate-incidents", json={"incidents": incidents})
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["count"] == 3
+    assert len({r["trace_id"] for r in data["results"]}) == 3
+
+    # One runbook lookup per incident, one multi-prompt SDK call
+    assert runbooks.call_count == 3
+    assert len(model.calls) == 1
+    assert len(model.calls[0][0]) == 3
+
+
+def test_batch_same_category_incidents_get_their_own_sections():
+    """Two storage incidents are not sent the sections ranked for the other"""
+    model = FakeModel([GOOD, GOOD])
+    texts = [
+        "Disk space at 99% on /var, log rotation failed",
+        "SAN replication lag and NFS mount stale handles",
+    ]
+    expected = [get_runbook_context("storage", text) for text in texts]
+    assert expected[0] != expected[1]
+
+    with patch.object(main, "watsonx_client", _sdk_client(model)):
+        data = TestClient(main.app).post(
+            "/evaluate-incidents",
+            json={"incidents": [{"incident_text": text, "category": "storage"} for text in texts]}
+        ).json()
+
+    prompts = model.calls[0][0]
+    for prompt, text, own, other in zip(prompts, texts, expected, reversed(expected)):
+        assert text in prompt
+        assert own in prompt and other not in prompt
+    assert [r["runbook_context"] for r in data["results"]] == [context[:500] for context in expected]
+
+
+def test_batch_full_runbooks_looked_up_once_per_category():
+    """With RUNBOOK_RETRIEVAL=full, same-category incidents share one lookup"""
+    model = FakeModel([GOOD, GOOD, GOOD])
+    incidents = [
+        {"incident_text": "Disk space at 99% on Server-DB-01", "category": "storage"},
+        {"incident_text": "SAN replication lag on Server-DB-02", "category": "storage"},
+        {"incident_text": "Login failures for all users", "category": "auth"},
+    ]
+
+    with patch.object(main, "watsonx_client", _sdk_client(model)), \
+            patch.object(runbook_module, "RUNBOOK_RETRIEVAL", "full"), \
+            patch.object(main, "get_runbook_context", side_effect=lambda category, incident_text: category) as runbooks:
+        data = TestClient(main.app).post("/evaluate-incidents", json={"incidents": incidents}).json()
+
+    assert runbooks.call_count == 2
+    assert [r["runbook_context"] for r in data["results"]] == ["storage", "storage", "auth"]
+
+
+def test_batch_runbook_lookups_bounded():
+    """No more than BATCH_CONCURRENCY runbook lookups run at once"""
+    model = FakeModel([GOOD] * 6)
+    lock = threading.Lock()
+    running = []
+    peak = []
+
+    def slow_lookup(category, incident_text):
+        with lock:
+            running.append(incident_text)
+            peak.append(len(running))
+        time.sleep(0.05)
+        with lock:
+            running.remove(incident_text)
+        return "runbook"
+
+    incidents = [{"incident_text": f"Disk space at 9{i}% on Server-DB-0{i}", "category": "storage"} for i in range(6)]
+    with patch.object(main, "watsonx_client", _sdk_client(model)), \
+            patch.object(main, "BATCH_CONCURRENCY", 2), \
+            patch.object(main, "get_runbook_context", side_effect=slow_lookup) as runbooks:
+        response = TestClient(main.app).post("/evaluate-incidents", json={"incidents": incidents})
+
+    assert response.status_code == 200
+    assert runbooks.call_count == 6
+    assert max(peak) == 2
+
+
+def test_batch_applies_policy_and_per_item_fallback():
+    """Ambiguous items are capped and unparseable items escalate individually"""
+    model = FakeModel([GOOD, GOOD, "Sorry, I cannot help with that."])
+    incidents = [
+        {"incident_text": "Disk space at 99% on Server-DB-01", "category": "storage"},
+        {"incident_text": "Latency high but metrics look normal", "category": "latency"},
+        {"incident_text": "Something odd happened on host", "category": "unknown"},
+    ]
+
+    with patch.object(main, "watsonx_client", _sdk_client(model)):
+        data = TestClient(main.app).post("/evaluate-incidents", json={"incidents": incidents}).json()
+
+    clear, ambiguous, broken = data["results"]
+    assert clear["recommended_action"] == "clear_logs"
+    assert ambiguous["confidence_score"] <= 60
+    assert ambiguous["recommended_action"] == "escalate_to_human"
+    assert broken["recommended_action"] == "escalate_to_human"
+    assert broken["confidence_score"] == 10
+
+
+def test_batch_duplicates_generated_once():
+    """Identical incidents within a batch share one generation"""
+    model = FakeModel([GOOD])
+    incident = {"incident_text": "Disk space at 99% on Server-DB-01", "category": "storage"}
+
+    with patch.object(main, "watsonx_client", _sdk_client(model)):
+        data = TestClient(main.app).post(
+            "/evaluate-incidents", json={"incidents": [incident] * 4}
+        ).json()
+
+    assert data["count"] == 4
+    assert len(model.calls[0][0]) == 1
+
+
+def test_empty_batch_rejected():
+    """An empty incidents list is a validation error"""
+    response = TestClient(main.app).post("/evaluate-incidents", json={"incidents": []})
+    assert response.status_code == 422
@@ -0,0 +1,122 @@
+"""
+Tests for NDJSON streaming bulk evaluation
+
+These tests validate:
+1. Every non-blank input line produces exactly one result line
+2. Invalid lines are reported without stopping the stream
+3. Line splitting handles chunk boundaries and oversized lines
+4. An evaluation or body-read failure becomes an error line tagged with its
+   line number, and closing the stream waits for the workers to stop
+"""
+
+import asyncio
+import json
+
+from fastapi.testclient import TestClient
+from unittest.mock import patch, MagicMock, AsyncMock
+
+from src.aegis_service import main
+from src.aegis_service.bulk_stream import evaluate_ndjson_stream, iter_ndjson_lines
+from src.aegis_service.models import ModelDecision
+
+
+def _mock_client() -> MagicMock:
+    mock = MagicMock()
+    mock.aget_decision = AsyncMock(return_value=ModelDecision(
+        analysis="Disk space critically low",
+        recommended_action="clear_logs",
+        confidence_score=95,
+        explanation="Log rotation failed."
+    ))
+    return mock
+
+
+def test_stream_returns_one_result_per_line():
+    """Valid and invalid lines each produce a result tagged with the line number"""
+    body = "\n".join([
+        json.dumps({"incident_text": f"Disk space at 9{i}% on Server-DB-0{i}", "category": "storage"})
+        for i in range(5)
+    ] + ["", '{"incident_text": "short"}', "not json"]) + "\n"
+
+    with patch.object(main, "watsonx_client", _mock_client()):
+        response = TestClient(main.app).post(
+            "/evaluate-incidents/stream",
+            content=body,
+            headers={"Content-Type": "application/x-ndjson"}
+        )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+
+    results = [json.loads(line) for line in response.text.splitlines()]
+    assert len(results) == 7
+    by_line = {r["line"]: r for r in results}
+    assert set(by_line) == {1, 2, 3, 4, 5, 7, 8}
+    assert all(by_line[i]["recommended_action"] == "clear_logs" for i in range(1, 6))
+    assert "error" in by_line[7] and "error" in by_line[8]
+    assert len({by_line[i]["trace_id"] for i in range(1, 6)}) == 5
+
+
+def test_line_splitting_across_chunks():
+    """Lines split across chunks are reassembled; oversized lines are flagged"""
+    async def chunks():
+        for chunk in [b'{"a":', b' 1}\n{"b"', b': 2}\n', b"x" * 50, b"\n", b'{"c": 3}']:
+            yield chunk
+
+    async def collect():
+        return [item async for item in iter_ndjson_lines(chunks(), max_line_bytes=20)]
+
+    lines = asyncio.run(collect())
+    assert lines == [(1, b'{"a": 1}'), (2, b'{"b": 2}'), (3, None), (4, b'{"c": 3}')]
+
+
+def test_failures_become_error_lines():
+    """A failing evaluation and a broken body each yield an error line, and the rest still stream"""
+    async def lines():
+        for n in range(1, 5):
+            yield n, b"{}"
+        raise ConnectionError("client reset")
+
+    async def evaluate_line(line_number, line):
+        if line_number == 2:
+            raise RuntimeError("model exploded")
+        return {"line": line_number, "recommended_action": "clear_logs"}
+
+    async def collect():
+        return [json.loads(out) async for out in evaluate_ndjson_stream(lines(), evaluate_line, workers=2)]
+
+    by_line = {r["line"]: r for r in asyncio.run(collect())}
+    assert set(by_line) == {1, 2, 3, 4, 5}
+    assert "model exploded" in by_line[2]["error"]
+    assert "client reset" in by_line[5]["error"]
+    assert all(by_line[n]["recommended_action"] == "clear_logs" for n in (1, 3, 4))
+
+
+def test_closing_stream_stops_workers():
+    """Closing the stream after the first result cancels and awaits in-flight evaluations"""
+    started, stopped = [], []
+
+    async def lines():
+        for n in range(1, 10):
+            yield n, b"{}"
+
+    async def evaluate_line(line_number, line):
+        started.append(line_number)
+        try:
+            if line_number > 1:
+                await asyncio.sleep(10)
+            return {"line": line_number}
+        finally:
+            stopped.append(line_number)
+
+    async def first_then_close():
+        stream = evaluate_ndjson_stream(lines(), evaluate_line, workers=3)
+        first = await stream.__anext__()
+        await stream.aclose()
+        # Nothing is left running once aclose() returns
+        return first, list(started), list(stopped)
+
+    first, started_at_close, stopped_at_close = asyncio.run(first_then_close())
+    assert json.loads(first) == {"line": 1}
+    assert {1, 2, 3} <= set(started_at_close)
+    assert sorted(stopped_at_close) == sorted(started_at_close)
@@ -0,0 +1,143 @@
+"""
+Tests for the confidence-gated model cascade
+
+These tests validate:
+1. A small-model decision outside the uncertainty band is kept and the
+   large model is never called
+2. A borderline small-model decision is re-evaluated by the large model
+3. A small-model failure (safe fallback) is escalated to the large model
+4. The /evaluate response reports the model and tier that decided
+"""
+
+import asyncio
+import json
+from unittest.mock import patch
+
+import httpx
+from fastapi.testclient import TestClient
+
+from src.aegis_service import main
+from src.aegis_service.model_pool import IAMTokenManager
+from src.aegis_service.models import ModelDecision
+from src.aegis_service.watsonx_client import WatsonxClient
+from src.aegis_service.watsonx_http import AsyncWatsonxTransport
+
+SMALL = "ibm/granite-3-2b-instruct"
+LARGE = "ibm/granite-3-8b-instruct"
+
+
+def _generated(confidence: int) -> str:
+    return json.dumps({
+        "recommended_action": "clear_logs",
+        "confidence_score": confidence,
+        "analysis": "Disk space critically low",
+        "explanation": "Log rotation failed; standard cleanup applies."
+    })
+
+
+def _cascade_client(answers: dict, calls: list) -> WatsonxClient:
+    """Client whose fake watsonx.ai answers per model ID (None = HTTP 500)"""
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        model_id = json.loads(request.content)["model_id"]
+        calls.append(model_id)
+        if answers[model_id] is None:
+            return httpx.Response(500, json={"errors": [{"code": "internal_error"}]})
+        event = json.dumps({"results": [{"generated_text": _generated(answers[model_id])}]})
+        return httpx.Response(200, text=f"data: {event}\n\n")
+
+    client = WatsonxClient()
+    client.mock_mode = False
+    client.model_id = LARGE
+    client.cascade = True
+    client.small_model_id = SMALL
+    client.cascade_band = (60, 90)
+    client.resilience.max_attempts = 1
+    client.async_transport = AsyncWatsonxTransport(
+        url="https://watsonx.test",
+        project_id="test-project",
+        token_manager=IAMTokenManager(
+            "test-key", fetch=lambda: {"access_token": "t", "expires_in": 3600}, background_refresh=False
+        ),
+        transport=httpx.MockTransport(handler)
+    )
+    return client
+
+
+def _decide(client: WatsonxClient, incident_text: str) -> ModelDecision:
+    async def run():
+        try:
+            return await client.aget_decision(
+                incident_text=incident_text,
+                category="storage",
+                reporter_role="SRE",
+                runbook_context=""
+            )
+        finally:
+            await client.aclose()
+
+    return asyncio.run(run())
+
+
+def test_confident_small_decision_is_kept():
+    """Confidence 95 is above the band, so the small model's answer stands"""
+    calls = []
+    client = _cascade_client({SMALL: 95, LARGE: 95}, calls)
+
+    decision = _decide(client, "Disk at 99% on Server-DB-01, log rotation failed")
+
+    assert calls == [SMALL]
+    assert decision.model_tier == "small" and decision.model_id == SMALL
+    assert decision.confidence_score == 95
+
+
+def test_borderline_decision_goes_to_large_model():
+    """Confidence 75 is inside the band, so the large model decides"""
+    calls = []
+    client = _cascade_client({SMALL: 75, LARGE: 93}, calls)
+
+    decision = _decide(client, "Disk at 97% on Server-APP-02, log rotation failed")
+
+    assert calls == [SMALL, LARGE]
+    assert decision.model_tier == "large" and decision.model_id == LARGE
+    assert decision.confidence_score == 93
+    assert client.tier_counts == {"small": 1, "large": 1}
+
+
+def test_small_model_failure_escalates_to_large_model():
+    """A safe fallback from the small model is not final; the large model is asked"""
+    calls = []
+    client = _cascade_client({SMALL: None, LARGE: 92}, calls)
+
+    decision = _decide(client, "Disk at 98% on Server-WEB-03, log rotation failed")
+
+    assert calls == [SMALL, LARGE]
+    assert not decision.is_fallback
+    assert decision.model_tier == "large"
+
+
+def test_response_reports_deciding_tier(mock_client):
+    """/evaluate returns the small model's ID and tier when it settled the incident"""
+    decision = ModelDecision(
+        recommended_action="clear_logs",
+        confidence_score=95,
+        analysis="Disk space critically low",
+        explanation="Log rotation failed; standard cleanup applies.",
+        model_id=SMALL,
+        model_tier="small"
+    )
+
+    async def small_decision(**kwargs):
+        return decision.model_copy()
+
+    mock_client.aget_decision = small_decision
+
+    with patch.object(main, "watsonx_client", mock_client):
+        data = TestClient(main.app).post(
+            "/evaluate-incident",
+            json={"incident_text": "Disk at 99% on Server-DB-01, log rotation failed", "category": "storage"}
+        ).json()
+
+    assert data["decision_path"] == "model"
+    assert data["model_tier"] == "small"
+    assert data["model_id"] == SMALL
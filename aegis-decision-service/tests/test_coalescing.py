@@ -0,0 +1,157 @@
+"""
+Tests for single-flight coalescing of identical in-flight incidents
+
+These tests validate:
+1. Concurrent identical requests share one model call but keep their own trace_id
+2. Different incidents are not merged
+3. Failures propagate to every attached caller
+4. Only the model call is shared: a follower whose leader was shed runs the
+   call under its own priority, deadline and trace
+"""
+
+import asyncio
+
+import httpx
+import pytest
+from unittest.mock import patch, MagicMock
+
+from src.aegis_service import admission as admission_module
+from src.aegis_service import main
+from src.aegis_service.admission import AdmissionController, AdmissionRejected, request_priority
+from src.aegis_service.coalescing import SingleFlight
+from src.aegis_service.models import IncidentRequest, ModelDecision
+
+
+def _slow_client(calls: list) -> MagicMock:
+    async def aget_decision(**kwargs):
+        calls.append(kwargs["incident_text"])
+        await asyncio.sleep(0.1)
+        return ModelDecision(
+            analysis="Disk space critically low",
+            recommended_action="clear_logs",
+            confidence_score=95,
+            explanation="Log rotation failed."
+        )
+
+    mock = MagicMock()
+    mock.aget_decision = aget_decision
+    return mock
+
+
+async def _post_many(payloads):
+    transport = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as http:
+        responses = await asyncio.gather(*[
+            http.post("/evaluate-incident", json=payload) for payload in payloads
+        ])
+    return [r.json() for r in responses]
+
+
+def test_identical_concurrent_requests_share_one_call():
+    """Ten identical payloads -> one model call, ten distinct trace_ids"""
+    calls = []
+    payload = {"incident_text": "Disk space at 99% on Server-DB-01", "category": "storage"}
+
+    with patch.object(main, "watsonx_client", _slow_client(calls)), \
+            patch.object(main, "single_flight", SingleFlight()) as flight:
+        results = asyncio.run(_post_many([payload] * 10))
+
+    assert len(calls) == 1
+    assert len({r["trace_id"] for r in results}) == 10
+    assert sum(r["coalesced"] for r in results) == 9
+    assert all(r["recommended_action"] == "clear_logs" for r in results)
+    assert flight.stats()["hits"] == 9
+    assert flight.stats()["misses"] == 1
+
+
+def test_different_incidents_not_merged():
+    """Distinct incident texts each get their own evaluation"""
+    calls = []
+    payloads = [
+        {"incident_text": f"Disk space at 9{i}% on Server-DB-0{i}", "category": "storage"}
+        for i in range(3)
+    ]
+
+    with patch.object(main, "watsonx_client", _slow_client(calls)), \
+            patch.object(main, "single_flight", SingleFlight()):
+        results = asyncio.run(_post_many(payloads))
+
+    assert len(calls) == 3
+    assert not any(r["coalesced"] for r in results)
+
+
+def test_failure_propagates_to_attached_callers():
+    """Every caller attached to a failed evaluation sees the exception"""
+    flight = SingleFlight()
+
+    async def failing():
+        await asyncio.sleep(0.05)
+        raise RuntimeError("watsonx down")
+
+    async def run():
+        return await asyncio.gather(
+            *[flight.do("key", failing) for _ in range(3)],
+            return_exceptions=True
+        )
+
+    results = asyncio.run(run())
+    assert all(isinstance(r, RuntimeError) for r in results)
+    assert flight.stats()["in_flight"] == 0
+
+
+def test_follower_reruns_when_leader_is_shed():
+    """A high-priority follower is answered by its own model call after its low-priority leader is shed"""
+    calls = []
+    mock_client = MagicMock()
+
+    async def aget_decision(model_slot, **kwargs):
+        async with model_slot():
+            calls.append(kwargs["incident_text"])
+            await asyncio.sleep(0.05)
+            return ModelDecision(
+                analysis="Disk space critically low",
+                recommended_action="clear_logs",
+                confidence_score=95,
+                explanation="Log rotation failed."
+            )
+
+    mock_client.aget_decision = aget_decision
+    request = IncidentRequest(incident_text="Disk space at 99% on Server-DB-01", category="storage")
+    priority = request_priority(request.reporter_role, request.category)
+
+    async def wait_for(condition):
+        while not condition():
+            await asyncio.sleep(0.005)
+
+    async def scenario():
+        controller = AdmissionController(max_concurrency=1, max_queue=1)
+        flight = SingleFlight()
+        with patch.object(main, "admission", controller), \
+                patch.object(main, "single_flight", flight), \
+                patch.object(main, "watsonx_client", mock_client), \
+                patch.object(admission_module, "CALLER_WEIGHTS", {"servicenow": 3}):
+            await controller.acquire()
+            leader = asyncio.create_task(main._evaluate(request, "trace-leader"))
+            await wait_for(lambda: controller.stats()["queued"] == 1)
+            follower = asyncio.create_task(main._evaluate(request, "trace-follower", caller="ServiceNow"))
+            await wait_for(lambda: flight.stats()["hits"] == 1)
+
+            # Outranks the leader but not the follower, so it evicts the leader and is then
+            # evicted by the follower's own call
+            displacer = asyncio.create_task(controller.acquire(priority=priority + 1))
+            leader_response = await leader
+            await wait_for(lambda: flight.stats()["reruns"] == 1)
+            with pytest.raises(AdmissionRejected):
+                await displacer
+            controller.release()
+            return leader_response, await follower, flight.stats()
+
+    leader, follower, stats = asyncio.run(scenario())
+    assert leader.decision_path == "fallback" and "Load shed" in leader.explanation
+    assert follower.decision_path == "model"
+    assert follower.recommended_action == "clear_logs"
+    assert follower.trace_id == "trace-follower"
+    assert not follower.coalesced
+    assert "queue" in follower.deadline.stages
+    assert calls == ["Disk space at 99% on Server-DB-01"]
+    assert stats["reruns"] == 1 and stats["in_flight"] == 0
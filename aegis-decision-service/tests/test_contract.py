@@ -9,12 +9,19 @@ These tests validate:
 
 import pytest
 from fastapi.testclient import TestClient
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch, MagicMock, AsyncMock
 
 from src.aegis_service.main import app
 from src.aegis_service.models import ModelDecision
 
 
+def _mock_watsonx_client():
+    """Mock client whose async entry point delegates to the sync get_decision mock"""
+    mock = MagicMock()
+    mock.aget_decision = AsyncMock(side_effect=lambda **kwargs: mock.get_decision(**kwargs))
+    return mock
+
+
 @pytest.fixture
 def client():
     """Test client fixture"""
@@ -52,7 +59,7 @@ def test_root_endpoint(client):
     assert "endpoints" in data
 
 
-@patch("src.aegis_service.main.watsonx_client")
+@patch("src.aegis_service.main.watsonx_client", new_callable=_mock_watsonx_client)
 def test_evaluate_incident_schema_compliance(mock_client, client):
     """Test that response matches exact schema"""
     # Mock watsonx client response
@@ -103,7 +110,7 @@ def test_evaluate_incident_schema_compliance(mock_client, client):
     assert data["policy"]["escalate_threshold"] == 80
 
 
-@patch("src.aegis_service.main.watsonx_client")
+@patch("src.aegis_service.main.watsonx_client", new_callable=_mock_watsonx_client)
 def test_confidence_policy_enforcement_low_confidence_wrong_action(mock_client, client):
     """
     Test that low confidence with non-escalate action is overridden.
@@ -144,7 +151,7 @@ def test_confidence_policy_enforcement_low_confidence_wrong_action(mock_client,
         assert data["recommended_action"] == "escalate_to_human"
 
 
-@patch("src.aegis_service.main.watsonx_client")
+@patch("src.aegis_service.main.watsonx_client", new_callable=_mock_watsonx_client)
 def test_high_confidence_auto_execute(mock_client, client):
     """Test high confidence scenario allows auto-execute"""
     mock_client.get_decision.return_value = ModelDecision(
@@ -169,7 +176,7 @@ def test_high_confidence_auto_execute(mock_client, client):
     assert data["recommended_action"] in ["clear_logs", "restart_service", "run_diagnostics"]
 
 
-@patch("src.aegis_service.main.watsonx_client")
+@patch("src.aegis_service.main.watsonx_client", new_callable=_mock_watsonx_client)
 def test_missing_incident_text_returns_400(mock_client, client):
     """Test that missing incident_text returns 400 error"""
     response = client.post(
@@ -183,7 +190,7 @@ def test_missing_incident_text_returns_400(mock_client, client):
     assert response.status_code == 422  # Pydantic validation error
 
 
-@patch("src.aegis_service.main.watsonx_client")
+@patch("src.aegis_service.main.watsonx_client", new_callable=_mock_watsonx_client)
 def test_empty_incident_text_returns_400(mock_client, client):
     """Test that empty incident_text returns validation error"""
     response = client.post(
@@ -197,7 +204,7 @@ def test_empty_incident_text_returns_400(mock_client, client):
     assert response.status_code == 422  # Pydantic validation error
 
 
-@patch("src.aegis_service.main.watsonx_client")
+@patch("src.aegis_service.main.watsonx_client", new_callable=_mock_watsonx_client)
 def test_fallback_on_exception(mock_client, client):
     """Test that service returns safe fallback when watsonx fails"""
     # Mock client throwing exception
@@ -220,7 +227,7 @@ def test_fallback_on_exception(mock_client, client):
     assert data["confidence_score"] <= 50  # Safe fallback has very low confidence
 
 
-@patch("src.aegis_service.main.watsonx_client")
+@patch("src.aegis_service.main.watsonx_client", new_callable=_mock_watsonx_client)
 def test_all_incident_categories(mock_client, client):
     """Test all valid incident categories"""
     categories = ["latency", "storage", "auth", "unknown"]
@@ -246,7 +253,7 @@ def test_all_incident_categories(mock_client, client):
         assert "confidence_score" in data
 
 
-@patch("src.aegis_service.main.watsonx_client")
+@patch("src.aegis_service.main.watsonx_client", new_callable=_mock_watsonx_client)
 def test_reporter_role_included(mock_client, client):
     """Test that reporter_role is handled correctly"""
     mock_client.get_decision.return_value = ModelDecision(
@@ -270,7 +277,7 @@ def test_reporter_role_included(mock_client, client):
     assert mock_client.get_decision.called
 
 
-@patch("src.aegis_service.main.watsonx_client")
+@patch("src.aegis_service.main.watsonx_client", new_callable=_mock_watsonx_client)
 def test_trace_id_uniqueness(mock_client, client):
     """Test that each request gets a unique trace_id"""
     mock_client.get_decision.return_value = ModelDecision(
@@ -0,0 +1,97 @@
+"""
+Tests for request deadline propagation
+
+These tests validate:
+1. The X-Request-Deadline-Ms header sets the budget, capped at
+   REQUEST_DEADLINE_MAX_MS; invalid values use the default
+2. A model call that outlives the deadline is cancelled and the caller gets
+   the escalate_to_human fallback while still waiting
+3. Responses report each stage's budget and usage
+4. The runbook budget caps the Langflow soft deadline
+"""
+
+import asyncio
+import time
+from unittest.mock import patch
+
+from fastapi.testclient import TestClient
+
+from scripts.langflow_stub import LangflowStub
+from src.aegis_service import deadline as deadline_module
+from src.aegis_service import main, runbook_context
+from src.aegis_service.deadline import DEADLINE_HEADER, Deadline
+from src.aegis_service.langflow_client import LangflowClient
+from src.aegis_service.runbook_context import retrieve_runbook_context
+
+INCIDENT = "Disk space at 99% on Server-DB-01. Log rotation failed."
+
+
+def test_header_sets_and_caps_budget():
+    """Header values are honoured up to the cap; bad values use the default"""
+    with patch.object(deadline_module, "REQUEST_DEADLINE_MS", 25000), \
+            patch.object(deadline_module, "REQUEST_DEADLINE_MAX_MS", 60000):
+        assert Deadline.from_header("1500").budget_ms == 1500
+        assert Deadline.from_header("900000").budget_ms == 60000
+        assert Deadline.from_header("soon").budget_ms == 25000
+        assert Deadline.from_header(None).budget_ms == 25000
+
+
+def test_slow_model_returns_fallback_within_deadline(mock_client):
+    """Inference past the deadline is cancelled and escalated to a human"""
+    real_decision = mock_client.aget_decision
+
+    async def slow_decision(**kwargs):
+        await asyncio.sleep(2)
+        return await real_decision(**kwargs)
+
+    mock_client.aget_decision = slow_decision
+
+    with patch.object(main, "watsonx_client", mock_client):
+        start = time.perf_counter()
+        data = TestClient(main.app).post(
+            "/evaluate-incident",
+            json={"incident_text": INCIDENT, "category": "storage"},
+            headers={DEADLINE_HEADER: "400"}
+        ).json()
+        elapsed = time.perf_counter() - start
+
+    assert elapsed < 1.5
+    assert data["recommended_action"] == "escalate_to_human"
+    assert data["decision_path"] == "fallback"
+    assert data["deadline"]["budget_ms"] == 400
+    assert data["deadline"]["exceeded_stage"] == "inference"
+
+
+def test_response_reports_stage_usage(mock_client):
+    """A successful evaluation reports runbook and inference budgets"""
+    with patch.object(main, "watsonx_client", mock_client):
+        data = TestClient(main.app).post(
+            "/evaluate-incident",
+            json={"incident_text": INCIDENT, "category": "storage"},
+            headers={DEADLINE_HEADER: "5000"}
+        ).json()
+
+    deadline = data["deadline"]
+    assert deadline["exceeded_stage"] is None
+    assert set(deadline["stages"]) >= {"runbook", "inference"}
+    runbook = deadline["stages"]["runbook"]
+    assert runbook["budget_ms"] <= 5000 * deadline_module.DEADLINE_RUNBOOK_SHARE
+    assert deadline["stages"]["inference"]["used_ms"] <= deadline["stages"]["inference"]["budget_ms"]
+
+
+def test_runbook_budget_caps_langflow_soft_deadline():
+    """A small runbook budget stops the wait for Langflow early"""
+    stub = LangflowStub(latency=0.5).start()
+    client = LangflowClient(url=stub.url, timeout=2)
+    try:
+        with patch.object(runbook_context, "langflow_client", client), \
+                patch.object(runbook_context, "LANGFLOW_SOFT_DEADLINE_MS", 1000):
+            start = time.perf_counter()
+            retrieval = retrieve_runbook_context("storage", INCIDENT, budget_ms=50)
+            elapsed = time.perf_counter() - start
+    finally:
+        client.close()
+        stub.stop()
+
+    assert retrieval.source == "local" and retrieval.langflow_outcome == "late"
+    assert elapsed < 0.3
@@ -0,0 +1,92 @@
+"""
+Tests for the decision cache
+
+These tests validate:
+1. Repeated incidents are served from cache and flagged as cache hits
+2. LRU and TTL eviction bound the cache
+3. Fallback decisions are never cached
+4. Snapshots survive a restart
+"""
+
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+from unittest.mock import patch
+
+from src.aegis_service.main import app
+from src.aegis_service.decision_cache import DecisionCache, make_cache_key
+from src.aegis_service.watsonx_client import WatsonxClient
+
+
+@pytest.fixture
+def mock_client(mock_client: WatsonxClient) -> WatsonxClient:
+    """The shared mock client with a private, empty decision cache"""
+    mock_client.decision_cache = DecisionCache(max_size=16, ttl=60, snapshot_path=None)
+    return mock_client
+
+
+def test_key_normalizes_case_and_whitespace():
+    """Trivially different re-sends share a key; other fields do not"""
+    base = make_cache_key("Disk space at 99% on Server-DB-01", "storage", "SRE", "m", "v1")
+    assert base == make_cache_key("  disk   SPACE at 99%\non server-db-01 ", "storage", "SRE", "m", "v1")
+    assert base != make_cache_key("Disk space at 99% on Server-DB-01", "storage", "SRE", "m", "v2")
+    assert base != make_cache_key("Disk space at 99% on Server-DB-01", "unknown", "SRE", "m", "v1")
+
+
+def test_repeat_incident_is_cache_hit(mock_client):
+    """Second identical request skips the model and reports cache_hit"""
+    payload = {
+        "incident_text": "Disk space at 99% on Server-DB-01. Log rotation failed.",
+        "category": "storage"
+    }
+
+    with patch("src.aegis_service.main.watsonx_client", mock_client), \
+            patch.object(mock_client, "_get_mock_response", wraps=mock_client._get_mock_response) as generate:
+        client = TestClient(app)
+        first = client.post("/evaluate-incident", json=payload).json()
+        second = client.post("/evaluate-incident", json=payload).json()
+
+    assert first["cache_hit"] is False
+    assert second["cache_hit"] is True
+    assert second["recommended_action"] == first["recommended_action"]
+    assert second["trace_id"] != first["trace_id"]
+    assert generate.call_count == 1
+
+
+def test_lru_and_ttl_eviction():
+    """Oldest entries are evicted past max_size and expired entries miss"""
+    cache = DecisionCache(max_size=2, ttl=60, snapshot_path=None)
+    cache.put("a", {"v": 1})
+    cache.put("b", {"v": 2})
+    cache.get("a")  # a is now most recently used
+    cache.put("c", {"v": 3})
+
+    assert cache.get("b") is None
+    assert cache.get("a") == {"v": 1}
+
+    short = DecisionCache(max_size=2, ttl=0.01, snapshot_path=None)
+    short.put("a", {"v": 1})
+    time.sleep(0.02)
+    assert short.get("a") is None
+
+
+def test_fallback_decisions_not_cached(mock_client):
+    """Errors must not be replayed from cache"""
+    with patch.object(mock_client, "_get_mock_response", side_effect=RuntimeError("boom")):
+        decision = mock_client.get_decision("Disk at 99% on host", "storage", "SRE", "")
+
+    assert decision.is_fallback
+    assert mock_client.decision_cache.stats()["size"] == 0
+
+
+def test_snapshot_round_trip(tmp_path):
+    """Entries written on shutdown are restored by a fresh cache"""
+    path = tmp_path / "cache.json"
+    cache = DecisionCache(max_size=8, ttl=60, snapshot_path=str(path))
+    cache.put("a", {"v": 1})
+    assert cache.save_snapshot() == 1
+
+    restored = DecisionCache(max_size=8, ttl=60, snapshot_path=str(path))
+    assert restored.load_snapshot() == 1
+    assert restored.get("a") == {"v": 1}
@@ -0,0 +1,93 @@
+"""
+Tests for the rule-based fast path
+
+These tests validate:
+1. The shipped rules file compiles and settles textbook incidents
+2. Runbook red flags and other categories fall through to the model
+3. Ambiguous incidents escalate without a model call
+4. The decision path is reported in the API response
+"""
+
+import pytest
+from fastapi.testclient import TestClient
+from unittest.mock import patch
+
+from src.aegis_service.main import app
+from src.aegis_service.decision_cache import DecisionCache
+from src.aegis_service.fast_path import FAST_PATH_RULES, RuleEngine
+from src.aegis_service.watsonx_client import WatsonxClient
+
+TEXTBOOK = "Disk space at 99% on Server-DB-01. /var/log is 95GB. Log rotation failed last night."
+
+
+@pytest.fixture
+def mock_client(mock_client: WatsonxClient) -> WatsonxClient:
+    """The shared mock client with the shipped rules and no decision cache"""
+    mock_client.decision_cache = DecisionCache(max_size=0)
+    mock_client.rule_engine = RuleEngine.from_file(FAST_PATH_RULES)
+    return mock_client
+
+
+def test_rules_match_textbook_incident_only():
+    """Red flags and out-of-scope categories fall through to the model"""
+    engine = RuleEngine.from_file(FAST_PATH_RULES)
+
+    rule, decision = engine.evaluate(TEXTBOOK, "storage", ambiguous=False)
+    assert rule == "storage_log_rotation_failed"
+    assert decision["recommended_action"] == "clear_logs"
+
+    assert engine.evaluate(TEXTBOOK, "auth", ambiguous=False) is None
+    assert engine.evaluate(TEXTBOOK + " Affects the production database.", "storage", ambiguous=False) is None
+    assert engine.evaluate("Disk space at 80% on Server-DB-01", "storage", ambiguous=False) is None
+
+    stats = engine.stats()
+    assert stats["hits"] == {"storage_log_rotation_failed": 1}
+    assert stats["misses"] == 3
+
+
+def test_fast_path_skips_model(mock_client):
+    """Settled incidents report decision_path=rules and never reach the model"""
+    with patch("src.aegis_service.main.watsonx_client", mock_client), \
+            patch.object(mock_client, "_get_mock_response", wraps=mock_client._get_mock_response) as generate:
+        http = TestClient(app)
+        textbook = http.post("/evaluate-incident", json={"incident_text": TEXTBOOK, "category": "storage"}).json()
+        ambiguous = http.post("/evaluate-incident", json={
+            "incident_text": "Database latency high but CPU and memory metrics are normal",
+            "category": "latency"
+        }).json()
+        other = http.post("/evaluate-incident", json={
+            "incident_text": "Login failures for all users after certificate renewal",
+            "category": "auth"
+        }).json()
+
+    assert textbook["decision_path"] == "rules"
+    assert textbook["rule"] == "storage_log_rotation_failed"
+    assert textbook["recommended_action"] == "clear_logs"
+
+    assert ambiguous["decision_path"] == "rules"
+    assert ambiguous["rule"] == "ambiguity"
+    assert ambiguous["recommended_action"] == "escalate_to_human"
+    assert ambiguous["confidence_score"] <= 60
+
+    assert other["decision_path"] == "model"
+    assert other["rule"] is None
+    assert generate.call_count == 1
+
+
+def test_invalid_rule_rejected():
+    """Rules with invalid decisions fail at load time, not per request"""
+    spec = {"rules": [{
+        "name": "bad",
+        "all_of": ["disk"],
+        "decision": {
+            "recommended_action": "reboot_everything",
+            "confidence_score": 99,
+            "analysis": "x",
+            "explanation": "y"
+        }
+    }]}
+    try:
+        RuleEngine.from_dict(spec)
+    except ValueError:
+        return
+    raise AssertionError("invalid rule decision was accepted")
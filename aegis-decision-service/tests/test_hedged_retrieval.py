@@ -0,0 +1,98 @@
+"""
+Tests for hedged runbook retrieval
+
+These tests validate (against scripts/langflow_stub.py):
+1. A fast Langflow answer wins and both sources are timed
+2. A slow Langflow misses the soft deadline: local context is used without
+   waiting, and the late answer still warms the cache
+3. With hedging off, a failing Langflow falls back to local runbooks
+4. The API response records the runbook source
+"""
+
+import time
+from unittest.mock import patch
+
+from fastapi.testclient import TestClient
+
+from scripts.langflow_stub import LangflowStub
+from src.aegis_service import main, runbook_context
+from src.aegis_service.langflow_client import LangflowClient
+from src.aegis_service.runbook_context import retrieve_runbook_context
+
+INCIDENT = "Disk space at 99% on Server-DB-01. Log rotation failed."
+
+
+def _with_stub(stub: LangflowStub):
+    client = LangflowClient(url=stub.url, timeout=2)
+    return client, patch.object(runbook_context, "langflow_client", client)
+
+
+def test_fast_langflow_wins():
+    """Langflow's context is used when it beats the soft deadline"""
+    stub = LangflowStub().start()
+    client, patched = _with_stub(stub)
+    try:
+        with patched, patch.object(runbook_context, "LANGFLOW_SOFT_DEADLINE_MS", 1000):
+            retrieval = retrieve_runbook_context("storage", INCIDENT)
+    finally:
+        client.close()
+        stub.stop()
+
+    assert retrieval.source == "langflow" and retrieval.langflow_outcome == "won"
+    assert "Langflow storage runbook" in retrieval.context
+    assert retrieval.local_ms is not None and retrieval.langflow_ms is not None
+
+
+def test_slow_langflow_misses_deadline_and_warms_cache():
+    """Local context is returned at the deadline; the late answer is cached"""
+    stub = LangflowStub(latency=0.4).start()
+    client, patched = _with_stub(stub)
+    try:
+        with patched, patch.object(runbook_context, "LANGFLOW_SOFT_DEADLINE_MS", 50):
+            start = time.perf_counter()
+            late = retrieve_runbook_context("storage", INCIDENT)
+            elapsed = time.perf_counter() - start
+
+            deadline = time.time() + 2
+            while client.cache.stats()["size"] == 0 and time.time() < deadline:
+                time.sleep(0.02)
+            cached = retrieve_runbook_context("storage", INCIDENT)
+    finally:
+        client.close()
+        stub.stop()
+
+    assert late.source == "local" and late.langflow_outcome == "late"
+    assert late.langflow_ms is None
+    assert elapsed < 0.3
+    assert cached.source == "langflow"
+    assert stub.requests == 1
+
+
+def test_sequential_mode_falls_back_after_failure():
+    """RUNBOOK_HEDGE=0 waits for Langflow, then uses local runbooks"""
+    stub = LangflowStub().start()
+    stub.failing = True
+    client, patched = _with_stub(stub)
+    try:
+        with patched, patch.object(runbook_context, "RUNBOOK_HEDGE", False):
+            retrieval = retrieve_runbook_context("storage", INCIDENT)
+    finally:
+        client.close()
+        stub.stop()
+
+    assert retrieval.source == "local" and retrieval.langflow_outcome == "failed"
+    assert retrieval.langflow_ms is not None
+    assert "[storage]" in retrieval.context
+
+
+def test_response_records_runbook_source(mock_client):
+    """/evaluate-incident reports where the runbook came from"""
+    with patch.object(main, "watsonx_client", mock_client):
+        data = TestClient(main.app).post(
+            "/evaluate-incident",
+            json={"incident_text": INCIDENT, "category": "storage"}
+        ).json()
+
+    assert data["runbook_retrieval"]["source"] == "local"
+    assert data["runbook_retrieval"]["langflow_outcome"] == "disabled"
+    assert data["runbook_retrieval"]["local_ms"] >= 0
@@ -0,0 +1,133 @@
+"""
+Tests for hedged watsonx.ai generations
+
+These tests validate:
+1. A generation slower than the latency percentile is hedged; the fast
+   hedge wins and the slow request is cancelled
+2. No hedge is sent before enough latencies are observed, or when the
+   primary answers in time
+3. The hedge rate cap holds across many slow generations
+4. A failed hedge does not beat a slower successful primary
+"""
+
+import asyncio
+import json
+import time
+
+import httpx
+
+from src.aegis_service.hedging import Hedger
+from src.aegis_service.latency import LatencyWindow
+from src.aegis_service.model_pool import IAMTokenManager
+from src.aegis_service.watsonx_client import WatsonxClient
+from src.aegis_service.watsonx_http import AsyncWatsonxTransport
+
+GENERATED = json.dumps({
+    "recommended_action": "clear_logs",
+    "confidence_score": 95,
+    "analysis": "Disk space critically low",
+    "explanation": "Log rotation failed; standard cleanup applies."
+})
+
+
+def _warm_window(latency_ms: float = 20, count: int = 50) -> LatencyWindow:
+    window = LatencyWindow()
+    for _ in range(count):
+        window.observe(latency_ms)
+    return window
+
+
+def test_slow_generation_is_hedged_and_loser_cancelled():
+    """The first request hangs; the hedge answers and the hung request is cancelled"""
+    state = {"requests": 0, "cancelled": 0}
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        state["requests"] += 1
+        try:
+            await asyncio.sleep(2.0 if state["requests"] == 1 else 0.01)
+        except asyncio.CancelledError:
+            state["cancelled"] += 1
+            raise
+        return httpx.Response(200, text=f'data: {json.dumps({"results": [{"generated_text": GENERATED}]})}\n\n')
+
+    client = WatsonxClient()
+    client.mock_mode = False
+    client.async_transport = AsyncWatsonxTransport(
+        url="https://watsonx.test",
+        project_id="test-project",
+        token_manager=IAMTokenManager(
+            "test-key", fetch=lambda: {"access_token": "t", "expires_in": 3600}, background_refresh=False
+        ),
+        transport=httpx.MockTransport(handler)
+    )
+    client.hedger = Hedger(enabled=True, percentile=95, max_rate=1.0, min_samples=10, latency=_warm_window())
+
+    async def run():
+        try:
+            return await client.aget_decision(
+                incident_text="Disk at 99% on Server-DB-01, log rotation failed",
+                category="storage",
+                reporter_role="SRE",
+                runbook_context=""
+            )
+        finally:
+            await client.aclose()
+
+    start = time.perf_counter()
+    decision = asyncio.run(run())
+    elapsed = time.perf_counter() - start
+
+    assert not decision.is_fallback
+    assert elapsed < 1.0
+    assert state["requests"] == 2 and state["cancelled"] == 1
+    assert client.hedger.hedged == 1 and client.hedger.hedge_wins == 1
+
+
+def test_no_hedge_when_cold_or_fast():
+    """Without enough samples, or with a fast primary, only one request is sent"""
+    calls = {"n": 0}
+
+    async def generation():
+        calls["n"] += 1
+        await asyncio.sleep(0.05)
+        return "ok"
+
+    cold = Hedger(enabled=True, max_rate=1.0, min_samples=100, latency=_warm_window(count=10))
+    assert asyncio.run(cold.run(generation)) == "ok"
+    assert calls["n"] == 1 and cold.hedged == 0
+
+    fast = Hedger(enabled=True, max_rate=1.0, min_samples=10, latency=_warm_window(latency_ms=500))
+    assert asyncio.run(fast.run(generation)) == "ok"
+    assert calls["n"] == 2 and fast.hedged == 0
+
+
+def test_hedge_rate_is_capped():
+    """With max_rate 0.1, twenty slow generations send at most two hedges"""
+    hedger = Hedger(enabled=True, max_rate=0.1, min_samples=10, latency=_warm_window(latency_ms=1, count=1000))
+
+    async def generation():
+        await asyncio.sleep(0.02)
+        return "ok"
+
+    async def run():
+        for _ in range(20):
+            await hedger.run(generation)
+
+    asyncio.run(run())
+    assert 1 <= hedger.hedged <= 2
+
+
+def test_failed_hedge_does_not_win():
+    """The slower primary's success is returned when the hedge errors out"""
+    attempts = {"n": 0}
+
+    async def generation():
+        attempts["n"] += 1
+        if attempts["n"] == 1:
+            await asyncio.sleep(0.1)
+            return "primary"
+        raise ConnectionError("reset")
+
+    hedger = Hedger(enabled=True, max_rate=1.0, min_samples=10, latency=_warm_window())
+    assert asyncio.run(hedger.run(generation)) == "primary"
+    assert hedger.hedged == 1 and hedger.hedge_wins == 0
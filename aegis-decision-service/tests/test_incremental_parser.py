@@ -0,0 +1,85 @@
+"""
+Tests for the incremental decision parser and early generation stop
+
+These tests validate:
+1. The parser handles the formats the old multi-strategy parser accepted
+2. Results do not depend on how the output is split into chunks
+3. Generation is cancelled as soon as the decision object closes
+"""
+
+import asyncio
+import json
+
+from src.aegis_service.incremental_parser import IncrementalDecisionParser, parse_decision_fields
+from src.aegis_service.watsonx_client import WatsonxClient
+
+DECISION = {
+    "recommended_action": "clear_logs",
+    "confidence_score": 95,
+    "analysis": "Disk space \"critically\" low on /var {logs}",
+    "explanation": "Log rotation failed;\nstandard cleanup applies."
+}
+OUTPUT = json.dumps(DECISION, indent=2)
+
+
+def test_parses_bare_fenced_and_wrapped_json():
+    """Markdown fences and surrounding prose are skipped"""
+    for text in [
+        OUTPUT,
+        f"```json\n{OUTPUT}\n```",
+        f"Here's the analysis:\n{OUTPUT}\nHope this helps! {{\"extra\": 1}}",
+    ]:
+        assert parse_decision_fields(text) == DECISION
+
+
+def test_chunking_does_not_change_result():
+    """Single-character chunks split escapes, keys and numbers anywhere"""
+    parser = IncrementalDecisionParser()
+    for char in OUTPUT:
+        parser.feed(char)
+    assert parser.complete
+    assert parser.fields == DECISION
+
+
+def test_skips_malformed_and_incomplete_objects():
+    """Parsing restarts at the next object when one is broken or missing fields"""
+    text = 'Note {the output} follows: {"analysis": "x"} ' + json.dumps(
+        {**DECISION, "confidence_score": "85", "tags": [{"a": "}"}]}
+    )
+    fields = parse_decision_fields(text)
+    assert fields["confidence_score"] == "85"
+    assert fields["tags"] == [{"a": "}"}]
+    assert fields["recommended_action"] == "clear_logs"
+
+
+def test_completes_at_closing_brace():
+    """chars_consumed stops at the closing brace even when trailing text is fed"""
+    parser = IncrementalDecisionParser()
+    assert parser.feed(OUTPUT + "\nHope this helps! Let me know if")
+    assert parser.chars_consumed == len(OUTPUT)
+    assert not IncrementalDecisionParser().feed(OUTPUT[:-1])
+
+
+def test_generation_cancelled_after_object_closes():
+    """Trailing chatter is never pulled and the stream is closed"""
+    pulled = []
+    closed = []
+
+    async def generate_stream():
+        try:
+            for chunk in [OUTPUT[:40], OUTPUT[40:], "\nHope this helps!", " More text."]:
+                pulled.append(chunk)
+                yield chunk
+        finally:
+            closed.append(True)
+
+    client = WatsonxClient()
+    raw_response, parser = asyncio.run(client._acollect_decision_text(generate_stream()))
+
+    assert raw_response == OUTPUT
+    assert len(pulled) == 2
+    assert closed == [True]
+
+    decision = client._finalize_decision(raw_response, "Disk at 99% on Server-DB-01", parser)
+    assert decision.recommended_action == "clear_logs"
+    assert decision.confidence_score == 95
@@ -0,0 +1,104 @@
+"""
+Tests for the Langflow runbook client
+
+These tests validate (against scripts/langflow_stub.py):
+1. Contexts are cached per category + normalized incident text
+2. Repeated failures open the breaker and calls stop reaching Langflow
+3. After the cool-down a successful probe closes the breaker again
+4. With the breaker open, retrieval falls back to local runbooks and the
+   breaker state shows up in /health
+"""
+
+from unittest.mock import patch
+
+from fastapi.testclient import TestClient
+
+from scripts.langflow_stub import LangflowStub
+from src.aegis_service import main, runbook_context
+from src.aegis_service.circuit_breaker import CircuitBreaker
+from src.aegis_service.langflow_client import LangflowClient
+from src.aegis_service.watsonx_client import WatsonxClient
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _client(stub: LangflowStub, clock=None, timeout: float = 1.0) -> LangflowClient:
+    breaker = CircuitBreaker("langflow", failure_threshold=3, cooldown=30, clock=clock or FakeClock())
+    return LangflowClient(url=stub.url, timeout=timeout, breaker=breaker)
+
+
+def test_contexts_cached_per_category_and_incident():
+    """Re-sent incidents are answered from the cache"""
+    stub = LangflowStub().start()
+    client = _client(stub)
+    try:
+        first = client.fetch("storage", "Disk space at 99% on Server-DB-01")
+        again = client.fetch("storage", "  disk space at 99%   on server-db-01 ")
+        other = client.fetch("auth", "Disk space at 99% on Server-DB-01")
+    finally:
+        client.close()
+        stub.stop()
+
+    assert first == again and "Langflow storage runbook" in first
+    assert "Langflow auth runbook" in other
+    assert stub.requests == 2
+    assert client.stats()["cache"]["hits"] == 1
+
+
+def test_breaker_opens_then_recovers_after_cooldown():
+    """Failures and timeouts open the breaker; a probe after the cool-down closes it"""
+    stub = LangflowStub(latency=0.3).start()
+    stub.failing = True
+    clock = FakeClock()
+    client = _client(stub, clock, timeout=0.1)
+    try:
+        assert client.fetch("latency", "timeout 1") is None          # timed out
+        stub.latency = 0.0
+        assert client.fetch("latency", "failure 2") is None          # HTTP 500
+        assert client.fetch("latency", "failure 3") is None
+        assert client.breaker.state == "open"
+
+        requests_when_opened = stub.requests
+        assert client.fetch("latency", "skipped") is None
+        assert stub.requests == requests_when_opened
+
+        stub.failing = False
+        clock.now += 31
+        assert client.fetch("latency", "probe") is not None
+        assert client.breaker.state == "closed"
+    finally:
+        client.close()
+        stub.stop()
+
+    assert client.stats()["failures"] == 3
+    assert client.breaker.stats()["rejected"] == 1
+
+
+def test_open_breaker_falls_back_to_local_and_reports_health():
+    """An unhealthy Langflow costs no time per incident and is visible in health"""
+    stub = LangflowStub().start()
+    stub.failing = True
+    client = _client(stub)
+    try:
+        with patch.object(runbook_context, "langflow_client", client):
+            for i in range(3):
+                runbook_context.get_runbook_context("storage", f"Disk full {i}")
+            requests_when_opened = stub.requests
+            context = runbook_context.get_runbook_context("storage", "Disk space at 99%, log rotation failed")
+
+        with patch.object(main, "langflow_client", client), \
+                patch.object(main, "watsonx_client", WatsonxClient()):
+            health = TestClient(main.app).get("/health").json()
+    finally:
+        client.close()
+        stub.stop()
+
+    assert stub.requests == requests_when_opened
+    assert "[storage]" in context or "Storage" in context
+    assert health["details"]["langflow"]["breaker"]["state"] == "open"
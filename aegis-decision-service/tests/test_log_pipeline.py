@@ -0,0 +1,110 @@
+"""
+Tests for the asynchronous structured logging pipeline
+
+These tests validate:
+1. Records are written as JSON by the listener thread, with `extra` fields,
+   formatted messages, exceptions and the active trace context
+2. Sampling keeps or drops all records of a trace together, never samples
+   unlisted levels, and LOG_SAMPLE_RATES is validated
+3. A full queue drops records and counts them instead of blocking
+"""
+
+import io
+import json
+import logging
+import random
+import uuid
+
+import pytest
+
+from src.aegis_service.log_pipeline import AsyncQueueHandler, LogPipeline, SamplingFilter, parse_sample_rates
+from src.aegis_service.tracing import span
+
+logger = logging.getLogger("aegis_service.test_log_pipeline")
+
+
+@pytest.fixture
+def pipeline():
+    pipeline = LogPipeline()
+    yield pipeline
+    pipeline.stop()
+
+
+def _lines(stream: io.StringIO):
+    return [json.loads(line) for line in stream.getvalue().splitlines()]
+
+
+def test_json_records_written_in_background(pipeline):
+    """extra fields, lazy arguments, exceptions and trace context reach the output"""
+    stream = io.StringIO()
+    pipeline.install(level="INFO", fmt="json", async_writes=True, sample_rates="", stream=stream)
+
+    logger.info("Retrieved runbook context", extra={"trace_id": "t-1", "runbook_length": 1800})
+    logger.warning("Ambiguous incident but confidence was %s, capping at 60", 95)
+    with span("test.request") as request_span:
+        logger.info("Inside a span")
+    try:
+        raise RuntimeError("model timed out")
+    except RuntimeError:
+        logger.error("Error evaluating incident", exc_info=True)
+    logger.debug("Below the root level")
+
+    pipeline.flush()
+    records = {record["message"]: record for record in _lines(stream)}
+
+    first = records["Retrieved runbook context"]
+    assert first["trace_id"] == "t-1"
+    assert first["runbook_length"] == 1800
+    assert first["level"] == "INFO"
+    assert first["logger"] == "aegis_service.test_log_pipeline"
+    assert "Ambiguous incident but confidence was 95, capping at 60" in records
+    assert records["Inside a span"]["trace_id"] == str(uuid.UUID(hex=request_span.trace_id))
+    assert records["Inside a span"]["span_id"] == request_span.span_id
+    assert "RuntimeError: model timed out" in records["Error evaluating incident"]["exception"]
+    assert "Below the root level" not in records
+
+
+def test_sampling_is_per_trace_and_per_level():
+    """A trace's INFO records share one decision; warnings are never sampled"""
+    sampler = SamplingFilter(parse_sample_rates("INFO=0.5"), rng=random.Random(0))
+
+    def record(level: int, trace_id: str) -> logging.LogRecord:
+        entry = logger.makeRecord(logger.name, level, __file__, 0, "msg", None, None)
+        entry.trace_id = trace_id
+        return entry
+
+    kept_traces = 0
+    for n in range(200):
+        trace_id = str(uuid.UUID(int=n * 7919))
+        decisions = {sampler.filter(record(logging.INFO, trace_id)) for _ in range(4)}
+        assert len(decisions) == 1
+        kept_traces += decisions.pop()
+        assert sampler.filter(record(logging.WARNING, trace_id))
+    assert 60 < kept_traces < 140
+    assert sampler.sampled_out == 4 * (200 - kept_traces)
+
+    assert parse_sample_rates("debug=0.01, INFO=1") == {logging.DEBUG: 0.01, logging.INFO: 1.0}
+    with pytest.raises(ValueError):
+        parse_sample_rates("VERBOSE=0.5")
+    with pytest.raises(ValueError):
+        parse_sample_rates("INFO=2")
+
+
+def test_full_queue_drops_instead_of_blocking(pipeline):
+    """Past queue_size records are dropped and counted; the rest are written"""
+    stream = io.StringIO()
+    pipeline.install(level="INFO", fmt="json", async_writes=True, sample_rates="", queue_size=5, stream=stream)
+    # Stop the writer so nothing drains while the queue fills
+    pipeline.listener.stop()
+
+    for n in range(8):
+        logger.info("Burst record %d", n)
+
+    handler = pipeline.handler
+    assert isinstance(handler, AsyncQueueHandler)
+    assert handler.dropped == 3
+    assert pipeline.stats()["dropped"] == 3
+
+    pipeline.listener.start()
+    pipeline.flush()
+    assert [record["message"] for record in _lines(stream)] == [f"Burst record {n}" for n in range(5)]
@@ -0,0 +1,126 @@
+"""
+Tests for the Prometheus metrics subsystem
+
+These tests validate:
+1. Counters and histograms render in the Prometheus text format
+   (cumulative buckets, +Inf, _sum/_count, escaped labels)
+2. An evaluation records every stage, the model call and its tokens, and
+   /metrics serves them with cache and in-flight series
+3. Regex extraction and the parse fallback are counted by strategy
+4. Policy overrides are counted, but not for provisional stream routing
+"""
+
+from unittest.mock import patch
+
+from fastapi.testclient import TestClient
+
+from src.aegis_service import main
+from src.aegis_service.metrics import (
+    MODEL_CALLS,
+    PARSE_STRATEGY,
+    POLICY_OVERRIDES,
+    STAGE_SECONDS,
+    Counter,
+    Histogram,
+    Registry
+)
+from src.aegis_service.models import ModelDecision
+
+STAGES = ("queue", "runbook", "prompt", "generation", "parse", "validate")
+
+
+def test_exposition_format():
+    """Histogram buckets are cumulative and label values are escaped"""
+    registry = Registry()
+    requests = registry.register(Counter("test_requests_total", "Requests", ["path"]))
+    latency = registry.register(Histogram("test_latency_seconds", "Latency", buckets=(0.1, 1.0)))
+
+    requests.inc(path='/a"b')
+    requests.inc(2, path='/a"b')
+    for value in (0.05, 0.5, 5.0):
+        latency.observe(value)
+
+    text = registry.render()
+    assert "# TYPE test_requests_total counter" in text
+    assert 'test_requests_total{path="/a\\"b"} 3' in text
+    assert "# TYPE test_latency_seconds histogram" in text
+    assert 'test_latency_seconds_bucket{le="0.1"} 1' in text
+    assert 'test_latency_seconds_bucket{le="1"} 2' in text
+    assert 'test_latency_seconds_bucket{le="+Inf"} 3' in text
+    assert "test_latency_seconds_sum 5.55" in text
+    assert "test_latency_seconds_count 3" in text
+
+
+def test_evaluation_records_stages_and_model_call(mock_client):
+    """One evaluation observes each stage once and counts one successful model call"""
+    model_id = mock_client.model_id
+    stages_before = {stage: STAGE_SECONDS.count(stage=stage) for stage in STAGES}
+    calls_before = MODEL_CALLS.value(model=model_id, outcome="ok")
+
+    with patch.object(main, "watsonx_client", mock_client):
+        http = TestClient(main.app)
+        data = http.post(
+            "/evaluate-incident",
+            json={"incident_text": "Disk space at 99% on Server-METRICS-01. Log rotation failed.", "category": "storage"}
+        ).json()
+        response = http.get("/metrics")
+
+    assert data["decision_path"] == "model"
+    for stage in STAGES:
+        assert STAGE_SECONDS.count(stage=stage) == stages_before[stage] + 1, stage
+    assert MODEL_CALLS.value(model=model_id, outcome="ok") == calls_before + 1
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    text = response.text
+    assert 'aegis_stage_duration_seconds_bucket{stage="generation",le="+Inf"}' in text
+    assert f'aegis_model_tokens_total{{model="{model_id}",kind="prompt"}}' in text
+    assert 'aegis_cache_hit_ratio{cache="decision"}' in text
+    assert 'aegis_in_flight{component="evaluations"} 0' in text
+    assert 'aegis_http_request_duration_seconds_count{method="POST",route="/evaluate-incident",status="200"}' in text
+
+
+def test_parse_strategy_breakdown(mock_client):
+    """Responses without a valid JSON object are counted as regex or fallback parses"""
+    regex_before = PARSE_STRATEGY.value(strategy="regex")
+    fallback_before = PARSE_STRATEGY.value(strategy="fallback")
+
+    # Fields without an enclosing object: no JSON to parse, the field regexes still match
+    unbraced = (
+        '"analysis": "Disk full", "recommended_action": "clear_logs", '
+        '"confidence_score": 95, "explanation": "Rotate logs"'
+    )
+    decision = mock_client._parse_response(unbraced)
+    assert not decision.is_fallback
+    assert PARSE_STRATEGY.value(strategy="regex") == regex_before + 1
+
+    decision = mock_client._parse_response("I am not sure what to do here.")
+    assert decision.is_fallback
+    assert PARSE_STRATEGY.value(strategy="fallback") == fallback_before + 1
+
+
+def test_policy_overrides_counted_once(mock_client):
+    """Ambiguity caps and forced escalations are counted; provisional routing is not"""
+    ambiguous = "Database latency high on replica-7 but CPU and memory metrics are normal"
+    cap_before = POLICY_OVERRIDES.value(rule="ambiguity_confidence_cap")
+    escalation_before = POLICY_OVERRIDES.value(rule="ambiguity_escalation")
+
+    routing = mock_client._provisional_routing(
+        {"recommended_action": "restart_service", "confidence_score": 95}, ambiguous
+    )
+    assert routing["recommended_action"] == "escalate_to_human"
+    assert POLICY_OVERRIDES.value(rule="ambiguity_confidence_cap") == cap_before
+
+    decision = mock_client._validate_decision(
+        ModelDecision(
+            analysis="Replica latency",
+            recommended_action="restart_service",
+            confidence_score=95,
+            explanation="Restart the replica."
+        ),
+        ambiguous
+    )
+    assert decision.confidence_score == 60
+    assert decision.recommended_action == "escalate_to_human"
+    assert POLICY_OVERRIDES.value(rule="ambiguity_confidence_cap") == cap_before + 1
+    assert POLICY_OVERRIDES.value(rule="ambiguity_escalation") == escalation_before + 1
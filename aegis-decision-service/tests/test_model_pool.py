@@ -0,0 +1,91 @@
+"""
+Tests for pooled watsonx.ai model handles and IAM token caching
+
+These tests validate:
+1. Handles are reused per (model_id, params) key
+2. IAM tokens are exchanged once while valid and pushed to listeners on refresh
+"""
+
+import time
+
+from src.aegis_service.model_pool import IAMTokenManager, ModelPool
+
+
+def _token_manager(calls: dict, expires_in: int = 3600) -> IAMTokenManager:
+    def fetch():
+        calls["iam"] = calls.get("iam", 0) + 1
+        return {"access_token": f"token-{calls['iam']}", "expires_in": expires_in}
+
+    return IAMTokenManager("test-key", fetch=fetch, background_refresh=False)
+
+
+def test_pool_reuses_handles_per_key():
+    """Same model_id and params return the same handle; different params do not"""
+    created = []
+    pool = ModelPool(
+        url="https://watsonx.test",
+        project_id="test-project",
+        token_manager=_token_manager({}),
+        factory=lambda model_id, params: created.append((model_id, params)) or object()
+    )
+
+    first = pool.get("ibm/granite-3-8b-instruct", {"max_new_tokens": 500})
+    second = pool.get("ibm/granite-3-8b-instruct", {"max_new_tokens": 500})
+    other = pool.get("ibm/granite-3-8b-instruct", {"max_new_tokens": 5})
+
+    assert first is second
+    assert other is not first
+    assert len(created) == 2
+
+    stats = pool.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 2
+
+
+def test_token_cached_until_expiry():
+    """get_token only exchanges the API key once while the token is valid"""
+    calls = {}
+    manager = _token_manager(calls)
+
+    assert manager.get_token() == "token-1"
+    assert manager.get_token() == "token-1"
+    assert manager.cached_token() == "token-1"
+    assert calls["iam"] == 1
+
+
+def test_expired_token_refreshes_and_notifies_listeners():
+    """Near-expiry tokens are refreshed and listeners receive the new token"""
+    calls = {}
+    manager = _token_manager(calls, expires_in=30)  # inside the expiry margin
+    received = []
+    manager.add_listener(received.append)
+
+    manager.get_token()
+    manager.get_token()
+
+    assert calls["iam"] == 2
+    assert received == ["token-1", "token-2"]
+
+
+def test_background_refresh_runs_before_expiry(monkeypatch):
+    """The refresher thread renews the token without a request asking for it"""
+    from src.aegis_service import model_pool
+
+    monkeypatch.setattr(model_pool, "IAM_REFRESH_MARGIN", 3599)
+    calls = {}
+    manager = IAMTokenManager(
+        "test-key",
+        fetch=lambda: calls.update(iam=calls.get("iam", 0) + 1) or {
+            "access_token": "t", "expires_in": 3600
+        }
+    )
+
+    try:
+        manager.get_token()
+        deadline = time.time() + 3
+        while calls["iam"] < 2 and time.time() < deadline:
+            time.sleep(0.05)
+    finally:
+        manager.stop()
+
+    assert calls["iam"] >= 2
@@ -0,0 +1,79 @@
+"""
+Tests for token-budgeted prompt assembly
+
+These tests validate:
+1. Pre-rendered prompts are identical to formatting the template directly
+2. Over budget, runbook context is trimmed before the incident text
+3. Oversized incident text keeps its beginning and end and fits the budget
+4. The prompt token count is recorded on each model decision
+"""
+
+from src.aegis_service.decision_cache import DecisionCache
+from src.aegis_service.prompt_assembler import PromptAssembler, estimate_tokens
+from src.aegis_service.watsonx_client import WatsonxClient
+
+TEMPLATE = WatsonxClient.SYSTEM_PROMPT_TEMPLATE
+RUNBOOK = "\n\n".join(f"## Section {i}\n- check item {i} on every volume" for i in range(40))
+
+
+def test_prerendered_prompt_matches_template():
+    """Within budget the prompt is exactly the formatted template"""
+    assembler = PromptAssembler(TEMPLATE, ["storage"])
+    fields = dict(
+        incident_text="Disk space at 99% on Server-DB-01 {not a field}",
+        category="storage",
+        reporter_role="SRE",
+        runbook_context=RUNBOOK
+    )
+
+    prompt = assembler.assemble(**fields)
+
+    assert prompt.text == TEMPLATE.format(**fields)
+    assert prompt.tokens == estimate_tokens(prompt.text)
+    assert not prompt.runbook_trimmed and not prompt.incident_trimmed
+    # Categories not pre-rendered at startup still work
+    assert assembler.assemble(**{**fields, "category": "network"}).text == \
+        TEMPLATE.format(**{**fields, "category": "network"})
+
+
+def test_runbook_trimmed_before_incident():
+    """The runbook gives way first, in whole blocks"""
+    assembler = PromptAssembler(TEMPLATE, ["storage"])
+    full = assembler.assemble("Log rotation failed on db-01", "storage", "SRE", RUNBOOK)
+    assembler.budget = full.tokens - 100
+
+    prompt = assembler.assemble("Log rotation failed on db-01", "storage", "SRE", RUNBOOK)
+
+    assert prompt.tokens <= assembler.budget
+    assert prompt.runbook_trimmed and not prompt.incident_trimmed
+    assert "Log rotation failed on db-01" in prompt.text
+    assert "## Section 0\n- check item 0 on every volume" in prompt.text
+    assert "## Section 39" not in prompt.text
+    assert assembler.stats()["runbook_trimmed"] == 1
+
+
+def test_oversized_incident_keeps_head_and_tail():
+    """A pasted log larger than the budget is cut in the middle"""
+    assembler = PromptAssembler(TEMPLATE, ["unknown"], budget=1500)
+    incident = "HEAD error rate spiking\n" + "INFO request ok status=200\n" * 5000 + "TAIL stack trace"
+
+    prompt = assembler.assemble(incident, "unknown", "SRE", RUNBOOK)
+
+    assert prompt.tokens <= 1500
+    assert prompt.runbook_trimmed and prompt.incident_trimmed
+    assert "Section" not in prompt.text
+    assert "HEAD error rate spiking" in prompt.text and "TAIL stack trace" in prompt.text
+    assert "characters of incident text omitted" in prompt.text
+
+
+def test_prompt_tokens_recorded_on_decision(mock_client):
+    """Model decisions carry the prompt size; rule and fallback paths have none"""
+    mock_client.rule_engine = None
+    mock_client.decision_cache = DecisionCache(max_size=0)
+
+    decision = mock_client.get_decision("Disk space at 99% on Server-DB-01", "storage", "SRE", RUNBOOK)
+
+    assert decision.prompt_tokens == mock_client._build_prompt(
+        "Disk space at 99% on Server-DB-01", "storage", "SRE", RUNBOOK
+    ).tokens
+    assert mock_client._get_fallback_decision("boom").prompt_tokens is None
@@ -0,0 +1,129 @@
+"""
+Tests for the watsonx.ai client-side rate limiter
+
+These tests validate:
+1. The token bucket paces callers at its rate instead of rejecting them,
+   and a caller cancelled while waiting gives its tokens back
+2. AIMD: successes grow the limit additively, a burst of 429s halves it
+   once, slow responses shrink it
+3. Against scripts/watsonx_stub.py injecting 429s above a concurrency
+   quota, a burst of evaluations waits for capacity and none of them ends
+   as a fallback decision
+"""
+
+import asyncio
+import time
+from unittest.mock import patch
+
+from scripts.watsonx_stub import WatsonxStub
+from src.aegis_service import rate_limiter
+from src.aegis_service.model_pool import IAMTokenManager
+from src.aegis_service.rate_limiter import AIMDLimiter, TokenBucket, WatsonxRateLimiter
+from src.aegis_service.watsonx_client import WatsonxClient
+from src.aegis_service.watsonx_http import AsyncWatsonxTransport
+
+
+def test_token_bucket_paces_callers():
+    """Ten requests at 50/s with a burst of 1 take about 180ms"""
+    bucket = TokenBucket(rate=50, burst=1)
+
+    async def run():
+        start = time.perf_counter()
+        await asyncio.gather(*(bucket.acquire() for _ in range(10)))
+        return time.perf_counter() - start
+
+    elapsed = asyncio.run(run())
+    assert 0.15 <= elapsed < 0.5
+
+
+def test_cancelled_waiter_returns_its_tokens():
+    """A caller cancelled while waiting does not push back the callers after it"""
+    bucket = TokenBucket(rate=10, burst=1, clock=lambda: 0.0)
+    limiter = WatsonxRateLimiter(rps=1, tps=100, clock=lambda: 0.0)
+
+    async def cancel_while_waiting(waiter):
+        task = asyncio.create_task(waiter)
+        await asyncio.sleep(0.01)
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+    async def use_slot():
+        async with limiter.slot(tokens=150):
+            pass
+
+    async def run():
+        assert bucket.reserve(1) == 0.0
+        await cancel_while_waiting(bucket.acquire(1))
+        # Cancelled in the token wait, after its request token was taken
+        await cancel_while_waiting(use_slot())
+
+    asyncio.run(run())
+    assert bucket.reserve(1) == 0.1
+    assert limiter.request_bucket.reserve(1) == 0.0
+    assert limiter.token_bucket.reserve(100) == 0.0
+    assert limiter.requests == 0
+
+
+def test_aimd_adjusts_limit():
+    """Additive increase per window, one halving per congestion event"""
+    now = [0.0]
+    limiter = AIMDLimiter(initial=4, minimum=1, maximum=10, latency_target_ms=1000, clock=lambda: now[0])
+
+    for _ in range(4):
+        limiter.on_success(started_at=now[0], latency_ms=100)
+    assert 4.9 < limiter.limit < 5.0
+
+    # Three 429s for calls sent before the first decrease count once
+    now[0] = 1.0
+    for _ in range(3):
+        limiter.on_rate_limited(started_at=0.5)
+    assert limiter.limit < 2.5 and limiter.decreases == 1
+
+    # A call sent after the decrease can lower it again; slow responses shrink it gently
+    now[0] = 2.0
+    limiter.on_success(started_at=1.5, latency_ms=5000)
+    assert limiter.decreases == 2
+    limiter.on_rate_limited(started_at=0.0)
+    assert limiter.decreases == 2
+
+
+def test_burst_against_rate_limited_stub_has_no_fallbacks():
+    """429s make calls wait and retry rather than fail"""
+    stub = WatsonxStub(latency=0.05, max_concurrency=2).start()
+    limiter = WatsonxRateLimiter(concurrency=AIMDLimiter(initial=8, minimum=1, maximum=8))
+
+    client = WatsonxClient()
+    client.mock_mode = False
+    client.async_transport = AsyncWatsonxTransport(
+        url=stub.url,
+        project_id="test-project",
+        token_manager=IAMTokenManager(
+            "test-key", fetch=lambda: {"access_token": "t", "expires_in": 3600}, background_refresh=False
+        ),
+        limiter=limiter
+    )
+
+    async def run():
+        try:
+            return await asyncio.gather(*(
+                client.aget_decision(
+                    incident_text=f"Disk at 99% on Server-DB-{i}, log rotation failed",
+                    category="storage",
+                    reporter_role="SRE",
+                    runbook_context=""
+                )
+                for i in range(12)
+            ))
+        finally:
+            await client.aclose()
+
+    try:
+        with patch.object(rate_limiter, "WATSONX_RATE_LIMIT_BACKOFF", 0.02):
+            decisions = asyncio.run(run())
+    finally:
+        stub.stop()
+
+    assert all(d.confidence_score > 10 for d in decisions)
+    assert stub.rate_limited > 0
+    assert limiter.stats()["rate_limited"] == stub.rate_limited
+    assert limiter.concurrency.limit < 8
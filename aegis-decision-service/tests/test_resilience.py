@@ -0,0 +1,169 @@
+"""
+Tests for retries and circuit breaking around watsonx.ai generation
+
+These tests validate:
+1. A transient 503 is retried and the incident gets a model decision
+2. Non-retryable errors, an exhausted retry budget and a backoff longer
+   than the request deadline all give up without retrying
+3. An SDK ApiRequestFailure is classified by the status of the response it
+   carries, for both retries and the breaker
+4. A sustained outage opens the breaker: later incidents fail fast without
+   calling watsonx.ai, and /health reports "degraded"
+"""
+
+import asyncio
+import json
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import httpx
+from fastapi.testclient import TestClient
+
+from src.aegis_service import main
+from src.aegis_service.circuit_breaker import CircuitBreaker
+from src.aegis_service.deadline import Deadline, current_deadline
+from src.aegis_service.model_pool import IAMTokenManager
+from src.aegis_service.resilience import ResilientCaller, RetryBudget
+from src.aegis_service.watsonx_client import WatsonxClient
+from src.aegis_service.watsonx_http import AsyncWatsonxTransport, WatsonxHTTPError
+
+GENERATED = json.dumps({
+    "recommended_action": "clear_logs",
+    "confidence_score": 95,
+    "analysis": "Disk space critically low",
+    "explanation": "Log rotation failed; standard cleanup applies."
+})
+
+
+def _make_client(statuses: list, calls: dict) -> WatsonxClient:
+    """WatsonxClient against a fake watsonx.ai answering with `statuses` in turn (then 200)"""
+    async def handler(request: httpx.Request) -> httpx.Response:
+        calls["generate"] = calls.get("generate", 0) + 1
+        status = statuses.pop(0) if statuses else 200
+        if status != 200:
+            return httpx.Response(status, text="unavailable")
+        return httpx.Response(200, text=f'data: {json.dumps({"results": [{"generated_text": GENERATED}]})}\n\n')
+
+    client = WatsonxClient()
+    client.mock_mode = False
+    client.async_transport = AsyncWatsonxTransport(
+        url="https://watsonx.test",
+        project_id="test-project",
+        token_manager=IAMTokenManager(
+            "test-key", fetch=lambda: {"access_token": "t", "expires_in": 3600}, background_refresh=False
+        ),
+        transport=httpx.MockTransport(handler)
+    )
+    client.resilience = ResilientCaller(
+        breaker=CircuitBreaker("watsonx", failure_threshold=3, cooldown=60),
+        budget=RetryBudget(ratio=0.5, minimum=10),
+        base_delay=0.01,
+        max_delay=0.02
+    )
+    return client
+
+
+def _decide(client: WatsonxClient, i: int = 0):
+    return client.aget_decision(
+        incident_text=f"Disk at 99% on Server-DB-{i}, log rotation failed",
+        category="storage",
+        reporter_role="SRE",
+        runbook_context=""
+    )
+
+
+def test_transient_503_is_retried():
+    """One 503 costs a retry, not a fallback"""
+    calls = {}
+    client = _make_client([503], calls)
+
+    decision = asyncio.run(_decide(client))
+
+    assert not decision.is_fallback
+    assert calls["generate"] == 2
+    assert client.resilience.retries == 1
+    assert client.resilience.breaker.state == "closed"
+
+
+def test_retries_stop_at_budget_deadline_and_bad_requests():
+    """400s, an empty budget and a too-short deadline all give up immediately"""
+    async def failing():
+        calls["n"] += 1
+        raise WatsonxHTTPError(status, "boom")
+
+    async def run(caller: ResilientCaller):
+        try:
+            await caller.acall(failing)
+        except WatsonxHTTPError:
+            pass
+
+    calls, status = {"n": 0}, 400
+    asyncio.run(run(ResilientCaller(base_delay=0.01)))
+    assert calls["n"] == 1
+
+    calls, status = {"n": 0}, 503
+    asyncio.run(run(ResilientCaller(budget=RetryBudget(ratio=0, minimum=0), base_delay=0.01)))
+    assert calls["n"] == 1
+
+    token = current_deadline.set(Deadline(budget_ms=5))
+    try:
+        calls = {"n": 0}
+        caller = ResilientCaller(base_delay=1.0, max_delay=1.0)
+        caller._rng.seed(1)
+        asyncio.run(run(caller))
+    finally:
+        current_deadline.reset(token)
+    assert calls["n"] == 1
+
+
+class ApiRequestFailure(Exception):
+    """Shape of ibm_watsonx_ai's ApiRequestFailure: the status is on the attached response"""
+
+    def __init__(self, status_code: int):
+        super().__init__(f"Failure during generate (status: {status_code})")
+        self.response = SimpleNamespace(status_code=status_code)
+
+
+def test_sdk_errors_classified_by_response_status():
+    """An SDK 503 is retried and counts against the breaker; an SDK 400 is not retried and means watsonx.ai is up"""
+    breaker = CircuitBreaker("watsonx", failure_threshold=5, cooldown=60)
+    caller = ResilientCaller(
+        breaker=breaker, budget=RetryBudget(ratio=1, minimum=10), max_attempts=2, base_delay=0.01, max_delay=0.01
+    )
+    statuses = [503, 503, 400]
+
+    async def failing():
+        raise ApiRequestFailure(statuses.pop(0))
+
+    async def run():
+        try:
+            await caller.acall(failing)
+        except ApiRequestFailure:
+            pass
+
+    asyncio.run(run())
+    assert statuses == [400] and caller.retries == 1
+    assert breaker.stats()["consecutive_failures"] == 2
+
+    asyncio.run(run())
+    assert statuses == [] and caller.retries == 1
+    assert breaker.stats()["consecutive_failures"] == 0
+
+
+def test_outage_opens_breaker_and_health_is_degraded():
+    """After the breaker opens, incidents escalate without calling watsonx.ai"""
+    calls = {}
+    client = _make_client([503] * 100, calls)
+
+    first = asyncio.run(_decide(client, 1))
+    assert first.is_fallback and calls["generate"] == 3
+    assert client.resilience.breaker.state == "open"
+
+    second = asyncio.run(_decide(client, 2))
+    assert second.is_fallback and "circuit breaker" in second.explanation
+    assert calls["generate"] == 3
+
+    with patch.object(main, "watsonx_client", client):
+        health = TestClient(main.app).get("/health").json()
+    assert health["status"] == "degraded"
+    assert health["details"]["watsonx"]["breaker"]["state"] == "open"
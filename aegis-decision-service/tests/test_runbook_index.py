@@ -0,0 +1,93 @@
+"""
+Tests for section-level runbook retrieval
+
+These tests validate:
+1. Runbooks split into headings, numbered steps and bold-label blocks
+2. BM25 ranks the section that matches the incident first, across categories
+3. Red flag sections of the incident's category are always included
+4. Incidents matching no section fall back to the full category runbook
+"""
+
+from unittest.mock import patch
+
+from src.aegis_service import runbook_context
+from src.aegis_service.runbook_context import RunbookStore, get_relevant_runbook_sections
+from src.aegis_service.runbook_index import BM25Index, split_sections
+
+STORAGE = """# Storage Runbook
+
+**Banner text**
+
+## Investigation Steps
+
+1. **Disk Space Analysis**
+   - Check disk usage on all volumes
+
+2. **Log File Review**
+   - Check if log rotation is functioning
+   - Identify large log files in /var/log
+
+## Red Flags (Always Escalate)
+- Storage issue affecting production databases
+
+## Success Criteria
+- All volumes have > 20% free space
+"""
+
+AUTH = """# Auth Runbook
+
+## Investigation Steps
+
+1. **Credential Validity**
+   - Check certificate expiration dates
+   - Validate SSO token signing keys
+
+## Red Flags (Always Escalate)
+- Multiple failed admin login attempts
+"""
+
+
+def _index() -> BM25Index:
+    return BM25Index.from_runbooks({"storage": STORAGE, "auth": AUTH})
+
+
+def test_split_sections():
+    """Numbered steps become their own sections; the banner is dropped"""
+    sections = split_sections("storage", STORAGE)
+
+    assert [s.title for s in sections] == [
+        "Investigation Steps > Disk Space Analysis",
+        "Investigation Steps > Log File Review",
+        "Red Flags (Always Escalate)",
+        "Success Criteria",
+    ]
+    assert "log rotation" in sections[1].text
+    assert all("Banner" not in s.text for s in sections)
+
+
+def test_search_ranks_matching_section_across_categories():
+    """The most specific section wins, whichever runbook it lives in"""
+    index = _index()
+
+    top = index.search("Log rotation failed, /var/log growing", top_k=2)
+    assert top[0][1].title == "Investigation Steps > Log File Review"
+
+    top = index.search("SSO certificate expired", top_k=1, boost_category="storage", category_boost=1.5)
+    assert top[0][1].category == "auth"
+    assert index.search("completely unrelated words", top_k=3) == []
+
+
+def test_relevant_sections_pin_red_flags_and_fall_back(tmp_path):
+    """Red flags are always present; no match means the full runbook"""
+    (tmp_path / "storage.md").write_text(STORAGE, encoding="utf-8")
+    (tmp_path / "auth.md").write_text(AUTH, encoding="utf-8")
+    (tmp_path / "unknown.md").write_text("# General", encoding="utf-8")
+
+    with patch.object(runbook_context, "runbook_store", RunbookStore(tmp_path)):
+        context = get_relevant_runbook_sections("storage", "Log rotation failed on db-01", top_k=1)
+        assert "### [storage] Investigation Steps > Log File Review" in context
+        assert "production databases" in context
+        assert "Credential Validity" not in context
+        assert "Success Criteria" not in context
+
+        assert get_relevant_runbook_sections("storage", "zzz qqq", top_k=1) == STORAGE.strip()
@@ -0,0 +1,125 @@
+"""
+Tests for the in-memory runbook store
+
+These tests validate:
+1. Runbooks are served from memory with the unknown.md fallback
+2. Changes are detected, swapped in atomically and reported to listeners
+3. The background watcher picks up edits
+4. Decisions cached under an old runbook are not served after an edit
+5. An unreadable runbook keeps the old text without bumping the version,
+   notifying listeners or logging on every poll
+"""
+
+import logging
+import os
+import time
+
+from unittest.mock import patch
+
+from src.aegis_service import runbook_context
+from src.aegis_service.decision_cache import DecisionCache
+from src.aegis_service.runbook_context import RunbookStore, get_local_runbook
+
+
+def _write(path, text: str, bump: int = 0):
+    path.write_text(text, encoding="utf-8")
+    if bump:
+        stat = path.stat()
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + bump))
+
+
+def test_serves_from_memory_with_fallback(tmp_path):
+    """Files are read once; missing categories fall back to unknown.md"""
+    _write(tmp_path / "storage.md", "  # Storage\nclear logs\n")
+    _write(tmp_path / "unknown.md", "# General")
+    store = RunbookStore(tmp_path)
+
+    with patch.object(runbook_context, "runbook_store", store):
+        assert get_local_runbook("storage") == "# Storage\nclear logs"
+        (tmp_path / "storage.md").unlink()  # still served until the next reload
+        assert get_local_runbook("storage") == "# Storage\nclear logs"
+        assert get_local_runbook("auth") == "# General"
+
+    try:
+        store.snapshot()["storage"] = "tampered"
+    except TypeError:
+        pass
+    else:
+        raise AssertionError("runbook snapshot is mutable")
+
+
+def test_reload_swaps_snapshot_and_notifies(tmp_path):
+    """Only changed categories are reported; old snapshots stay intact"""
+    _write(tmp_path / "storage.md", "v1")
+    _write(tmp_path / "auth.md", "auth")
+    store = RunbookStore(tmp_path)
+    notified = []
+    store.add_listener(notified.append)
+
+    before = store.snapshot()
+    assert store.reload() == set()
+
+    _write(tmp_path / "storage.md", "v2", bump=1_000_000)
+    (tmp_path / "auth.md").unlink()
+    _write(tmp_path / "latency.md", "latency")
+
+    assert store.reload() == {"storage", "auth", "latency"}
+    assert notified[-1] == {"storage", "auth", "latency"}
+    assert dict(store.snapshot()) == {"storage": "v2", "latency": "latency"}
+    assert before["storage"] == "v1" and "auth" in before
+
+
+def test_unreadable_runbook_is_not_a_change(tmp_path, caplog):
+    """Polls that only find an unreadable runbook are no-ops until it is fixed"""
+    _write(tmp_path / "storage.md", "# Storage v1")
+    store = RunbookStore(tmp_path)
+    store.reload()
+    notified = []
+    store.add_listener(notified.append)
+
+    (tmp_path / "storage.md").unlink()
+    (tmp_path / "storage.md").mkdir()  # listed like a runbook, but reading it fails
+    with caplog.at_level(logging.ERROR, logger=runbook_context.logger.name):
+        assert [store.reload() for _ in range(3)] == [set(), set(), set()]
+    assert store.version == 1
+    assert notified == []
+    assert store.get("storage") == "# Storage v1"
+    assert sum("Error reading runbook storage" in r.message for r in caplog.records) == 1
+
+    (tmp_path / "storage.md").rmdir()
+    _write(tmp_path / "storage.md", "# Storage v2")
+    assert store.reload() == {"storage"}
+    assert store.version == 2
+    assert notified == [{"storage"}]
+    assert store.get("storage") == "# Storage v2"
+
+
+def test_watcher_picks_up_edits(tmp_path):
+    """The polling thread reloads without any request traffic"""
+    _write(tmp_path / "storage.md", "v1")
+    store = RunbookStore(tmp_path)
+    store.snapshot()
+    store.start_watching(interval=0.02)
+    try:
+        _write(tmp_path / "storage.md", "version two", bump=1_000_000)
+        deadline = time.time() + 2
+        while store.get("storage") != "version two" and time.time() < deadline:
+            time.sleep(0.02)
+    finally:
+        store.stop()
+
+    assert store.get("storage") == "version two"
+
+
+def test_decision_cache_keyed_on_runbook(mock_client):
+    """An edited runbook means a cache miss, even for decisions still in flight"""
+    mock_client.decision_cache = DecisionCache(max_size=16, ttl=60, snapshot_path=None)
+    incident = "Disk space at 99% on Server-DB-01. Log rotation failed."
+
+    first = mock_client.get_decision(incident, "storage", "SRE", "runbook v1")
+    again = mock_client.get_decision(incident, "storage", "SRE", "runbook v1")
+    edited = mock_client.get_decision(incident, "storage", "SRE", "runbook v2")
+
+    assert not first.cache_hit
+    assert again.cache_hit
+    assert not edited.cache_hit
@@ -0,0 +1,84 @@
+"""
+Tests for the single-pass signal matcher
+
+These tests validate:
+1. One scan reports every signal with its positions
+2. Ambiguity detection and the auto-resolution check keep their behaviour
+3. Malformed signal files are rejected at load time
+"""
+
+import json
+
+from src.aegis_service.signals import SignalMatcher, load_signal_matchers
+from src.aegis_service.models import ModelDecision
+from src.aegis_service.watsonx_client import WatsonxClient
+
+
+def test_scan_reports_all_signals_with_positions():
+    """Whole words only, case-insensitive, multi-word phrases recognized"""
+    matcher = load_signal_matchers()["incident"]
+    text = "Latency HIGH but metrics normal; it may or might be DNS. No clear cause. Butter lowers."
+
+    signals = matcher.scan(text)
+    assert signals["high_symptom"] == [8]
+    assert signals["contrast"] == [13]
+    assert signals["metrics"] == [17]
+    assert signals["normal"] == [25]
+    assert len(signals["uncertainty"]) == 2
+    assert "no_clear_cause" in signals
+    assert "steady_metric" not in signals  # "lowers" is not "low"
+
+
+def test_ambiguity_detection():
+    """Same verdicts as the original per-pattern regexes"""
+    client = WatsonxClient()
+    ambiguous = [
+        "Latency is bad, however CPU looks normal",
+        "Elevated error rate while memory is stable",
+        "Failures are intermittent and the cause is unclear",
+        "Login errors with no obvious pattern across regions",
+    ]
+    clear = [
+        "Disk space at 99% on Server-DB-01. Log rotation failed.",
+        "Service crashed with OOM error at 14:02, restart required",
+        "Normal operation resumed, but disk is full",
+    ]
+    assert all(client._detect_ambiguity(text) for text in ambiguous)
+    assert not any(client._detect_ambiguity(text) for text in clear)
+
+
+def test_auto_resolution_language_flagged():
+    """Explanations implying auto-resolution get a review note below 90"""
+    client = WatsonxClient()
+    for explanation, flagged in [
+        ("This can be auto-resolved safely.", True),
+        ("Issue can be resolved by clearing logs automatically.", True),
+        ("It will be resolved after cleanup.", True),
+        ("Automatically generated; can be resolved with review.", False),
+        ("Run diagnostics before acting.", False),
+    ]:
+        decision = client._validate_decision(ModelDecision(
+            analysis="a",
+            recommended_action="run_diagnostics",
+            confidence_score=85,
+            explanation=explanation
+        ), "Service error rate elevated after deploy")
+        assert decision.explanation.endswith("Requires review before execution.") == flagged, explanation
+
+
+def test_invalid_signals_file_rejected(tmp_path):
+    """Bad patterns fail when the file is loaded"""
+    path = tmp_path / "signals.json"
+    path.write_text(json.dumps({"sets": {"incident": {"broken": ["(unclosed"]}}}))
+    try:
+        load_signal_matchers(str(path))
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("invalid pattern was accepted")
+
+    try:
+        SignalMatcher({})
+    except ValueError:
+        return
+    raise AssertionError("empty signal set was accepted")
@@ -0,0 +1,181 @@
+"""
+Tests for the SSE streaming evaluation endpoint
+
+These tests validate:
+1. routing is emitted before analysis/explanation and the final decision
+2. The routing signal and final decision both respect the confidence policy
+3. The REST transport decodes watsonx.ai server-sent events
+4. The SDK fallback stops its worker thread and closes the SDK stream once
+   the reader goes away, even after the event loop has closed
+"""
+
+import asyncio
+import json
+import threading
+
+import httpx
+from fastapi.testclient import TestClient
+from unittest.mock import patch
+
+from src.aegis_service import main
+from src.aegis_service.decision_cache import DecisionCache
+from src.aegis_service.model_pool import IAMTokenManager
+from src.aegis_service.watsonx_client import WatsonxClient
+from src.aegis_service.watsonx_http import AsyncWatsonxTransport
+
+OUTPUT = json.dumps({
+    "recommended_action": "clear_logs",
+    "confidence_score": 95,
+    "analysis": "Disk space critically low",
+    "explanation": "Log rotation failed; standard cleanup applies."
+})
+
+
+def _streaming_client(output: str) -> WatsonxClient:
+    client = WatsonxClient()
+    client.mock_mode = False
+    client.async_transport = None
+    client.decision_cache = DecisionCache(max_size=0)
+
+    async def stream_text(prompt, incident_text):
+        for i in range(0, len(output), 5):
+            yield output[i:i + 5]
+
+    client._stream_text = stream_text
+    return client
+
+
+def _parse_sse(text: str):
+    events = []
+    for block in text.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.splitlines())
+        events.append((lines["event"], json.loads(lines["data"])))
+    return events
+
+
+def _post_stream(client: WatsonxClient, incident_text: str):
+    with patch.object(main, "watsonx_client", client):
+        response = TestClient(main.app).post(
+            "/evaluate-incident/stream",
+            json={"incident_text": incident_text, "category": "storage"}
+        )
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    return _parse_sse(response.text)
+
+
+def test_stream_event_order_and_final_decision():
+    """routing arrives first and the final decision carries timing"""
+    events = _post_stream(_streaming_client(OUTPUT), "Disk space at 99% on Server-DB-01")
+    names = [name for name, _ in events]
+
+    assert names == ["trace", "routing", "analysis", "explanation", "decision"]
+    routing = events[1][1]
+    assert routing == {"recommended_action": "clear_logs", "confidence_score": 95, "provisional": True}
+
+    decision = events[-1][1]
+    assert decision["recommended_action"] == "clear_logs"
+    assert decision["trace_id"] == events[0][1]["trace_id"]
+    assert decision["timing"]["time_to_routing_ms"] <= decision["timing"]["total_ms"]
+
+
+def test_stream_routing_respects_policy():
+    """Ambiguous incidents are capped in the early signal, not just the final decision"""
+    events = dict(_post_stream(
+        _streaming_client(OUTPUT),
+        "Disk latency high but metrics normal, cause unclear"
+    ))
+
+    assert events["routing"]["recommended_action"] == "escalate_to_human"
+    assert events["routing"]["confidence_score"] <= 60
+    assert events["decision"]["recommended_action"] == "escalate_to_human"
+    assert events["decision"]["confidence_score"] <= 60
+
+
+def test_stream_unparseable_output_falls_back():
+    """Garbage output still ends in a safe decision event"""
+    events = dict(_post_stream(_streaming_client("I am not JSON"), "Disk space at 99% on host"))
+
+    assert "routing" not in events
+    assert events["decision"]["recommended_action"] == "escalate_to_human"
+
+
+def test_rest_transport_decodes_sse():
+    """generate_stream yields generated_text from each SSE data line"""
+    chunks = ['{"recommended_action": "clear_logs", ', '"confidence_score": 95}']
+    body = "".join(
+        f"id: {i}\nevent: message\ndata: {json.dumps({'results': [{'generated_text': c}]})}\n\n"
+        for i, c in enumerate(chunks)
+    )
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        assert request.url.path == "/ml/v1/text/generation_stream"
+        return httpx.Response(200, text=body, headers={"Content-Type": "text/event-stream"})
+
+    transport = AsyncWatsonxTransport(
+        url="https://watsonx.test",
+        project_id="test-project",
+        token_manager=IAMTokenManager(
+            "test-key",
+            fetch=lambda: {"access_token": "t", "expires_in": 3600},
+            background_refresh=False
+        ),
+        transport=httpx.MockTransport(handler)
+    )
+
+    async def collect():
+        try:
+            return [c async for c in transport.generate_stream("prompt", "model", {})]
+        finally:
+            await transport.aclose()
+
+    assert asyncio.run(collect()) == chunks
+
+
+class BlockingSDKStream:
+    """SDK stream whose second chunk only arrives when released"""
+
+    def __init__(self):
+        self.release = threading.Event()
+        self.closed = threading.Event()
+        self.sent = 0
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        if self.sent:
+            self.release.wait(5)
+        if self.sent >= 3:
+            raise StopIteration
+        self.sent += 1
+        return OUTPUT[:5]
+
+    def close(self):
+        self.closed.set()
+
+
+def test_sdk_stream_closed_when_reader_leaves():
+    """Leaving after the first chunk closes the SDK stream when its next chunk arrives"""
+    sdk_stream = BlockingSDKStream()
+
+    class FakeModel:
+        def generate_text_stream(self, prompt):
+            return sdk_stream
+
+    client = WatsonxClient()
+    client.mock_mode = False
+    client.async_transport = None
+    client._initialize_model = lambda: FakeModel()
+
+    async def read_one_chunk():
+        stream = client._stream_text("prompt", "Disk space at 99%")
+        first = await stream.__anext__()
+        await stream.aclose()
+        return first
+
+    assert asyncio.run(read_one_chunk()) == OUTPUT[:5]
+    # The loop is closed now; the worker must notice the reader left instead of posting to it
+    sdk_stream.release.set()
+    assert sdk_stream.closed.wait(2)
+    assert sdk_stream.sent == 2
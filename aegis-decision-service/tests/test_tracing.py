@@ -0,0 +1,148 @@
+"""
+Tests for distributed tracing
+
+These tests validate:
+1. W3C traceparent headers round-trip; malformed ones start a new trace
+2. An incoming traceparent is continued: the response trace_id is its trace
+   ID, and the response carries traceparent and a per-stage Server-Timing
+3. The file exporter writes OTLP/JSON spans forming one tree per request,
+   with policy overrides recorded as span events
+4. The hedged Langflow call (run on the retrieval thread pool) sends the
+   request's traceparent, parented on its langflow.fetch span
+"""
+
+import json
+import uuid
+from unittest.mock import patch
+
+from fastapi.testclient import TestClient
+
+from scripts.langflow_stub import LangflowStub
+from src.aegis_service import main, runbook_context, tracing
+from src.aegis_service.circuit_breaker import CircuitBreaker
+from src.aegis_service.langflow_client import LangflowClient
+from src.aegis_service.tracing import SpanExporter, format_traceparent, parse_traceparent, span
+
+TRACE_ID = "4bf92f3577b34da6a3ce929d0e0e4736"
+PARENT_ID = "00f067aa0ba902b7"
+
+
+def test_traceparent_round_trip():
+    """Valid headers parse back to what was formatted; invalid ones are ignored"""
+    header = format_traceparent(TRACE_ID, PARENT_ID, sampled=True)
+    assert header == f"00-{TRACE_ID}-{PARENT_ID}-01"
+    assert parse_traceparent(header) == (TRACE_ID, PARENT_ID, True)
+    assert parse_traceparent(f"00-{TRACE_ID}-{PARENT_ID}-00") == (TRACE_ID, PARENT_ID, False)
+    # Future versions may append fields
+    assert parse_traceparent(f"01-{TRACE_ID}-{PARENT_ID}-01-extra") == (TRACE_ID, PARENT_ID, True)
+
+    for invalid in (
+        None,
+        "",
+        f"ff-{TRACE_ID}-{PARENT_ID}-01",
+        f"00-{'0' * 32}-{PARENT_ID}-01",
+        f"00-{TRACE_ID}-{'0' * 16}-01",
+        f"00-{TRACE_ID[:-1]}-{PARENT_ID}-01",
+        f"00-{TRACE_ID}-{PARENT_ID}-01-extra",
+        "00-not-hex-at-all"
+    ):
+        assert parse_traceparent(invalid) is None, invalid
+
+
+def test_request_continues_trace_with_server_timing(mock_client):
+    """The caller's trace ID becomes the incident trace_id; stages show in Server-Timing"""
+    with patch.object(main, "watsonx_client", mock_client):
+        response = TestClient(main.app).post(
+            "/evaluate-incident",
+            json={"incident_text": "Disk space at 99% on Server-TRACE-01. Log rotation failed.", "category": "storage"},
+            headers={"traceparent": format_traceparent(TRACE_ID, PARENT_ID)}
+        )
+
+    assert response.json()["trace_id"] == str(uuid.UUID(hex=TRACE_ID))
+
+    returned = parse_traceparent(response.headers["traceparent"])
+    assert returned[0] == TRACE_ID
+    assert returned[1] != PARENT_ID
+
+    timing = response.headers["server-timing"]
+    for stage in (
+        "admission.queue", "runbook.retrieve", "prompt.assemble",
+        "watsonx.generate", "decision.parse", "policy.validate", "total"
+    ):
+        assert f"{stage};dur=" in timing, stage
+
+
+def test_file_exporter_writes_span_tree(tmp_path, mock_client):
+    """Every exported span of a request belongs to its trace and hangs off its server span"""
+    path = tmp_path / "traces.jsonl"
+    file_exporter = SpanExporter(mode="file", path=str(path), service_name="aegis-test")
+    ambiguous = "Database latency high on replica-7 but CPU and memory metrics are normal"
+    # An overconfident answer to an ambiguous incident, which the policy overrides
+    mock_client._get_mock_response = lambda incident_text: json.dumps({
+        "analysis": "Replica latency",
+        "recommended_action": "restart_service",
+        "confidence_score": 95,
+        "explanation": "Restart the replica."
+    })
+
+    with patch.object(tracing, "exporter", file_exporter), \
+            patch.object(main, "watsonx_client", mock_client):
+        TestClient(main.app).post(
+            "/evaluate-incident",
+            json={"incident_text": ambiguous, "category": "latency"},
+            headers={"traceparent": format_traceparent(TRACE_ID, PARENT_ID)}
+        )
+        file_exporter.flush()
+    file_exporter.shutdown()
+
+    spans = []
+    for line in path.read_text().splitlines():
+        resource_spans = json.loads(line)["resourceSpans"][0]
+        assert resource_spans["resource"]["attributes"][0] == {
+            "key": "service.name", "value": {"stringValue": "aegis-test"}
+        }
+        spans.extend(resource_spans["scopeSpans"][0]["spans"])
+
+    assert {s["traceId"] for s in spans} == {TRACE_ID}
+    by_name = {s["name"]: s for s in spans}
+    server = by_name["POST /evaluate-incident"]
+    assert server["parentSpanId"] == PARENT_ID
+    assert server["kind"] == tracing.KIND_SERVER
+
+    span_ids = {s["spanId"] for s in spans}
+    for s in spans:
+        if s is not server:
+            assert s["parentSpanId"] in span_ids, s["name"]
+        assert int(s["endTimeUnixNano"]) >= int(s["startTimeUnixNano"])
+
+    events = [e["name"] for e in by_name["policy.validate"].get("events", [])]
+    assert "policy.override" in events
+
+
+def test_langflow_call_carries_traceparent():
+    """The Langflow request is parented on langflow.fetch, inside the caller's trace"""
+    stub = LangflowStub().start()
+    client = LangflowClient(
+        url=stub.url, timeout=2.0, breaker=CircuitBreaker("langflow", failure_threshold=3, cooldown=30)
+    )
+    finished = []
+    recording = SpanExporter(mode="none")
+    recording.export = finished.append
+    try:
+        with patch.object(runbook_context, "langflow_client", client), \
+                patch.object(runbook_context, "RUNBOOK_HEDGE", True), \
+                patch.object(runbook_context, "LANGFLOW_SOFT_DEADLINE_MS", 2000), \
+                patch.object(tracing, "exporter", recording):
+            with span("test.request") as request_span:
+                retrieval = runbook_context.retrieve_runbook_context("storage", "Disk full on tracing-01")
+    finally:
+        client.close()
+        stub.stop()
+
+    assert retrieval.source == "langflow"
+    trace_id, parent_id, sampled = parse_traceparent(stub.traceparents[0])
+    assert trace_id == request_span.trace_id
+    fetch = next(s for s in finished if s.name == "langflow.fetch")
+    assert parent_id == fetch.span_id
+    assert fetch.parent_id == request_span.span_id
+    assert fetch.attributes["http.response.status_code"] == 200
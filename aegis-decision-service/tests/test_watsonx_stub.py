@@ -0,0 +1,156 @@
+"""
+Tests for the local watsonx.ai stand-in and the load-test harness
+
+These tests validate:
+1. Latency specs: fixed values, distributions and weighted mixtures, and
+   invalid specs are rejected
+2. Injected errors and 429s (with Retry-After) reach the client and are
+   counted in the stub's stats
+3. Templated outputs are picked by the incident category in the prompt,
+   and the real IAM exchange and REST path run against the stub
+4. The harness's incident storm repeats incidents at the duplicate rate and
+   its summary reports percentiles and the fallback rate
+"""
+
+import asyncio
+import json
+import random
+import urllib.error
+import urllib.request
+from itertools import islice
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from scripts.load_test import incident_storm, summarize
+from scripts.watsonx_stub import WatsonxStub, load_responses, parse_latency
+from src.aegis_service import model_pool
+from src.aegis_service.model_pool import IAMTokenManager
+from src.aegis_service.watsonx_client import WatsonxClient
+from src.aegis_service.watsonx_http import AsyncWatsonxTransport
+
+RESPONSES = Path(__file__).parent.parent / "scripts" / "watsonx_stub_responses.json"
+
+
+def _generate(stub: WatsonxStub, prompt: str = "Category: storage"):
+    request = urllib.request.Request(
+        f"{stub.url}/ml/v1/text/generation",
+        data=json.dumps({"input": prompt, "model_id": "ibm/granite-3-8b-instruct"}).encode(),
+        headers={"Content-Type": "application/json"},
+        method="POST"
+    )
+    try:
+        with urllib.request.urlopen(request, timeout=5) as response:
+            return response.status, dict(response.headers)
+    except urllib.error.HTTPError as e:
+        return e.code, dict(e.headers)
+
+
+def test_latency_specs():
+    """Each distribution lands where its parameters put it"""
+    rng = random.Random(0)
+
+    def median(spec):
+        sampler = parse_latency(spec)
+        return sorted(sampler(rng) for _ in range(2001))[1000]
+
+    assert median(0.2) == median("0.2") == median("fixed:0.2") == 0.2
+    assert 0.25 < median("uniform:0.1,0.5") < 0.35
+    assert 1.4 < median("normal:1.5,0.3") < 1.6
+    assert 1.6 < median("lognormal:1.8,0.35") < 2.0
+    assert 0.3 < median("exp:0.5") < 0.4
+
+    mixture = parse_latency("fixed:1@9|fixed:10@1")
+    draws = [mixture(rng) for _ in range(2000)]
+    assert set(draws) == {1.0, 10.0}
+    assert 100 < draws.count(10.0) < 300
+
+    for spec in ["gamma:1,2", "uniform:1", "fast", "fixed:x"]:
+        with pytest.raises(ValueError):
+            parse_latency(spec)
+
+
+def test_injected_errors_and_rate_limits():
+    """error_rate and rate_limit_rate answer with their statuses and are counted"""
+    stub = WatsonxStub(error_rate=1.0, error_status=503).start()
+    try:
+        status, _ = _generate(stub)
+    finally:
+        stub.stop()
+    assert status == 503
+    assert stub.stats()["errors"] == 1
+
+    stub = WatsonxStub(rate_limit_rate=0.5, retry_after=2, seed=1).start()
+    try:
+        statuses = [_generate(stub) for _ in range(40)]
+    finally:
+        stub.stop()
+    limited = [headers for status, headers in statuses if status == 429]
+    assert 10 < len(limited) < 30
+    assert all(headers["Retry-After"] == "2" for headers in limited)
+    assert stub.stats() == {
+        "requests": 40, "rate_limited": len(limited), "errors": 0, "malformed": 0,
+        "in_flight": 0, "peak_in_flight": 1
+    }
+
+
+def test_templated_outputs_over_rest_path():
+    """Storage and auth incidents get their category's decision through the real REST and IAM path"""
+    stub = WatsonxStub(responses=load_responses(str(RESPONSES)), seed=2).start()
+    token_manager = IAMTokenManager("test-key", background_refresh=False)
+
+    client = WatsonxClient()
+    client.mock_mode = False
+    client.async_transport = AsyncWatsonxTransport(
+        url=stub.url, project_id="test-project", token_manager=token_manager
+    )
+
+    async def run():
+        try:
+            return await asyncio.gather(*(
+                client.aget_decision(
+                    incident_text=text, category=category, reporter_role="SRE", runbook_context=""
+                )
+                for text, category in [
+                    ("Disk at 99% on Server-DB-1, log rotation failed", "storage"),
+                    ("Login failures for 40 users after certificate rotation", "auth"),
+                ]
+            ))
+        finally:
+            await client.aclose()
+
+    try:
+        with patch.object(model_pool, "IBM_IAM_URL", f"{stub.url}/identity/token"):
+            storage, auth = asyncio.run(run())
+    finally:
+        stub.stop()
+
+    assert token_manager.refresh_count == 1
+    assert storage.recommended_action in ("clear_logs", "run_diagnostics")
+    assert "storage runbook" in storage.explanation or "diagnostics" in storage.explanation
+    assert auth.recommended_action == "escalate_to_human"
+    assert "identity provider" in auth.explanation
+    assert stub.stats()["requests"] == 2
+
+
+def test_incident_storm_and_summary():
+    """Duplicates repeat earlier bodies; the summary counts failures as fallbacks"""
+    bodies = list(islice(incident_storm(random.Random(3), duplicate_rate=0.3), 500))
+    assert {body["category"] for body in bodies} == {"storage", "latency", "auth", "unknown"}
+    repeats = len(bodies) - len({json.dumps(body, sort_keys=True) for body in bodies})
+    assert 100 < repeats < 200
+
+    results = [(200, n / 1000, "model") for n in range(1, 91)]
+    results += [(200, 0.5, "fallback")] * 5 + [(200, 0.01, "rules")] * 3 + [("ReadTimeout", 60.0, None)] * 2
+    summary = summarize(results, elapsed_s=10.0, skipped=4)
+
+    assert summary["sent"] == 100 and summary["completed"] == 98 and summary["failed"] == 2
+    assert summary["skipped"] == 4
+    assert summary["throughput_rps"] == 9.8
+    assert summary["latency_ms"]["p50"] == 46.0
+    assert summary["latency_ms"]["p99"] == 500.0
+    assert summary["latency_ms"]["max"] == 500.0
+    assert summary["fallback_rate"] == 0.07
+    assert summary["decision_paths"] == {"model": 90, "fallback": 5, "rules": 3}
+    assert summary["statuses"] == {"200": 98, "ReadTimeout": 2}
@@ -3,6 +3,8 @@ import os
 from fastapi import Request, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 
+from app.tracing import traced
+
 security = HTTPBearer()
 
 
@@ -14,6 +16,7 @@ def get_bearer_token() -> str:
     return token
 
 
+@traced("auth.verify_token")
 async def verify_token(credentials: HTTPAuthorizationCredentials) -> str:
     """Verify the bearer token from the Authorization header."""
     expected_token = get_bearer_token()
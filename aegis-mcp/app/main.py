@@ -5,13 +5,21 @@ import asyncio
 from typing import Any
 from fastapi import FastAPI, Depends, HTTPException, status, Request
 from fastapi.security import HTTPAuthorizationCredentials
-from fastapi.responses import StreamingResponse, JSONResponse
+from fastapi.responses import StreamingResponse, JSONResponse, Response
 from pydantic import BaseModel, Field
 
 from app.auth import security, verify_token
 from app.policy import Capability, authorize, get_authorization_info
 from app.vault import load_vault_token
 from app.tools import get_secret, run_diagnostics, execute_runbook
+from app.metrics import (
+    CONTENT_TYPE as METRICS_CONTENT_TYPE,
+    IN_FLIGHT,
+    METRICS_ENABLED,
+    REGISTRY,
+    HTTPMetricsMiddleware,
+)
+from app.tracing import TracingMiddleware
 from app.mcp_protocol import (
     process_jsonrpc_message,
     MCP_TOOLS,
@@ -27,6 +35,12 @@ app = FastAPI(
     version="0.2.0",
 )
 
+# Time every request by route (pure ASGI, so SSE streams are unaffected)
+app.add_middleware(HTTPMetricsMiddleware)
+
+# Server span per request from the caller's traceparent; adds traceparent and Server-Timing headers
+app.add_middleware(TracingMiddleware)
+
 
 # =============================================================================
 # Request Models (with agent_id)
@@ -143,20 +157,24 @@ async def mcp_sse_endpoint(request: Request):
     Handles the MCP protocol over SSE transport.
     """
     async def event_generator():
-        # Send initial endpoint info
-        endpoint_msg = {
-            "type": "endpoint",
-            "url": "/messages"
-        }
-        yield f"data: {json.dumps(endpoint_msg)}\n\n"
-
-        # Keep connection alive
-        while True:
-            if await request.is_disconnected():
-                break
-            # Send keepalive ping every 30 seconds
-            yield ": keepalive\n\n"
-            await asyncio.sleep(30)
+        IN_FLIGHT.inc(kind="sse")
+        try:
+            # Send initial endpoint info
+            endpoint_msg = {
+                "type": "endpoint",
+                "url": "/messages"
+            }
+            yield f"data: {json.dumps(endpoint_msg)}\n\n"
+
+            # Keep connection alive
+            while True:
+                if await request.is_disconnected():
+                    break
+                # Send keepalive ping every 30 seconds
+                yield ": keepalive\n\n"
+                await asyncio.sleep(30)
+        finally:
+            IN_FLIGHT.dec(kind="sse")
 
     return StreamingResponse(
         event_generator(),
@@ -225,6 +243,14 @@ async def health_check():
     return {"status": "ok"}
 
 
+@app.get("/metrics", tags=["Health"], response_class=Response)
+async def metrics():
+    """Prometheus metrics - no authentication required (like /health)."""
+    if not METRICS_ENABLED:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Metrics are disabled")
+    return Response(content=REGISTRY.render(), media_type=METRICS_CONTENT_TYPE)
+
+
 @app.post(
     "/mcp/tools/get_secret",
     response_model=GetSecretResponse,
@@ -7,6 +7,7 @@ from datetime import datetime, timezone
 from app.tools import run_diagnostics, execute_runbook, get_secret
 from app.policy import Capability, authorize, get_authorization_info
 from app.vault import load_vault_token
+from app.metrics import JSONRPC_MESSAGES
 
 
 # MCP Protocol version
@@ -279,9 +280,13 @@ def process_jsonrpc_message(message: dict) -> dict | None:
     if handler:
         try:
             result = handler(params)
-            return create_jsonrpc_response(msg_id, result)
         except Exception as e:
+            JSONRPC_MESSAGES.inc(method=method, outcome="error")
             return create_jsonrpc_error(msg_id, -32603, f"Internal error: {str(e)}")
+        # Tool failures are reported in the result, not as JSON-RPC errors
+        JSONRPC_MESSAGES.inc(method=method, outcome="tool_error" if result.get("isError") else "ok")
+        return create_jsonrpc_response(msg_id, result)
     else:
-        # Method not found
+        # Method not found (bounded label: arbitrary method names are not recorded)
+        JSONRPC_MESSAGES.inc(method="unknown", outcome="error")
         return create_jsonrpc_error(msg_id, -32601, f"Method not found: {method}")
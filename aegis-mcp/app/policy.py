@@ -2,6 +2,9 @@
 import os
 from enum import Enum
 
+from app.metrics import AUTHORIZATIONS
+from app.tracing import traced
+
 
 class Capability(str, Enum):
     """Capabilities that can be authorized."""
@@ -54,6 +57,7 @@ def get_allowed_agents(capability: Capability) -> set[str]:
     return allowed
 
 
+@traced("auth.authorize")
 def authorize(agent_id: str | None, capability: Capability) -> str:
     """
     Authorize an agent for a specific capability.
@@ -71,6 +75,7 @@ def authorize(agent_id: str | None, capability: Capability) -> str:
     """
     # Validate agent_id exists
     if not agent_id or not agent_id.strip():
+        AUTHORIZATIONS.inc(capability=capability.value, result="invalid")
         raise ValueError("agent_id is required and cannot be empty")
 
     agent_id = agent_id.strip()
@@ -78,6 +83,7 @@ def authorize(agent_id: str | None, capability: Capability) -> str:
     # Check if any agents are configured
     allowed_agents = get_allowed_agents(capability)
     if not allowed_agents:
+        AUTHORIZATIONS.inc(capability=capability.value, result="unconfigured")
         raise PermissionError(
             f"No agents configured for capability '{capability.value}'. "
             "Set AEGIS_EXECUTION_AGENT_ID environment variable."
@@ -85,10 +91,12 @@ def authorize(agent_id: str | None, capability: Capability) -> str:
 
     # Check if this agent is allowed
     if agent_id not in allowed_agents:
+        AUTHORIZATIONS.inc(capability=capability.value, result="denied")
         raise PermissionError(
             f"Agent '{agent_id}' is not authorized for capability '{capability.value}'"
         )
 
+    AUTHORIZATIONS.inc(capability=capability.value, result="allowed")
     return agent_id
 
 
@@ -3,7 +3,12 @@ import os
 from typing import Any
 from datetime import datetime, timezone
 
+from app.metrics import instrument_tool
+from app.tracing import traced
 
+
+@traced("tool.get_secret")
+@instrument_tool
 def get_secret(name: str) -> dict[str, str]:
     """
     Retrieve a secret value by name.
@@ -17,6 +22,8 @@ def get_secret(name: str) -> dict[str, str]:
     return {"name": name, "value": "NOT_FOUND"}
 
 
+@traced("tool.run_diagnostics")
+@instrument_tool
 def run_diagnostics(incident_text: str) -> dict[str, Any]:
     """
     Run simulated diagnostics on an incident.
@@ -91,6 +98,8 @@ def run_diagnostics(incident_text: str) -> dict[str, Any]:
     }
 
 
+@traced("tool.execute_runbook")
+@instrument_tool
 def execute_runbook(action: str, parameters: dict[str, Any] | None = None) -> dict[str, Any]:
     """
     Execute a simulated runbook action.
@@ -0,0 +1,305 @@
+"""Distributed tracing for the MCP server (W3C traceparent, OTLP/JSON export).
+
+Each HTTP request runs in a server span that continues the caller's
+`traceparent` (e.g. from Orchestrate or the decision service); auth, Vault
+loads and tool execution are child spans. Responses carry the server
+span's `traceparent` and a `Server-Timing` header with the time per span.
+
+Finished spans are exported in OTLP/JSON from a background thread:
+TRACE_EXPORT=file appends to TRACE_FILE, TRACE_EXPORT=otlp POSTs to
+TRACE_OTLP_ENDPOINT (an OTLP/HTTP collector). TRACING_ENABLED=0 turns
+tracing off.
+"""
+import os
+import json
+import time
+import queue
+import random
+import inspect
+import logging
+import functools
+import threading
+import urllib.request
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Iterator
+
+logger = logging.getLogger(__name__)
+
+TRACING_ENABLED = os.environ.get("TRACING_ENABLED", "1") == "1"
+TRACE_EXPORT = os.environ.get("TRACE_EXPORT", "none")  # none, file or otlp
+TRACE_FILE = os.environ.get("TRACE_FILE", "traces.jsonl")
+TRACE_OTLP_ENDPOINT = os.environ.get("TRACE_OTLP_ENDPOINT", "http://localhost:4318/v1/traces")
+TRACE_SERVICE_NAME = os.environ.get("TRACE_SERVICE_NAME", "aegis-mcp")
+
+# OTLP span kinds and status codes
+KIND_INTERNAL, KIND_SERVER = 1, 2
+STATUS_UNSET, STATUS_ERROR = 0, 2
+
+
+def parse_traceparent(header: str | None) -> tuple[str, str, bool] | None:
+    """Parse a W3C traceparent header into (trace ID, parent span ID, sampled)."""
+    if not header:
+        return None
+    parts = header.strip().lower().split("-")
+    if len(parts) < 4 or len(parts[0]) != 2 or parts[0] == "ff":
+        return None
+    version, trace_id, span_id, flags = parts[:4]
+    if version == "00" and len(parts) != 4:
+        return None
+    try:
+        if len(trace_id) != 32 or len(span_id) != 16 or len(flags) != 2:
+            return None
+        if int(trace_id, 16) == 0 or int(span_id, 16) == 0:
+            return None
+        return trace_id, span_id, bool(int(flags, 16) & 0x01)
+    except ValueError:
+        return None
+
+
+def _new_id(bits: int) -> str:
+    value = 0
+    while not value:
+        value = random.getrandbits(bits)
+    return f"{value:0{bits // 4}x}"
+
+
+class Span:
+    """One timed operation within a trace."""
+
+    def __init__(
+        self,
+        name: str,
+        parent: "Span | None" = None,
+        remote: tuple[str, str, bool] | None = None,
+        kind: int = KIND_INTERNAL,
+        attributes: dict[str, Any] | None = None,
+    ):
+        self.name = name
+        self.kind = kind
+        self.span_id = _new_id(64)
+        if parent is not None:
+            self.trace_id, self.parent_id, self.sampled = parent.trace_id, parent.span_id, parent.sampled
+            self.root = parent.root
+        else:
+            self.trace_id, self.parent_id, self.sampled = remote or (_new_id(128), None, True)
+            self.root = self
+        self.attributes: dict[str, Any] = dict(attributes or {})
+        self.status = STATUS_UNSET
+        self.status_message = ""
+        self.start_ns = time.time_ns()
+        self.end_ns: int | None = None
+        self.finished: list[Span] = []
+
+    @property
+    def traceparent(self) -> str:
+        return f"00-{self.trace_id}-{self.span_id}-{'01' if self.sampled else '00'}"
+
+    @property
+    def duration_ms(self) -> float:
+        return ((self.end_ns or time.time_ns()) - self.start_ns) / 1e6
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def record_error(self, error: BaseException) -> None:
+        self.status = STATUS_ERROR
+        self.status_message = f"{type(error).__name__}: {error}"[:200]
+
+    def end(self) -> None:
+        if self.end_ns is not None:
+            return
+        self.end_ns = time.time_ns()
+        if self.root is not self:
+            self.root.finished.append(self)
+        if self.sampled:
+            exporter.export(self)
+
+    def server_timing(self) -> str:
+        """Server-Timing header value: summed time per span name, plus total."""
+        durations: dict[str, float] = {}
+        for child in list(self.finished):
+            durations[child.name] = durations.get(child.name, 0.0) + child.duration_ms
+        metrics = [f"{name};dur={ms:.2f}" for name, ms in durations.items()]
+        metrics.append(f"total;dur={self.duration_ms:.2f}")
+        return ", ".join(metrics)
+
+    def to_otlp(self) -> dict[str, Any]:
+        data: dict[str, Any] = {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": self.kind,
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.end_ns),
+            "attributes": _otlp_attributes(self.attributes),
+            "status": {"code": self.status},
+        }
+        if self.parent_id:
+            data["parentSpanId"] = self.parent_id
+        if self.status_message:
+            data["status"]["message"] = self.status_message
+        return data
+
+
+_current_span: ContextVar[Span | None] = ContextVar("aegis_mcp_current_span", default=None)
+
+
+@contextmanager
+def span(name: str, **attributes: Any) -> Iterator[Span | None]:
+    """Run a block as a child span of the active span (None while tracing is off)."""
+    if not TRACING_ENABLED:
+        yield None
+        return
+    active = Span(name, parent=_current_span.get(), attributes=attributes)
+    token = _current_span.set(active)
+    try:
+        yield active
+    except BaseException as e:
+        active.record_error(e)
+        raise
+    finally:
+        _current_span.reset(token)
+        active.end()
+
+
+def traced(name: str) -> Callable:
+    """Decorator running a sync or async function in a span."""
+    def decorator(fn: Callable) -> Callable:
+        if inspect.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def async_wrapper(*args, **kwargs):
+                with span(name):
+                    return await fn(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with span(name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def _otlp_value(value: Any) -> dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def _otlp_attributes(attributes: dict[str, Any]) -> list[dict[str, Any]]:
+    return [{"key": key, "value": _otlp_value(value)} for key, value in attributes.items() if value is not None]
+
+
+class SpanExporter:
+    """Exports finished spans in OTLP/JSON batches from a background thread."""
+
+    def __init__(self, mode: str = TRACE_EXPORT, max_queue: int = 4096):
+        self.mode = mode
+        self._queue: queue.Queue[Span] = queue.Queue(maxsize=max_queue)
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+
+    def export(self, span: Span) -> None:
+        if self.mode not in ("file", "otlp"):
+            return
+        if self._thread is None:
+            with self._lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._run, name="aegis-mcp-span-exporter", daemon=True)
+                    self._thread.start()
+        try:
+            self._queue.put_nowait(span)
+        except queue.Full:
+            pass  # never block a request on export
+
+    def _run(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < 256:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            self._write(batch)
+
+    def _write(self, spans: list[Span]) -> None:
+        payload = json.dumps({
+            "resourceSpans": [{
+                "resource": {"attributes": _otlp_attributes({"service.name": TRACE_SERVICE_NAME})},
+                "scopeSpans": [{"scope": {"name": "app.tracing"}, "spans": [s.to_otlp() for s in spans]}],
+            }]
+        })
+        try:
+            if self.mode == "file":
+                with open(TRACE_FILE, "a") as f:
+                    f.write(payload + "\n")
+            else:
+                request = urllib.request.Request(
+                    TRACE_OTLP_ENDPOINT,
+                    data=payload.encode(),
+                    headers={"Content-Type": "application/json"},
+                    method="POST",
+                )
+                with urllib.request.urlopen(request, timeout=5):
+                    pass
+        except Exception as e:
+            logger.warning(f"Span export failed ({len(spans)} spans): {e}")
+
+
+exporter = SpanExporter()
+
+
+class TracingMiddleware:
+    """Pure ASGI middleware: server span per request, traceparent and Server-Timing response headers."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not TRACING_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        remote = None
+        for name, value in scope.get("headers", ()):
+            if name == b"traceparent":
+                remote = parse_traceparent(value.decode("latin-1"))
+                break
+
+        server = Span(
+            f"{scope['method']} {scope['path']}",
+            remote=remote,
+            kind=KIND_SERVER,
+            attributes={"http.request.method": scope["method"], "url.path": scope["path"]},
+        )
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                server.set_attribute("http.response.status_code", message["status"])
+                if message["status"] >= 500:
+                    server.status = STATUS_ERROR
+                # SSE headers go out before the stream, so its timing covers setup only
+                headers = list(message.get("headers", []))
+                headers.append((b"traceparent", server.traceparent.encode()))
+                headers.append((b"server-timing", server.server_timing().encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        token = _current_span.set(server)
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except BaseException as e:
+            server.record_error(e)
+            raise
+        finally:
+            _current_span.reset(token)
+            route = getattr(scope.get("route"), "path", None)
+            if route:
+                server.name = f"{scope['method']} {route}"
+                server.set_attribute("http.route", route)
+            server.end()
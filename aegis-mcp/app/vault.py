@@ -1,8 +1,12 @@
 """HashiCorp Vault integration for secret retrieval."""
 import os
+import time
 import logging
 from typing import Any
 
+from app.metrics import VAULT_SECONDS
+from app.tracing import span
+
 logger = logging.getLogger(__name__)
 
 
@@ -139,4 +143,13 @@ def load_vault_token() -> dict[str, Any]:
     This is called AFTER authorization succeeds.
     The token value is never returned; only success/failure status.
     """
-    return load_vault_secret()
+    start = time.perf_counter()
+    with span("vault.load", configured=is_vault_configured()) as vault_span:
+        result = load_vault_secret()
+        if vault_span is not None:
+            vault_span.set_attribute("loaded", bool(result.get("vault_secret_loaded")))
+    VAULT_SECONDS.observe(
+        time.perf_counter() - start,
+        loaded="true" if result.get("vault_secret_loaded") else "false",
+    )
+    return result